@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Compare the full-file copilot response against the streamed per-agent patch, offline.
+
+Both paths are driven by FakeCopilotClient with the same scripted change (one agent
+added and wired into the front man's tools, the front man's instructions rewritten), so
+the difference is only in what the model has to write and when the caller sees it.
+Prints time to first event, total time and output tokens for each path.
+Usage: python benchmarks/copilot_patch_benchmark.py [--network industry/airline_policy] [--token-ms 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+from fake_copilot_llm import AGENT_BUILDER_DIR, FakeCopilotClient
+
+from pyhocon_copilot_service import request_hocon_update, stream_hocon_patch
+from pyhocon_updater_service import AgentSpanIndex, _array_strings
+
+REGISTRY_ROOT = os.path.join(os.path.dirname(AGENT_BUILDER_DIR), "neuro-san-studio", "registries")
+
+
+def scripted_change(current_hocon):
+    index = AgentSpanIndex(current_hocon)
+    front_man = index.order[0]
+    tools_field = index.agents[front_man][1].get("tools")
+    tools = (_array_strings(index, tools_field.value) if tools_field is not None else None) or []
+    plan = {
+        "title": "Add feedback collector agent",
+        "description": f"Adds a FeedbackCollector that {front_man} calls after answering.",
+        "changes": ["Added FeedbackCollector", f"Updated {front_man} instructions and tools"],
+        "agents": {"existing": index.order, "new": ["FeedbackCollector"]},
+        "tools": {"existing": [], "new": []},
+        "connections": [[front_man, "FeedbackCollector"]],
+    }
+    edits = [
+        {"op": "update", "agent": front_man, "tools": tools + ["FeedbackCollector"],
+         "instructions": f"You are {front_man}. After answering, ask FeedbackCollector to record feedback."},
+        {"op": "add", "agent": {
+            "name": "FeedbackCollector",
+            "function": "${aaosa_call}",
+            "instructions": "Record the user's feedback on the last answer in one sentence.",
+        }},
+    ]
+    return plan, edits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--network", default="industry/airline_policy", help="Network path relative to the registries")
+    parser.add_argument("--first-token-ms", type=float, default=500.0)
+    parser.add_argument("--token-ms", type=float, default=5.0, help="Simulated time per output token")
+    args = parser.parse_args()
+
+    with open(os.path.join(REGISTRY_ROOT, f"{args.network}.hocon")) as f:
+        current_hocon = f.read()
+    plan, edits = scripted_change(current_hocon)
+    prompt = "Add an agent that collects feedback after each answer."
+
+    def client():
+        return FakeCopilotClient(plan, edits, args.first_token_ms / 1000.0, args.token_ms / 1000.0)
+
+    full_client = client()
+    start = time.perf_counter()
+    full = request_hocon_update(current_hocon, prompt, client=full_client)
+    full_total = (time.perf_counter() - start) * 1000.0
+
+    patch_client = client()
+    start = time.perf_counter()
+    first_event = None
+    result = None
+    for event in stream_hocon_patch(current_hocon, prompt, client=patch_client):
+        if first_event is None:
+            first_event = (time.perf_counter() - start) * 1000.0
+        if event["type"] == "result":
+            result = event["plan"]
+    patch_total = (time.perf_counter() - start) * 1000.0
+
+    assert result["hocon"] == full["plan"]["hocon"], "patched HOCON differs from the full-file response"
+
+    print(f"network={args.network} size={len(current_hocon)} chars, {len(edits)} edits")
+    print(f"  {'full-file':<10} first event={full_total:8.1f}ms  total={full_total:8.1f}ms"
+          f"  tokens out={full_client.tokens_out}")
+    print(f"  {'patch':<10} first event={first_event:8.1f}ms  total={patch_total:8.1f}ms"
+          f"  tokens out={patch_client.tokens_out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the google-genai client used by pyhocon_copilot_service.
+
+FakeCopilotClient answers generate_content / generate_content_stream from a scripted
+change instead of calling Gemini, pacing its output like a real model (a fixed delay
+before the first token, then a fixed delay per token) so latency can be compared
+without credentials or network access. Tokens are estimated at 4 characters each.
+
+The scripted change is a plan dict plus a list of updater edits. Full-file requests get
+the plan with the whole patched HOCON in plan.hocon; patch requests get NDJSON lines.
+"""
+import json
+import os
+import sys
+import time
+
+AGENT_BUILDER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_BUILDER_DIR)
+
+from pyhocon_copilot_service import PATCH_SYSTEM_PROMPT  # noqa: E402
+from pyhocon_updater_service import apply_edits  # noqa: E402
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModels:
+    def __init__(self, client):
+        self.client = client
+
+    def _response_text(self, contents, config):
+        current_hocon = contents.split("CURRENT_HOCON:\n", 1)[1].rsplit("\n\nUSER_PROMPT:\n", 1)[0]
+        plan, edits = self.client.plan, self.client.edits
+        if config["system_instruction"] == PATCH_SYSTEM_PROMPT:
+            lines = [json.dumps({"type": "plan", **plan})]
+            lines += [json.dumps({"type": "op", **edit}) for edit in edits]
+            lines.append(json.dumps({"type": "done"}))
+            return "\n".join(lines) + "\n"
+        return json.dumps({"plan": {**plan, "hocon": apply_edits(current_hocon, edits)}})
+
+    def generate_content(self, model, contents, config):
+        text = self._response_text(contents, config)
+        self.client.record(text)
+        time.sleep(self.client.first_token_delay + estimate_tokens(text) * self.client.token_delay)
+        return FakeChunk(text)
+
+    def generate_content_stream(self, model, contents, config):
+        text = self._response_text(contents, config)
+        self.client.record(text)
+        time.sleep(self.client.first_token_delay)
+        step = self.client.chunk_tokens * CHARS_PER_TOKEN
+        for start in range(0, len(text), step):
+            chunk = text[start:start + step]
+            time.sleep(estimate_tokens(chunk) * self.client.token_delay)
+            yield FakeChunk(chunk)
+
+
+class FakeCopilotClient:
+    """
+    Drop-in for genai.Client as far as the copilot service uses it.
+    """
+
+    def __init__(self, plan, edits, first_token_delay=0.5, token_delay=0.01, chunk_tokens=16):
+        self.plan = plan
+        self.edits = edits
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.chunk_tokens = chunk_tokens
+        self.tokens_out = 0
+        self.models = FakeModels(self)
+
+    def record(self, text):
+        self.tokens_out = estimate_tokens(text)
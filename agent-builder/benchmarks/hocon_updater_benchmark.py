@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compare bulk prompt edits done one agent per call against a single batched update.
+
+Generates a synthetic network with --agents agents, then rewrites every agent's
+instructions three ways and prints the wall time of each:
+    spawn-per-agent   one updater process (parse + full rewrite) per agent, as the UI used to
+    call-per-agent    update_agent_instructions in-process, once per agent
+    batch             one update_agents call (one parse, one fsync)
+Usage: python benchmarks/hocon_updater_benchmark.py [--agents 40] [--repeat 3]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+AGENT_BUILDER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_BUILDER_DIR)
+
+from pyhocon_updater_service import AgentSpanIndex, update_agent_instructions, update_agents  # noqa: E402
+
+AGENT_TEMPLATE = '''        {{
+            "name": "agent_{index}",
+            "function": ${{aaosa_call}},
+            "instructions": ${{instructions_prefix}} """
+You are agent {index}. Route requests about topic {index} to your tools.
+""" ${{aaosa_instructions}},
+            "command": ${{aaosa_command}},
+            "tools": [{tools}]
+        }}'''
+
+
+def build_network(agent_count):
+    blocks = []
+    for index in range(agent_count):
+        tools = f'"agent_{index + 1}"' if index + 1 < agent_count else ""
+        blocks.append(AGENT_TEMPLATE.format(index=index, tools=tools))
+    return (
+        'include "registries/aaosa.hocon"\n'
+        "{\n"
+        '    "instructions_prefix": """\n    You are part of a benchmark network.\n    """,\n'
+        '    "tools": [\n' + ",\n".join(blocks) + "\n    ]\n}\n"
+    )
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--python", default=sys.executable, help="Interpreter for the spawned updater")
+    parser.add_argument("--agents", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="hocon_updater_bench_")
+    network_file = os.path.join(work_dir, "bench_network.hocon")
+    names = [f"agent_{index}" for index in range(args.agents)]
+    script = os.path.join(AGENT_BUILDER_DIR, "pyhocon_updater_service.py")
+
+    def spawn_per_agent(run):
+        for name in names:
+            subprocess.run([args.python, script, network_file, name, f"Run {run}: {name}"],
+                           check=True, stdout=subprocess.DEVNULL)
+
+    def call_per_agent(run):
+        for name in names:
+            update_agent_instructions(network_file, name, f"Run {run}: {name}")
+
+    def batch(run):
+        update_agents(network_file, [
+            {"op": "update", "agent": name, "instructions": f"Run {run}: {name}"} for name in names
+        ])
+
+    try:
+        print(f"agents={args.agents} repeat={args.repeat}")
+        for label, func in (("spawn-per-agent", spawn_per_agent),
+                            ("call-per-agent", call_per_agent),
+                            ("batch", batch)):
+            samples = []
+            for run in range(args.repeat):
+                with open(network_file, "w") as f:
+                    f.write(build_network(args.agents))
+                samples.append(timed(lambda: func(run)))
+                # Every agent must carry the new text, whichever path wrote it
+                with open(network_file) as f:
+                    content = f.read()
+                assert all(f"Run {run}: {name}\n" in content for name in names)
+                assert AgentSpanIndex(content).order == names
+            print(f"  {label:<16} best={min(samples):9.1f}ms  mean={sum(samples) / len(samples):9.1f}ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
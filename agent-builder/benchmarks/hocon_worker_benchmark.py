@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Compare request latency of the long-lived HOCON worker against spawning a script per call.
+
+Runs the same manifest/parse/toolbox operations both ways and prints p50/p99 in ms.
+Usage: python benchmarks/hocon_worker_benchmark.py [--iterations 50] [--concurrency 8]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+AGENT_BUILDER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUDIO_DIR = os.path.join(os.path.dirname(AGENT_BUILDER_DIR), "neuro-san-studio")
+REGISTRY_ROOT = os.path.join(STUDIO_DIR, "registries")
+TOOLBOX_PATH = os.path.join(STUDIO_DIR, "toolbox", "toolbox_info.hocon")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_worker(python, port):
+    worker = subprocess.Popen(
+        [python, os.path.join(AGENT_BUILDER_DIR, "pyhocon_worker_service.py"), str(port)],
+        cwd=AGENT_BUILDER_DIR,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    # Block until the worker prints its ready line, same as the Vite middleware does.
+    line = worker.stdout.readline()
+    if "listening" not in line:
+        worker.kill()
+        raise RuntimeError(f"HOCON worker failed to start: {line!r}")
+    return worker
+
+
+def call_worker(port, operation, payload):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/{operation}",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request) as response:
+        return response.read()
+
+
+def call_spawn(python, script, args):
+    subprocess.run(
+        [python, os.path.join(AGENT_BUILDER_DIR, script), *args],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def measure(func, iterations, concurrency):
+    def timed(_):
+        start = time.perf_counter()
+        func()
+        return (time.perf_counter() - start) * 1000.0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(timed, range(iterations)))
+
+
+def report(label, samples):
+    print(
+        f"  {label:<8} p50={percentile(samples, 50):8.1f}ms  p99={percentile(samples, 99):8.1f}ms"
+        f"  mean={statistics.mean(samples):8.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--python", default=sys.executable, help="Interpreter used for both paths")
+    parser.add_argument("--network", default="basic/coffee_finder", help="Network path relative to the registries")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    network_file = os.path.join(REGISTRY_ROOT, f"{args.network}.hocon")
+    cases = {
+        "manifest": (
+            {"registriesRoot": REGISTRY_ROOT},
+            ("pyhocon_manifest_parser.py", [REGISTRY_ROOT]),
+        ),
+        "parse": (
+            {"filePath": network_file, "registryRoot": REGISTRY_ROOT},
+            ("pyhocon_parser_service.py", [network_file, REGISTRY_ROOT]),
+        ),
+        "toolbox": (
+            {"toolboxPath": TOOLBOX_PATH},
+            ("pyhocon_toolbox_parser.py", [TOOLBOX_PATH]),
+        ),
+    }
+
+    port = free_port()
+    worker = start_worker(args.python, port)
+    try:
+        print(f"iterations={args.iterations} concurrency={args.concurrency} network={args.network}")
+        for operation, (payload, (script, script_args)) in cases.items():
+            # One warm-up call so the worker's first-request costs are not counted.
+            call_worker(port, operation, payload)
+            worker_samples = measure(lambda: call_worker(port, operation, payload), args.iterations, args.concurrency)
+            spawn_samples = measure(
+                lambda: call_spawn(args.python, script, script_args), args.iterations, args.concurrency
+            )
+            print(f"{operation}:")
+            report("worker", worker_samples)
+            report("spawn", spawn_samples)
+            print(f"  speedup  p50 x{percentile(spawn_samples, 50) / percentile(worker_samples, 50):.1f}")
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats") as response:
+            print(f"worker stats: {response.read().decode('utf-8')}")
+    finally:
+        worker.terminate()
+        worker.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,8 @@
 import sys
 import os
 import json
-from google import genai
-from google.genai import types
-import google.auth
-from google.auth.exceptions import DefaultCredentialsError
+
+from pyhocon_updater_service import HoconUpdateError, apply_edits
 
 # Try to load dotenv but don't fail if missing
 try:
@@ -57,73 +55,251 @@ HOCON Rules:
 - `connections` should represent the agent-to-agent call graph (who calls whom)
 """
 
+PATCH_SYSTEM_PROMPT = """You are an expert AI Architect specializing in 'Neuro SAN' Agent networks, defined in HOCON format.
+You will be given CURRENT_HOCON (the existing network) and USER_PROMPT (the requested change).
 
-def generate_hocon_update(file_path, prompt):
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            current_hocon = f.read()
-    except Exception as e:
-        print(json.dumps({"error": f"Failed to read HOCON file: {e}"}), file=sys.stderr)
-        sys.exit(1)
+Respond with newline-delimited JSON: one compact JSON object per line, no markdown, no extra text.
+Describe only what changes; NEVER repeat the unchanged network.
+
+Line 1 is the plan:
+{"type": "plan", "title": "...(max 8 words)", "description": "1-2 sentences", "changes": ["..."],
+ "agents": {"existing": ["..."], "new": ["..."]}, "tools": {"existing": ["..."], "new": ["..."]},
+ "connections": [["AgentA", "AgentB"]]}
+
+Then one line per agent operation:
+{"type": "op", "op": "update", "agent": "ExistingAgent", "instructions": "...", "tools": ["..."], "function": {...}}
+{"type": "op", "op": "add", "agent": {"name": "NewAgent", "function": {...}, "instructions": "...", "tools": ["..."]}}
+{"type": "op", "op": "remove", "agent": "ExistingAgent"}
+
+Finally:
+{"type": "done"}
+
+Patch Rules:
+- In "update", include only the keys that change (any of instructions, tools, function)
+- "tools" replaces the agent's whole tools list
+- "function" may be the string "${aaosa_call}" to keep using the shared AAOSA function
+- If an agent is strictly a function (leaf node), it MUST NOT have an `instructions` key
+- When you add an agent, also update the tools list of the agent that should call it
+- `connections` should represent the agent-to-agent call graph (who calls whom)
+"""
+
+MODEL_NAME = 'gemini-2.5-pro'
 
-    client = None
+PATCH_OPS = ("update", "add", "remove")
+
+
+class CopilotError(Exception):
+    """
+    Raised when the copilot cannot produce a plan. The message is safe to show to the user.
+    """
+
+
+_client = None
+
+
+def get_client():
+    """
+    Build the Gemini client once per process (ADC first, then GOOGLE_API_KEY).
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    # Imported here so that the prompts and the patch path load without google-genai (e.g. offline benchmarks)
+    try:
+        from google import genai
+        import google.auth
+    except ImportError as e:
+        raise CopilotError(f"google-genai is not installed: {e}") from e
 
     try:
         credentials, project_id = google.auth.default()
         if project_id:
-            client = genai.Client(vertexai=True, project=project_id, location="us-central1")
+            _client = genai.Client(vertexai=True, project=project_id, location="us-central1")
         else:
             raise Exception("No project_id found in ADC.")
     except Exception as adc_err:
         API_KEY = os.environ.get("GOOGLE_API_KEY", "")
         if API_KEY:
-            client = genai.Client(api_key=API_KEY)
+            _client = genai.Client(api_key=API_KEY)
         else:
-            print(json.dumps({"error": f"Auth failed. No ADC or API_KEY found. ADC Error: {adc_err}"}), file=sys.stderr)
-            sys.exit(1)
+            raise CopilotError(f"Auth failed. No ADC or API_KEY found. ADC Error: {adc_err}")
+
+    return _client
+
+
+def _strip_fences(res_text):
+    """
+    Strip accidental markdown fences around a model response.
+    """
+    res_text = res_text.strip()
+    if res_text.startswith("```json"):
+        res_text = res_text[7:]
+        if res_text.endswith("```"):
+            res_text = res_text[:-3]
+    elif res_text.startswith("```"):
+        res_text = res_text[3:]
+        if res_text.endswith("```"):
+            res_text = res_text[:-3]
+    return res_text.strip()
+
+
+def _raise_copilot_error(e):
+    error_msg = str(e)
+    if "401" in error_msg or "403" in error_msg or "API_KEY_INVALID" in error_msg:
+        raise CopilotError("Auth Error: Invalid API Key or blocked project permissions.") from e
+    raise CopilotError(f"Gemini Generation Failed: {e}") from e
+
+
+def _contents(current_hocon, prompt):
+    return f"CURRENT_HOCON:\n{current_hocon}\n\nUSER_PROMPT:\n{prompt}"
+
+
+def request_hocon_update(current_hocon, prompt, client=None):
+    """
+    Ask the model for a plan against the given HOCON content and return the parsed response.
+    The response carries the whole modified file in plan.hocon.
+    """
+    client = client or get_client()
 
     try:
         response = client.models.generate_content(
-            model='gemini-2.5-pro',
-            contents=f"CURRENT_HOCON:\n{current_hocon}\n\nUSER_PROMPT:\n{prompt}",
-            config=types.GenerateContentConfig(
-                system_instruction=UNIFIED_SYSTEM_PROMPT,
-                response_mime_type="application/json",
-            )
+            model=MODEL_NAME,
+            contents=_contents(current_hocon, prompt),
+            config={
+                "system_instruction": UNIFIED_SYSTEM_PROMPT,
+                "response_mime_type": "application/json",
+            }
         )
 
-        res_text = response.text.strip()
-
-        # Strip any accidental markdown fences
-        if res_text.startswith("```json"):
-            res_text = res_text[7:]
-            if res_text.endswith("```"):
-                res_text = res_text[:-3]
-        elif res_text.startswith("```"):
-            res_text = res_text[3:]
-            if res_text.endswith("```"):
-                res_text = res_text[:-3]
-
-        parsed = json.loads(res_text.strip())
+        parsed = json.loads(_strip_fences(response.text))
 
         # Validate structure
         if "plan" not in parsed:
             raise ValueError("Response missing 'plan' key")
 
-        print(json.dumps(parsed))
+        return parsed
+
+    except Exception as e:
+        _raise_copilot_error(e)
+
+
+def _iter_lines(chunks):
+    """
+    Reassemble streamed text chunks into complete lines.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk.text or ""
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line
+    yield buffer
+
+
+def _parse_event(line):
+    line = line.strip()
+    if not line or line.startswith("```"):
+        return None
+    event = json.loads(line)
+    if not isinstance(event, dict) or "type" not in event:
+        raise ValueError(f"Unexpected line in patch stream: {line[:200]}")
+    if event["type"] == "op" and event.get("op") not in PATCH_OPS:
+        raise ValueError(f"Unknown patch op: {event.get('op')}")
+    return event
+
+
+def stream_hocon_patch(current_hocon, prompt, client=None):
+    """
+    Stream the model's plan as events while it is generated, then apply the patch locally.
+
+    Yields, in order:
+        {"type": "plan", ...plan fields...}     as soon as the first line arrives
+        {"type": "op", "op": ..., ...}          one per agent edit
+        {"type": "result", "plan": {...}}       plan plus "patch" (the edits) and "hocon" (the patched file)
+
+    The model only writes the change, so output tokens scale with the edit rather than the network.
+    Raises CopilotError if generation fails or the patch does not apply.
+    """
+    client = client or get_client()
+    plan = None
+    edits = []
+
+    try:
+        stream = client.models.generate_content_stream(
+            model=MODEL_NAME,
+            contents=_contents(current_hocon, prompt),
+            config={"system_instruction": PATCH_SYSTEM_PROMPT},
+        )
+        for line in _iter_lines(stream):
+            event = _parse_event(line)
+            if event is None:
+                continue
+            if event["type"] == "plan":
+                plan = {key: value for key, value in event.items() if key != "type"}
+            elif event["type"] == "op":
+                edits.append({key: value for key, value in event.items() if key != "type"})
+            elif event["type"] == "done":
+                break
+            yield event
+    except Exception as e:
+        _raise_copilot_error(e)
+
+    if plan is None:
+        raise CopilotError("Gemini Generation Failed: response had no plan")
+
+    try:
+        new_hocon = apply_edits(current_hocon, edits)
+    except HoconUpdateError as e:
+        raise CopilotError(f"Copilot patch did not apply: {e}") from e
+
+    yield {"type": "result", "plan": {**plan, "patch": edits, "hocon": new_hocon}}
+
+
+def request_hocon_patch(current_hocon, prompt, client=None):
+    """
+    Non-streaming form of stream_hocon_patch, shaped like request_hocon_update's response.
+    """
+    result = None
+    for event in stream_hocon_patch(current_hocon, prompt, client=client):
+        if event["type"] == "result":
+            result = event
+    return {"plan": result["plan"]}
+
 
+def generate_hocon_update(file_path, prompt, mode="full"):
+    """
+    CLI entry point. mode is "full" (whole file in the plan), "patch" (patched locally)
+    or "stream" (one JSON event per line as the plan is generated).
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            current_hocon = f.read()
     except Exception as e:
-        error_msg = str(e)
-        if "401" in error_msg or "403" in error_msg or "API_KEY_INVALID" in error_msg:
-            print(json.dumps({"error": "Auth Error: Invalid API Key or blocked project permissions."}), file=sys.stderr)
+        print(json.dumps({"error": f"Failed to read HOCON file: {e}"}), file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if mode == "stream":
+            for event in stream_hocon_patch(current_hocon, prompt):
+                print(json.dumps(event), flush=True)
+            return
+        if mode == "patch":
+            parsed = request_hocon_patch(current_hocon, prompt)
         else:
-            print(json.dumps({"error": f"Gemini Generation Failed: {e}"}), file=sys.stderr)
+            parsed = request_hocon_update(current_hocon, prompt)
+    except CopilotError as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
         sys.exit(1)
 
+    print(json.dumps(parsed))
+
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print(json.dumps({"error": "Missing arguments. Usage: pyhocon_copilot_service.py <file_path> <prompt>"}), file=sys.stderr)
+    args = [arg for arg in sys.argv[1:] if arg not in ("--patch", "--stream")]
+    if len(args) < 2:
+        print(json.dumps({"error": "Missing arguments. Usage: pyhocon_copilot_service.py <file_path> <prompt> [--patch|--stream]"}), file=sys.stderr)
         sys.exit(1)
 
-    generate_hocon_update(sys.argv[1], sys.argv[2])
+    cli_mode = "stream" if "--stream" in sys.argv else "patch" if "--patch" in sys.argv else "full"
+    generate_hocon_update(args[0], args[1], cli_mode)
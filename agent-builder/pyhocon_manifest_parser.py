@@ -54,25 +54,35 @@ def parse_manifest_entries(content: str) -> dict:
     
     return entries
 
+def find_manifest_files(registries_root: str) -> list[str]:
+    """
+    Return the root manifest plus every manifest it pulls in through `include`, recursively.
+    Include paths are written relative to the registries' parent ("registries/basic/manifest.hocon").
+    """
+    manifest_files = []
+    pending = [os.path.join(registries_root, 'manifest.hocon')]
+    while pending:
+        manifest_path = os.path.normpath(pending.pop(0))
+        if manifest_path in manifest_files or not os.path.exists(manifest_path):
+            continue
+        manifest_files.append(manifest_path)
+
+        with open(manifest_path, 'r') as f:
+            content = f.read()
+        for include in re.findall(r'^\s*include\s+"([^"]+)"', content, re.MULTILINE):
+            if include.startswith('registries/'):
+                include = include[len('registries/'):]
+            pending.append(os.path.join(registries_root, include))
+
+    return manifest_files
+
 def get_served_networks(registries_root: str) -> list[str]:
     """
     Parse all manifest files in registries and return served+public agent networks.
     """
     served_networks = []
     
-    # List of manifest files to parse
-    manifest_files = [
-        os.path.join(registries_root, 'manifest.hocon'),
-        os.path.join(registries_root, 'basic', 'manifest.hocon'),
-        os.path.join(registries_root, 'tools', 'manifest.hocon'),
-        os.path.join(registries_root, 'industry', 'manifest.hocon'),
-        os.path.join(registries_root, 'experimental', 'manifest.hocon'),
-    ]
-    
-    for manifest_path in manifest_files:
-        if not os.path.exists(manifest_path):
-            continue
-        
+    for manifest_path in find_manifest_files(registries_root):
         try:
             with open(manifest_path, 'r') as f:
                 content = f.read()
@@ -1,27 +1,142 @@
 import sys
 import json
 import os
+import re
+import threading
+from collections import OrderedDict
 from pyhocon import ConfigFactory, HOCONConverter
 
-if len(sys.argv) < 3:
-    print("Usage: python pyhocon_parser_service.py <file_path> <registry_root>", file=sys.stderr)
-    sys.exit(1)
+INCLUDE_PATTERN = re.compile(r'^\s*include\s+(?:required\s*\(\s*)?(?:file\s*\(\s*)?"([^"]+)"', re.MULTILINE)
 
-file_path = sys.argv[1]
-registry_root = sys.argv[2]
 
-try:
+class NetworkCache:
+    """
+    Bounded LRU of parsed networks for the long-lived worker.
+
+    An entry stays valid while the (mtime, size) of the network file and of every file it
+    pulls in through `include` are unchanged, so editing registries/aaosa.hocon invalidates
+    every network that includes it.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def stamp(path):
+        try:
+            stat = os.stat(path)
+            return (path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return (path, None, None)
+
+    @classmethod
+    def collect_stamps(cls, file_path, registry_root):
+        """
+        Stamp the network and, recursively, its includes. Includes are resolved the way
+        parse_network_content does (registry root, 'registries/' prefix stripped) and also
+        next to the including file; missing candidates are stamped too so new files are noticed.
+        """
+        stamps = []
+        seen = set()
+        pending = [os.path.normpath(file_path)]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            file_stamp = cls.stamp(path)
+            stamps.append(file_stamp)
+            if file_stamp[1] is None:
+                continue
+            try:
+                with open(path, 'r') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            for include in INCLUDE_PATTERN.findall(content):
+                if include.startswith('registries/'):
+                    include = include[len('registries/'):]
+                for base in (registry_root, os.path.dirname(path)):
+                    pending.append(os.path.normpath(os.path.join(base, include)))
+        return stamps
+
+    def get(self, file_path, registry_root, loader):
+        key = (os.path.normpath(file_path), os.path.normpath(registry_root))
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, stamps = entry
+                if all(self.stamp(path) == (path, mtime, size) for path, mtime, size in stamps):
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+                self.invalidations += 1
+            self.misses += 1
+
+        # Stamp before loading so an edit that lands mid-parse is picked up next time.
+        stamps = self.collect_stamps(file_path, registry_root)
+        value = loader()
+
+        with self.lock:
+            self.entries[key] = (value, stamps)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+def parse_network_content(content, registry_root):
+    """
+    Parse HOCON content against the registries root and return it as a JSON string.
+    """
+    # Fix includes: 'include "registries/' -> 'include "'
+    fixed_content = content.replace('include "registries/', 'include "')
+
+    conf = ConfigFactory.parse_string(fixed_content, basedir=registry_root)
+    return HOCONConverter.to_json(conf)
+
+
+def parse_network(file_path, registry_root):
+    """
+    Parse a HOCON network file and return it as a JSON string.
+    """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
     with open(file_path, 'r') as f:
         content = f.read()
-    
-    # Fix includes: 'include "registries/' -> 'include "'
-    fixed_content = content.replace('include "registries/', 'include "')
-    
-    conf = ConfigFactory.parse_string(fixed_content, basedir=registry_root)
-    print(HOCONConverter.to_json(conf))
-except Exception as e:
-    print(f'Error: {e}', file=sys.stderr)
-    sys.exit(1)
+
+    return parse_network_content(content, registry_root)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python pyhocon_parser_service.py <file_path> <registry_root>", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        print(parse_network(sys.argv[1], sys.argv[2]))
+    except Exception as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
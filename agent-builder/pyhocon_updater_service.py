@@ -1,134 +1,601 @@
+#!/usr/bin/env python3
+"""
+Edit agent blocks in a HOCON agent network file in place.
+
+The file is tokenized once into a span index of the top-level `tools` array: one entry
+per agent block, with the exact text span of each of its fields. A batch of edits is
+then turned into non-overlapping splices over the original text and written back with a
+single atomic replace, so comments, includes and substitutions outside the edited
+values are left untouched and an edit can never bleed into the next agent's block.
+
+Usage:
+    python pyhocon_updater_service.py <file_path> <agent_name> <new_instructions>
+    python pyhocon_updater_service.py <file_path> --batch '<json list of edits>'
+
+Edits:
+    {"op": "update", "agent": "Name", "instructions": "...", "tools": [...], "function": {...}}
+    {"op": "add", "agent": {"name": "Name", "instructions": "...", "function": {...}, ...}}
+    {"op": "remove", "agent": "Name", "prune_references": true}
+
+`function` may also be given as a HOCON string such as "${aaosa_call}", which is written verbatim.
+"""
 import sys
-import re
+import json
 import os
+import tempfile
 
-def update_agent_instructions(file_path, agent_name, new_instructions):
+# Characters that end an unquoted HOCON token
+UNQUOTED_STOP = set(' \t\r\n"{}[],=:#')
+
+# Fields written as triple-quoted strings when they are set
+MULTILINE_FIELDS = ("instructions",)
+
+UPDATABLE_FIELDS = ("instructions", "tools", "function")
+
+
+class HoconUpdateError(Exception):
+    """
+    Raised when an edit cannot be applied. Nothing is written when this is raised.
+    """
+
+
+class Token:
+    __slots__ = ("kind", "start", "end")
+
+    def __init__(self, kind, start, end):
+        self.kind = kind
+        self.start = start
+        self.end = end
+
+
+class Node:
+    """
+    A parsed HOCON value with its [start, end) span in the source text.
+    kind is one of: object, array, concat, string, subst, word, sep.
+    """
+
+    __slots__ = ("kind", "start", "end", "fields", "items", "parts")
+
+    def __init__(self, kind, start, end=None):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.fields = []
+        self.items = []
+        self.parts = []
+
+
+class Field:
+    __slots__ = ("key", "key_token", "sep", "value")
+
+    def __init__(self, key, key_token, sep, value):
+        self.key = key
+        self.key_token = key_token
+        self.sep = sep
+        self.value = value
+
+
+def tokenize(content):
+    """
+    Split HOCON text into structural tokens, skipping whitespace and comments.
+    Newlines are kept because they separate fields and array items.
+    """
+    tokens = []
+    i, n = 0, len(content)
+    while i < n:
+        c = content[i]
+        if c == '\n':
+            tokens.append(Token('newline', i, i + 1))
+            i += 1
+        elif c in ' \t\r\ufeff':
+            i += 1
+        elif c == '#' or content.startswith('//', i):
+            end = content.find('\n', i)
+            i = n if end == -1 else end
+        elif content.startswith('"""', i):
+            end = content.find('"""', i + 3)
+            if end == -1:
+                raise HoconUpdateError(f"Unterminated triple-quoted string at offset {i}")
+            end += 3
+            # HOCON lets extra quotes sit just before the closing """
+            while end < n and content[end] == '"':
+                end += 1
+            tokens.append(Token('string', i, end))
+            i = end
+        elif c == '"':
+            end = i + 1
+            while end < n and content[end] != '"':
+                if content[end] == '\n':
+                    raise HoconUpdateError(f"Unterminated string at offset {i}")
+                end += 2 if content[end] == '\\' else 1
+            if end >= n:
+                raise HoconUpdateError(f"Unterminated string at offset {i}")
+            tokens.append(Token('string', i, end + 1))
+            i = end + 1
+        elif content.startswith('${', i):
+            end = content.find('}', i)
+            if end == -1:
+                raise HoconUpdateError(f"Unterminated substitution at offset {i}")
+            tokens.append(Token('subst', i, end + 1))
+            i = end + 1
+        elif c in '{}[],':
+            tokens.append(Token(c, i, i + 1))
+            i += 1
+        elif content.startswith('+=', i):
+            tokens.append(Token('sep', i, i + 2))
+            i += 2
+        elif c in '=:':
+            tokens.append(Token('sep', i, i + 1))
+            i += 1
+        else:
+            end = i
+            while end < n and content[end] not in UNQUOTED_STOP and not content.startswith('//', end) \
+                    and not content.startswith('${', end) and not content.startswith('+=', end):
+                end += 1
+            tokens.append(Token('word', i, end))
+            i = end
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent pass over the tokens that records spans; values are not interpreted.
+    """
+
+    def __init__(self, content, tokens):
+        self.content = content
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise HoconUpdateError("Unexpected end of file")
+        self.pos += 1
+        return token
+
+    def skip(self, kinds):
+        while self.peek() is not None and self.peek().kind in kinds:
+            self.pos += 1
+
+    def text(self, node_or_token):
+        return self.content[node_or_token.start:node_or_token.end]
+
+    def parse_root(self):
+        self.skip(('newline', ','))
+        # Includes may precede a braced root object
+        start = self.pos
+        while self.peek() is not None and self.peek().kind == 'word' and self.text(self.peek()) == 'include':
+            self.next()
+            self.parse_value()
+            self.skip(('newline', ','))
+        token = self.peek()
+        if token is None or token.kind != '{':
+            self.pos = start
+            token = self.peek()
+        if token is not None and token.kind == '{':
+            root = self.parse_object()
+            self.skip(('newline', ','))
+            if self.peek() is not None:
+                raise HoconUpdateError(f"Unexpected content after root object at offset {self.peek().start}")
+            return root
+        root = self.parse_object_body(0, None)
+        root.end = len(self.content)
+        return root
+
+    def parse_object(self):
+        open_token = self.next()
+        node = self.parse_object_body(open_token.start, '}')
+        node.end = self.next().end
+        return node
+
+    def parse_object_body(self, start, closing):
+        node = Node('object', start)
+        while True:
+            self.skip(('newline', ','))
+            token = self.peek()
+            if token is None:
+                if closing is not None:
+                    raise HoconUpdateError(f"Missing '{closing}' for block opened at offset {start}")
+                return node
+            if token.kind == closing:
+                return node
+            if token.kind == 'word' and self.text(token) == 'include':
+                self.next()
+                self.parse_value()
+                continue
+            if token.kind not in ('word', 'string'):
+                raise HoconUpdateError(f"Expected a key at offset {token.start}")
+            key_token = self.next()
+            sep = None
+            if self.peek() is not None and self.peek().kind == 'sep':
+                sep = self.text(self.next())
+                # A value may start on the line after the separator
+                self.skip(('newline',))
+            elif self.peek() is None or self.peek().kind != '{':
+                raise HoconUpdateError(f"Expected '=', ':' or '{{' after key at offset {key_token.start}")
+            value = self.parse_value()
+            node.fields.append(Field(unquote(self.text(key_token)), key_token, sep, value))
+
+    def parse_array(self):
+        open_token = self.next()
+        node = Node('array', open_token.start)
+        while True:
+            self.skip(('newline', ','))
+            token = self.peek()
+            if token is None:
+                raise HoconUpdateError(f"Missing ']' for list opened at offset {open_token.start}")
+            if token.kind == ']':
+                node.end = self.next().end
+                return node
+            node.items.append(self.parse_value())
+
+    def parse_value(self):
+        parts = []
+        while self.peek() is not None and self.peek().kind not in ('newline', ',', '}', ']'):
+            token = self.peek()
+            if token.kind == '{':
+                parts.append(self.parse_object())
+            elif token.kind == '[':
+                parts.append(self.parse_array())
+            else:
+                self.next()
+                parts.append(Node(token.kind, token.start, token.end))
+        if not parts:
+            offset = self.peek().start if self.peek() is not None else len(self.content)
+            raise HoconUpdateError(f"Missing value at offset {offset}")
+        if len(parts) == 1:
+            return parts[0]
+        concat = Node('concat', parts[0].start, parts[-1].end)
+        concat.parts = parts
+        return concat
+
+
+def unquote(text):
+    if text.startswith('"""'):
+        return text[3:-3]
+    if text.startswith('"'):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text[1:-1]
+    return text.strip()
+
+
+class AgentSpanIndex:
+    """
+    Span index of the agent blocks in a network file's top-level `tools` array.
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.root = _Parser(content, tokenize(content)).parse_root()
+
+        self.tools_array = None
+        for field in self.root.fields:
+            if field.key == 'tools' and field.value.kind == 'array':
+                # HOCON: the last definition wins
+                self.tools_array = field.value
+        if self.tools_array is None:
+            raise HoconUpdateError("No top-level 'tools' list found")
+
+        self.agents = {}
+        self.order = []
+        for item in self.tools_array.items:
+            if item.kind != 'object':
+                continue
+            fields = {field.key: field for field in item.fields}
+            name_field = fields.get('name')
+            if name_field is None or name_field.value.kind not in ('string', 'word'):
+                continue
+            name = unquote(content[name_field.value.start:name_field.value.end])
+            self.agents[name] = (item, fields)
+            self.order.append(name)
+
+    def field_indent(self, item, fields):
+        """Indentation used for fields inside an agent block."""
+        anchor = next(iter(item.fields), None)
+        if anchor is None:
+            return self.line_indent(item.start) + '    '
+        return self.line_indent(anchor.key_token.start)
+
+    def line_indent(self, offset):
+        line_start = self.content.rfind('\n', 0, offset) + 1
+        prefix = self.content[line_start:offset]
+        return prefix[:len(prefix) - len(prefix.lstrip())]
+
+    def key_style(self):
+        """(quote keys?, separator) as used by the first agent's name field."""
+        for name in self.order:
+            name_field = self.agents[name][1]['name']
+            quoted = self.content[name_field.key_token.start] == '"'
+            sep = name_field.sep or '='
+            return quoted, sep
+        return False, '='
+
+    def _comma_between(self, before, after):
+        return ',' in [token.kind for token in tokenize(self.content[before.end:after.start])]
+
+    def items_use_commas(self):
+        items = self.tools_array.items
+        if len(items) > 1:
+            return self._comma_between(items[0], items[1])
+        return self.key_style()[0]
+
+    def fields_use_commas(self):
+        for name in self.order:
+            fields = self.agents[name][0].fields
+            if len(fields) > 1:
+                return self._comma_between(fields[0].value, fields[1].key_token)
+        return self.key_style()[0]
+
+
+def _indent_block(text, indent):
+    lines = text.split('\n')
+    return '\n'.join([lines[0]] + [indent + line for line in lines[1:]])
+
+
+def format_value(key, value, indent):
+    """Render a Python value as HOCON text for the given field."""
+    if key in MULTILINE_FIELDS:
+        if not isinstance(value, str):
+            raise HoconUpdateError(f"'{key}' must be a string")
+        # Triple-quoted strings cannot contain triple quotes
+        sanitized = value.replace('"""', '\\"\\"\\"')
+        return '"""\n' + sanitized + '\n"""'
+    if key == 'function' and isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(not isinstance(item, (dict, list)) for item in value):
+        # Keep tool lists on one line, as the registries write them
+        return json.dumps(value)
+    return _indent_block(json.dumps(value, indent=4), indent)
+
+
+def format_key(key, quoted):
+    return json.dumps(key) if quoted else key
+
+
+def _replace_instructions(index, agent_name, field, value):
+    node = field.value
+    parts = node.parts if node.kind == 'concat' else [node]
+    literal = next((part for part in parts if part.kind == 'string'), None)
+    if literal is None:
+        raise HoconUpdateError(
+            f"Instructions of '{agent_name}' have no string literal; refusing to overwrite substitution logic"
+        )
+    # Keep substitutions around the literal, e.g. ${instructions_prefix} """...""" ${aaosa_instructions}
+    return (literal.start, literal.end, format_value('instructions', value, ''))
+
+
+def _array_strings(index, node):
+    """The string items of a plain list value, or None if it holds anything else."""
+    if node.kind != 'array':
+        return None
+    values = []
+    for item in node.items:
+        if item.kind not in ('string', 'word'):
+            return None
+        values.append(unquote(index.content[item.start:item.end]))
+    return values
+
+
+def plan_edits(index, edits):
+    """
+    Turn a batch of edits into a list of (start, end, replacement) splices over index.content.
+    """
+    splices = []
+    touched = {}
+    removed = []
+    added = []
+    quoted, sep = index.key_style()
+    sep_text = ': ' if sep == ':' else ' = '
+    field_comma = ',' if index.fields_use_commas() else ''
+
+    def claim(agent_name, key):
+        if (agent_name, key) in touched:
+            raise HoconUpdateError(f"Conflicting edits for '{agent_name}' ({key})")
+        touched[(agent_name, key)] = True
+
+    for edit in edits:
+        op = edit.get('op', 'update')
+        if op == 'update':
+            agent_name = edit.get('agent')
+            if agent_name not in index.agents:
+                raise HoconUpdateError(f"Agent '{agent_name}' not found")
+            item, fields = index.agents[agent_name]
+            indent = index.field_indent(item, fields)
+            for key in UPDATABLE_FIELDS:
+                if key not in edit:
+                    continue
+                claim(agent_name, key)
+                field = fields.get(key)
+                if field is None:
+                    # Append the missing field after the block's last field
+                    anchor = item.fields[-1].value.end if item.fields else item.start + 1
+                    text = field_comma + '\n' + indent + format_key(key, quoted) + sep_text \
+                        + format_value(key, edit[key], indent)
+                    splices.append((anchor, anchor, text))
+                elif key == 'instructions':
+                    splices.append(_replace_instructions(index, agent_name, field, edit[key]))
+                else:
+                    splices.append((field.value.start, field.value.end, format_value(key, edit[key], indent)))
+        elif op == 'remove':
+            agent_name = edit.get('agent')
+            if agent_name not in index.agents:
+                raise HoconUpdateError(f"Agent '{agent_name}' not found")
+            claim(agent_name, '*')
+            removed.append((agent_name, edit.get('prune_references', True)))
+        elif op == 'add':
+            agent = edit.get('agent') or {}
+            agent_name = agent.get('name')
+            if not agent_name:
+                raise HoconUpdateError("Added agents need a 'name'")
+            if agent_name in index.agents or agent_name in [a.get('name') for a in added]:
+                raise HoconUpdateError(f"Agent '{agent_name}' already exists")
+            added.append(agent)
+        else:
+            raise HoconUpdateError(f"Unknown edit op '{op}'")
+
+    for agent_name, _ in removed:
+        if any(name == agent_name and key != '*' for name, key in touched):
+            raise HoconUpdateError(f"Conflicting edits for '{agent_name}' (updated and removed)")
+
+    # Drop removed agents from other agents' tools lists, unless those lists are edited explicitly
+    pruned = {name for name, prune in removed if prune}
+    removed_names = {name for name, _ in removed}
+    if pruned:
+        for agent_name in index.order:
+            if agent_name in removed_names or (agent_name, 'tools') in touched:
+                continue
+            item, fields = index.agents[agent_name]
+            field = fields.get('tools')
+            values = _array_strings(index, field.value) if field is not None else None
+            if values is None or not pruned.intersection(values):
+                continue
+            kept = [value for value in values if value not in pruned]
+            splices.append((field.value.start, field.value.end, json.dumps(kept)))
+
+    items = index.tools_array.items
+    position = {id(item): i for i, item in enumerate(items)}
+    removed_positions = sorted(position[id(index.agents[name][0])] for name in removed_names)
+
+    # Remove each run of consecutive removed items together with the separator before it
+    # (or after it, for a run at the start of the list)
+    runs = []
+    for i in removed_positions:
+        if runs and runs[-1][1] == i - 1:
+            runs[-1][1] = i
+        else:
+            runs.append([i, i])
+    for first, last in runs:
+        if first > 0:
+            splices.append((items[first - 1].end, items[last].end, ''))
+        elif last + 1 < len(items):
+            splices.append((items[first].start, items[last + 1].start, ''))
+        else:
+            splices.append((items[first].start, items[last].end, ''))
+
+    if added:
+        if items:
+            anchor = items[-1].end
+            item_indent = index.line_indent(items[-1].start)
+        else:
+            anchor = index.tools_array.start + 1
+            item_indent = index.line_indent(index.tools_array.start) + '    '
+        separator = ',' if index.items_use_commas() else ''
+        field_indent = item_indent + '    '
+        blocks = []
+        for agent in added:
+            lines = [
+                field_indent + format_key(key, quoted) + sep_text + format_value(key, value, field_indent)
+                for key, value in agent.items()
+            ]
+            blocks.append(item_indent + '{\n' + (field_comma + '\n').join(lines) + '\n' + item_indent + '}')
+        if items:
+            text = separator + '\n' + (separator + '\n').join(blocks)
+        else:
+            text = '\n' + (separator + '\n').join(blocks) + '\n' + index.line_indent(index.tools_array.start)
+        splices.append((anchor, anchor, text))
+
+    return splices
+
+
+def apply_splices(content, splices):
+    ordered = sorted(splices, key=lambda splice: (splice[0], splice[1]))
+    for before, after in zip(ordered, ordered[1:]):
+        if before[1] > after[0]:
+            raise HoconUpdateError(f"Overlapping edits at offsets {before[0]}-{before[1]} and {after[0]}-{after[1]}")
+    # Apply from the end so earlier offsets stay valid
+    for start, end, text in reversed(ordered):
+        content = content[:start] + text + content[end:]
+    return content
+
+
+def apply_edits(content, edits):
+    """
+    Apply a batch of edits to HOCON text and return the new text.
+    """
+    index = AgentSpanIndex(content)
+    new_content = apply_splices(content, plan_edits(index, edits))
+
+    # Re-index the result so a malformed edit is caught before anything is written
+    check = AgentSpanIndex(new_content)
+    for edit in edits:
+        if edit.get('op') == 'add' and edit['agent']['name'] not in check.agents:
+            raise HoconUpdateError(f"Added agent '{edit['agent']['name']}' not found after edit")
+        if edit.get('op') == 'remove' and edit['agent'] in check.agents:
+            raise HoconUpdateError(f"Removed agent '{edit['agent']}' still present after edit")
+    return new_content
+
+
+def write_atomic(file_path, content):
+    """
+    Write via a temp file in the same directory plus rename, so readers never see a partial file.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(file_path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path):
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o7777)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def update_agents(file_path, edits):
+    """
+    Apply a batch of agent edits to a network file with one read, one parse and one write.
+    Returns a short summary; raises HoconUpdateError (nothing written) if any edit fails.
+    """
     if not os.path.exists(file_path):
-        print(f"Error: File not found: {file_path}", file=sys.stderr)
-        return False
+        raise HoconUpdateError(f"File not found: {file_path}")
 
     with open(file_path, 'r') as f:
         content = f.read()
 
-    # Strategy:
-    # 1. Find the block for the specific agent. 
-    #    Look for name = "agent_name" or name = agent_name
-    # 2. Within that block (or scanning generally if unique), find the `instructions` field.
-    #    This is tricky because HOCON is flexible.
-    #    However, in our specific NHS structure, it's fairly consistent:
-    #    {
-    #       name = "AgentName"
-    #       instructions = """..."""
-    #       ...
-    #    }
-    
-    # Let's try to locate the agent name first
-    # This regex looks for: name\s*=\s*"?AGENT_NAME"?
-    name_pattern = re.compile(f'name\\s*=\\s*"?{re.escape(agent_name)}"?')
-    name_match = name_pattern.search(content)
-
-    if not name_match:
-        print(f"Error: Agent '{agent_name}' not found in {file_path}", file=sys.stderr)
-        # Fallback: maybe it's defined differently?
-        return False
+    new_content = apply_edits(content, edits)
+    if new_content != content:
+        write_atomic(file_path, new_content)
+    return {"success": True, "edits": len(edits), "changed": new_content != content}
 
-    # Start searching for 'instructions' AFTER the name match
-    # We need to be careful not to bleed into another agent's block.
-    # We can scan forward until we hit 'instructions'.
-    
-    # Better approach might be to find the 'instructions' line that follows the name match closely.
-    # Or, if instructions come first? Standard is usually name then instructions.
-    
-    # Let's assume standard format for now:
-    # Look for 'instructions = ' after the name_match index
-    # We need to handle optional whitespace and optional assignment chars (?)
-    
-    # Regex for instructions start: instructions\s*=\s*(?:\$\{.*\}|\"\"\")
-    # We specifically want to replace the triple-quoted string content
-    
-    # Let's find the start of the instructions block after the name
-    offset = name_match.end()
-    remaining_content = content[offset:]
-    
-    # Pattern to find 'instructions =' assignment
-    instr_key_pattern = re.compile(r'instructions\s*=\s*')
-    instr_match = instr_key_pattern.search(remaining_content)
-    
-    if not instr_match:
-        # Maybe instructions came BEFORE name? (Unlikely in our manifests but possible in HOCON)
-        # Let's assume standard order for now.
-        print(f"Error: 'instructions' field not found for agent '{agent_name}'", file=sys.stderr)
-        return False
-    
-    instr_start_idx = offset + instr_match.end()
-    
-    # Check what comes next. It should be quotes.
-    # We expect triple quotes """
-    if content[instr_start_idx:instr_start_idx+3] != '"""':
-        # Might be single quote? or variable ref?
-        # If it's a variable ref ${...}, we probably shouldn't edit it directly unless we resolve it?
-        # Requirement says "Update prompt". If it's a variable, we might need to find where that variable is defined.
-        # BUT, if we simply overwrite the variable ref with a literal string, that works too (though breaks reuse).
-        # Let's support overwriting whatever is there with a new triple quoted string.
-        pass
-        
-    # We want to replace whatever is the value of instructions with new_instructions wrapped in """
-    # Value ends at the next unquoted newline or matching quote? 
-    # If it is currently """...""", we find the closing """.
-    # If it is "...", we find closing ".
-    # If it is ${...}, we find end of line or next field?
-    
-    # Simplify: We only support editing agents that have explicit string instructions or we will overwrite.
-    # To do this safely, we usually look for the start of the value and the end of the value.
-    
-    # If existing is """, find closing """
-    if content[instr_start_idx:instr_start_idx+3] == '"""':
-        # Find closing """
-        # We need to skip the opening ones
-        closing_idx = content.find('"""', instr_start_idx + 3)
-        if closing_idx == -1:
-            print("Error: Malformed HOCON, closing quotes not found", file=sys.stderr)
-            return False
-        
-        # Replace content
-        # Check if there is an appended variable like ${aaosa_instructions} after the closing quotes?
-        # In coffee_finder: """...""" ${aaosa_instructions}
-        # We should PRESERVE the ${aaosa_instructions} if we can.
-        
-        # Actually, let's just replace the text inside the triple quotes.
-        # Why? Because that's the "System Prompt" part. The suffix variable is likely standard.
-        
-        prefix = content[:instr_start_idx + 3]
-        suffix = content[closing_idx:]
-        
-        # Construct new content
-        # Ensure new instructions escapes triple quotes if any (unlikely in prompts but possible)
-        sanitized_new = new_instructions.replace('"""', '\\"\\"\\"')
-        
-        new_content = prefix + "\n" + sanitized_new + "\n" + suffix
-        
-        with open(file_path, 'w') as f:
-            f.write(new_content)
-            
+
+def update_agent_instructions(file_path, agent_name, new_instructions):
+    try:
+        update_agents(file_path, [{"op": "update", "agent": agent_name, "instructions": new_instructions}])
         return True
-        
-    else:
-        print("Error: Target instructions are not in triple-quote format. Editing not supported yet to avoid breaking variable logic.", file=sys.stderr)
+    except HoconUpdateError as e:
+        print(f"Error: {e}", file=sys.stderr)
         return False
 
+
 if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[2] == '--batch':
+        try:
+            print(json.dumps(update_agents(sys.argv[1], json.loads(sys.argv[3]))))
+            sys.exit(0)
+        except (HoconUpdateError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
     if len(sys.argv) < 4:
         print("Usage: python pyhocon_updater_service.py <file_path> <agent_name> <new_instructions>", file=sys.stderr)
+        print("       python pyhocon_updater_service.py <file_path> --batch '<json edits>'", file=sys.stderr)
         sys.exit(1)
 
     path = sys.argv[1]
     agent = sys.argv[2]
-    # Instructions might contain newlines, passing as single arg from shell might be tricky.
-    # Better to read from stdin or file.
-    # Given we spawn from node, we can pass as an argument if escaped properly, or via stdin.
-    # Let's try reading the last argument as the prompt.
+    # Instructions arrive as a single argv entry from the Node middleware.
     prompt = sys.argv[3]
-    
+
     success = update_agent_instructions(path, agent, prompt)
     if success:
         print("Success")
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Long-lived HOCON service for the agent-builder Vite middleware.
+
+Spawning a fresh interpreter per request pays Python startup plus the pyhocon
+(and google-genai) imports on every canvas click. This service keeps those
+imports warm and answers the same operations over a local HTTP/JSON interface:
+
+    GET  /health
+    GET  /stats                                                     -> network and manifest cache hit/miss counters
+    POST /manifest  {"registriesRoot"}                              -> {"networks": [...]}
+    POST /parse     {"registryRoot", "filePath" | "hoconContent"}   -> parsed network JSON
+    POST /update    {"filePath", "agentName", "newPrompt"}          -> {"success": true}
+                    {"filePath", "edits": [...]}                    -> {"success": true, "edits", "changed"}
+    POST /toolbox   {"toolboxPath"}                                 -> [{"id", "class", "description"}]
+    POST /copilot   {"prompt", "filePath" | "hoconContent", "mode"} -> {"plan": {...}}
+    POST /copilot-stream  {"prompt", "filePath" | "hoconContent"}   -> NDJSON plan/op/result events
+
+Errors come back as a non-200 status with {"error": ..., "details": ...}; once a stream
+has started, an error arrives as a final {"type": "error", ...} event instead.
+Requests are served on a thread each, so a slow copilot call does not hold up parsing.
+
+Usage: python pyhocon_worker_service.py [port]
+"""
+import sys
+import json
+import os
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pyhocon_manifest_parser import get_served_networks
+from pyhocon_parser_service import NetworkCache, parse_network, parse_network_content
+from pyhocon_toolbox_parser import parse_toolbox
+from pyhocon_updater_service import HoconUpdateError, update_agents
+
+# The copilot needs google-genai, which is optional for everything else; importing it here keeps it warm.
+try:
+    from google import genai  # noqa: F401  pylint: disable=unused-import
+    import pyhocon_copilot_service
+except ImportError as copilot_import_error:
+    pyhocon_copilot_service = None
+    COPILOT_IMPORT_ERROR = str(copilot_import_error)
+else:
+    COPILOT_IMPORT_ERROR = None
+
+DEFAULT_PORT = 5175
+
+# pyhocon builds its grammar by flipping pyparsing's process-wide default whitespace,
+# so concurrent parses can corrupt each other. Parsing is serialised; everything else is not.
+PYHOCON_LOCK = threading.Lock()
+
+# Parsed networks, reused until the file or one of its includes changes on disk.
+NETWORK_CACHE = NetworkCache(max_entries=int(os.environ.get("HOCON_NETWORK_CACHE_SIZE", 128)))
+
+# Served-network listing, reused until the root manifest or an included manifest changes.
+MANIFEST_CACHE = NetworkCache(max_entries=4)
+
+# Edits read, splice and replace whole files; keep two edits of the same file from interleaving.
+UPDATE_LOCK = threading.Lock()
+
+
+class WorkerError(Exception):
+    """
+    Raised by an operation to return a specific HTTP status to the caller.
+    """
+
+    def __init__(self, status, error, details=""):
+        super().__init__(error)
+        self.status = status
+        self.error = error
+        self.details = details
+
+
+def _require(payload, *keys):
+    missing = [key for key in keys if payload.get(key) in (None, "")]
+    if missing:
+        raise WorkerError(400, f"Missing required fields: {', '.join(missing)}")
+
+
+def _read_hocon(payload):
+    """
+    Return the HOCON text either inlined in the request or read from filePath.
+    """
+    if payload.get("hoconContent"):
+        return payload["hoconContent"]
+    _require(payload, "filePath")
+    file_path = payload["filePath"]
+    if not os.path.exists(file_path):
+        raise WorkerError(404, f"File not found: {file_path}")
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def handle_manifest(payload):
+    _require(payload, "registriesRoot")
+    if not os.path.isdir(payload["registriesRoot"]):
+        raise WorkerError(404, f"Registries directory not found: {payload['registriesRoot']}")
+    registries_root = payload["registriesRoot"]
+    return MANIFEST_CACHE.get(
+        os.path.join(registries_root, "manifest.hocon"),
+        registries_root,
+        lambda: {"networks": get_served_networks(registries_root)},
+    )
+
+
+def handle_parse(payload):
+    _require(payload, "registryRoot")
+    registry_root = payload["registryRoot"]
+    if payload.get("hoconContent"):
+        with PYHOCON_LOCK:
+            return parse_network_content(payload["hoconContent"], registry_root)
+
+    _require(payload, "filePath")
+    file_path = payload["filePath"]
+    if not os.path.exists(file_path):
+        raise WorkerError(404, f"File not found: {file_path}")
+
+    def load():
+        with PYHOCON_LOCK:
+            return parse_network(file_path, registry_root)
+
+    return NETWORK_CACHE.get(file_path, registry_root, load)
+
+
+def handle_update(payload):
+    _require(payload, "filePath")
+    if "edits" in payload:
+        edits = payload["edits"]
+        if not isinstance(edits, list):
+            raise WorkerError(400, "'edits' must be a list")
+    else:
+        _require(payload, "agentName")
+        if payload.get("newPrompt") is None:
+            raise WorkerError(400, "Missing required fields: newPrompt")
+        edits = [{"op": "update", "agent": payload["agentName"], "instructions": payload["newPrompt"]}]
+    if not os.path.exists(payload["filePath"]):
+        raise WorkerError(404, f"File not found: {payload['filePath']}")
+    with UPDATE_LOCK:
+        try:
+            return update_agents(payload["filePath"], edits)
+        except HoconUpdateError as e:
+            raise WorkerError(422, "Update failed", str(e)) from e
+
+
+def handle_toolbox(payload):
+    _require(payload, "toolboxPath")
+    toolbox_path = payload["toolboxPath"]
+    if not os.path.exists(toolbox_path):
+        raise WorkerError(404, f"Toolbox file not found: {toolbox_path}")
+    with open(toolbox_path, "r", encoding="utf-8") as f:
+        return parse_toolbox(f.read())
+
+
+def handle_copilot(payload):
+    _require(payload, "prompt")
+    if pyhocon_copilot_service is None:
+        raise WorkerError(503, "Copilot unavailable", COPILOT_IMPORT_ERROR)
+    current_hocon = _read_hocon(payload)
+    # "patch" asks for per-agent edits and applies them here instead of having the whole file echoed back
+    request = pyhocon_copilot_service.request_hocon_update
+    if payload.get("mode") == "patch":
+        request = pyhocon_copilot_service.request_hocon_patch
+    try:
+        return request(current_hocon, payload["prompt"])
+    except pyhocon_copilot_service.CopilotError as e:
+        raise WorkerError(500, "Copilot inference failed", str(e)) from e
+
+
+def handle_copilot_stream(payload):
+    _require(payload, "prompt")
+    if pyhocon_copilot_service is None:
+        raise WorkerError(503, "Copilot unavailable", COPILOT_IMPORT_ERROR)
+    current_hocon = _read_hocon(payload)
+    return pyhocon_copilot_service.stream_hocon_patch(current_hocon, payload["prompt"])
+
+
+OPERATIONS = {
+    "/manifest": handle_manifest,
+    "/parse": handle_parse,
+    "/update": handle_update,
+    "/toolbox": handle_toolbox,
+    "/copilot": handle_copilot,
+}
+
+# Operations that return an iterator of events, written back as chunked NDJSON.
+STREAMING_OPERATIONS = {
+    "/copilot-stream": handle_copilot_stream,
+}
+
+
+class HoconRequestHandler(BaseHTTPRequestHandler):
+    """
+    Dispatches POST bodies to the matching operation and writes JSON back.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "copilot": pyhocon_copilot_service is not None})
+        elif self.path == "/stats":
+            self._send(200, {"networkCache": NETWORK_CACHE.stats(), "manifestCache": MANIFEST_CACHE.stats()})
+        else:
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        operation = OPERATIONS.get(self.path) or STREAMING_OPERATIONS.get(self.path)
+        if operation is None:
+            self._send(404, {"error": f"Unknown operation: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "Invalid JSON body"})
+            return
+
+        try:
+            if self.path in STREAMING_OPERATIONS:
+                self._stream(operation(payload))
+            else:
+                self._send(200, operation(payload))
+        except WorkerError as e:
+            self._send(e.status, {"error": e.error, "details": e.details})
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            self._send(500, {"error": str(e), "details": type(e).__name__})
+
+    def _send(self, status, result):
+        # The parser already hands back a JSON string; don't encode it twice.
+        body = result if isinstance(result, str) else json.dumps(result)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, events):
+        # Pull the first event before committing to a 200 so early failures still get a status.
+        events = iter(events)
+        try:
+            first = next(events, None)
+        except Exception as e:
+            raise WorkerError(500, "Stream failed", str(e)) from e
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write(event):
+            data = (json.dumps(event) + "\n").encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        try:
+            if first is not None:
+                write(first)
+            for event in events:
+                write(event)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        except Exception as e:
+            write({"type": "error", "error": str(e)})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        # Keep the Vite console quiet; errors are still reported on stderr.
+        pass
+
+
+def serve(port=DEFAULT_PORT, host="127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), HoconRequestHandler)
+    server.daemon_threads = True
+    # The middleware waits for this line before routing requests here.
+    print(f"HOCON worker listening on {host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else int(os.environ.get("HOCON_WORKER_PORT", DEFAULT_PORT))
+    serve(port)
@@ -109,22 +109,19 @@ const agentBuilderService = {
     },
 
     /**
-     * Ask Gemini Copilot for architectural changes
-     * @param {string} networkPath - Path to existing network (or null for draft)
-     * @param {string} prompt - User's request
-     * @param {object} currentGraphData - Optional: Current graph state {nodes, edges, metadata} for draft networks
+     * Build the copilot request body: prompt enriched with the allowed tools/subnetworks,
+     * plus either the draft network's HOCON or the existing network path
      */
-    generateCopilotPlan: async (networkPath, prompt, currentGraphData = null) => {
-        try {
-            // Fetch strictly allowed real platform tools and subnetworks
-            const [networks, tools] = await Promise.all([
-                agentBuilderService.getAllNetworks(),
-                agentBuilderService.getTools()
-            ]);
-            const availableSubnetworks = networks.map(n => "/" + n);
-            const availableTools = Object.keys(tools).filter(k => k !== 'error');
+    buildCopilotRequest: async (networkPath, prompt, currentGraphData = null) => {
+        // Fetch strictly allowed real platform tools and subnetworks
+        const [networks, tools] = await Promise.all([
+            agentBuilderService.getAllNetworks(),
+            agentBuilderService.getTools()
+        ]);
+        const availableSubnetworks = networks.map(n => "/" + n);
+        const availableTools = Object.keys(tools).filter(k => k !== 'error');
 
-            const enrichedPrompt = `${prompt}
+        const enrichedPrompt = `${prompt}
 
 CRITICAL RULES:
 1. You are ONLY allowed to add valid native tools or subnetworks to the agents.
@@ -132,21 +129,36 @@ CRITICAL RULES:
 3. You MUST ONLY use tools from this exact list: ${JSON.stringify(availableTools)}
 4. You MUST ONLY use subnetworks from this exact list: ${JSON.stringify(availableSubnetworks)}`;
 
-            const requestBody = { prompt: enrichedPrompt };
-
-            // If currentGraphData is provided (draft network), generate HOCON from it
-            if (currentGraphData && currentGraphData.nodes && currentGraphData.edges) {
-                const { default: HoconGenerator } = await import('../utils/HoconGenerator.js');
-                const hoconContent = HoconGenerator.generateHocon(
-                    currentGraphData.nodes,
-                    currentGraphData.edges,
-                    currentGraphData.metadata || {}
-                );
-                requestBody.hoconContent = hoconContent;
-            } else {
-                // Otherwise use network path (existing network)
-                requestBody.networkPath = networkPath;
-            }
+        const requestBody = { prompt: enrichedPrompt };
+
+        // If currentGraphData is provided (draft network), generate HOCON from it
+        if (currentGraphData && currentGraphData.nodes && currentGraphData.edges) {
+            const { default: HoconGenerator } = await import('../utils/HoconGenerator.js');
+            const hoconContent = HoconGenerator.generateHocon(
+                currentGraphData.nodes,
+                currentGraphData.edges,
+                currentGraphData.metadata || {}
+            );
+            requestBody.hoconContent = hoconContent;
+        } else {
+            // Otherwise use network path (existing network)
+            requestBody.networkPath = networkPath;
+        }
+
+        return requestBody;
+    },
+
+    /**
+     * Ask Gemini Copilot for architectural changes
+     * @param {string} networkPath - Path to existing network (or null for draft)
+     * @param {string} prompt - User's request
+     * @param {object} currentGraphData - Optional: Current graph state {nodes, edges, metadata} for draft networks
+     * @param {string} mode - 'full' (model returns the whole file) or 'patch' (per-agent edits applied locally)
+     */
+    generateCopilotPlan: async (networkPath, prompt, currentGraphData = null, mode = 'full') => {
+        try {
+            const requestBody = await agentBuilderService.buildCopilotRequest(networkPath, prompt, currentGraphData);
+            requestBody.mode = mode;
 
             const response = await fetch(`${API_BASE_URL}/copilot-generate`, {
                 method: 'POST',
@@ -164,6 +176,42 @@ CRITICAL RULES:
         }
     },
 
+    /**
+     * Stream a copilot patch: yields {type: 'plan'} as soon as the plan is written, one
+     * {type: 'op'} per agent edit, then {type: 'result', plan} whose plan.hocon is the patched network.
+     * A failure after streaming started arrives as {type: 'error'}.
+     */
+    streamCopilotPlan: async function* (networkPath, prompt, currentGraphData = null) {
+        const requestBody = await agentBuilderService.buildCopilotRequest(networkPath, prompt, currentGraphData);
+        const response = await fetch(`${API_BASE_URL}/copilot-stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(requestBody)
+        });
+        if (!response.ok) {
+            const errData = await response.json().catch(() => ({}));
+            throw new Error(errData.details || errData.error || 'Copilot generation failed');
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop() || ''; // Keep incomplete line
+
+            for (const line of lines) {
+                if (line.trim()) yield JSON.parse(line);
+            }
+        }
+        if (buffer.trim()) yield JSON.parse(buffer);
+    },
+
     /**
      * Dispatch copilot update to the native agent_network_designer agent via nsflow
      * Returns an async generator that yields parsed JSON line objects (logs, responses, etc)
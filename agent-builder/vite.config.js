@@ -39,45 +39,86 @@ export default defineConfig(({ mode }) => {
         react(),
         {
             name: 'local-network-server',
-            configureServer(server) {
+            async configureServer(server) {
+                const { spawn } = await import('child_process');
+                const path = await import('path');
+
+                // USE VIRTUAL ENV PYTHON
+                const PYTHON_EXECUTABLE = path.resolve(__dirname, '../neuro-san-studio/venv/bin/python3');
+                const HOCON_WORKER_PORT = Number(env.HOCON_WORKER_PORT || 5175);
+                const HOCON_WORKER_URL = `http://127.0.0.1:${HOCON_WORKER_PORT}`;
+
+                // One long-lived Python process keeps pyhocon/google-genai imported across requests.
+                // Until it reports ready (or if it dies) we fall back to spawning the scripts directly.
+                let hoconWorkerReady = false;
+                const hoconWorker = spawn(PYTHON_EXECUTABLE, [path.resolve(__dirname, 'pyhocon_worker_service.py'), String(HOCON_WORKER_PORT)], { cwd: __dirname });
+                hoconWorker.stdout.on('data', (data) => {
+                    if (data.toString().includes('HOCON worker listening')) hoconWorkerReady = true;
+                });
+                hoconWorker.stderr.on('data', (data) => console.error(`[hocon-worker] ${data.toString().trimEnd()}`));
+                hoconWorker.on('error', (err) => {
+                    hoconWorkerReady = false;
+                    console.warn('HOCON worker failed to start, using per-request spawns:', err.message);
+                });
+                hoconWorker.on('exit', (code) => {
+                    hoconWorkerReady = false;
+                    if (code) console.warn(`HOCON worker exited with code ${code}, using per-request spawns`);
+                });
+                server.httpServer?.on('close', () => hoconWorker.kill());
+
+                // Run one of the pyhocon_* scripts and collect its output.
+                const runPythonScript = (script, args) => new Promise((resolve) => {
+                    const pythonProcess = spawn(PYTHON_EXECUTABLE, [path.resolve(__dirname, script), ...args]);
+                    let stdout = '';
+                    let stderr = '';
+                    pythonProcess.stdout.on('data', d => stdout += d.toString());
+                    pythonProcess.stderr.on('data', d => stderr += d.toString());
+                    pythonProcess.on('error', err => resolve({ code: -1, stdout, stderr: stderr + err.message }));
+                    pythonProcess.on('close', code => resolve({ code, stdout, stderr }));
+                });
+
+                // Ask the worker for `operation`; `fallback` spawns the equivalent script if the worker is not up.
+                // Both paths resolve to the same { code, stdout, stderr } shape.
+                const callHoconService = async (operation, payload, fallback) => {
+                    if (hoconWorkerReady) {
+                        try {
+                            const response = await fetch(`${HOCON_WORKER_URL}/${operation}`, {
+                                method: 'POST',
+                                headers: { 'Content-Type': 'application/json' },
+                                body: JSON.stringify(payload)
+                            });
+                            const text = await response.text();
+                            return response.ok ? { code: 0, stdout: text, stderr: '' } : { code: response.status, stdout: '', stderr: text };
+                        } catch (err) {
+                            console.warn(`HOCON worker request failed (${err.message}), spawning instead`);
+                        }
+                    }
+                    return fallback();
+                };
+
                 server.middlewares.use('/api/local', async (req, res, next) => {
                     const fs = await import('fs');
-                    const path = await import('path');
                     const url = new URL(req.url, `http://${req.headers.host}`);
 
                     // Path to registries in neuro-san-studio (peer directory)
                     const REGISTRY_ROOT = path.resolve(__dirname, '../neuro-san-studio/registries');
-                    // USE VIRTUAL ENV PYTHON
-                    const PYTHON_EXECUTABLE = path.resolve(__dirname, '../neuro-san-studio/venv/bin/python3');
 
                     if (url.pathname === '/networks' && req.method === 'GET') {
                         try {
-                            const { spawn } = await import('child_process');
-                            const pythonScript = path.resolve(__dirname, 'pyhocon_manifest_parser.py');
-
-                            const pythonProcess = spawn(PYTHON_EXECUTABLE, [pythonScript, REGISTRY_ROOT]);
-
-                            let stdoutData = '';
-                            let stderrData = '';
-
-                            pythonProcess.stdout.on('data', (data) => {
-                                stdoutData += data.toString();
-                            });
-
-                            pythonProcess.stderr.on('data', (data) => {
-                                stderrData += data.toString();
-                            });
-
-                            pythonProcess.on('close', (code) => {
-                                if (code !== 0) {
-                                    console.error(`Manifest parser failed: ${stderrData}`);
-                                    res.statusCode = 500;
-                                    res.end(JSON.stringify({ error: 'Parser failed', details: stderrData }));
-                                } else {
-                                    res.setHeader('Content-Type', 'application/json');
-                                    res.end(stdoutData);
-                                }
-                            });
+                            const { code, stdout, stderr } = await callHoconService(
+                                'manifest',
+                                { registriesRoot: REGISTRY_ROOT },
+                                () => runPythonScript('pyhocon_manifest_parser.py', [REGISTRY_ROOT])
+                            );
+
+                            if (code !== 0) {
+                                console.error(`Manifest parser failed: ${stderr}`);
+                                res.statusCode = 500;
+                                res.end(JSON.stringify({ error: 'Parser failed', details: stderr }));
+                            } else {
+                                res.setHeader('Content-Type', 'application/json');
+                                res.end(stdout);
+                            }
 
                         } catch (err) {
                             console.error('Error listing networks:', err);
@@ -105,32 +146,20 @@ export default defineConfig(({ mode }) => {
                                 return;
                             }
 
-                            const { spawn } = await import('child_process');
-                            const pythonScript = path.resolve(__dirname, 'pyhocon_parser_service.py');
-
-                            const pythonProcess = spawn(PYTHON_EXECUTABLE, [pythonScript, fullPath, REGISTRY_ROOT]);
-
-                            let stdoutData = '';
-                            let stderrData = '';
-
-                            pythonProcess.stdout.on('data', (data) => {
-                                stdoutData += data.toString();
-                            });
-
-                            pythonProcess.stderr.on('data', (data) => {
-                                stderrData += data.toString();
-                            });
+                            const { code, stdout, stderr } = await callHoconService(
+                                'parse',
+                                { filePath: fullPath, registryRoot: REGISTRY_ROOT },
+                                () => runPythonScript('pyhocon_parser_service.py', [fullPath, REGISTRY_ROOT])
+                            );
 
-                            pythonProcess.on('close', (code) => {
-                                if (code !== 0) {
-                                    console.error(`Python parser failed: ${stderrData}`);
-                                    res.statusCode = 500;
-                                    res.end(JSON.stringify({ error: 'Parser failed', details: stderrData }));
-                                } else {
-                                    res.setHeader('Content-Type', 'application/json');
-                                    res.end(stdoutData);
-                                }
-                            });
+                            if (code !== 0) {
+                                console.error(`Python parser failed: ${stderr}`);
+                                res.statusCode = 500;
+                                res.end(JSON.stringify({ error: 'Parser failed', details: stderr }));
+                            } else {
+                                res.setHeader('Content-Type', 'application/json');
+                                res.end(stdout);
+                            }
 
                         } catch (err) {
                             console.error('Error executing parser:', err);
@@ -162,24 +191,66 @@ export default defineConfig(({ mode }) => {
                                     return;
                                 }
 
-                                const { spawn } = await import('child_process');
-                                const pythonScript = path.resolve(__dirname, 'pyhocon_updater_service.py');
+                                const { code, stderr } = await callHoconService(
+                                    'update',
+                                    { filePath: fullPath, agentName, newPrompt },
+                                    () => runPythonScript('pyhocon_updater_service.py', [fullPath, agentName, newPrompt])
+                                );
 
-                                const pythonProcess = spawn(PYTHON_EXECUTABLE, [pythonScript, fullPath, agentName, newPrompt]);
+                                if (code === 0) {
+                                    res.setHeader('Content-Type', 'application/json');
+                                    res.end(JSON.stringify({ success: true }));
+                                } else {
+                                    console.error('Updater failed:', stderr);
+                                    res.statusCode = 500;
+                                    res.end(JSON.stringify({ error: 'Update failed', details: stderr }));
+                                }
+
+                            } catch (e) {
+                                res.statusCode = 500;
+                                res.end(JSON.stringify({ error: 'Invalid JSON body' }));
+                            }
+                        });
+                        return;
+                    }
 
-                                let stderrData = '';
-                                pythonProcess.stderr.on('data', d => stderrData += d.toString());
+                    // Apply a batch of agent edits (update/add/remove) with one parse and one write
+                    if (url.pathname === '/update-agents' && req.method === 'POST') {
+                        let body = '';
+                        req.on('data', chunk => { body += chunk.toString(); });
+                        req.on('end', async () => {
+                            try {
+                                const { networkPath, edits } = JSON.parse(body);
 
-                                pythonProcess.on('close', (code) => {
-                                    if (code === 0) {
-                                        res.setHeader('Content-Type', 'application/json');
-                                        res.end(JSON.stringify({ success: true }));
-                                    } else {
-                                        console.error('Updater failed:', stderrData);
-                                        res.statusCode = 500;
-                                        res.end(JSON.stringify({ error: 'Update failed', details: stderrData }));
-                                    }
-                                });
+                                if (!networkPath || !Array.isArray(edits)) {
+                                    res.statusCode = 400;
+                                    res.end(JSON.stringify({ error: 'Missing required fields' }));
+                                    return;
+                                }
+
+                                const safePath = networkPath.replace(/\.\./g, '');
+                                const fullPath = path.join(REGISTRY_ROOT, `${safePath}.hocon`);
+
+                                if (!fs.existsSync(fullPath)) {
+                                    res.statusCode = 404;
+                                    res.end(JSON.stringify({ error: 'Network file not found' }));
+                                    return;
+                                }
+
+                                const { code, stdout, stderr } = await callHoconService(
+                                    'update',
+                                    { filePath: fullPath, edits },
+                                    () => runPythonScript('pyhocon_updater_service.py', [fullPath, '--batch', JSON.stringify(edits)])
+                                );
+
+                                res.setHeader('Content-Type', 'application/json');
+                                if (code === 0) {
+                                    res.end(stdout);
+                                } else {
+                                    console.error('Batch updater failed:', stderr);
+                                    res.statusCode = code >= 400 ? code : 422;
+                                    res.end(JSON.stringify({ error: 'Update failed', details: stderr }));
+                                }
 
                             } catch (e) {
                                 res.statusCode = 500;
@@ -222,33 +293,22 @@ export default defineConfig(({ mode }) => {
                     // [NEW] Endpoint to list Native Coded Tools from toolbox_info.hocon
                     if (url.pathname === '/tools' && req.method === 'GET') {
                         try {
-                            const { spawn } = await import('child_process');
-                            const pythonScript = path.resolve(__dirname, 'pyhocon_toolbox_parser.py');
                             const toolboxPath = path.resolve(__dirname, '../neuro-san-studio/toolbox/toolbox_info.hocon');
 
-                            const pythonProcess = spawn(PYTHON_EXECUTABLE, [pythonScript, toolboxPath]);
+                            const { code, stdout, stderr } = await callHoconService(
+                                'toolbox',
+                                { toolboxPath },
+                                () => runPythonScript('pyhocon_toolbox_parser.py', [toolboxPath])
+                            );
 
-                            let dataString = '';
-                            let errorString = '';
-
-                            pythonProcess.stdout.on('data', (data) => {
-                                dataString += data.toString();
-                            });
-
-                            pythonProcess.stderr.on('data', (data) => {
-                                errorString += data.toString();
-                            });
-
-                            pythonProcess.on('close', (code) => {
-                                if (code === 0) {
-                                    res.setHeader('Content-Type', 'application/json');
-                                    res.end(dataString);
-                                } else {
-                                    console.error('Tools Parser failed:', errorString);
-                                    res.statusCode = 500;
-                                    res.end(JSON.stringify({ error: 'Failed to parse tools', details: errorString }));
-                                }
-                            });
+                            if (code === 0) {
+                                res.setHeader('Content-Type', 'application/json');
+                                res.end(stdout);
+                            } else {
+                                console.error('Tools Parser failed:', stderr);
+                                res.statusCode = 500;
+                                res.end(JSON.stringify({ error: 'Failed to parse tools', details: stderr }));
+                            }
 
                         } catch (err) {
                             console.error('Error executing tools parser:', err);
@@ -264,64 +324,134 @@ export default defineConfig(({ mode }) => {
                         req.on('data', chunk => { body += chunk.toString(); });
                         req.on('end', async () => {
                             try {
-                                const { networkPath, prompt, hoconContent } = JSON.parse(body);
+                                const { networkPath, prompt, hoconContent, mode } = JSON.parse(body);
                                 if (!prompt) {
                                     res.statusCode = 400; res.end(JSON.stringify({ error: 'Missing prompt' })); return;
                                 }
+                                // mode 'patch': the model returns per-agent edits, applied locally by the updater
+                                const modeArgs = mode === 'patch' ? ['--patch'] : [];
 
                                 let fullPath = null;
-                                let tempFilePath = null;
 
-                                // If hoconContent is provided (draft network), write to temp file
-                                if (hoconContent) {
-                                    const { writeFileSync } = await import('fs');
-                                    const tmpdir = await import('os').then(m => m.tmpdir());
-                                    tempFilePath = path.join(tmpdir, `draft_network_${Date.now()}.hocon`);
-                                    writeFileSync(tempFilePath, hoconContent, 'utf-8');
-                                    fullPath = tempFilePath;
-                                } else if (networkPath) {
-                                    // Otherwise use the provided network path (existing network)
+                                // hoconContent (draft network) is sent inline; otherwise use the existing network path
+                                if (!hoconContent && networkPath) {
                                     const safePath = networkPath.replace(/\.\./g, '');
                                     fullPath = path.join(REGISTRY_ROOT, `${safePath}.hocon`);
 
                                     if (!fs.existsSync(fullPath)) {
                                         res.statusCode = 404; res.end(JSON.stringify({ error: 'HOCON file not found' })); return;
                                     }
-                                } else {
+                                } else if (!hoconContent) {
                                     res.statusCode = 400; res.end(JSON.stringify({ error: 'Must provide either networkPath or hoconContent' })); return;
                                 }
 
-                                const { spawn } = await import('child_process');
-                                const pythonScript = path.resolve(__dirname, 'pyhocon_copilot_service.py');
-                                const pythonProcess = spawn(PYTHON_EXECUTABLE, [pythonScript, fullPath, prompt]);
-
-                                let stdoutData = '';
-                                let stderrData = '';
-                                pythonProcess.stdout.on('data', d => stdoutData += d.toString());
-                                pythonProcess.stderr.on('data', d => stderrData += d.toString());
-
-                                pythonProcess.on('close', code => {
-                                    // Clean up temp file if created
-                                    if (tempFilePath) {
+                                const spawnCopilot = async () => {
+                                    if (!hoconContent) {
+                                        return runPythonScript('pyhocon_copilot_service.py', [fullPath, prompt, ...modeArgs]);
+                                    }
+                                    // Write the draft network to a temp file for the one-shot script
+                                    const tmpdir = await import('os').then(m => m.tmpdir());
+                                    const tempFilePath = path.join(tmpdir, `draft_network_${Date.now()}.hocon`);
+                                    fs.writeFileSync(tempFilePath, hoconContent, 'utf-8');
+                                    try {
+                                        return await runPythonScript('pyhocon_copilot_service.py', [tempFilePath, prompt, ...modeArgs]);
+                                    } finally {
                                         try {
-                                            const { unlinkSync } = require('fs');
-                                            unlinkSync(tempFilePath);
+                                            fs.unlinkSync(tempFilePath);
                                         } catch (e) {
                                             console.warn('Failed to delete temp file:', e);
                                         }
                                     }
+                                };
+
+                                const { code, stdout, stderr } = await callHoconService(
+                                    'copilot',
+                                    hoconContent ? { prompt, hoconContent, mode } : { prompt, filePath: fullPath, mode },
+                                    spawnCopilot
+                                );
+
+                                if (code === 0) {
+                                    res.setHeader('Content-Type', 'application/json');
+                                    res.end(stdout);
+                                } else {
+                                    console.error('Copilot service failed:', stderr);
+                                    res.statusCode = 500;
+                                    res.end(JSON.stringify({ error: 'Copilot inference failed', details: stderr }));
+                                }
+                            } catch (e) {
+                                console.error('Copilot endpoint error:', e);
+                                res.statusCode = 500; res.end(JSON.stringify({ error: 'Invalid JSON body or processing error' }));
+                            }
+                        });
+                        return;
+                    }
 
-                                    if (code === 0) {
-                                        res.setHeader('Content-Type', 'application/json');
-                                        res.end(stdoutData);
-                                    } else {
-                                        console.error('Copilot service failed:', stderrData);
-                                        res.statusCode = 500;
-                                        res.end(JSON.stringify({ error: 'Copilot inference failed', details: stderrData }));
+                    // Streamed copilot patch: NDJSON plan/op events as the model writes them, then the patched HOCON
+                    if (url.pathname === '/copilot-stream' && req.method === 'POST') {
+                        let body = '';
+                        req.on('data', chunk => { body += chunk.toString(); });
+                        req.on('end', async () => {
+                            let tempFilePath = null;
+                            try {
+                                const { networkPath, prompt, hoconContent } = JSON.parse(body);
+                                if (!prompt || (!hoconContent && !networkPath)) {
+                                    res.statusCode = 400; res.end(JSON.stringify({ error: 'Missing prompt, networkPath or hoconContent' })); return;
+                                }
+
+                                let fullPath = null;
+                                if (!hoconContent) {
+                                    fullPath = path.join(REGISTRY_ROOT, `${networkPath.replace(/\.\./g, '')}.hocon`);
+                                    if (!fs.existsSync(fullPath)) {
+                                        res.statusCode = 404; res.end(JSON.stringify({ error: 'HOCON file not found' })); return;
+                                    }
+                                }
+
+                                if (hoconWorkerReady) {
+                                    try {
+                                        const response = await fetch(`${HOCON_WORKER_URL}/copilot-stream`, {
+                                            method: 'POST',
+                                            headers: { 'Content-Type': 'application/json' },
+                                            body: JSON.stringify(hoconContent ? { prompt, hoconContent } : { prompt, filePath: fullPath })
+                                        });
+                                        res.statusCode = response.status;
+                                        res.setHeader('Content-Type', response.headers.get('content-type') || 'application/json');
+                                        for await (const chunk of response.body) {
+                                            res.write(chunk);
+                                        }
+                                        res.end();
+                                        return;
+                                    } catch (err) {
+                                        if (res.headersSent) {
+                                            res.end(JSON.stringify({ type: 'error', error: err.message }) + '\n');
+                                            return;
+                                        }
+                                        console.warn(`HOCON worker stream failed (${err.message}), spawning instead`);
                                     }
+                                }
+
+                                // Fallback: the one-shot script prints one event per line as they arrive
+                                if (hoconContent) {
+                                    const tmpdir = await import('os').then(m => m.tmpdir());
+                                    tempFilePath = path.join(tmpdir, `draft_network_${Date.now()}.hocon`);
+                                    fs.writeFileSync(tempFilePath, hoconContent, 'utf-8');
+                                }
+                                const pythonProcess = spawn(PYTHON_EXECUTABLE, [
+                                    path.resolve(__dirname, 'pyhocon_copilot_service.py'), tempFilePath || fullPath, prompt, '--stream'
+                                ]);
+                                let stderr = '';
+                                res.setHeader('Content-Type', 'application/x-ndjson');
+                                pythonProcess.stdout.on('data', d => res.write(d));
+                                pythonProcess.stderr.on('data', d => stderr += d.toString());
+                                pythonProcess.on('close', code => {
+                                    if (code !== 0) {
+                                        res.write(JSON.stringify({ type: 'error', error: 'Copilot inference failed', details: stderr }) + '\n');
+                                    }
+                                    res.end();
+                                    if (tempFilePath) fs.unlink(tempFilePath, () => {});
                                 });
                             } catch (e) {
-                                console.error('Copilot endpoint error:', e);
+                                console.error('Copilot stream endpoint error:', e);
+                                if (tempFilePath) fs.unlink(tempFilePath, () => {});
                                 res.statusCode = 500; res.end(JSON.stringify({ error: 'Invalid JSON body or processing error' }));
                             }
                         });
@@ -363,39 +493,36 @@ export default defineConfig(({ mode }) => {
                                     return;
                                 }
 
-                                // Write HOCON to temp file
-                                const { writeFileSync, unlinkSync } = await import('fs');
-                                const tmpdir = await import('os').then(m => m.tmpdir());
-                                const tempPath = path.join(tmpdir, `parse_hocon_${Date.now()}.hocon`);
-                                writeFileSync(tempPath, hoconContent, 'utf-8');
-
-                                // Parse using Python script
-                                const { spawn } = await import('child_process');
-                                const pythonScript = path.resolve(__dirname, 'pyhocon_parser_service.py');
-                                const pythonProcess = spawn(PYTHON_EXECUTABLE, [pythonScript, tempPath, REGISTRY_ROOT]);
-
-                                let stdoutData = '';
-                                let stderrData = '';
-                                pythonProcess.stdout.on('data', d => stdoutData += d.toString());
-                                pythonProcess.stderr.on('data', d => stderrData += d.toString());
-
-                                pythonProcess.on('close', code => {
-                                    // Clean up temp file
+                                const spawnParser = async () => {
+                                    // Write HOCON to temp file for the one-shot script
+                                    const tmpdir = await import('os').then(m => m.tmpdir());
+                                    const tempPath = path.join(tmpdir, `parse_hocon_${Date.now()}.hocon`);
+                                    fs.writeFileSync(tempPath, hoconContent, 'utf-8');
                                     try {
-                                        unlinkSync(tempPath);
-                                    } catch (e) {
-                                        console.warn('Failed to delete temp HOCON file:', e);
+                                        return await runPythonScript('pyhocon_parser_service.py', [tempPath, REGISTRY_ROOT]);
+                                    } finally {
+                                        try {
+                                            fs.unlinkSync(tempPath);
+                                        } catch (e) {
+                                            console.warn('Failed to delete temp HOCON file:', e);
+                                        }
                                     }
+                                };
 
-                                    if (code === 0) {
-                                        res.setHeader('Content-Type', 'application/json');
-                                        res.end(stdoutData);
-                                    } else {
-                                        console.error('HOCON parser failed:', stderrData);
-                                        res.statusCode = 500;
-                                        res.end(JSON.stringify({ error: 'Failed to parse HOCON', details: stderrData }));
-                                    }
-                                });
+                                const { code, stdout, stderr } = await callHoconService(
+                                    'parse',
+                                    { hoconContent, registryRoot: REGISTRY_ROOT },
+                                    spawnParser
+                                );
+
+                                if (code === 0) {
+                                    res.setHeader('Content-Type', 'application/json');
+                                    res.end(stdout);
+                                } else {
+                                    console.error('HOCON parser failed:', stderr);
+                                    res.statusCode = 500;
+                                    res.end(JSON.stringify({ error: 'Failed to parse HOCON', details: stderr }));
+                                }
                             } catch (e) {
                                 console.error('Parse HOCON endpoint error:', e);
                                 res.statusCode = 500;
@@ -0,0 +1,136 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Approximate nearest-neighbour indexes of RAG vector stores: recall@k and queries per second vs. exact search.
+
+Generates --vectors unit vectors of --dimensions scattered around --topics random centres (as the
+embeddings of chunks on a number of topics are; --spread is the scale of their distance to the
+centres, relative to that of the centres to the origin) and --queries query vectors drawn the same way.
+Exact search scores every vector with one matrix-vector product, as NumpyVectorStore does; it
+gives the true top k of every query. Every installed ANN backend (hnswlib, faiss, and the NumPy
+IVF index) is then built over the vectors and searched with each value of its recall/latency
+knob: --ef-search for HNSW, --probes for IVF. Queries are run one at a time, as the RAG tools do.
+
+Usage: PYTHONPATH=`pwd` python benchmarks/rag_ann_index_benchmark.py [--vectors 1000000] [--dimensions 128]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from coded_tools.tools.ann_index import HNSW_M
+from coded_tools.tools.ann_index import available_backends
+from coded_tools.tools.ann_index import create_ann_index
+
+# Rows scored at once when computing the true top k
+EXACT_BATCH_SIZE = 65536
+
+
+def make_vectors(count, centres, spread, seed, batch_size=EXACT_BATCH_SIZE):
+    rng = np.random.default_rng(seed)
+    dimensions = centres.shape[1]
+    vectors = np.empty((count, dimensions), dtype=np.float32)
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        batch = centres[rng.integers(len(centres), size=size)]
+        batch += rng.standard_normal((size, dimensions), dtype=np.float32) * spread / np.sqrt(dimensions)
+        vectors[start : start + size] = batch / np.linalg.norm(batch, axis=1, keepdims=True)
+    return vectors
+
+
+def true_top_k(vectors, queries, k):
+    """The rows of the k vectors most similar to every query, over the matrix in batches."""
+    best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+    best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+    for start in range(0, len(vectors), EXACT_BATCH_SIZE):
+        scores = queries @ vectors[start : start + EXACT_BATCH_SIZE].T
+        rows = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+        best_scores = np.concatenate([best_scores, scores], axis=1)
+        best_rows = np.concatenate([best_rows, rows], axis=1)
+        top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(best_scores, top, axis=1)
+        best_rows = np.take_along_axis(best_rows, top, axis=1)
+    return [set(rows) for rows in best_rows]
+
+
+def exact_qps(vectors, queries, k):
+    start = time.perf_counter()
+    for query in queries:
+        scores = vectors @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        _ = top[np.argsort(-scores[top])]
+    return len(queries) / (time.perf_counter() - start)
+
+
+def measure(index, queries, truth, k):
+    found = 0
+    start = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        rows, _ = index.search(query, k)
+        found += len(expected.intersection(rows.tolist()))
+    seconds = time.perf_counter() - start
+    return found / (k * len(queries)), len(queries) / seconds
+
+
+def report(label, recall, qps, exact):
+    print(f"  {label:<28}  recall@k={recall:6.3f}  QPS={qps:9.1f}  speed-up={qps / exact:7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=1000000)
+    parser.add_argument("--dimensions", type=int, default=128)
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--spread", type=float, default=1.0)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--backends", default=",".join(available_backends()))
+    parser.add_argument("--probes", default="1,4,8,16,32,64")
+    parser.add_argument("--ef-search", default="16,32,64,128,256")
+    parser.add_argument("--hnsw-m", type=int, default=HNSW_M)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centres = rng.standard_normal((args.topics, args.dimensions), dtype=np.float32) / np.sqrt(args.dimensions)
+    print(
+        f"vectors={args.vectors} dimensions={args.dimensions} topics={args.topics} spread={args.spread}"
+        f" queries={args.queries} k={args.k}"
+    )
+    vectors = make_vectors(args.vectors, centres, args.spread, seed=1)
+    queries = make_vectors(args.queries, centres, args.spread, seed=2)
+
+    start = time.perf_counter()
+    truth = true_top_k(vectors, queries, args.k)
+    print(f"  true top k of all queries in {time.perf_counter() - start:.1f}s")
+    exact = exact_qps(vectors, queries, args.k)
+    report("exact", 1.0, exact, exact)
+
+    for backend in args.backends.split(","):
+        index = create_ann_index(backend)
+        if hasattr(index, "m"):
+            index.m = args.hnsw_m
+        start = time.perf_counter()
+        index.build(vectors)
+        print(f"  {backend} index built in {time.perf_counter() - start:.1f}s, {index.memory_size() / 2**20:.0f}MB")
+        knob = "probes" if backend == "ivf" else "ef_search"
+        for value in (args.probes if backend == "ivf" else args.ef_search).split(","):
+            setattr(index, knob, int(value))
+            report(f"{backend} {knob}={value}", *measure(index, queries, truth, args.k), exact)
+
+
+if __name__ == "__main__":
+    main()
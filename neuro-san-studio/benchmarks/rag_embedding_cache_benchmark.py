@@ -0,0 +1,145 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Building a RAG vector store with and without the embedding cache.
+
+Builds an in-memory vector store through BaseRag.generate_vector_store() over --chunks chunks
+of a synthetic document, three times: cold (empty cache), warm (same document) and after
+--changed-percent of the chunks changed. Embeddings come from a deterministic local stand-in
+for OpenAIEmbeddings that sleeps --request-ms per request of up to 1000 chunks plus
+--chunk-ms per chunk, and counts the chunks it is sent. The chunks are generated directly,
+standing in for the loader and the tiktoken splitter (which downloads its encoding).
+
+Usage: PYTHONPATH=`pwd` python benchmarks/rag_embedding_cache_benchmark.py [--chunks 5000] [--changed-percent 5]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import tempfile
+import time
+from typing import List
+from unittest import mock
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from coded_tools.tools import base_rag
+from coded_tools.tools import embedding_cache
+from coded_tools.tools.base_rag import VECTOR_SIZE
+from coded_tools.tools.base_rag import BaseRag
+
+WORDS = "policy claim refund baggage delay route fare cabin crew seat upgrade lounge notice travel".split()
+
+
+class FakeOpenAIEmbeddings(Embeddings):
+    """Deterministic hash-seeded vectors with the latency profile of a remote embeddings API."""
+
+    model = "fake-embedding"
+
+    def __init__(self, args):
+        self.dimensions = VECTOR_SIZE
+        self.args = args
+        self.chunks_sent = 0
+
+    def _vector(self, text: str) -> List[float]:
+        rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+        return [rng.uniform(-1.0, 1.0) for _ in range(self.dimensions)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.chunks_sent += len(texts)
+        requests = (len(texts) + 999) // 1000
+        time.sleep((requests * self.args.request_ms + len(texts) * self.args.chunk_ms) / 1000)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+class NoRegistry:
+    """Builds on every request, so that each build below runs."""
+
+    async def get_or_build(self, key, build, ttl=None):
+        return await build()
+
+
+class SyntheticRag(BaseRag):
+    """A BaseRag over generated chunks, embedded by the fake model."""
+
+    def __init__(self, model, chunks):
+        self.model = model
+        self.chunks = chunks
+        super().__init__()
+
+    def create_embeddings(self) -> Embeddings:
+        return self.model
+
+    async def load_documents(self, loader_args):
+        return []
+
+    async def _process_documents(self, loader_args) -> List[Document]:
+        return [Document(page_content=text, metadata={"chunk": index}) for index, text in enumerate(self.chunks)]
+
+
+def make_chunks(count, seed):
+    rng = random.Random(seed)
+    return [f"Section {index}. " + " ".join(rng.choice(WORDS) for _ in range(70)) for index in range(count)]
+
+
+async def build(model, chunks):
+    start = time.perf_counter()
+    sent = model.chunks_sent
+    store = await SyntheticRag(model, chunks).generate_vector_store(loader_args={})
+    assert len(store) == len(chunks)
+    return time.perf_counter() - start, model.chunks_sent - sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--changed-percent", type=float, default=5)
+    parser.add_argument("--request-ms", type=float, default=300)
+    parser.add_argument("--chunk-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks, seed=1)
+    changed = list(chunks)
+    rng = random.Random(2)
+    for index in rng.sample(range(len(chunks)), int(len(chunks) * args.changed_percent / 100)):
+        changed[index] = chunks[index] + " Revised."
+
+    print(f"chunks={args.chunks} dimensions={VECTOR_SIZE} request={args.request_ms}ms chunk={args.chunk_ms}ms")
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(base_rag, "VECTOR_STORE_REGISTRY", NoRegistry()):
+        model = FakeOpenAIEmbeddings(args)
+        with mock.patch.object(embedding_cache, "EMBEDDING_CACHE_PATH", ""):
+            seconds, sent = asyncio.run(build(model, chunks))
+        print(f"  {'no cache':<22}  time={seconds:7.2f}s  chunks embedded={sent:6d}")
+        path = os.path.join(tmp, "embeddings.db")
+        with mock.patch.object(embedding_cache, "EMBEDDING_CACHE_PATH", path):
+            for label, document in (
+                ("cache cold", chunks),
+                ("cache warm", chunks),
+                (f"{args.changed_percent:g}% chunks changed", changed),
+            ):
+                seconds, sent = asyncio.run(build(model, document))
+                print(f"  {label:<22}  time={seconds:7.2f}s  chunks embedded={sent:6d}")
+        print(f"  cache file={os.path.getsize(path) / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Re-indexing a RAG vector store after one of its documents changed: full rebuild vs. incremental.
+
+Writes --files documents of --chunks-per-file lines each and builds an in-memory vector store
+over them through BaseRag.generate_vector_store(). It then changes --changed files and builds
+again, once from scratch (as before document indexes) and once incrementally from the previous
+store. The embedding cache is disabled so that the embedding calls saved are those of the index
+alone. Embeddings come from a deterministic local stand-in for OpenAIEmbeddings (--request-ms per
+request of up to 1000 chunks, plus --chunk-ms per chunk); loading a document takes --load-ms,
+standing in for parsing a PDF, and its chunks are its lines, standing in for the tiktoken
+splitter (which downloads its encoding).
+
+Usage: PYTHONPATH=`pwd` python benchmarks/rag_incremental_reindex_benchmark.py [--files 50] [--changed 1]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import tempfile
+import time
+import weakref
+from typing import List
+from unittest import mock
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from coded_tools.tools import base_rag
+from coded_tools.tools import document_index
+from coded_tools.tools import embedding_cache
+from coded_tools.tools.base_rag import VECTOR_SIZE
+from coded_tools.tools.base_rag import BaseRag
+
+WORDS = "policy claim refund baggage delay route fare cabin crew seat upgrade lounge notice travel".split()
+
+
+class FakeOpenAIEmbeddings(Embeddings):
+    """Deterministic hash-seeded vectors with the latency of a remote embeddings API."""
+
+    model = "fake-embedding"
+    dimensions = VECTOR_SIZE
+    request_ms = 300.0
+    chunk_ms = 0.5
+    chunks_sent = 0
+
+    def _vector(self, text: str) -> List[float]:
+        rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+        return [rng.uniform(-1.0, 1.0) for _ in range(self.dimensions)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        FakeOpenAIEmbeddings.chunks_sent += len(texts)
+        time.sleep(((len(texts) + 999) // 1000 * self.request_ms + len(texts) * self.chunk_ms) / 1000)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+class NoRegistry:
+    """Builds on every request, so that each build below runs."""
+
+    async def get_or_build(self, key, build, ttl=None):
+        return await build()
+
+
+class FileRag(BaseRag):
+    """A BaseRag over the lines of local files."""
+
+    load_ms = 200.0
+    loaded = 0
+
+    def create_embeddings(self) -> Embeddings:
+        return FakeOpenAIEmbeddings()
+
+    async def load_documents(self, loader_args):
+        return []
+
+    async def _process_documents(self, loader_args) -> List[Document]:
+        chunks: List[Document] = []
+        for path in loader_args["urls"]:
+            FileRag.loaded += 1
+            await asyncio.sleep(self.load_ms / 1000)
+            with open(path, "r", encoding="utf-8") as source:
+                lines: List[str] = source.read().splitlines()
+            chunks.extend(Document(page_content=line, metadata={"source": path}) for line in lines)
+        return chunks
+
+
+def write_file(path, index, chunks, rng, suffix=""):
+    with open(path, "w", encoding="utf-8") as source:
+        for chunk in range(chunks):
+            source.write(f"File {index} section {chunk}{suffix}. " + " ".join(rng.choice(WORDS) for _ in range(70)))
+            source.write("\n")
+
+
+def build(paths):
+    loaded, sent = FileRag.loaded, FakeOpenAIEmbeddings.chunks_sent
+    start = time.perf_counter()
+    store = asyncio.run(FileRag().generate_vector_store({"urls": paths}))
+    seconds = time.perf_counter() - start
+    return store, seconds, FileRag.loaded - loaded, FakeOpenAIEmbeddings.chunks_sent - sent
+
+
+def report(label, seconds, loaded, sent):
+    print(f"  {label:<22}  time={seconds:7.2f}s  documents loaded={loaded:4d}  chunks embedded={sent:6d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--chunks-per-file", type=int, default=100)
+    parser.add_argument("--changed", type=int, default=1)
+    parser.add_argument("--request-ms", type=float, default=300)
+    parser.add_argument("--chunk-ms", type=float, default=0.5)
+    parser.add_argument("--load-ms", type=float, default=200)
+    args = parser.parse_args()
+
+    FakeOpenAIEmbeddings.request_ms = args.request_ms
+    FakeOpenAIEmbeddings.chunk_ms = args.chunk_ms
+    FileRag.load_ms = args.load_ms
+    rng = random.Random(1)
+    print(f"files={args.files} chunks/file={args.chunks_per_file} changed={args.changed} dimensions={VECTOR_SIZE}")
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(
+        embedding_cache, "EMBEDDING_CACHE_PATH", ""
+    ), mock.patch.object(base_rag, "VECTOR_STORE_REGISTRY", NoRegistry()):
+        paths = [os.path.join(tmp, f"document_{index}.txt") for index in range(args.files)]
+        for index, path in enumerate(paths):
+            write_file(path, index, args.chunks_per_file, rng)
+        store, seconds, loaded, sent = build(paths)
+        report("initial build", seconds, loaded, sent)
+
+        for index in rng.sample(range(args.files), args.changed):
+            write_file(paths[index], index, args.chunks_per_file, rng, suffix=" revised")
+        with mock.patch.object(document_index, "_LATEST_VECTOR_STORES", weakref.WeakValueDictionary()):
+            _, seconds, loaded, sent = build(paths)
+        report("full rebuild", seconds, loaded, sent)
+        _, seconds, loaded, sent = build(paths)
+        report("incremental", seconds, loaded, sent)
+        del store
+
+
+if __name__ == "__main__":
+    main()
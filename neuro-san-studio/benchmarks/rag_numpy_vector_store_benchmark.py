@@ -0,0 +1,132 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Saved RAG vector stores: InMemoryVectorStore JSON dumps vs. the NumPy memmap format.
+
+Saves --chunks random chunks of --dimensions with NumpyVectorStore, then reports the size on
+disk, the time to save and load the store, the latency of the first query after loading and
+the median latency of --queries top-k searches. The JSON dump of InMemoryVectorStore is
+measured the same way at --json-chunks chunks (its Python lists of floats need several GB of
+memory at 100k chunks of 1536 dimensions), next to the NumPy format at the same size.
+Queries are random vectors, so no embedding model is called.
+
+Usage: PYTHONPATH=`pwd` python benchmarks/rag_numpy_vector_store_benchmark.py [--chunks 100000] [--json-chunks 10000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from coded_tools.tools.base_rag import VECTOR_SIZE
+from coded_tools.tools.numpy_vector_store import CHUNKS_SUFFIX
+from coded_tools.tools.numpy_vector_store import OFFSETS_SUFFIX
+from coded_tools.tools.numpy_vector_store import VECTORS_SUFFIX
+from coded_tools.tools.numpy_vector_store import NumpyVectorStore
+from coded_tools.tools.numpy_vector_store import write_store
+
+WORDS = "policy claim refund baggage delay route fare cabin crew seat upgrade lounge notice travel".split()
+
+
+def make_chunks(count, dimensions, seed):
+    rng = np.random.default_rng(seed)
+    words = random.Random(seed)
+    vectors = rng.standard_normal((count, dimensions), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [f"chunk-{index}" for index in range(count)]
+    texts = [f"Section {index}. " + " ".join(words.choice(WORDS) for _ in range(70)) for index in range(count)]
+    chunks = [(text, {"source": f"doc_{index // 100}.pdf"}) for index, text in enumerate(texts)]
+    return ids, vectors, chunks
+
+
+def size_mb(*paths):
+    return sum(os.path.getsize(path) for path in paths) / 1024 / 1024
+
+
+def measure_queries(store, queries, k):
+    start = time.perf_counter()
+    store.similarity_search_with_score_by_vector(queries[0], k=k)
+    first = time.perf_counter() - start
+    durations = []
+    for query in queries[1:]:
+        start = time.perf_counter()
+        store.similarity_search_with_score_by_vector(query, k=k)
+        durations.append(time.perf_counter() - start)
+    return first, statistics.median(durations)
+
+
+def report(label, size, save, load, first, median):
+    print(
+        f"  {label:<18}  size={size:8.1f}MB  save={save:7.2f}s  load={load * 1000:9.1f}ms"
+        f"  first query={first * 1000:8.1f}ms  query p50={median * 1000:8.2f}ms"
+    )
+
+
+def bench_numpy(path, ids, vectors, chunks, queries, k):
+    start = time.perf_counter()
+    write_store(path, ids, vectors, chunks)
+    save = time.perf_counter() - start
+    start = time.perf_counter()
+    store = NumpyVectorStore.load(path, embedding=None)
+    load = time.perf_counter() - start
+    base = os.path.splitext(path)[0]
+    size = size_mb(path, base + VECTORS_SUFFIX, base + CHUNKS_SUFFIX, base + OFFSETS_SUFFIX)
+    report(f"numpy {len(ids)}", size, save, load, *measure_queries(store, queries, k))
+
+
+def bench_json(path, ids, vectors, chunks, queries, k):
+    store = InMemoryVectorStore(embedding=None)
+    for chunk_id, vector, (text, metadata) in zip(ids, vectors.tolist(), chunks):
+        store.store[chunk_id] = {"id": chunk_id, "vector": vector, "text": text, "metadata": metadata}
+    start = time.perf_counter()
+    store.dump(path)
+    save = time.perf_counter() - start
+    del store
+    start = time.perf_counter()
+    store = InMemoryVectorStore.load(path, embedding=None)
+    load = time.perf_counter() - start
+    report(f"json {len(ids)}", size_mb(path), save, load, *measure_queries(store, queries, k))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=100000)
+    parser.add_argument("--json-chunks", type=int, default=10000)
+    parser.add_argument("--dimensions", type=int, default=VECTOR_SIZE)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=4)
+    args = parser.parse_args()
+
+    queries = np.random.default_rng(7).standard_normal((args.queries + 1, args.dimensions)).tolist()
+    print(f"dimensions={args.dimensions} k={args.k} queries={args.queries}")
+    with tempfile.TemporaryDirectory() as tmp:
+        ids, vectors, chunks = make_chunks(args.chunks, args.dimensions, seed=1)
+        bench_numpy(os.path.join(tmp, "large.json"), ids, vectors, chunks, queries, args.k)
+        del ids, vectors, chunks
+
+        if args.json_chunks:
+            ids, vectors, chunks = make_chunks(args.json_chunks, args.dimensions, seed=2)
+            bench_numpy(os.path.join(tmp, "small.json"), ids, vectors, chunks, queries, args.k)
+            bench_json(os.path.join(tmp, "dump.json"), ids, vectors, chunks, queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
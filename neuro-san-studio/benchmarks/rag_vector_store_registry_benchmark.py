@@ -0,0 +1,172 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Repeated RAG tool calls over the same source: per-call vector store builds vs. the registry.
+
+Writes a --chunks line source file and makes --calls calls of BaseRag.generate_vector_store()
+over it, each from a fresh tool instance as a coded tool invocation does, in three modes:
+  rebuild   no registry; chunks re-split and re-embedded per call (embeddings from a warm cache)
+  saved     no registry; save_vector_store, so each call re-reads the saved store
+  registry  the process-wide registry
+Then starts --concurrent calls at once on a cold registry and counts the builds.
+Embeddings come from a deterministic local stand-in for OpenAIEmbeddings (--request-ms per
+request of up to 1000 chunks); chunks are the file's lines, standing in for the loader and
+the tiktoken splitter (which downloads its encoding).
+
+Usage: PYTHONPATH=`pwd` python benchmarks/rag_vector_store_registry_benchmark.py [--chunks 5000] [--calls 10]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import statistics
+import tempfile
+import time
+import weakref
+from typing import List
+from unittest import mock
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from coded_tools.tools import base_rag
+from coded_tools.tools import document_index
+from coded_tools.tools import embedding_cache
+from coded_tools.tools.base_rag import VECTOR_SIZE
+from coded_tools.tools.base_rag import BaseRag
+from coded_tools.tools.vector_store_registry import VectorStoreRegistry
+
+WORDS = "policy claim refund baggage delay route fare cabin crew seat upgrade lounge notice travel".split()
+
+
+class FakeOpenAIEmbeddings(Embeddings):
+    """Deterministic hash-seeded vectors with the latency of a remote embeddings API."""
+
+    model = "fake-embedding"
+    dimensions = VECTOR_SIZE
+    request_ms = 300.0
+    chunks_sent = 0
+
+    def _vector(self, text: str) -> List[float]:
+        rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+        return [rng.uniform(-1.0, 1.0) for _ in range(self.dimensions)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        FakeOpenAIEmbeddings.chunks_sent += len(texts)
+        time.sleep((len(texts) + 999) // 1000 * self.request_ms / 1000)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+class NoRegistry:
+    """Builds on every request, as generate_vector_store() did before the registry."""
+
+    async def get_or_build(self, key, build, ttl=None):
+        return await build()
+
+
+class FileRag(BaseRag):
+    """A BaseRag over the lines of local files."""
+
+    builds = 0
+
+    def create_embeddings(self) -> Embeddings:
+        return FakeOpenAIEmbeddings()
+
+    async def load_documents(self, loader_args):
+        return []
+
+    async def _process_documents(self, loader_args) -> List[Document]:
+        FileRag.builds += 1
+        chunks: List[Document] = []
+        for path in loader_args["urls"]:
+            with open(path, "r", encoding="utf-8") as source:
+                chunks.extend(Document(page_content=line) for line in source.read().splitlines())
+        return chunks
+
+
+async def call(source, vector_store_path=None):
+    rag = FileRag()
+    if vector_store_path:
+        rag.save_vector_store = True
+        rag.configure_vector_store_path(vector_store_path)
+    start = time.perf_counter()
+    await rag.generate_vector_store({"urls": [source]})
+    return time.perf_counter() - start
+
+
+async def repeated(source, calls, vector_store_path=None):
+    await call(source, vector_store_path)
+    return [await call(source, vector_store_path) for _ in range(calls)]
+
+
+async def concurrent(source, count):
+    await asyncio.gather(*(call(source) for _ in range(count)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--concurrent", type=int, default=8)
+    parser.add_argument("--request-ms", type=float, default=300)
+    args = parser.parse_args()
+
+    FakeOpenAIEmbeddings.request_ms = args.request_ms
+    rng = random.Random(1)
+    print(f"chunks={args.chunks} dimensions={VECTOR_SIZE} calls={args.calls}")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.txt")
+        with open(source, "w", encoding="utf-8") as source_file:
+            for index in range(args.chunks):
+                source_file.write(f"Section {index}. " + " ".join(rng.choice(WORDS) for _ in range(70)) + "\n")
+        with mock.patch.object(embedding_cache, "EMBEDDING_CACHE_PATH", os.path.join(tmp, "embeddings.db")):
+            disabled = NoRegistry()
+            enabled = VectorStoreRegistry(max_bytes=4 * 1024**3, max_entries=32)
+            modes = (
+                ("rebuild", disabled, None),
+                ("saved", disabled, os.path.join(tmp, "store.json")),
+                ("registry", enabled, None),
+            )
+            for label, registry, vector_store_path in modes:
+                with mock.patch.object(base_rag, "VECTOR_STORE_REGISTRY", registry):
+                    durations = asyncio.run(repeated(source, args.calls, vector_store_path))
+                print(
+                    f"  {label:<8}  per call p50={statistics.median(durations) * 1000:9.1f}ms"
+                    f"  max={max(durations) * 1000:9.1f}ms"
+                )
+            print(f"  registry stats={enabled.stats()}")
+
+            for label, registry in (("no registry", disabled), ("registry", VectorStoreRegistry(4 * 1024**3, 32))):
+                FileRag.builds = 0
+                # Cold: no earlier store to update incrementally either
+                with mock.patch.object(base_rag, "VECTOR_STORE_REGISTRY", registry), mock.patch.object(
+                    document_index, "_LATEST_VECTOR_STORES", weakref.WeakValueDictionary()
+                ):
+                    start = time.perf_counter()
+                    asyncio.run(concurrent(source, args.concurrent))
+                print(
+                    f"  {args.concurrent} concurrent cold calls, {label:<11}  builds={FileRag.builds}"
+                    f"  wall={time.perf_counter() - start:6.2f}s"
+                )
+
+
+if __name__ == "__main__":
+    main()
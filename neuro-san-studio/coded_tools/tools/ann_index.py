@@ -0,0 +1,552 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+"""
+Approximate nearest-neighbour (ANN) indexes over the unit-normalized vectors of a NumpyVectorStore.
+
+Exact search scores every chunk of a store for every query. An index scores a fraction of them
+instead, and may miss some of the true top k in exchange:
+  hnswlib  HNSW graph of the hnswlib package (pip install hnswlib)
+  faiss    HNSW graph of the faiss-cpu package (pip install faiss-cpu)
+  ivf      Inverted file in plain NumPy: the chunks are clustered by spherical k-means, and
+           a query scores the chunks of the RAG_ANN_IVF_PROBES clusters closest to it
+The "auto" backend is the first of these that is installed. Recall is traded for latency with
+RAG_ANN_HNSW_EF_SEARCH and RAG_ANN_IVF_PROBES: higher values find more of the true top k, slower.
+
+AnnVectorStore is the store of the "ann" vector_store_type of the RAG tools. It saves its index
+next to the store files, as <name>.ann and the <name>.ann.json manifest.
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import math
+import os
+import threading
+import time
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from coded_tools.tools.numpy_vector_store import Chunk
+from coded_tools.tools.numpy_vector_store import NumpyVectorStore
+
+ANN_BACKEND = os.getenv("RAG_ANN_BACKEND", "auto")
+# Stores with fewer chunks are searched exactly, which is fast enough and always right
+ANN_MIN_CHUNKS = int(os.getenv("RAG_ANN_MIN_CHUNKS", "10000"))
+HNSW_M = int(os.getenv("RAG_ANN_HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("RAG_ANN_HNSW_EF_CONSTRUCTION", "200"))
+HNSW_EF_SEARCH = int(os.getenv("RAG_ANN_HNSW_EF_SEARCH", "64"))
+# Number of IVF clusters; 0 for the square root of the number of chunks
+IVF_LISTS = int(os.getenv("RAG_ANN_IVF_LISTS", "0"))
+IVF_PROBES = int(os.getenv("RAG_ANN_IVF_PROBES", "16"))
+# k-means runs on a sample of this many chunks per cluster
+IVF_TRAINING_CHUNKS_PER_LIST = 64
+IVF_TRAINING_ITERATIONS = 10
+# Chunks assigned to clusters per matrix product
+IVF_BATCH_SIZE = 16384
+INDEX_SUFFIX = ".ann"
+INDEX_MANIFEST_SUFFIX = ".ann.json"
+
+logger = logging.getLogger(__name__)
+
+
+def _unit(embedding: Any) -> np.ndarray:
+    """An embedding as a float32 vector of unit norm."""
+    vector: np.ndarray = np.asarray(embedding, dtype=np.float32).ravel()
+    norm: float = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def _top(rows: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """The k rows with the highest scores, best first."""
+    k = min(k, len(rows))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    top: np.ndarray = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return rows[top], scores[top]
+
+
+class AnnIndex(ABC):
+    """
+    Index over the rows of a matrix of unit-normalized vectors, searched by inner product.
+    """
+
+    # Name of the backend, and the module it needs
+    backend: str = ""
+    module: Optional[str] = None
+
+    def __init__(self):
+        self.count: int = 0
+
+    @classmethod
+    def installed(cls) -> bool:
+        """Returns True if the module of the backend can be imported."""
+        return cls.module is None or importlib.util.find_spec(cls.module) is not None
+
+    @abstractmethod
+    def build_params(self) -> Dict[str, Any]:
+        """The parameters an index is built with; a saved index is read only if they did not change."""
+
+    @abstractmethod
+    def build(self, vectors: np.ndarray):
+        """
+        Index the rows of vectors.
+
+        :param vectors: Unit-normalized float32 matrix, one row per chunk
+        """
+
+    @abstractmethod
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param query: Unit-normalized query vector
+        :param k: Number of rows to return
+        :return: Rows of the (approximately) k nearest vectors and their cosine similarity, best first
+        """
+
+    @abstractmethod
+    def save(self, path: str):
+        """Write the index to a file."""
+
+    @abstractmethod
+    def load(self, path: str, vectors: np.ndarray):
+        """
+        Read an index written by save().
+
+        :param path: The index file
+        :param vectors: The matrix the index was built over
+        """
+
+    @abstractmethod
+    def memory_size(self) -> int:
+        """Estimated memory held by the index, in bytes."""
+
+
+class HnswlibIndex(AnnIndex):
+    """
+    HNSW graph of the hnswlib package.
+    """
+
+    backend = "hnswlib"
+    module = "hnswlib"
+
+    def __init__(self, m: int = HNSW_M, ef_construction: int = HNSW_EF_CONSTRUCTION, ef_search: int = HNSW_EF_SEARCH):
+        """
+        :param m: Links per node of the graph; more take more memory and build time, for better recall
+        :param ef_construction: Candidates considered when linking a node
+        :param ef_search: Candidates considered by a query
+        """
+        super().__init__()
+        self.m: int = m
+        self.ef_construction: int = ef_construction
+        self.ef_search: int = ef_search
+        self._index: Any = None
+        self._dimensions: int = 0
+
+    def _new_index(self, dimensions: int) -> Any:
+        # Do lazy import so that users do not always have to install hnswlib
+        # pylint: disable=import-error
+        # pylint: disable=import-outside-toplevel
+        import hnswlib
+
+        self._dimensions = dimensions
+        return hnswlib.Index(space="ip", dim=dimensions)
+
+    def build_params(self) -> Dict[str, Any]:
+        return {"m": self.m, "ef_construction": self.ef_construction}
+
+    def build(self, vectors: np.ndarray):
+        self._index = self._new_index(vectors.shape[1])
+        self._index.init_index(max_elements=len(vectors), ef_construction=self.ef_construction, M=self.m)
+        self._index.add_items(np.asarray(vectors), np.arange(len(vectors)))
+        self._index.set_ef(self.ef_search)
+        self.count = len(vectors)
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, self.count)
+        if k > self.ef_search:
+            # Queries consider at least k candidates
+            self._index.set_ef(k)
+        labels, distances = self._index.knn_query(query, k=k)
+        if k > self.ef_search:
+            self._index.set_ef(self.ef_search)
+        # Inner product distances are 1 - similarity
+        return labels[0].astype(np.int64), 1.0 - distances[0]
+
+    def save(self, path: str):
+        self._index.save_index(path)
+
+    def load(self, path: str, vectors: np.ndarray):
+        self._index = self._new_index(vectors.shape[1])
+        self._index.load_index(path, max_elements=len(vectors))
+        self._index.set_ef(self.ef_search)
+        self.count = self._index.get_current_count()
+
+    def memory_size(self) -> int:
+        # A copy of the vectors, and about 2 * m links of 4 bytes per level-0 node
+        return self.count * (self._dimensions * 4 + self.m * 8 + 16)
+
+
+class FaissHnswIndex(AnnIndex):
+    """
+    HNSW graph of the faiss-cpu package.
+    """
+
+    backend = "faiss"
+    module = "faiss"
+
+    def __init__(self, m: int = HNSW_M, ef_construction: int = HNSW_EF_CONSTRUCTION, ef_search: int = HNSW_EF_SEARCH):
+        """
+        :param m: Links per node of the graph; more take more memory and build time, for better recall
+        :param ef_construction: Candidates considered when linking a node
+        :param ef_search: Candidates considered by a query
+        """
+        super().__init__()
+        self.m: int = m
+        self.ef_construction: int = ef_construction
+        self.ef_search: int = ef_search
+        self._index: Any = None
+
+    @staticmethod
+    def _faiss() -> Any:
+        # Do lazy import so that users do not always have to install faiss
+        # pylint: disable=import-error
+        # pylint: disable=import-outside-toplevel
+        import faiss
+
+        return faiss
+
+    def build_params(self) -> Dict[str, Any]:
+        return {"m": self.m, "ef_construction": self.ef_construction}
+
+    def build(self, vectors: np.ndarray):
+        faiss = self._faiss()
+        self._index = faiss.IndexHNSWFlat(vectors.shape[1], self.m, faiss.METRIC_INNER_PRODUCT)
+        self._index.hnsw.efConstruction = self.ef_construction
+        self._index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+        self.count = self._index.ntotal
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        self._index.hnsw.efSearch = max(self.ef_search, k)
+        scores, labels = self._index.search(query.reshape(1, -1), min(k, self.count))
+        # Missing neighbours are labelled -1
+        found: np.ndarray = labels[0] >= 0
+        return labels[0][found].astype(np.int64), scores[0][found]
+
+    def save(self, path: str):
+        self._faiss().write_index(self._index, path)
+
+    def load(self, path: str, vectors: np.ndarray):
+        self._index = self._faiss().read_index(path)
+        self.count = self._index.ntotal
+
+    def memory_size(self) -> int:
+        # A copy of the vectors, and about 2 * m links of 8 bytes per level-0 node
+        return self.count * (self._index.d * 4 + self.m * 16) if self._index is not None else 0
+
+
+class IvfIndex(AnnIndex):
+    """
+    Inverted file index in plain NumPy. The vectors are clustered by spherical k-means; each cluster
+    lists its rows, and a query scores only the rows of the clusters whose centroids are closest to it.
+    """
+
+    backend = "ivf"
+
+    def __init__(self, lists: int = IVF_LISTS, probes: int = IVF_PROBES, seed: int = 0):
+        """
+        :param lists: Number of clusters; 0 for the square root of the number of vectors
+        :param probes: Clusters scored by a query
+        :param seed: Seed of the k-means sample and initial centroids
+        """
+        super().__init__()
+        self.lists: int = lists
+        self.probes: int = probes
+        self.seed: int = seed
+        self._vectors: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        self._centroids: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        # Rows sorted by cluster, and where the rows of each cluster start (and the last one ends)
+        self._order: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._offsets: np.ndarray = np.zeros(1, dtype=np.int64)
+
+    def build_params(self) -> Dict[str, Any]:
+        return {"lists": self.lists, "seed": self.seed}
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """The cluster of the closest centroid to every row."""
+        assignments: np.ndarray = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), IVF_BATCH_SIZE):
+            batch: np.ndarray = np.asarray(vectors[start : start + IVF_BATCH_SIZE])
+            assignments[start : start + IVF_BATCH_SIZE] = np.argmax(batch @ centroids.T, axis=1)
+        return assignments
+
+    def _train(self, vectors: np.ndarray, lists: int) -> np.ndarray:
+        """Centroids of spherical k-means over a sample of the rows."""
+        rng: np.random.Generator = np.random.default_rng(self.seed)
+        size: int = min(len(vectors), lists * IVF_TRAINING_CHUNKS_PER_LIST)
+        sample: np.ndarray = np.asarray(vectors[np.sort(rng.choice(len(vectors), size, replace=False))])
+        centroids: np.ndarray = sample[rng.choice(size, lists, replace=False)].copy()
+        for _ in range(IVF_TRAINING_ITERATIONS):
+            assignments: np.ndarray = self._assign(sample, centroids)
+            counts: np.ndarray = np.bincount(assignments, minlength=lists)
+            filled: np.ndarray = np.flatnonzero(counts)
+            starts: np.ndarray = np.concatenate([[0], np.cumsum(counts[filled])[:-1]])
+            sums: np.ndarray = np.add.reduceat(sample[np.argsort(assignments, kind="stable")], starts, axis=0)
+            norms: np.ndarray = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids[filled] = sums / np.maximum(norms, np.finfo(np.float32).tiny)
+            empty: int = lists - len(filled)
+            if empty:
+                # Empty clusters start again from random rows
+                centroids[counts == 0] = sample[rng.choice(size, empty, replace=False)]
+        return centroids
+
+    def build(self, vectors: np.ndarray):
+        count: int = len(vectors)
+        lists: int = max(1, min(self.lists or round(math.sqrt(count)), count))
+        self._centroids = self._train(vectors, lists)
+        assignments: np.ndarray = self._assign(vectors, self._centroids)
+        self._order = np.argsort(assignments, kind="stable").astype(np.int64)
+        self._offsets = np.zeros(lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignments, minlength=lists), out=self._offsets[1:])
+        self._vectors = vectors
+        self.count = count
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        probes: int = max(1, min(self.probes, len(self._centroids)))
+        probed: np.ndarray = np.argpartition(-(self._centroids @ query), probes - 1)[:probes]
+        rows: np.ndarray = np.concatenate(
+            [self._order[self._offsets[cluster] : self._offsets[cluster + 1]] for cluster in probed]
+        )
+        # Rows of a cluster are in ascending order, which keeps reads of a mapped matrix local
+        return _top(rows, np.asarray(self._vectors[rows]) @ query, k)
+
+    def save(self, path: str):
+        with open(path, "wb") as output:
+            np.savez(output, centroids=self._centroids, order=self._order, offsets=self._offsets)
+
+    def load(self, path: str, vectors: np.ndarray):
+        with np.load(path) as saved:
+            self._centroids = saved["centroids"]
+            self._order = saved["order"]
+            self._offsets = saved["offsets"]
+        if self._offsets[-1] != len(vectors):
+            raise ValueError(f"IVF index {path} lists {self._offsets[-1]} rows, not {len(vectors)}")
+        self._vectors = vectors
+        self.count = len(vectors)
+
+    def memory_size(self) -> int:
+        return self._centroids.nbytes + self._order.nbytes + self._offsets.nbytes
+
+
+ANN_BACKENDS: Dict[str, Type[AnnIndex]] = {
+    HnswlibIndex.backend: HnswlibIndex,
+    FaissHnswIndex.backend: FaissHnswIndex,
+    IvfIndex.backend: IvfIndex,
+}
+
+
+def available_backends() -> List[str]:
+    """The ANN backends that can be used, in the order "auto" tries them."""
+    return [backend for backend, index_class in ANN_BACKENDS.items() if index_class.installed()]
+
+
+def create_ann_index(backend: Optional[str] = None) -> AnnIndex:
+    """
+    Create an empty index of a backend, configured by the RAG_ANN_* environment variables.
+    Backends that are not installed fall back to "ivf".
+
+    :param backend: "auto", "hnswlib", "faiss" or "ivf"; defaults to RAG_ANN_BACKEND
+    :return: The index
+    :raises ValueError: If the backend is unknown
+    """
+    backend = backend or ANN_BACKEND
+    if backend == "auto":
+        backend = available_backends()[0]
+    index_class: Optional[Type[AnnIndex]] = ANN_BACKENDS.get(backend)
+    if index_class is None:
+        raise ValueError(f"Unknown ANN backend {backend!r}. Available backends are 'auto', {', '.join(ANN_BACKENDS)}")
+    if not index_class.installed():
+        logger.warning("ANN backend %s is not installed (pip install %s). Using ivf.", backend, index_class.module)
+        index_class = IvfIndex
+    return index_class()
+
+
+class AnnVectorStore(NumpyVectorStore):
+    """
+    NumpyVectorStore searched through an approximate nearest-neighbour index.
+
+    The index is built over all chunks by build_index(), or by the first search after the chunks
+    changed. Searches with a filter, and stores of fewer than min_chunks chunks, are exact.
+    """
+
+    # pylint: disable=redefined-builtin
+
+    def __init__(self, embedding: Embeddings, backend: Optional[str] = None, min_chunks: Optional[int] = None):
+        """
+        :param embedding: Embeddings model used for added documents and queries
+        :param backend: ANN backend, see create_ann_index(); defaults to RAG_ANN_BACKEND
+        :param min_chunks: Stores with fewer chunks are searched exactly, without an index;
+            defaults to RAG_ANN_MIN_CHUNKS
+        """
+        super().__init__(embedding)
+        self.backend: str = backend or ANN_BACKEND
+        self.min_chunks: int = ANN_MIN_CHUNKS if min_chunks is None else min_chunks
+        self._index: Optional[AnnIndex] = None
+        self._index_lock = threading.Lock()
+        # The manifest the store was loaded from, whose saved index may be read instead of built
+        self._loaded_from: Optional[str] = None
+        # The manifest next to which the current index is saved
+        self._index_saved_at: Optional[str] = None
+
+    def _changed(self):
+        self._index = None
+        self._loaded_from = None
+        self._index_saved_at = None
+
+    def _put(self, ids: Sequence[str], vectors: np.ndarray, chunks: Sequence[Chunk]):
+        super()._put(ids, vectors, chunks)
+        if ids:
+            self._changed()
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete chunks by id; unknown ids are ignored."""
+        count: int = len(self)
+        deleted: Optional[bool] = super().delete(ids, **kwargs)
+        if len(self) != count:
+            self._changed()
+        return deleted
+
+    def memory_size(self) -> int:
+        """
+        Estimate the memory held by the store and its index.
+
+        :return: Estimated size in bytes
+        """
+        return super().memory_size() + (self._index.memory_size() if self._index is not None else 0)
+
+    def _ids_digest(self) -> str:
+        return hashlib.sha256("\n".join(self._ids).encode("utf-8")).hexdigest()
+
+    def _manifest(self, index: AnnIndex) -> Dict[str, Any]:
+        return {"backend": index.backend, "params": index.build_params(), "ids": self._ids_digest()}
+
+    def _read_index(self, path: str) -> Optional[AnnIndex]:
+        """The index saved next to the manifest at path, if it was built over these chunks with these parameters."""
+        base: str = os.path.splitext(path)[0]
+        index: AnnIndex = create_ann_index(self.backend)
+        try:
+            with open(base + INDEX_MANIFEST_SUFFIX, "r", encoding="utf-8") as manifest_file:
+                manifest: Dict[str, Any] = json.load(manifest_file)
+            if manifest != self._manifest(index):
+                logger.info("The ANN index saved with %s does not match the store. Building it again.", path)
+                return None
+            index.load(base + INDEX_SUFFIX, self._vectors)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, RuntimeError) as error:
+            logger.warning("Could not read the ANN index saved with %s: %s", path, error)
+            return None
+        self._index_saved_at = path
+        return index
+
+    def build_index(self) -> Optional[AnnIndex]:
+        """
+        Build the index over the chunks, or read the one saved with the files the store was loaded from.
+
+        :return: The index, or None if the store is searched exactly
+        """
+        if len(self) < self.min_chunks:
+            return None
+        with self._index_lock:
+            if self._index is None:
+                index: Optional[AnnIndex] = self._read_index(self._loaded_from) if self._loaded_from else None
+                if index is None:
+                    start: float = time.perf_counter()
+                    index = create_ann_index(self.backend)
+                    index.build(self._vectors)
+                    logger.info(
+                        "Built %s index over %d chunks in %.1fs", index.backend, len(self), time.perf_counter() - start
+                    )
+                self._index = index
+            return self._index
+
+    def _top_k(
+        self, embedding: List[float], k: int, filter: Optional[Callable[[Document], bool]] = None
+    ) -> List[Tuple[int, float]]:
+        """Rows and cosine similarities of (approximately) the k chunks most similar to an embedding, best first."""
+        index: Optional[AnnIndex] = self.build_index() if filter is None and k > 0 else None
+        if index is None:
+            return super()._top_k(embedding, k, filter)
+        rows, scores = index.search(_unit(embedding), k)
+        if len(rows) < min(k, len(self)):
+            # The probed clusters or graph neighbours held fewer than k chunks
+            return super()._top_k(embedding, k, filter)
+        return [(int(row), float(score)) for row, score in zip(rows, scores)]
+
+    def save_index(self, path: str):
+        """
+        Save the index next to the store files at path, unless it is already saved there.
+
+        :param path: Path of the .json manifest of the store
+        """
+        index: Optional[AnnIndex] = self._index
+        if index is None or self._index_saved_at == path:
+            return
+        base: str = os.path.splitext(path)[0]
+        # The index is written before its manifest, which names the chunks it was built over
+        index.save(f"{base}{INDEX_SUFFIX}.tmp")
+        os.replace(f"{base}{INDEX_SUFFIX}.tmp", base + INDEX_SUFFIX)
+        with open(f"{base}{INDEX_MANIFEST_SUFFIX}.tmp", "w", encoding="utf-8") as manifest_file:
+            json.dump(self._manifest(index), manifest_file)
+        os.replace(f"{base}{INDEX_MANIFEST_SUFFIX}.tmp", base + INDEX_MANIFEST_SUFFIX)
+        self._index_saved_at = path
+
+    def dump(self, path: str):
+        """
+        Save the store in the binary format, with its index if it has one.
+
+        :param path: Path of the .json manifest; the other files are written next to it
+        """
+        super().dump(path)
+        self._index_saved_at = None
+        self.save_index(path)
+
+    @classmethod
+    def load(cls, path: str, embedding: Embeddings) -> "AnnVectorStore":
+        """
+        Open a store saved by dump(). Its saved index is read when it is first needed.
+
+        :param path: Path of the .json manifest or JSON dump
+        :param embedding: Embeddings model used for queries and added documents
+        :return: The store
+        """
+        store: AnnVectorStore = super().load(path, embedding)
+        store._loaded_from = path
+        return store
@@ -15,6 +15,7 @@
 # END COPYRIGHT
 
 import asyncio
+import json
 import logging
 import os
 import re
@@ -22,24 +23,50 @@ from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
 from typing import Any
+from typing import Dict
 from typing import List
 from typing import Literal
 from typing import Optional
+from typing import Tuple
+from typing import Type
 
-from langchain_community.vectorstores import InMemoryVectorStore
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import VectorStore
 from langchain_core.vectorstores.base import VectorStoreRetriever
 from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from sqlalchemy import text
 from sqlalchemy.exc import ProgrammingError
 
+from coded_tools.tools.ann_index import AnnVectorStore
+from coded_tools.tools.document_index import DocumentIndex
+from coded_tools.tools.document_index import SourceRecord
+from coded_tools.tools.document_index import chunk_ids
+from coded_tools.tools.document_index import fingerprint_sources
+from coded_tools.tools.document_index import index_path
+from coded_tools.tools.document_index import recall_vector_store
+from coded_tools.tools.document_index import remember_vector_store
+from coded_tools.tools.embedding_cache import embedding_namespace
+from coded_tools.tools.embedding_cache import with_embedding_cache
+from coded_tools.tools.numpy_vector_store import NumpyVectorStore
+from coded_tools.tools.vector_store_registry import VECTOR_STORE_CACHE_TTL
+from coded_tools.tools.vector_store_registry import VECTOR_STORE_REGISTRY
+from coded_tools.tools.vector_store_registry import registry_key
+from coded_tools.tools.vector_store_registry import source_stamps
+
 # Invalid file path character pattern
 INVALID_PATH_PATTERN = r"[<>:\"|?*\x00-\x1F]"
 DEFAULT_TABLE_NAME = "vectorstore"
+# Suffix of the table holding the document index of a postgres vector store table
+DOCUMENT_INDEX_TABLE_SUFFIX = "_documents"
 EMBEDDINGS_MODEL = "text-embedding-3-small"
 VECTOR_SIZE = 1536
+# Chunk size and overlap in tokens
+CHUNK_SIZE = 100
+CHUNK_OVERLAP = 50
+# Vector stores held in memory, by vector store type
+IN_MEMORY_VECTOR_STORES: Dict[str, Type[NumpyVectorStore]] = {"in_memory": NumpyVectorStore, "ann": AnnVectorStore}
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +98,14 @@ class BaseRag(ABC):
         # Save the generated vector store as a JSON file if True
         self.save_vector_store: bool = False
         self.abs_vector_store_path: Optional[str] = None
-        self.embeddings: Embeddings = OpenAIEmbeddings(model=EMBEDDINGS_MODEL, dimensions=VECTOR_SIZE)
+        # Document chunks embedded before (by any RAG tool) are read from the local embedding cache
+        self.embeddings: Embeddings = with_embedding_cache(self.create_embeddings())
+
+    def create_embeddings(self) -> Embeddings:
+        """
+        Create the embeddings model used for document chunks and queries.
+        """
+        return OpenAIEmbeddings(model=EMBEDDINGS_MODEL, dimensions=VECTOR_SIZE)
 
     @abstractmethod
     async def load_documents(self, loader_args: Any) -> List[Document]:
@@ -80,6 +114,26 @@ class BaseRag(ABC):
         """
         raise NotImplementedError
 
+    def document_sources(self, loader_args: Any) -> Optional[List[str]]:
+        """
+        The source documents named in the loader arguments, each of which can be loaded on its own
+        with source_loader_args(). Vector stores over them are re-indexed one changed document at a time.
+
+        :param loader_args: Arguments specific to the document loader
+        :return: The "urls" of the loader arguments, or None if the sources cannot be loaded one by one
+        """
+        if isinstance(loader_args, dict) and isinstance(loader_args.get("urls"), list):
+            return [str(url) for url in loader_args["urls"]]
+        return None
+
+    def source_loader_args(self, loader_args: Any, source: str) -> Any:
+        """
+        :param loader_args: Arguments specific to the document loader
+        :param source: One of the document_sources() of loader_args
+        :return: Loader arguments loading only that source
+        """
+        return {**loader_args, "urls": [source]}
+
     def configure_vector_store_path(self, vector_store_path: Optional[str]):
         """
         Validate the vector store file path and set it as an absolute path.
@@ -112,7 +166,7 @@ class BaseRag(ABC):
         self,
         loader_args: Any,
         postgres_config: Optional[PostgresConfig] = None,
-        vector_store_type: Literal["in_memory", "postgres"] = "in_memory",
+        vector_store_type: Literal["in_memory", "ann", "postgres"] = "in_memory",
     ) -> Optional[VectorStore]:
         """
         Asynchronously loads documents from a given data source, splits them into
@@ -120,14 +174,15 @@ class BaseRag(ABC):
 
         :param loader_args: Arguments specific to the document loader
         :param postgres_config: PostgreSQL configuration (required for postgres vector store)
-        :param vector_store_type: Type of vector store to create
+        :param vector_store_type: Type of vector store to create: "in_memory", "ann" (in memory,
+            searched through an approximate nearest-neighbour index) or "postgres"
         :return: Vector store containing the embedded document chunks
         """
 
         # If vector store type is unsupported, fallback to in-memory vector store
-        if vector_store_type not in {"in_memory", "postgres"}:
+        if vector_store_type not in {"in_memory", "ann", "postgres"}:
             logger.warning(
-                "Received %s as 'vector_store_typ'. Available types are 'in_memory' and 'postgres'\n",
+                "Received %s as 'vector_store_typ'. Available types are 'in_memory', 'ann' and 'postgres'\n",
                 vector_store_type,
             )
             vector_store_type = "in_memory"
@@ -136,11 +191,15 @@ class BaseRag(ABC):
         if vector_store_type == "postgres" and postgres_config is None:
             raise ValueError("postgres_config is required when vector_store_type is 'postgres'\n")
 
-        # Try to load existing vector store for in-memory vector store
-        if vector_store_type == "in_memory":
-            existing_store = await self._load_existing_vector_store()
-            if existing_store:
-                return existing_store
+        # In-memory vector stores are built once per process for the same sources and reused
+        if vector_store_type in IN_MEMORY_VECTOR_STORES:
+            stamps: Dict[str, Any] = await source_stamps([loader_args, self.abs_vector_store_path])
+            key: str = await self.vector_store_key(loader_args, vector_store_type, stamps)
+            # Stores over sources whose changes the stamps do not show are reused for a limited time only
+            ttl: Optional[float] = None if self.sources_stamped(loader_args, stamps) else VECTOR_STORE_CACHE_TTL
+            return await VECTOR_STORE_REGISTRY.get_or_build(
+                key, lambda: self._build_in_memory_vector_store(loader_args, vector_store_type), ttl=ttl
+            )
 
         # Load and process documents
         vectorstore = await self._create_new_vector_store(loader_args, postgres_config, vector_store_type)
@@ -150,14 +209,189 @@ class BaseRag(ABC):
 
         return vectorstore
 
-    async def _load_existing_vector_store(self) -> Optional[VectorStore]:
-        """Try to load existing vector store from file."""
+    def vector_store_lineage(self, loader_args: Any) -> str:
+        """
+        Key shared by the in-memory vector stores built from loader_args whatever their source
+        documents and the state of those. It covers the tool class, the loader arguments other
+        than the document_sources(), the vector store file, and the chunking and embedding parameters.
+
+        :param loader_args: Arguments specific to the document loader
+        :return: The lineage key
+        """
+        if self.document_sources(loader_args) is not None:
+            loader_args = {arg: value for arg, value in loader_args.items() if arg != "urls"}
+        return registry_key(
+            tool=f"{type(self).__module__}.{type(self).__qualname__}",
+            loader_args=loader_args,
+            vector_store_path=self.abs_vector_store_path,
+            chunking=[CHUNK_SIZE, CHUNK_OVERLAP],
+            embeddings=getattr(self.embeddings, "namespace", None) or embedding_namespace(self.embeddings),
+        )
+
+    async def vector_store_key(
+        self, loader_args: Any, vector_store_type: str = "in_memory", stamps: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Key of the in-memory vector store built from loader_args in the process-wide registry:
+        its vector_store_lineage() and type, the loader arguments, and the modification stamps
+        of the sources and of the saved vector store file.
+
+        :param loader_args: Arguments specific to the document loader
+        :param vector_store_type: One of the IN_MEMORY_VECTOR_STORES types
+        :param stamps: The source_stamps() of loader_args and the vector store file, if already taken
+        :return: The registry key
+        """
+        if stamps is None:
+            stamps = await source_stamps([loader_args, self.abs_vector_store_path])
+        return registry_key(
+            lineage=self.vector_store_lineage(loader_args),
+            vector_store_type=vector_store_type,
+            loader_args=loader_args,
+            sources=stamps,
+        )
+
+    def sources_stamped(self, loader_args: Any, stamps: Dict[str, Any]) -> bool:
+        """
+        Whether a change to the documents of loader_args changes their stamps: they are
+        loaded one by one from document_sources(), and every one of those has a stamp.
+        Other loaders (such as a Confluence site) read documents that no stamp describes.
+
+        :param loader_args: Arguments specific to the document loader
+        :param stamps: The source_stamps() of loader_args
+        :return: True if the stamps of the sources show when their documents change
+        """
+        sources: Optional[List[str]] = self.document_sources(loader_args)
+        return bool(sources) and all(stamps.get(source) is not None for source in sources)
+
+    async def _build_in_memory_vector_store(
+        self, loader_args: Any, vector_store_type: str = "in_memory"
+    ) -> NumpyVectorStore:
+        """
+        Update the latest in-memory vector store built from loader_args (or the saved one) for the
+        documents that changed, or create it from the sources, and save it if configured.
+        """
+        store_class: Type[NumpyVectorStore] = IN_MEMORY_VECTOR_STORES[vector_store_type]
+        vectorstore, document_index, changed = await self._refresh_in_memory_vector_store(loader_args, store_class)
+        if isinstance(vectorstore, AnnVectorStore):
+            # Built off the event loop, before the store is saved or shared
+            await asyncio.to_thread(vectorstore.build_index)
+        if changed:
+            await self._save_vector_store(vectorstore, "in_memory", document_index)
+        elif isinstance(vectorstore, AnnVectorStore) and self.save_vector_store and self.abs_vector_store_path:
+            # The index built over an unchanged saved store is saved next to it
+            try:
+                vectorstore.save_index(self.abs_vector_store_path)
+            except OSError as os_error:
+                logger.error("Failed to save ANN index next to %s: %s\n", self.abs_vector_store_path, os_error)
+        return vectorstore
+
+    async def _refresh_in_memory_vector_store(
+        self, loader_args: Any, store_class: Type[NumpyVectorStore]
+    ) -> Tuple[NumpyVectorStore, Optional[DocumentIndex], bool]:
+        """
+        :return: The in-memory vector store for loader_args, its document index if it has one,
+            and whether it differs from the saved store
+        """
+        sources: Optional[List[str]] = self.document_sources(loader_args)
+        if sources is None:
+            # Sources that cannot be loaded one by one are all loaded again
+            existing_store = await self._load_existing_vector_store(store_class)
+            if existing_store:
+                return existing_store, None, False
+            return await self._create_in_memory_vector_store(loader_args, store_class), None, True
+
+        lineage: str = self.vector_store_lineage(loader_args)
+        previous: Optional[Tuple[NumpyVectorStore, DocumentIndex]] = recall_vector_store(lineage)
+        if previous is None:
+            existing_store = await self._load_existing_vector_store(store_class)
+            if existing_store:
+                document_index: Optional[DocumentIndex] = DocumentIndex.load(index_path(self.abs_vector_store_path))
+                if document_index is None:
+                    # Saved without a document index: used as is
+                    return existing_store, None, False
+                previous = (existing_store, document_index)
+
+        vectorstore, document_index, changed = await self._update_in_memory_vector_store(
+            loader_args, sources, previous, store_class
+        )
+        remember_vector_store(lineage, vectorstore, document_index)
+        return vectorstore, document_index, changed
+
+    async def _update_in_memory_vector_store(
+        self,
+        loader_args: Any,
+        sources: List[str],
+        previous: Optional[Tuple[NumpyVectorStore, DocumentIndex]],
+        store_class: Type[NumpyVectorStore] = NumpyVectorStore,
+    ) -> Tuple[NumpyVectorStore, DocumentIndex, bool]:
+        """
+        Build an in-memory vector store over sources, reusing the chunks of the documents
+        that did not change since the previous store.
+
+        :return: The new store, its document index, and whether it differs from the previous store
+        """
+        previous_store, previous_index = previous or (None, DocumentIndex())
+        fingerprints: Dict[str, Optional[Dict[str, Any]]] = await fingerprint_sources(sources, previous_index)
+        unchanged: List[str] = [
+            source
+            for source in previous_index.unchanged(fingerprints)
+            if previous_store is not None and previous_store.has_ids(previous_index.sources[source].ids)
+        ]
+
+        vectorstore = store_class(embedding=self.embeddings)
+        document_index = DocumentIndex({source: previous_index.sources[source] for source in unchanged})
+        if unchanged:
+            # Copied with their vectors, without embedding them again
+            vectorstore.add_from(
+                previous_store, [chunk_id for record in document_index.sources.values() for chunk_id in record.ids]
+            )
+
+        stale: List[str] = [source for source in fingerprints if source not in unchanged]
+        await self._index_documents(vectorstore, loader_args, stale, fingerprints, document_index)
+
+        removed: int = len(set(previous_index.sources) - set(fingerprints))
+        logger.info(
+            "In-memory vector store: %d documents re-indexed, %d unchanged, %d removed.\n",
+            len(stale),
+            len(unchanged),
+            removed,
+        )
+        return vectorstore, document_index, previous is None or bool(stale or removed)
+
+    async def _index_documents(
+        self,
+        vectorstore: VectorStore,
+        loader_args: Any,
+        sources: List[str],
+        fingerprints: Dict[str, Optional[Dict[str, Any]]],
+        document_index: DocumentIndex,
+    ):
+        """Load, split and embed the given sources into the vector store, and record them in the document index."""
+        if not sources:
+            return
+        chunks_by_source: List[List[Document]] = await asyncio.gather(
+            *(self._process_documents(self.source_loader_args(loader_args, source)) for source in sources)
+        )
+        chunks: List[Document] = []
+        ids: List[str] = []
+        for source, source_chunks in zip(sources, chunks_by_source):
+            source_ids: List[str] = chunk_ids(source, source_chunks)
+            document_index.sources[source] = SourceRecord(fingerprints[source], source_ids)
+            chunks.extend(source_chunks)
+            ids.extend(source_ids)
+        if chunks:
+            await vectorstore.aadd_documents(chunks, ids=ids)
+
+    async def _load_existing_vector_store(
+        self, store_class: Type[NumpyVectorStore] = NumpyVectorStore
+    ) -> Optional[NumpyVectorStore]:
+        """Try to load existing vector store from file, mapping its vectors into memory."""
 
         if not self.abs_vector_store_path:
             return None
 
         try:
-            vector_store: VectorStore = InMemoryVectorStore.load(
+            vector_store: NumpyVectorStore = store_class.load(
                 path=self.abs_vector_store_path, embedding=self.embeddings
             )
             logger.info("Loaded vector store from: %s\n", self.abs_vector_store_path)
@@ -185,18 +419,22 @@ class BaseRag(ABC):
         docs: List[Document] = await self.load_documents(loader_args)
 
         # Split documents into smaller chunks for better embedding and retrieval
-        text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(chunk_size=100, chunk_overlap=50)
+        text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+        )
 
         doc_chunks: List[Document] = text_splitter.split_documents(docs)
         logger.info("Processed %d document chunks\n", len(doc_chunks))
 
         return doc_chunks
 
-    async def _create_in_memory_vector_store(self, loader_args) -> VectorStore:
+    async def _create_in_memory_vector_store(
+        self, loader_args, store_class: Type[NumpyVectorStore] = NumpyVectorStore
+    ) -> NumpyVectorStore:
         """Create an in-memory vector store."""
         doc_chunks: List[Document] = await self._process_documents(loader_args)
         logger.info("Creating in-memory vector store.")
-        return await InMemoryVectorStore.afrom_documents(
+        return await store_class.afrom_documents(
             documents=doc_chunks,
             embedding=self.embeddings,
         )
@@ -231,33 +469,36 @@ class BaseRag(ABC):
         )
 
         try:
-            # Initialize vector store table
-            await pg_engine.ainit_vectorstore_table(
-                table_name=table_name,
-                vector_size=VECTOR_SIZE,
-            )
-
-            doc_chunks: List[Document] = await self._process_documents(loader_args)
-
-            logger.info("Creating postgres vector store from documents.")
-            # Create vector store and load documents
-            return await PGVectorStore.afrom_documents(
-                documents=doc_chunks,
-                embedding=self.embeddings,
-                engine=pg_engine,
-                table_name=table_name,
-            )
-
-        except ProgrammingError:
-            # Table already exists. Create vector store from it.
-            logger.info("Table %s already exists.\n", table_name)
-            logger.info("Creating postgres vector store from existing table.\n")
-            return await PGVectorStore.create(
+            try:
+                # Initialize vector store table
+                await pg_engine.ainit_vectorstore_table(
+                    table_name=table_name,
+                    vector_size=VECTOR_SIZE,
+                )
+                created: bool = True
+            except ProgrammingError:
+                logger.info("Table %s already exists.\n", table_name)
+                created = False
+
+            vectorstore = await PGVectorStore.create(
                 engine=pg_engine,
                 table_name=table_name,
                 embedding_service=self.embeddings,
             )
 
+            sources: Optional[List[str]] = self.document_sources(loader_args)
+            if sources is not None:
+                # Only the documents that changed since the table was last indexed are re-embedded
+                await self._update_postgres_vector_store(
+                    vectorstore, postgres_config, table_name, loader_args, sources, created
+                )
+            elif created:
+                logger.info("Creating postgres vector store from documents.")
+                await vectorstore.aadd_documents(await self._process_documents(loader_args))
+            else:
+                logger.info("Creating postgres vector store from existing table.\n")
+            return vectorstore
+
         except OSError as os_error:
             # Fail to create vector store due to connection error
             logger.error("Fail to create vector store due to connection error. %s\n", os_error)
@@ -275,8 +516,98 @@ class BaseRag(ABC):
             logger.error("Fail to create vector store due to invalid DB name. %s\n", invalid_catalog_error)
             return None
 
-    async def _save_vector_store(self, vectorstore: VectorStore, vector_store_type: Literal["in_memory", "postgres"]):
-        """Save vector store to file if configured."""
+    async def _update_postgres_vector_store(
+        self,
+        vectorstore: VectorStore,
+        postgres_config: PostgresConfig,
+        table_name: str,
+        loader_args: Any,
+        sources: List[str],
+        created: bool,
+    ):
+        """
+        Bring a postgres vector store table up to date with sources: delete the chunks of documents
+        that changed or were removed, and add the chunks of changed and new documents. The document
+        index of the table is kept in the table named table_name + DOCUMENT_INDEX_TABLE_SUFFIX.
+        A table filled before it had a document index is used as is.
+        """
+        # Do lazy import so that users do not always have to install postgres (the asyncio engine needs greenlet)
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        index_table: str = f"{table_name}{DOCUMENT_INDEX_TABLE_SUFFIX}"
+        engine = create_async_engine(postgres_config.connection_string)
+        try:
+            async with engine.begin() as connection:
+                await connection.execute(
+                    text(
+                        f'CREATE TABLE IF NOT EXISTS "{index_table}" '
+                        "(source TEXT PRIMARY KEY, fingerprint TEXT, ids TEXT NOT NULL)"
+                    )
+                )
+                if created:
+                    # Left over from a dropped vector store table
+                    await connection.execute(text(f'DELETE FROM "{index_table}"'))
+                rows = (await connection.execute(text(f'SELECT source, fingerprint, ids FROM "{index_table}"'))).all()
+            if not created and not rows:
+                logger.info("Table %s has no document index. Using it as is.\n", table_name)
+                return
+
+            previous_index = DocumentIndex(
+                {
+                    source: SourceRecord(json.loads(fingerprint) if fingerprint else None, json.loads(ids))
+                    for source, fingerprint, ids in rows
+                }
+            )
+            fingerprints: Dict[str, Optional[Dict[str, Any]]] = await fingerprint_sources(sources, previous_index)
+            unchanged: List[str] = previous_index.unchanged(fingerprints)
+            stale: List[str] = [source for source in fingerprints if source not in unchanged]
+            outdated: List[str] = [source for source in previous_index.sources if source not in unchanged]
+            outdated_ids: List[str] = [
+                chunk_id for source in outdated for chunk_id in previous_index.sources[source].ids
+            ]
+            logger.info(
+                "Postgres vector store: %d documents re-indexed, %d unchanged, %d removed.\n",
+                len(stale),
+                len(unchanged),
+                len(set(previous_index.sources) - set(fingerprints)),
+            )
+            if outdated_ids:
+                await vectorstore.adelete(outdated_ids)
+
+            document_index = DocumentIndex()
+            await self._index_documents(vectorstore, loader_args, stale, fingerprints, document_index)
+
+            async with engine.begin() as connection:
+                if outdated:
+                    await connection.execute(
+                        text(f'DELETE FROM "{index_table}" WHERE source = ANY(:sources)'), {"sources": outdated}
+                    )
+                if document_index.sources:
+                    await connection.execute(
+                        text(
+                            f'INSERT INTO "{index_table}" (source, fingerprint, ids) '
+                            "VALUES (:source, :fingerprint, :ids)"
+                        ),
+                        [
+                            {
+                                "source": source,
+                                "fingerprint": json.dumps(record.fingerprint) if record.fingerprint else None,
+                                "ids": json.dumps(record.ids),
+                            }
+                            for source, record in document_index.sources.items()
+                        ],
+                    )
+        finally:
+            await engine.dispose()
+
+    async def _save_vector_store(
+        self,
+        vectorstore: VectorStore,
+        vector_store_type: Literal["in_memory", "postgres"],
+        document_index: Optional[DocumentIndex] = None,
+    ):
+        """Save vector store to file if configured, with its document index if it has one."""
         should_save: bool = self.save_vector_store and self.abs_vector_store_path and vector_store_type == "in_memory"
 
         if not should_save:
@@ -285,6 +616,8 @@ class BaseRag(ABC):
         try:
             os.makedirs(os.path.dirname(self.abs_vector_store_path), exist_ok=True)
             vectorstore.dump(path=self.abs_vector_store_path)
+            if document_index is not None:
+                document_index.save(index_path(self.abs_vector_store_path))
             logger.info("Vector store saved to: %s\n", self.abs_vector_store_path)
         except OSError as os_error:
             logger.error("Failed to save vector store to %s: %s\n", self.abs_vector_store_path, os_error)
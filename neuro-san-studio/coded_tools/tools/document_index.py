@@ -0,0 +1,232 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+"""
+Document-level fingerprints of the sources in a vector store, for incremental re-indexing.
+
+A DocumentIndex records, for every source (file path or URL) in a vector store, a fingerprint
+of the document and the ids of its chunks. When the store is built again, only the chunks of
+documents whose fingerprint changed are deleted and re-embedded, and the chunks of documents
+no longer among the sources are purged.
+
+Fingerprints are the SHA-256 of local files (hashed again only when their mtime or size
+changed) and the ETag/Last-Modified of http(s) URLs. Sources without a fingerprint, such as
+URLs served without validators, are re-indexed on every build.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+import weakref
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from coded_tools.tools.vector_store_registry import remote_stamp
+
+HASH_BLOCK_SIZE = 1024 * 1024
+INDEX_FILE_SUFFIX = ".index.json"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceRecord:
+    """The fingerprint of a source document and the ids of its chunks in the vector store."""
+
+    fingerprint: Optional[Dict[str, Any]]
+    ids: List[str]
+
+
+@dataclass
+class DocumentIndex:
+    """
+    Fingerprint and chunk ids of every source document in a vector store.
+    """
+
+    sources: Dict[str, SourceRecord] = field(default_factory=dict)
+
+    def unchanged(self, fingerprints: Dict[str, Optional[Dict[str, Any]]]) -> List[str]:
+        """
+        :param fingerprints: The current fingerprint of every source, from fingerprint_sources()
+        :return: The sources whose document is the one indexed
+        """
+        return [
+            source
+            for source, fingerprint in fingerprints.items()
+            if source in self.sources and same_document(self.sources[source].fingerprint, fingerprint)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the index as JSON-serializable data."""
+        return {
+            source: {"fingerprint": record.fingerprint, "ids": record.ids} for source, record in self.sources.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DocumentIndex":
+        """Inverse of to_dict()."""
+        return cls({source: SourceRecord(record.get("fingerprint"), record["ids"]) for source, record in data.items()})
+
+    def save(self, path: str):
+        """
+        Write the index to a JSON file.
+
+        :param path: Path of the file, from index_path()
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as index_file:
+            json.dump(self.to_dict(), index_file)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["DocumentIndex"]:
+        """
+        Read an index saved by save().
+
+        :param path: Path of the file, from index_path()
+        :return: The index, or None if there is none (or it cannot be read)
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as index_file:
+                return cls.from_dict(json.load(index_file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, AttributeError) as error:
+            logger.warning("Ignoring unreadable document index %s: %s", path, error)
+            return None
+
+
+def index_path(vector_store_path: str) -> str:
+    """
+    :param vector_store_path: Path of a vector store JSON file
+    :return: Path of the document index saved next to it
+    """
+    return os.path.splitext(vector_store_path)[0] + INDEX_FILE_SUFFIX
+
+
+def same_document(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> bool:
+    """
+    :return: True if two fingerprints identify the same document; a missing fingerprint never does
+    """
+    if old is None or new is None:
+        return False
+    if "sha256" in new:
+        return old.get("sha256") == new["sha256"]
+    return old == new
+
+
+def _file_fingerprint(path: str, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    stat = os.stat(path)
+    if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+        return previous
+    digest = hashlib.sha256()
+    with open(path, "rb") as document:
+        for block in iter(lambda: document.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return {"sha256": digest.hexdigest(), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _fingerprint(source: str, previous: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    try:
+        if source.startswith(("http://", "https://")):
+            validators: Optional[List[str]] = remote_stamp(source)
+            return {"etag": validators[0], "last_modified": validators[1]} if validators else None
+        if os.path.isfile(source):
+            return _file_fingerprint(source, previous)
+    except OSError as error:
+        logger.debug("Could not fingerprint %s: %s", source, error)
+    return None
+
+
+async def fingerprint_sources(
+    sources: List[str], previous: Optional[DocumentIndex] = None
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Fingerprint source documents concurrently.
+
+    :param sources: File paths and URLs
+    :param previous: The index the sources were last built into, whose file hashes are reused
+        for files with an unchanged mtime and size
+    :return: The fingerprint of every source (None when it has none), by source
+    """
+    unique: List[str] = list(dict.fromkeys(sources))
+    records: Dict[str, SourceRecord] = previous.sources if previous else {}
+    fingerprints = await asyncio.gather(
+        *(
+            asyncio.to_thread(_fingerprint, source, records[source].fingerprint if source in records else None)
+            for source in unique
+        )
+    )
+    return dict(zip(unique, fingerprints))
+
+
+def chunk_ids(source: str, chunks: List[Document]) -> List[str]:
+    """
+    Deterministic ids for the chunks of a source document, so that writing the same chunks
+    again replaces them instead of duplicating them.
+
+    :param source: The source the chunks were loaded from
+    :param chunks: Its chunks, in order
+    :return: A UUID string per chunk
+    """
+    return [
+        str(uuid.uuid5(uuid.NAMESPACE_URL, f"{source}\x00{position}\x00{chunk.page_content}"))
+        for position, chunk in enumerate(chunks)
+    ]
+
+
+# The document index of each in-memory vector store, and the latest store built per lineage
+# (the registry key of a store without its source stamps), both kept only while the store is alive
+_DOCUMENT_INDEXES: "weakref.WeakKeyDictionary[VectorStore, DocumentIndex]" = weakref.WeakKeyDictionary()
+_LATEST_VECTOR_STORES: "weakref.WeakValueDictionary[str, VectorStore]" = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+
+def remember_vector_store(lineage: str, vector_store: VectorStore, document_index: DocumentIndex):
+    """
+    Record an in-memory vector store as the latest built for its lineage, with its document index.
+
+    :param lineage: Key of the stores built from the same tool arguments
+    :param vector_store: The store
+    :param document_index: Its document index
+    """
+    with _lock:
+        _DOCUMENT_INDEXES[vector_store] = document_index
+        _LATEST_VECTOR_STORES[lineage] = vector_store
+
+
+def recall_vector_store(lineage: str) -> Optional[Tuple[VectorStore, DocumentIndex]]:
+    """
+    :param lineage: Key of the stores built from the same tool arguments
+    :return: The latest store recorded for the lineage and its document index,
+        or None if it is no longer in use
+    """
+    with _lock:
+        vector_store: Optional[VectorStore] = _LATEST_VECTOR_STORES.get(lineage)
+        if vector_store is None or vector_store not in _DOCUMENT_INDEXES:
+            return None
+        return vector_store, _DOCUMENT_INDEXES[vector_store]
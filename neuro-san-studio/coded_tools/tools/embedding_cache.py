@@ -0,0 +1,286 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+"""
+Persistent, content-addressed cache of document embeddings for the RAG tools.
+
+Vectors are stored in a local SQLite file keyed by the hash of the embedding model, its
+dimensions and the chunk text, so re-building a vector store over the same sources only
+embeds chunks that are new or changed. The file is bounded in size: once it grows past the
+budget, the least recently used vectors are evicted.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from langchain_core.embeddings import Embeddings
+
+# Location of the cache file; set to an empty string to disable the cache
+EMBEDDING_CACHE_PATH = os.getenv(
+    "RAG_EMBEDDING_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "neuro-san-studio", "embeddings.db")
+)
+EMBEDDING_CACHE_MAX_MB = float(os.getenv("RAG_EMBEDDING_CACHE_MAX_MB", "512"))
+# Keeps each statement below SQLite's limit on bound parameters
+SQLITE_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_namespace(embeddings: Embeddings) -> str:
+    """
+    Identify the vectors an embeddings model produces, so different models or dimensions never share entries.
+
+    :param embeddings: The embeddings model
+    :return: The class, model name and dimensions of the model
+    """
+    model: str = getattr(embeddings, "model", None) or getattr(embeddings, "model_name", None) or ""
+    dimensions: str = str(getattr(embeddings, "dimensions", None) or "")
+    return f"{type(embeddings).__name__}:{model}:{dimensions}"
+
+
+class EmbeddingCache:
+    """
+    Size-bounded SQLite store of embedding vectors keyed by content hash.
+    Safe to share between threads and, through SQLite's locking, between processes.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        :param path: Path of the SQLite file; created with its directory if missing
+        :param max_bytes: Size of the stored vectors above which the least recently used are evicted
+        """
+        self.path: str = path
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        # Bytes stored, counted on first use and kept up to date by this process
+        self._stored_bytes: Optional[int] = None
+
+    @staticmethod
+    def key(namespace: str, text: str) -> str:
+        """
+        Content address of a chunk's embedding.
+
+        :param namespace: The embedding_namespace() of the model
+        :param text: The chunk text
+        :return: Hex SHA-256 of the namespace and text
+        """
+        return hashlib.sha256(f"{namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+            connection.commit()
+            self._connection = connection
+            self._stored_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        return self._connection
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up vectors and mark the ones found as recently used.
+
+        :param keys: Content addresses from key()
+        :return: The vectors found, by key
+        """
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(keys), SQLITE_BATCH_SIZE):
+                batch: List[str] = keys[start : start + SQLITE_BATCH_SIZE]
+                placeholders: str = ",".join("?" * len(batch))
+                rows = connection.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch)
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+            now: float = time.time()
+            found_keys: List[str] = list(found)
+            for start in range(0, len(found_keys), SQLITE_BATCH_SIZE):
+                batch = found_keys[start : start + SQLITE_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                connection.execute(f"UPDATE embeddings SET last_used = ? WHERE key IN ({placeholders})", [now, *batch])
+            connection.commit()
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, List[float]]]):
+        """
+        Store vectors, then evict the least recently used ones if the cache is over its budget.
+
+        :param items: (key, vector) pairs; vectors are stored as 32-bit floats
+        """
+        now: float = time.time()
+        rows = []
+        for key, vector in items:
+            blob: bytes = array("f", vector).tobytes()
+            rows.append((key, blob, len(blob), now))
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connect()
+            before: int = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, size, last_used) VALUES (?, ?, ?, ?)", rows
+            )
+            connection.commit()
+            # Keys stored meanwhile by another process are ignored; the vectors of a model share one size
+            self._stored_bytes += (connection.total_changes - before) * rows[0][2]
+            if self._stored_bytes > self.max_bytes:
+                self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection):
+        """Delete least recently used vectors until the cache is back under 90% of its budget."""
+        self._stored_bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+        excess: int = self._stored_bytes - int(self.max_bytes * 0.9)
+        if excess <= 0:
+            return
+        doomed: List[str] = []
+        freed: int = 0
+        for key, size in connection.execute("SELECT key, size FROM embeddings ORDER BY last_used"):
+            doomed.append(key)
+            freed += size
+            if freed >= excess:
+                break
+        for start in range(0, len(doomed), SQLITE_BATCH_SIZE):
+            batch: List[str] = doomed[start : start + SQLITE_BATCH_SIZE]
+            connection.execute(f"DELETE FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch)
+        connection.commit()
+        self._stored_bytes -= freed
+        self.evictions += len(doomed)
+        logger.info("Evicted %d embeddings (%d bytes) from %s", len(doomed), freed, self.path)
+
+    def close(self):
+        """Close the SQLite connection; it is reopened on next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings that look document chunks up in an EmbeddingCache and only send the
+    missing ones to the wrapped model. Queries are passed straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, namespace: Optional[str] = None):
+        """
+        :param embeddings: The model to embed cache misses with
+        :param cache: The cache to consult
+        :param namespace: Identity of the model's vectors; defaults to embedding_namespace(embeddings)
+        """
+        self.embeddings: Embeddings = embeddings
+        self.cache: EmbeddingCache = cache
+        self.namespace: str = namespace or embedding_namespace(embeddings)
+
+    def _lookup(self, texts: List[str]) -> Tuple[List[str], Dict[str, List[float]], List[str]]:
+        """Keys for texts, the vectors already cached, and the distinct texts still to embed."""
+        keys: List[str] = [EmbeddingCache.key(self.namespace, text) for text in texts]
+        found: Dict[str, List[float]] = self.cache.get_many(keys)
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        return keys, found, list(missing.values())
+
+    def _merge(
+        self, keys: List[str], found: Dict[str, List[float]], missing: List[str], vectors: List[List[float]]
+    ) -> Tuple[List[Tuple[str, List[float]]], List[List[float]]]:
+        """The newly embedded (key, vector) pairs, and the vectors for keys in order."""
+        new_items: List[Tuple[str, List[float]]] = [
+            (EmbeddingCache.key(self.namespace, text), vector) for text, vector in zip(missing, vectors)
+        ]
+        found.update(new_items)
+        return new_items, [found[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed document chunks, embedding only those not cached yet.
+
+        :param texts: The chunk texts
+        :return: One vector per text, in order
+        """
+        keys, found, missing = self._lookup(texts)
+        vectors: List[List[float]] = self.embeddings.embed_documents(missing) if missing else []
+        new_items, result = self._merge(keys, found, missing, vectors)
+        self.cache.put_many(new_items)
+        return result
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed document chunks, embedding only those not cached yet. The SQLite work runs off the event loop.
+
+        :param texts: The chunk texts
+        :return: One vector per text, in order
+        """
+        keys, found, missing = await asyncio.to_thread(self._lookup, texts)
+        logger.info("Embedding %d of %d chunks; %d are cached", len(missing), len(texts), len(found))
+        vectors: List[List[float]] = await self.embeddings.aembed_documents(missing) if missing else []
+        new_items, result = self._merge(keys, found, missing, vectors)
+        await asyncio.to_thread(self.cache.put_many, new_items)
+        return result
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the wrapped model."""
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Embed a query with the wrapped model."""
+        return await self.embeddings.aembed_query(text)
+
+
+_SHARED_CACHES: Dict[str, EmbeddingCache] = {}
+_SHARED_CACHES_LOCK = threading.Lock()
+
+
+def with_embedding_cache(embeddings: Embeddings, path: Optional[str] = None) -> Embeddings:
+    """
+    Wrap embeddings with the shared cache file at path, or return them unchanged if caching is disabled.
+
+    :param embeddings: The embeddings model
+    :param path: The cache file; defaults to RAG_EMBEDDING_CACHE_PATH
+    :return: Embeddings consulting the cache
+    """
+    path = EMBEDDING_CACHE_PATH if path is None else path
+    if not path:
+        return embeddings
+    with _SHARED_CACHES_LOCK:
+        cache: Optional[EmbeddingCache] = _SHARED_CACHES.get(path)
+        if cache is None:
+            cache = EmbeddingCache(path, int(EMBEDDING_CACHE_MAX_MB * 1024 * 1024))
+            _SHARED_CACHES[path] = cache
+    return CachedEmbeddings(embeddings, cache)
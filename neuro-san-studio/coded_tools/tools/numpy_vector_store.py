@@ -0,0 +1,503 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+"""
+In-memory vector store over a float32 NumPy matrix, saved in a binary format opened with np.memmap.
+
+A store saved at <name>.json is written as:
+  <name>.json          manifest: format version, dimensions and the chunk ids
+  <name>.vectors.npy   float32 matrix of the unit-normalized chunk embeddings, one row per chunk
+  <name>.chunks.jsonl  [text, metadata] of each chunk, one JSON line per row
+  <name>.offsets.npy   int64 byte offset of each line of the chunks file, and of its end
+Loading reads the manifest and maps the .npy files; the texts of chunks are read only when a
+search returns them. Searches score all chunks with one matrix-vector product (the cosine
+similarity, since rows are normalized) and select the top k with np.argpartition.
+
+Vector stores dumped as JSON by InMemoryVectorStore still load; convert them once with
+
+    python -m coded_tools.tools.numpy_vector_store <name>.json
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import uuid
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import InMemoryVectorStore
+from langchain_core.vectorstores import VectorStore
+from langchain_core.vectorstores.utils import maximal_marginal_relevance
+
+FORMAT = "numpy-memmap"
+FORMAT_VERSION = 1
+# Every manifest starts with these bytes, which tells it apart from a JSON dump
+MANIFEST_PREFIX = b'{"format": "numpy-memmap"'
+VECTORS_SUFFIX = ".vectors.npy"
+CHUNKS_SUFFIX = ".chunks.jsonl"
+OFFSETS_SUFFIX = ".offsets.npy"
+# Rough CPython footprint of a chunk held in memory besides its text
+CHUNK_OVERHEAD_BYTES = 512
+CONVERT_COMMAND = "python -m coded_tools.tools.numpy_vector_store <path>"
+
+logger = logging.getLogger(__name__)
+
+Chunk = Tuple[str, Dict[str, Any]]
+
+
+def _normalize(vectors: Any) -> np.ndarray:
+    """Rows of vectors as a float32 matrix of unit norm (zero rows stay zero)."""
+    matrix: np.ndarray = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms: np.ndarray = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _paths(path: str) -> Tuple[str, str, str]:
+    base: str = os.path.splitext(path)[0]
+    return base + VECTORS_SUFFIX, base + CHUNKS_SUFFIX, base + OFFSETS_SUFFIX
+
+
+def _read_json_dump(path: str) -> Tuple[List[str], np.ndarray, List[Chunk]]:
+    """The ids, normalized vectors and chunks of a vector store dumped as JSON by InMemoryVectorStore."""
+    entries: Dict[str, Dict[str, Any]] = InMemoryVectorStore.load(path, embedding=None).store
+    if not entries:
+        return [], np.zeros((0, 0), dtype=np.float32), []
+    vectors: np.ndarray = _normalize([entry["vector"] for entry in entries.values()])
+    return list(entries), vectors, [(entry["text"], entry.get("metadata") or {}) for entry in entries.values()]
+
+
+def _replace(path: str, write: Callable[[Any], None]):
+    """Write a file through a temporary file, so that readers never see it half-written."""
+    temporary: str = f"{path}.tmp"
+    with open(temporary, "wb") as output:
+        write(output)
+    os.replace(temporary, path)
+
+
+class _ChunkFile:
+    """
+    Read-only random access to the [text, metadata] lines of a saved chunks file.
+    """
+
+    def __init__(self, path: str, offsets: np.ndarray):
+        self._offsets: np.ndarray = offsets
+        with open(path, "rb") as chunks:
+            self._map: mmap.mmap = mmap.mmap(chunks.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> Chunk:
+        text, metadata = json.loads(self._map[int(self._offsets[row]) : int(self._offsets[row + 1])])
+        return text, metadata
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Vector store over a float32 matrix of unit-normalized embeddings, searched by cosine similarity.
+    """
+
+    # pylint: disable=redefined-builtin
+
+    def __init__(self, embedding: Embeddings):
+        """
+        :param embedding: Embeddings model used for added documents and queries
+        """
+        self.embedding: Embeddings = embedding
+        self._ids: List[str] = []
+        self._vectors: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        self._chunks: Union[List[Chunk], _ChunkFile] = []
+        # Row of every id, built on first use
+        self._positions: Optional[Dict[str, int]] = None
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    @property
+    def ids(self) -> List[str]:
+        """The ids of the chunks, in row order."""
+        return list(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def memory_size(self) -> int:
+        """
+        Estimate the memory held by the store. The rows of a loaded store are paged in from
+        its files by the operating system and are not counted.
+
+        :return: Estimated size in bytes
+        """
+        size: int = sum(len(chunk_id) + CHUNK_OVERHEAD_BYTES for chunk_id in self._ids)
+        if not isinstance(self._vectors, np.memmap):
+            size += self._vectors.nbytes
+        if isinstance(self._chunks, list):
+            size += sum(len(text) for text, _ in self._chunks)
+        return size
+
+    def _position_of(self) -> Dict[str, int]:
+        if self._positions is None:
+            self._positions = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+        return self._positions
+
+    def _document(self, row: int) -> Document:
+        text, metadata = self._chunks[row]
+        return Document(id=self._ids[row], page_content=text, metadata=metadata)
+
+    def _materialize(self):
+        """Copy the rows of a loaded store into memory before changing them."""
+        if isinstance(self._vectors, np.memmap):
+            self._vectors = np.array(self._vectors)
+        if not isinstance(self._chunks, list):
+            self._chunks = [self._chunks[row] for row in range(len(self._chunks))]
+
+    def _put(self, ids: Sequence[str], vectors: np.ndarray, chunks: Sequence[Chunk]):
+        """Add rows, replacing those with the same ids."""
+        if not ids:
+            return
+        if self._ids and vectors.shape[1] != self._vectors.shape[1]:
+            raise ValueError(f"Expected {self._vectors.shape[1]}-dimensional vectors, got {vectors.shape[1]}")
+        self._materialize()
+        positions: Dict[str, int] = self._position_of()
+        appended: List[int] = []
+        for index, chunk_id in enumerate(ids):
+            row: Optional[int] = positions.get(chunk_id)
+            if row is None:
+                positions[chunk_id] = len(self._ids) + len(appended)
+                appended.append(index)
+            elif row < len(self._ids):
+                self._vectors[row] = vectors[index]
+                self._chunks[row] = chunks[index]
+            else:
+                # Repeated within ids: the last one wins
+                appended[row - len(self._ids)] = index
+        if appended:
+            self._vectors = np.concatenate([self._vectors, vectors[appended]]) if self._ids else vectors[appended]
+            self._ids.extend(ids[index] for index in appended)
+            self._chunks.extend(chunks[index] for index in appended)
+
+    def _add_embedded(
+        self, documents: List[Document], vectors: List[List[float]], ids: Optional[List[str]]
+    ) -> List[str]:
+        if ids and len(ids) != len(documents):
+            raise ValueError(f"ids must be the same length as documents. Got {len(ids)} ids and {len(documents)}.")
+        chunk_ids: List[str] = [
+            (ids[index] if ids else document.id) or str(uuid.uuid4()) for index, document in enumerate(documents)
+        ]
+        chunks: List[Chunk] = [(document.page_content, document.metadata) for document in documents]
+        self._put(chunk_ids, _normalize(vectors), chunks)
+        return chunk_ids
+
+    def add_documents(self, documents: List[Document], ids: Optional[List[str]] = None, **kwargs: Any) -> List[str]:
+        """Embed and add documents, replacing those with the same ids."""
+        if not documents:
+            return []
+        vectors: List[List[float]] = self.embedding.embed_documents([doc.page_content for doc in documents])
+        return self._add_embedded(documents, vectors, ids)
+
+    async def aadd_documents(
+        self, documents: List[Document], ids: Optional[List[str]] = None, **kwargs: Any
+    ) -> List[str]:
+        """Embed and add documents, replacing those with the same ids."""
+        if not documents:
+            return []
+        vectors: List[List[float]] = await self.embedding.aembed_documents([doc.page_content for doc in documents])
+        return self._add_embedded(documents, vectors, ids)
+
+    def add_from(self, other: "NumpyVectorStore", ids: Iterable[str]):
+        """
+        Copy chunks and their vectors from another store without embedding them again.
+
+        :param other: The store holding the chunks
+        :param ids: Ids of the chunks to copy
+        """
+        positions: Dict[str, int] = other._position_of()
+        chunk_ids: List[str] = list(ids)
+        rows: List[int] = [positions[chunk_id] for chunk_id in chunk_ids]
+        if rows:
+            self._put(chunk_ids, np.asarray(other._vectors[rows]), [other._chunks[row] for row in rows])
+
+    def has_ids(self, ids: Iterable[str]) -> bool:
+        """Returns True if the store holds every one of the ids."""
+        positions: Dict[str, int] = self._position_of()
+        return all(chunk_id in positions for chunk_id in ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete chunks by id; unknown ids are ignored."""
+        if not ids:
+            return None
+        positions: Dict[str, int] = self._position_of()
+        rows: List[int] = [positions[chunk_id] for chunk_id in set(ids) if chunk_id in positions]
+        if rows:
+            self._materialize()
+            keep: np.ndarray = np.ones(len(self._ids), dtype=bool)
+            keep[rows] = False
+            self._vectors = self._vectors[keep]
+            self._ids = [chunk_id for chunk_id, kept in zip(self._ids, keep) if kept]
+            self._chunks = [chunk for chunk, kept in zip(self._chunks, keep) if kept]
+            self._positions = None
+        return True
+
+    async def adelete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete chunks by id; unknown ids are ignored."""
+        return self.delete(ids, **kwargs)
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        """The documents of the chunks with the given ids that the store holds."""
+        positions: Dict[str, int] = self._position_of()
+        return [self._document(positions[chunk_id]) for chunk_id in ids if chunk_id in positions]
+
+    async def aget_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        """The documents of the chunks with the given ids that the store holds."""
+        return self.get_by_ids(ids)
+
+    def _top_k(
+        self, embedding: List[float], k: int, filter: Optional[Callable[[Document], bool]] = None
+    ) -> List[Tuple[int, float]]:
+        """Rows and cosine similarities of the k chunks most similar to an embedding, best first."""
+        if not self._ids or k <= 0:
+            return []
+        scores: np.ndarray = self._vectors @ _normalize(embedding)[0]
+        rows: Optional[np.ndarray] = None
+        if filter is not None:
+            rows = np.array([row for row in range(len(self._ids)) if filter(self._document(row))], dtype=np.int64)
+            if not len(rows):
+                return []
+        candidates: np.ndarray = scores if rows is None else scores[rows]
+        k = min(k, len(candidates))
+        top: np.ndarray = np.argpartition(-candidates, k - 1)[:k]
+        top = top[np.argsort(-candidates[top], kind="stable")]
+        if rows is not None:
+            top = rows[top]
+        return [(int(row), float(scores[row])) for row in top]
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Callable[[Document], bool]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """
+        :param embedding: Query embedding
+        :param k: Number of chunks to return
+        :param filter: Predicate on the Document of a chunk
+        :return: The k most similar chunks and their cosine similarity, best first
+        """
+        return [(self._document(row), score) for row, score in self._top_k(embedding, k, filter)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, **kwargs)
+
+    async def asimilarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        embedding: List[float] = await self.embedding.aembed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [document for document, _ in await self.asimilarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return self._cosine_relevance_score_fn
+
+    def max_marginal_relevance_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: Optional[Callable[[Document], bool]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        rows: List[int] = [row for row, _ in self._top_k(embedding, fetch_k, filter)]
+        if not rows:
+            return []
+        selected: List[int] = maximal_marginal_relevance(
+            np.array(embedding, dtype=np.float32), np.asarray(self._vectors[rows]), lambda_mult=lambda_mult, k=k
+        )
+        return [self._document(rows[index]) for index in selected]
+
+    def max_marginal_relevance_search(
+        self, query: str, k: int = 4, fetch_k: int = 20, lambda_mult: float = 0.5, **kwargs: Any
+    ) -> List[Document]:
+        embedding: List[float] = self.embedding.embed_query(query)
+        return self.max_marginal_relevance_search_by_vector(embedding, k, fetch_k, lambda_mult, **kwargs)
+
+    async def amax_marginal_relevance_search(
+        self, query: str, k: int = 4, fetch_k: int = 20, lambda_mult: float = 0.5, **kwargs: Any
+    ) -> List[Document]:
+        embedding: List[float] = await self.embedding.aembed_query(query)
+        return self.max_marginal_relevance_search_by_vector(embedding, k, fetch_k, lambda_mult, **kwargs)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        store = cls(embedding=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+    @classmethod
+    async def afrom_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        store = cls(embedding=embedding, **kwargs)
+        await store.aadd_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+    def dump(self, path: str):
+        """
+        Save the store in the binary format.
+
+        :param path: Path of the .json manifest; the other files are written next to it
+        """
+        write_store(path, self._ids, self._vectors, (self._chunks[row] for row in range(len(self._ids))))
+
+    @classmethod
+    def load(cls, path: str, embedding: Embeddings) -> "NumpyVectorStore":
+        """
+        Open a store saved by dump(), mapping its vectors into memory, or read a vector store
+        dumped as JSON by InMemoryVectorStore.
+
+        :param path: Path of the .json manifest or JSON dump
+        :param embedding: Embeddings model used for queries and added documents
+        :return: The store
+        :raises FileNotFoundError: If the store or one of its files does not exist
+        :raises ValueError: If the files do not hold a store in a supported format
+        """
+        with open(path, "rb") as manifest_file:
+            is_manifest: bool = manifest_file.read(len(MANIFEST_PREFIX)) == MANIFEST_PREFIX
+        if not is_manifest:
+            logger.info("Reading JSON vector store dump %s. Convert it with: %s", path, CONVERT_COMMAND)
+            return cls.from_json_dump(path, embedding)
+
+        with open(path, "r", encoding="utf-8") as manifest_file:
+            manifest: Dict[str, Any] = json.load(manifest_file)
+        if manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported {FORMAT} version {manifest.get('version')} in {path}")
+
+        store = cls(embedding=embedding)
+        store._ids = manifest["ids"]
+        if store._ids:
+            vectors_path, chunks_path, offsets_path = _paths(path)
+            store._vectors = np.load(vectors_path, mmap_mode="r")
+            store._chunks = _ChunkFile(chunks_path, np.load(offsets_path, mmap_mode="r"))
+            if not len(store._ids) == len(store._vectors) == len(store._chunks):
+                raise ValueError(f"The files of vector store {path} do not have the same number of chunks")
+        return store
+
+    @classmethod
+    def from_json_dump(cls, path: str, embedding: Embeddings) -> "NumpyVectorStore":
+        """
+        Read a vector store dumped as JSON by InMemoryVectorStore.
+
+        :param path: Path of the JSON dump
+        :param embedding: Embeddings model used for queries and added documents
+        :return: The store, in memory
+        """
+        store = cls(embedding=embedding)
+        store._put(*_read_json_dump(path))
+        return store
+
+
+def write_store(path: str, ids: List[str], vectors: np.ndarray, chunks: Iterable[Chunk]):
+    """
+    Write chunks in the binary format read by NumpyVectorStore.load().
+
+    :param path: Path of the .json manifest; the other files are written next to it
+    :param ids: Chunk ids
+    :param vectors: Unit-normalized chunk embeddings, one row per id
+    :param chunks: (text, metadata) of each id
+    """
+    directory: str = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    vectors_path, chunks_path, offsets_path = _paths(path)
+    lines: List[bytes] = [
+        json.dumps([text, metadata], ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+        for text, metadata in chunks
+    ]
+    offsets: np.ndarray = np.zeros(len(lines) + 1, dtype=np.int64)
+    np.cumsum([len(line) for line in lines], out=offsets[1:])
+    dimensions: int = int(vectors.shape[1]) if vectors.ndim == 2 else 0
+
+    _replace(vectors_path, lambda output: np.save(output, np.asarray(vectors, dtype=np.float32)))
+    _replace(chunks_path, lambda output: output.writelines(lines))
+    _replace(offsets_path, lambda output: np.save(output, offsets))
+    # The manifest goes last: a store is complete once it is replaced
+    manifest: Dict[str, Any] = {"format": FORMAT, "version": FORMAT_VERSION, "dimensions": dimensions, "ids": ids}
+    _replace(path, lambda output: output.write(json.dumps(manifest).encode("utf-8")))
+
+
+def convert_json_dump(source: str, destination: Optional[str] = None) -> int:
+    """
+    Convert a vector store dumped as JSON by InMemoryVectorStore to the binary format.
+
+    :param source: Path of the JSON dump
+    :param destination: Path of the .json manifest to write; defaults to source, converted in place
+    :return: Number of chunks converted
+    """
+    ids, vectors, chunks = _read_json_dump(source)
+    write_store(destination or source, ids, vectors, chunks)
+    return len(ids)
+
+
+def main():
+    """Convert JSON vector store dumps from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Convert vector stores dumped as JSON by InMemoryVectorStore to the NumPy memmap format."
+    )
+    parser.add_argument("source", help="Path of the JSON dump")
+    parser.add_argument("destination", nargs="?", help="Path of the converted store (.json). Default to source.")
+    args = parser.parse_args()
+    count: int = convert_json_dump(args.source, args.destination)
+    print(f"Converted {count} chunks to {args.destination or args.source}")
+
+
+if __name__ == "__main__":
+    main()
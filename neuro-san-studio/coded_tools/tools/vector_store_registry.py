@@ -0,0 +1,281 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+"""
+Process-wide registry of built in-memory vector stores, shared by the RAG tools.
+
+Stores are keyed by everything they were built from (tool class, sources and their
+modification stamps, chunking and embedding parameters), so a RAG tool invoked again
+over unchanged sources reuses the store instead of re-loading, re-splitting and
+re-embedding them. Stores over sources whose changes cannot be detected from their stamps
+are kept for a limited time only. The registry is an LRU bounded by a memory budget and an entry count.
+Concurrent requests for a store that is being built wait for that build (single-flight),
+from any thread or event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from langchain_core.vectorstores import VectorStore
+
+VECTOR_STORE_CACHE_MAX_MB = float(os.getenv("RAG_VECTOR_STORE_CACHE_MAX_MB", "1024"))
+VECTOR_STORE_CACHE_MAX_ENTRIES = int(os.getenv("RAG_VECTOR_STORE_CACHE_MAX_ENTRIES", "32"))
+# Seconds a store over sources without a usable stamp is reused; 0 builds it on every request
+VECTOR_STORE_CACHE_TTL = float(os.getenv("RAG_VECTOR_STORE_CACHE_TTL", "0"))
+# Seconds to wait for the ETag/Last-Modified of a remote source
+SOURCE_STAMP_TIMEOUT = float(os.getenv("RAG_SOURCE_STAMP_TIMEOUT", "5"))
+
+# Rough CPython footprint of a float in a list, and of a stored document besides its vector and text
+FLOAT_BYTES = 32
+DOCUMENT_OVERHEAD_BYTES = 512
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(vector_store: VectorStore) -> int:
+    """
+    Estimate the memory held by a vector store.
+
+    :param vector_store: A store with a memory_size() method, an InMemoryVectorStore,
+        or another store (which holds its data elsewhere)
+    :return: Estimated size in bytes
+    """
+    memory_size: Optional[Callable[[], int]] = getattr(vector_store, "memory_size", None)
+    if callable(memory_size):
+        return memory_size()
+    documents: Dict[str, Dict[str, Any]] = getattr(vector_store, "store", None) or {}
+    size: int = 0
+    for document in documents.values():
+        size += len(document.get("vector") or ()) * FLOAT_BYTES
+        size += len(document.get("text") or "") + DOCUMENT_OVERHEAD_BYTES
+    return size
+
+
+def _local_stamp(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+        return [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return None
+
+
+def remote_stamp(url: str) -> Optional[List[str]]:
+    """
+    The ETag and Last-Modified of a URL from a HEAD request.
+
+    :param url: An http(s) URL
+    :return: [ETag, Last-Modified], or None if the server sends neither or cannot be reached
+    """
+    try:
+        request = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(request, timeout=SOURCE_STAMP_TIMEOUT) as response:  # nosec B310
+            validators = [response.headers.get("ETag"), response.headers.get("Last-Modified")]
+    except (OSError, ValueError) as error:
+        logger.debug("Could not stamp %s: %s", url, error)
+        return None
+    return validators if any(validators) else None
+
+
+def _source_strings(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [item for element in value for item in _source_strings(element)]
+    if isinstance(value, dict):
+        return [item for element in value.values() for item in _source_strings(element)]
+    return []
+
+
+async def source_stamps(loader_args: Any) -> Dict[str, Any]:
+    """
+    Stamp the sources named in loader arguments: (mtime, size) for local files and
+    (ETag, Last-Modified) for http(s) URLs. Remote sources without validators, or that cannot
+    be reached, stamp as None.
+
+    :param loader_args: Arguments specific to the document loader
+    :return: The stamp of every source, by source
+    """
+    stamps: Dict[str, Any] = {}
+    remote: List[str] = []
+    for value in _source_strings(loader_args):
+        if value.startswith(("http://", "https://")):
+            remote.append(value)
+        elif os.path.exists(value):
+            stamps[value] = _local_stamp(value)
+    if remote:
+        results = await asyncio.gather(*(asyncio.to_thread(remote_stamp, url) for url in remote))
+        stamps.update(zip(remote, results))
+    return stamps
+
+
+def registry_key(**parts: Any) -> str:
+    """
+    Digest of the parameters a vector store was built from; lists of sources are order-insensitive.
+
+    :param parts: JSON-serializable build parameters
+    :return: Hex SHA-256 of their canonical JSON
+    """
+
+    def canonical(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {str(key): canonical(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple, set)):
+            items = [canonical(item) for item in value]
+            return sorted(items, key=lambda item: json.dumps(item, sort_keys=True, default=str))
+        return value
+
+    encoded: str = json.dumps(canonical(parts), sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RegistryEntry:
+    """A built vector store, its estimated size, and when it expires (time.monotonic()) if it does."""
+
+    vector_store: VectorStore
+    size: int
+    expires: Optional[float] = None
+
+
+class VectorStoreRegistry:
+    """
+    LRU of built vector stores with a memory budget and single-flight builds.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        """
+        :param max_bytes: Estimated memory above which the least recently used stores are evicted
+        :param max_entries: Maximum number of stores kept
+        """
+        self.max_bytes: int = max_bytes
+        self.max_entries: int = max_entries
+        self._entries: "OrderedDict[str, RegistryEntry]" = OrderedDict()
+        self._building: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    async def get_or_build(
+        self, key: str, build: Callable[[], Awaitable[VectorStore]], ttl: Optional[float] = None
+    ) -> VectorStore:
+        """
+        Return the store registered under key, waiting for a build already in progress
+        or building it with build() otherwise.
+
+        :param key: The registry_key() of the store
+        :param build: Coroutine function building the store
+        :param ttl: Seconds the built store is reused for; None for as long as it is not evicted,
+            0 or less to not register it (concurrent requests still share its build)
+        :return: The vector store
+        """
+        with self._lock:
+            entry: Optional[RegistryEntry] = self._entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires <= time.monotonic():
+                self._entries.pop(key)
+                self._bytes -= entry.size
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.vector_store
+            pending: Optional[Future] = self._building.get(key)
+            if pending is None:
+                self.misses += 1
+                self._building[key] = Future()
+            else:
+                self.coalesced += 1
+        if pending is not None:
+            return await asyncio.wrap_future(pending)
+
+        try:
+            vector_store: VectorStore = await build()
+        except BaseException as error:
+            with self._lock:
+                future: Future = self._building.pop(key)
+            future.set_exception(error)
+            raise
+        with self._lock:
+            future = self._building.pop(key)
+            if vector_store is not None and (ttl is None or ttl > 0):
+                self._register(key, vector_store, None if ttl is None else time.monotonic() + ttl)
+        future.set_result(vector_store)
+        return vector_store
+
+    def _register(self, key: str, vector_store: VectorStore, expires: Optional[float]):
+        size: int = estimate_size(vector_store)
+        if size > self.max_bytes or self.max_entries <= 0:
+            logger.info("Vector store of %d bytes exceeds the registry budget; not registered.", size)
+            return
+        self._entries[key] = RegistryEntry(vector_store, size, expires)
+        self._bytes += size
+        while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one store, or all of them when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                entry: Optional[RegistryEntry] = self._entries.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry.size
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and memory use for monitoring."""
+        with self._lock:
+            lookups: int = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "building": len(self._building),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+VECTOR_STORE_REGISTRY = VectorStoreRegistry(
+    max_bytes=int(VECTOR_STORE_CACHE_MAX_MB * 1024 * 1024), max_entries=VECTOR_STORE_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,74 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+"""
+Local stand-ins for the embeddings model and document loaders of the RAG tools, shared by their tests.
+"""
+
+import hashlib
+import os
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from coded_tools.tools.base_rag import BaseRag
+
+
+class RecordingEmbeddings(Embeddings):
+    """
+    Deterministic embeddings seeded by the text, recording the texts of the documents they embed.
+    """
+
+    def __init__(self, dimensions: int = 8):
+        """
+        :param dimensions: Size of the vectors
+        """
+        self.dimensions: int = dimensions
+        self.embedded: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        seed: int = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+        return np.random.default_rng(seed).normal(size=self.dimensions).astype(np.float32).tolist()
+
+
+class FileRag(BaseRag):
+    """
+    RAG over the lines of local files, without the tiktoken splitter, recording the files it loads.
+    """
+
+    # Names of the files loaded, by every instance
+    loaded: List[str] = []
+
+    def create_embeddings(self) -> Embeddings:
+        return RecordingEmbeddings()
+
+    async def load_documents(self, loader_args):
+        return []
+
+    async def _process_documents(self, loader_args) -> List[Document]:
+        chunks: List[Document] = []
+        for path in loader_args["urls"]:
+            FileRag.loaded.append(os.path.basename(path))
+            with open(path, "r", encoding="utf-8") as source:
+                lines: List[str] = source.read().splitlines()
+            chunks.extend(Document(page_content=line, metadata={"source": path}) for line in lines)
+        return chunks
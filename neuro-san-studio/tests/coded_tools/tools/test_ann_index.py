@@ -0,0 +1,142 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+import asyncio
+import os
+import tempfile
+import weakref
+from unittest import TestCase
+from unittest import mock
+
+import numpy as np
+from langchain_core.documents import Document
+
+from coded_tools.tools import base_rag
+from coded_tools.tools import document_index
+from coded_tools.tools import embedding_cache
+from coded_tools.tools.ann_index import AnnVectorStore
+from coded_tools.tools.ann_index import FaissHnswIndex
+from coded_tools.tools.ann_index import HnswlibIndex
+from coded_tools.tools.ann_index import IvfIndex
+from coded_tools.tools.ann_index import create_ann_index
+from coded_tools.tools.vector_store_registry import VectorStoreRegistry
+from tests.coded_tools.tools.rag_test_utils import FileRag
+from tests.coded_tools.tools.rag_test_utils import RecordingEmbeddings
+
+
+def clustered_vectors(count: int, dimensions: int = 16, clusters: int = 20, seed: int = 1) -> np.ndarray:
+    """Unit vectors scattered around random centres, as embeddings of documents on a few topics are."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dimensions))
+    vectors = centres[rng.integers(clusters, size=count)] + rng.normal(scale=0.4, size=(count, dimensions))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+class TestAnnIndex(TestCase):
+    """
+    Unit tests for the approximate nearest-neighbour indexes and AnnVectorStore.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "store.json")
+
+    def test_ivf_recall(self):
+        """
+        The IVF index finds most of the true top 10, and all of them when it probes every cluster.
+        """
+        vectors = clustered_vectors(5000)
+        queries = clustered_vectors(50, seed=2)
+        exact = [set(np.argsort(-(vectors @ query))[:10]) for query in queries]
+
+        index = IvfIndex(probes=8)
+        index.build(vectors)
+        found = [len(set(index.search(query, 10)[0]) & truth) for query, truth in zip(queries, exact)]
+        self.assertGreaterEqual(sum(found) / (10 * len(queries)), 0.9)
+
+        index.probes = len(index._centroids)  # pylint: disable=protected-access
+        rows, scores = index.search(queries[0], 10)
+        self.assertEqual(set(rows), exact[0])
+        np.testing.assert_allclose(scores, np.sort(vectors @ queries[0])[::-1][:10], rtol=1e-5)
+
+    def test_missing_backends_fall_back_to_ivf(self):
+        """
+        HNSW backends that are not installed fall back to the NumPy IVF index; unknown backends are errors.
+        """
+        with mock.patch.object(HnswlibIndex, "installed", return_value=False), mock.patch.object(
+            FaissHnswIndex, "installed", return_value=False
+        ):
+            self.assertIsInstance(create_ann_index("auto"), IvfIndex)
+            self.assertIsInstance(create_ann_index("hnswlib"), IvfIndex)
+            self.assertIsInstance(create_ann_index("faiss"), IvfIndex)
+        with self.assertRaises(ValueError):
+            create_ann_index("annoy")
+
+    def test_store_searches_through_its_index(self):
+        """
+        AnnVectorStore finds the chunks exact search finds, and searches small stores and filters exactly.
+        """
+        embeddings = RecordingEmbeddings(dimensions=16)
+        documents = [Document(id=str(row), page_content=f"{row} chunk", metadata={"row": row}) for row in range(600)]
+        store = AnnVectorStore.from_documents(documents, embeddings, backend="ivf", min_chunks=100)
+        small = AnnVectorStore.from_documents(documents[:50], embeddings, backend="ivf", min_chunks=100)
+
+        self.assertIsInstance(store.build_index(), IvfIndex)
+        self.assertIsNone(small.build_index())
+        for row in (0, 123, 599):
+            self.assertEqual(store.similarity_search(f"{row} chunk", k=1)[0].id, str(row))
+        selected = store.similarity_search("7 chunk", k=3, filter=lambda document: document.metadata["row"] > 300)
+        self.assertTrue(all(document.metadata["row"] > 300 for document in selected))
+
+        store.delete(["123"])
+        self.assertNotEqual(store.similarity_search("123 chunk", k=1)[0].id, "123")
+
+    def test_saved_index_is_reused(self):
+        """
+        A store built with vector_store_type "ann" saves its index, which is read back instead of built again.
+        """
+        patches = (
+            mock.patch.object(base_rag, "VECTOR_STORE_REGISTRY", VectorStoreRegistry(10**9, 8)),
+            mock.patch.object(embedding_cache, "EMBEDDING_CACHE_PATH", ""),
+            mock.patch.object(document_index, "_LATEST_VECTOR_STORES", weakref.WeakValueDictionary()),
+            mock.patch("coded_tools.tools.ann_index.ANN_BACKEND", "ivf"),
+            mock.patch("coded_tools.tools.ann_index.ANN_MIN_CHUNKS", 100),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        lines = os.path.join(self.tmp.name, "lines.txt")
+        with open(lines, "w", encoding="utf-8") as source:
+            source.writelines(f"{row} chunk\n" for row in range(600))
+        rag = FileRag()
+        rag.save_vector_store = True
+        rag.configure_vector_store_path(self.path)
+        store = asyncio.run(rag.generate_vector_store({"urls": [lines]}, vector_store_type="ann"))
+        self.assertIsInstance(store, AnnVectorStore)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "store.ann")))
+
+        with mock.patch.object(IvfIndex, "build") as build:
+            loaded = AnnVectorStore.load(self.path, RecordingEmbeddings())
+            self.assertIsInstance(loaded.build_index(), IvfIndex)
+            self.assertEqual(loaded.similarity_search("42 chunk", k=1)[0].page_content, "42 chunk")
+            build.assert_not_called()
+
+            loaded.add_documents([Document(page_content="42 chunk again")], ids=["extra"])
+            loaded.build_index()
+            build.assert_called_once()
@@ -0,0 +1,129 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+import asyncio
+import os
+import tempfile
+import weakref
+from typing import List
+from typing import Optional
+from unittest import TestCase
+from unittest import mock
+
+from coded_tools.tools import base_rag
+from coded_tools.tools import document_index
+from coded_tools.tools import embedding_cache
+from coded_tools.tools.document_index import DocumentIndex
+from coded_tools.tools.document_index import index_path
+from coded_tools.tools.vector_store_registry import VectorStoreRegistry
+from tests.coded_tools.tools.rag_test_utils import FileRag
+
+
+class TestDocumentIndex(TestCase):
+    """
+    Unit tests for incremental re-indexing of in-memory vector stores by document fingerprint.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = {}
+        for name in ("a.txt", "b.txt", "c.txt"):
+            self.paths[name] = os.path.join(self.tmp.name, name)
+            self.write(name, f"{name} first\n{name} second\n")
+        patches = (
+            mock.patch.object(base_rag, "VECTOR_STORE_REGISTRY", VectorStoreRegistry(10**9, 8)),
+            mock.patch.object(embedding_cache, "EMBEDDING_CACHE_PATH", ""),
+            mock.patch.object(document_index, "_LATEST_VECTOR_STORES", weakref.WeakValueDictionary()),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.tmp.cleanup)
+        FileRag.loaded = []
+
+    def write(self, name: str, content: str):
+        with open(self.paths[name], "w", encoding="utf-8") as source:
+            source.write(content)
+
+    @staticmethod
+    def texts(store) -> List[str]:
+        return sorted(document.page_content for document in store.get_by_ids(store.ids))
+
+    def build(self, *names: str, vector_store_path: Optional[str] = None):
+        rag = FileRag()
+        if vector_store_path:
+            rag.save_vector_store = True
+            rag.configure_vector_store_path(vector_store_path)
+        return asyncio.run(rag.generate_vector_store({"urls": [self.paths[name] for name in names]}))
+
+    def test_only_changed_documents_are_reindexed(self):
+        """
+        Rebuilding after one document changed loads only that document and keeps the others' chunks.
+        """
+        self.build("a.txt", "b.txt", "c.txt")
+        self.write("b.txt", "b.txt revised\n")
+        os.utime(self.paths["b.txt"], ns=(1, 1))
+        FileRag.loaded = []
+
+        store = self.build("a.txt", "b.txt", "c.txt")
+        self.assertEqual(FileRag.loaded, ["b.txt"])
+        self.assertEqual(store.embedding.embedded, ["b.txt revised"])
+        self.assertEqual(
+            self.texts(store), ["a.txt first", "a.txt second", "b.txt revised", "c.txt first", "c.txt second"]
+        )
+
+    def test_removed_documents_are_purged(self):
+        """
+        Dropping a document from the sources removes its chunks without loading the others again.
+        """
+        self.build("a.txt", "b.txt", "c.txt")
+        FileRag.loaded = []
+
+        store = self.build("a.txt", "c.txt")
+        self.assertEqual(FileRag.loaded, [])
+        self.assertEqual(self.texts(store), ["a.txt first", "a.txt second", "c.txt first", "c.txt second"])
+
+    def test_touched_documents_with_the_same_content_are_kept(self):
+        """
+        A document whose modification time changed but whose content did not is not loaded again.
+        """
+        self.build("a.txt", "b.txt")
+        os.utime(self.paths["a.txt"], ns=(1, 1))
+        FileRag.loaded = []
+
+        self.build("a.txt", "b.txt")
+        self.assertEqual(FileRag.loaded, [])
+
+    def test_saved_document_index_is_used_by_a_new_process(self):
+        """
+        A saved vector store is updated from its saved document index when nothing is in memory.
+        """
+        path = os.path.join(self.tmp.name, "stores", "store.json")
+        self.build("a.txt", "b.txt", vector_store_path=path)
+        saved = DocumentIndex.load(index_path(path))
+        self.assertEqual(sorted(saved.sources), [self.paths["a.txt"], self.paths["b.txt"]])
+
+        # As in a new process: nothing registered or recalled
+        self.write("a.txt", "a.txt revised\n")
+        os.utime(self.paths["a.txt"], ns=(1, 1))
+        FileRag.loaded = []
+        with mock.patch.object(base_rag, "VECTOR_STORE_REGISTRY", VectorStoreRegistry(10**9, 8)), mock.patch.object(
+            document_index, "_LATEST_VECTOR_STORES", weakref.WeakValueDictionary()
+        ):
+            store = self.build("a.txt", "b.txt", vector_store_path=path)
+        self.assertEqual(FileRag.loaded, ["a.txt"])
+        self.assertEqual(self.texts(store), ["a.txt revised", "b.txt first", "b.txt second"])
+        self.assertEqual(len(DocumentIndex.load(index_path(path)).sources[self.paths["a.txt"]].ids), 1)
@@ -0,0 +1,100 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+from unittest import mock
+
+from coded_tools.tools import embedding_cache
+from coded_tools.tools.embedding_cache import CachedEmbeddings
+from coded_tools.tools.embedding_cache import EmbeddingCache
+from tests.coded_tools.tools.rag_test_utils import FileRag
+from tests.coded_tools.tools.rag_test_utils import RecordingEmbeddings
+
+
+class TestEmbeddingCache(TestCase):
+    """
+    Unit tests for EmbeddingCache and CachedEmbeddings.
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "embeddings.db")
+        self.cache = EmbeddingCache(self.path, max_bytes=1024 * 1024)
+        self.addCleanup(self.cache.close)
+
+    def test_only_new_chunks_are_embedded(self):
+        """
+        A second pass over the same chunks embeds nothing; a changed document only embeds its new chunks.
+        """
+        model = RecordingEmbeddings(dimensions=4)
+        embeddings = CachedEmbeddings(model, self.cache)
+        first = embeddings.embed_documents(["alpha", "beta", "alpha"])
+        self.assertEqual(model.embedded, ["alpha", "beta"])
+
+        model.embedded.clear()
+        self.assertEqual(embeddings.embed_documents(["alpha", "beta", "alpha"]), first)
+        self.assertEqual(asyncio.run(embeddings.aembed_documents(["beta", "gamma"]))[0], first[1])
+        self.assertEqual(model.embedded, ["gamma"])
+
+        # Another model (here, other dimensions) never reads these vectors
+        other = RecordingEmbeddings(dimensions=2)
+        CachedEmbeddings(other, self.cache).embed_documents(["alpha"])
+        self.assertEqual(other.embedded, ["alpha"])
+
+        # The vectors persist across processes
+        reopened = EmbeddingCache(self.path, max_bytes=1024 * 1024)
+        self.addCleanup(reopened.close)
+        fresh = RecordingEmbeddings(dimensions=4)
+        self.assertEqual(CachedEmbeddings(fresh, reopened).embed_documents(["alpha", "beta"]), first[:2])
+        self.assertEqual(fresh.embedded, [])
+
+    def test_least_recently_used_are_evicted(self):
+        """
+        Over budget, the vectors used longest ago are evicted first.
+        """
+        # Each 4-float vector takes 16 bytes; the budget holds 10 of them
+        cache = EmbeddingCache(os.path.join(os.path.dirname(self.path), "small.db"), max_bytes=160)
+        self.addCleanup(cache.close)
+        model = RecordingEmbeddings(dimensions=4)
+        embeddings = CachedEmbeddings(model, cache)
+        for index in range(8):
+            with mock.patch("time.time", return_value=float(index)):
+                embeddings.embed_documents([f"chunk {index}"])
+        with mock.patch("time.time", return_value=100.0):
+            embeddings.embed_documents(["chunk 0"])
+            embeddings.embed_documents([f"new {index}" for index in range(4)])
+        self.assertGreater(cache.evictions, 0)
+
+        model.embedded.clear()
+        embeddings.embed_documents(["chunk 0", "new 3", "chunk 1"])
+        self.assertEqual(model.embedded, ["chunk 1"])
+
+    def test_base_rag_uses_the_cache(self):
+        """
+        BaseRag wraps the embeddings it creates with the shared cache, unless the cache path is empty.
+        """
+        with mock.patch.object(embedding_cache, "EMBEDDING_CACHE_PATH", self.path):
+            rag = FileRag()
+            self.addCleanup(rag.embeddings.cache.close)
+            self.assertIsInstance(rag.embeddings, CachedEmbeddings)
+            self.assertEqual(rag.embeddings.cache.path, self.path)
+            self.assertIs(FileRag().embeddings.cache, rag.embeddings.cache)
+        with mock.patch.object(embedding_cache, "EMBEDDING_CACHE_PATH", ""):
+            self.assertIsInstance(FileRag().embeddings, RecordingEmbeddings)
@@ -0,0 +1,114 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+import asyncio
+import os
+import tempfile
+from typing import List
+from unittest import TestCase
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from coded_tools.tools.numpy_vector_store import NumpyVectorStore
+from coded_tools.tools.numpy_vector_store import convert_json_dump
+from tests.coded_tools.tools.rag_test_utils import RecordingEmbeddings
+
+WORDS = ["refund", "baggage", "delay", "seat", "upgrade", "lounge", "fare", "crew"]
+
+
+def make_documents(count: int) -> List[Document]:
+    return [
+        Document(id=f"chunk-{index}", page_content=f"{WORDS[index % len(WORDS)]} {index}", metadata={"row": index})
+        for index in range(count)
+    ]
+
+
+def results(store, query: str, k: int = 5):
+    return [(document.id, round(score, 5)) for document, score in store.similarity_search_with_score(query, k=k)]
+
+
+class TestNumpyVectorStore(TestCase):
+    """
+    Unit tests for NumpyVectorStore and its binary format.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "stores", "store.json")
+        self.embeddings = RecordingEmbeddings()
+
+    def test_search_matches_in_memory_vector_store(self):
+        """
+        Searches rank chunks and score them by cosine similarity like InMemoryVectorStore.
+        """
+        documents = make_documents(50)
+        reference = InMemoryVectorStore.from_documents(documents, self.embeddings)
+        store = asyncio.run(NumpyVectorStore.afrom_documents(documents, self.embeddings))
+        for query in ("refund 3", "lounge", "crew 49"):
+            self.assertEqual(results(store, query), results(reference, query))
+        self.assertEqual(len(store.max_marginal_relevance_search("fare", k=3, fetch_k=10)), 3)
+
+    def test_dump_and_load_maps_the_vectors(self):
+        """
+        A dumped store loads with its vectors mapped from disk and searches as before.
+        """
+        store = NumpyVectorStore.from_documents(make_documents(30), self.embeddings)
+        store.dump(self.path)
+        loaded = NumpyVectorStore.load(self.path, self.embeddings)
+
+        self.assertIsInstance(loaded._vectors, np.memmap)  # pylint: disable=protected-access
+        self.assertEqual(loaded.ids, store.ids)
+        self.assertEqual(results(loaded, "delay 10"), results(store, "delay 10"))
+        self.assertEqual(loaded.get_by_ids(["chunk-7"])[0].metadata, {"row": 7})
+
+        selected = loaded.similarity_search("seat", k=3, filter=lambda document: document.metadata["row"] % 2 == 0)
+        self.assertEqual(len(selected), 3)
+        self.assertTrue(all(document.metadata["row"] % 2 == 0 for document in selected))
+
+    def test_loaded_stores_can_be_changed(self):
+        """
+        Adding, replacing and deleting chunks of a loaded store leaves its files untouched.
+        """
+        NumpyVectorStore.from_documents(make_documents(10), self.embeddings).dump(self.path)
+        loaded = NumpyVectorStore.load(self.path, self.embeddings)
+
+        loaded.add_documents([Document(page_content="fare 3 revised")], ids=["chunk-3"])
+        loaded.add_documents([Document(page_content="new chunk")], ids=["chunk-new"])
+        loaded.delete(["chunk-0", "unknown"])
+        self.assertEqual(len(loaded), 10)
+        self.assertEqual(loaded.get_by_ids(["chunk-3"])[0].page_content, "fare 3 revised")
+        self.assertEqual(results(loaded, "new chunk", k=1), [("chunk-new", 1.0)])
+
+        self.assertEqual(len(NumpyVectorStore.load(self.path, self.embeddings)), 10)
+        self.assertEqual(NumpyVectorStore.load(self.path, self.embeddings).get_by_ids(["chunk-0"])[0].id, "chunk-0")
+
+    def test_json_dumps_load_and_convert(self):
+        """
+        JSON dumps of InMemoryVectorStore still load, and convert in place to the binary format.
+        """
+        documents = make_documents(20)
+        reference = InMemoryVectorStore.from_documents(documents, self.embeddings)
+        reference.dump(self.path)
+
+        from_json = NumpyVectorStore.load(self.path, self.embeddings)
+        self.assertEqual(results(from_json, "upgrade"), results(reference, "upgrade"))
+        self.assertEqual(convert_json_dump(self.path), 20)
+        converted = NumpyVectorStore.load(self.path, self.embeddings)
+        self.assertIsInstance(converted._vectors, np.memmap)  # pylint: disable=protected-access
+        self.assertEqual(results(converted, "upgrade"), results(reference, "upgrade"))
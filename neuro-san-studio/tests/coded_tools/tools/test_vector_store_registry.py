@@ -0,0 +1,174 @@
+# Copyright © 2025-2026 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+import asyncio
+import os
+import tempfile
+import time
+from typing import List
+from unittest import TestCase
+from unittest import mock
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from coded_tools.tools import base_rag
+from coded_tools.tools import embedding_cache
+from coded_tools.tools.vector_store_registry import VectorStoreRegistry
+from coded_tools.tools.vector_store_registry import estimate_size
+from tests.coded_tools.tools.rag_test_utils import FileRag
+from tests.coded_tools.tools.rag_test_utils import RecordingEmbeddings
+
+
+class PageRag(FileRag):
+    """
+    RAG over a page whose changes no source stamp shows, like a Confluence site.
+    """
+
+    text = "version one"
+
+    def document_sources(self, loader_args):
+        return None
+
+    async def _process_documents(self, loader_args) -> List[Document]:
+        return [Document(page_content=PageRag.text)]
+
+
+def make_store(texts: List[str]) -> InMemoryVectorStore:
+    store = InMemoryVectorStore(RecordingEmbeddings())
+    store.add_texts(texts)
+    return store
+
+
+class TestVectorStoreRegistry(TestCase):
+    """
+    Unit tests for VectorStoreRegistry and its use by BaseRag.
+    """
+
+    def test_concurrent_requests_share_one_build(self):
+        """
+        Requests for a store that is being built wait for that build instead of starting their own.
+        """
+        registry = VectorStoreRegistry(max_bytes=10**9, max_entries=8)
+        builds: List[str] = []
+
+        async def build():
+            builds.append("build")
+            await asyncio.sleep(0.05)
+            return make_store(["a", "b"])
+
+        async def run():
+            return await asyncio.gather(*(registry.get_or_build("key", build) for _ in range(5)))
+
+        stores = asyncio.run(run())
+        self.assertEqual(len(builds), 1)
+        self.assertTrue(all(store is stores[0] for store in stores))
+        self.assertIs(asyncio.run(registry.get_or_build("key", build)), stores[0])
+        stats = registry.stats()
+        self.assertEqual((stats["misses"], stats["coalesced"], stats["hits"]), (1, 4, 1))
+
+    def test_failed_builds_are_not_registered(self):
+        """
+        A failing build raises to every waiter and the next request builds again.
+        """
+        registry = VectorStoreRegistry(max_bytes=10**9, max_entries=8)
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def run():
+            requests = [registry.get_or_build("key", fail) for _ in range(3)]
+            return await asyncio.gather(*requests, return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in asyncio.run(run())))
+
+        async def build():
+            return make_store(["a"])
+
+        asyncio.run(registry.get_or_build("key", build))
+        self.assertEqual(registry.stats()["entries"], 1)
+
+    def test_least_recently_used_stores_are_evicted(self):
+        """
+        Stores past the memory budget are evicted, least recently used first.
+        """
+        size: int = estimate_size(make_store(["x" * 10]))
+        registry = VectorStoreRegistry(max_bytes=size * 2, max_entries=8)
+
+        async def fill():
+            for key in ("a", "b"):
+                await registry.get_or_build(key, lambda: asyncio.sleep(0, make_store(["x" * 10])))
+            await registry.get_or_build("a", None)
+            await registry.get_or_build("c", lambda: asyncio.sleep(0, make_store(["y" * 10])))
+
+        asyncio.run(fill())
+        stats = registry.stats()
+        self.assertEqual((stats["entries"], stats["evictions"], stats["bytes"]), (2, 1, size * 2))
+        # "a" was used after "b", so "b" went and needs a new build
+        asyncio.run(registry.get_or_build("a", None))
+        asyncio.run(registry.get_or_build("b", lambda: asyncio.sleep(0, make_store(["x" * 10]))))
+        self.assertEqual(registry.stats()["misses"], stats["misses"] + 1)
+
+    def test_base_rag_reuses_stores_until_sources_change(self):
+        """
+        BaseRag builds an in-memory store once for unchanged sources and again after a source changes.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "notes.txt")
+            with open(path, "w", encoding="utf-8") as source:
+                source.write("first line\nsecond line\n")
+            registry = VectorStoreRegistry(max_bytes=10**9, max_entries=8)
+            with mock.patch.object(base_rag, "VECTOR_STORE_REGISTRY", registry), mock.patch.object(
+                embedding_cache, "EMBEDDING_CACHE_PATH", ""
+            ):
+                FileRag.loaded = []
+                first = asyncio.run(FileRag().generate_vector_store({"urls": [path]}))
+                self.assertIs(asyncio.run(FileRag().generate_vector_store({"urls": [path]})), first)
+                self.assertEqual(FileRag.loaded, ["notes.txt"])
+
+                with open(path, "a", encoding="utf-8") as source:
+                    source.write("third line\n")
+                changed = asyncio.run(FileRag().generate_vector_store({"urls": [path]}))
+                self.assertEqual(FileRag.loaded, ["notes.txt", "notes.txt"])
+                self.assertEqual(len(changed), 3)
+
+    def test_stores_over_unstamped_sources_expire(self):
+        """
+        Stores whose sources have no stamp are built again on every call, or after RAG_VECTOR_STORE_CACHE_TTL.
+        """
+        registry = VectorStoreRegistry(max_bytes=10**9, max_entries=8)
+
+        def texts():
+            store = asyncio.run(PageRag().generate_vector_store({"url": "https://wiki.example.com"}))
+            return [document.page_content for document in store.get_by_ids(store.ids)]
+
+        with mock.patch.object(base_rag, "VECTOR_STORE_REGISTRY", registry), mock.patch.object(
+            embedding_cache, "EMBEDDING_CACHE_PATH", ""
+        ), mock.patch("coded_tools.tools.vector_store_registry.remote_stamp", return_value=None):
+            PageRag.text = "version one"
+            self.assertEqual(texts(), ["version one"])
+            PageRag.text = "version two"
+            self.assertEqual(texts(), ["version two"])
+            self.assertEqual(registry.stats()["entries"], 0)
+
+            with mock.patch.object(base_rag, "VECTOR_STORE_CACHE_TTL", 0.5):
+                self.assertEqual(texts(), ["version two"])
+                PageRag.text = "version three"
+                self.assertEqual(texts(), ["version two"])
+                time.sleep(0.6)
+                self.assertEqual(texts(), ["version three"])
+            self.assertEqual(registry.stats()["expirations"], 1)
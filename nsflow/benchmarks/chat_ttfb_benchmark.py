@@ -0,0 +1,88 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Time to first chat frame for the "final" (previous) and "stream" chat modes.
+
+A simulated agent network emits --steps AGENT messages --step-ms apart and then the AI
+answer, the shape of a multi-agent turn. Each chat message goes through
+NsWebsocketUtils.process_message exactly as it does for the chat WebSocket.
+
+Usage: python benchmarks/chat_ttfb_benchmark.py [--steps 8] [--step-ms 500] [--turns 5]
+"""
+
+import argparse
+import asyncio
+import time
+from unittest import mock
+
+from nsflow.backend.utils.agentutils.ns_websocket_utils import CHAT_MODES, NsWebsocketUtils
+from nsflow.backend.utils.tools.ns_configs_registry import NsConfigsRegistry
+
+
+class SimulatedAgentSession:
+    """A blocking session whose agents take --step-ms each before reporting."""
+
+    def __init__(self, steps: int, step_delay: float):
+        self.steps = steps
+        self.step_delay = step_delay
+
+    def streaming_chat(self, _chat_request):
+        for index in range(self.steps):
+            time.sleep(self.step_delay)
+            yield {"response": {"type": "AGENT", "text": f"step {index} done", "origin": [{"tool": f"agent_{index}"}]}}
+        time.sleep(self.step_delay)
+        yield {"response": {"type": "AI", "text": "Here is the answer.", "origin": [{"tool": "front_man"}]}}
+
+
+async def run_mode(mode, args):
+    session = SimulatedAgentSession(args.steps, args.step_ms / 1000.0)
+    with mock.patch.object(NsWebsocketUtils, "create_agent_session", return_value=session):
+        utils = NsWebsocketUtils("bench_net", None, f"ttfb-{mode}", mode)
+    frames = [0]
+
+    async def send(_text):
+        frames[0] += 1
+
+    first, totals = [], []
+    for _ in range(args.turns):
+        start = time.perf_counter()
+        await utils.process_message({"message": "plan my trip"}, send)
+        totals.append(time.perf_counter() - start)
+        first.append(utils.last_time_to_first_frame)
+    await utils.close_user_session()
+    return first, totals, frames[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=8, help="AGENT messages before the AI answer")
+    parser.add_argument("--step-ms", type=float, default=500.0, help="Time each simulated agent takes")
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    NsConfigsRegistry.set_current("http", "localhost", 8080)
+    print(f"steps={args.steps} step={args.step_ms}ms turns={args.turns}")
+    for mode in CHAT_MODES:
+        first, totals, frames = asyncio.run(run_mode(mode, args))
+        print(
+            f"  {mode:<6} time to first frame avg={sum(first) / len(first) * 1000:8.1f}ms"
+            f"  max={max(first) * 1000:8.1f}ms  turn avg={sum(totals) / len(totals) * 1000:8.1f}ms"
+            f"  frames/turn={frames / args.turns:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
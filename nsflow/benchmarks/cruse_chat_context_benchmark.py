@@ -0,0 +1,108 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Per-turn chat_context cost on long CRUSE threads: query and rebuild vs. the cached window.
+
+For each of --lengths, bulk-loads a thread with that many messages, then runs --turns turns:
+each adds a message and fetches the chat_context with --max-history messages, as the chat
+client does. The uncached mode is the previous behaviour (a window of 0 makes every lookup
+miss, so each call queries and re-parses the history); the cached mode uses the default window.
+Reports the median time of the chat_context request.
+
+Usage: python benchmarks/cruse_chat_context_benchmark.py [--lengths 100 1000 10000] [--max-history 10]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from unittest import mock
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from nsflow.backend.api.v1 import cruse_endpoints
+from nsflow.backend.db import models  # noqa: F401  pylint: disable=unused-import
+from nsflow.backend.db.chat_context_cache import ChatContextCache
+from nsflow.backend.db.database import Base, get_threads_session, set_sqlite_pragma
+
+ORIGIN = [{"tool": "front", "instantiation_index": 1}, {"tool": "specialist", "instantiation_index": 2}]
+
+
+async def turns(http, length, args):
+    thread_id = (await http.post("/cruse/threads", json={"title": "long"})).json()["id"]
+    history = [{"sender": "AI", "origin": ORIGIN, "text": f"Earlier answer {index}. " * 8} for index in range(length)]
+    await http.post(f"/cruse/threads/{thread_id}/messages:bulk", json={"messages": history})
+    durations = []
+    for index in range(args.turns):
+        message = {"sender": "HUMAN", "origin": ORIGIN, "text": f"Question {index}"}
+        await http.post(f"/cruse/threads/{thread_id}/messages", json=message)
+        start = time.perf_counter()
+        response = await http.get(f"/cruse/threads/{thread_id}/chat_context", params={"max_history": args.max_history})
+        durations.append(time.perf_counter() - start)
+        assert response.json()["chat_context"]["chat_histories"][0]["messages"][-1]["text"] == message["text"]
+    return statistics.median(durations)
+
+
+async def run(path, cache, args):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragma)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def get_session():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(cruse_endpoints.router)
+    app.dependency_overrides[get_threads_session] = get_session
+    try:
+        with mock.patch.object(cruse_endpoints, "CHAT_CONTEXT_CACHE", cache):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+                return [await turns(http, length, args) for length in args.lengths]
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--max-history", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"max_history={args.max_history} turns={args.turns}")
+    results = {}
+    for label, cache in (("uncached", ChatContextCache(window=0)), ("cached", ChatContextCache())):
+        with tempfile.TemporaryDirectory() as tmp:
+            results[label] = asyncio.run(run(os.path.join(tmp, "threads.db"), cache, args))
+        print(f"  {label:<8} stats={cache.stats()}")
+    for index, length in enumerate(args.lengths):
+        uncached, cached = results["uncached"][index], results["cached"][index]
+        print(
+            f"  {length:>6} messages  uncached p50={uncached * 1000:7.2f}ms  cached p50={cached * 1000:7.2f}ms"
+            f"  {uncached / cached:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Event-loop stalls caused by CRUSE thread requests while chat streams share the loop.
+
+Seeds an SQLite threads database with --threads threads of --messages messages, then for
+--seconds runs --clients clients issuing create/add-message/list/get requests against the app
+in process, next to --chats chat streams. Each chat stream stands in for a chat WebSocket's
+sender task: it wakes every --interval-ms and records how late it woke up. With the previous
+synchronous sessions (replicated by a router below, with the previous rollback-journal pragmas)
+every query runs on the event loop; with the async sessions it runs on the driver's threads.
+Building ORM objects and the response still happens on the loop, so listing every thread
+(which grows as clients create threads) stays expensive; --skip-list leaves it out.
+
+Usage: python benchmarks/cruse_db_loop_benchmark.py [--clients 8] [--chats 20] [--seconds 5] [--skip-list]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from nsflow.backend.api.v1 import cruse_endpoints
+from nsflow.backend.db.database import Base, get_threads_session, set_sqlite_pragma
+from nsflow.backend.db.models import Message, Thread
+
+
+def foreign_keys_only(dbapi_conn, _connection_record):
+    """The previous connection setup: rollback journal, default busy timeout."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def blocking_router(session_factory) -> APIRouter:
+    """The previous endpoints for the measured requests: synchronous queries inside async handlers."""
+    router = APIRouter(prefix="/cruse")
+
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @router.post("/threads", response_model=cruse_endpoints.ThreadResponse)
+    async def create_thread(thread: cruse_endpoints.ThreadCreate, db: Session = Depends(get_db)):
+        db_thread = Thread(id=str(uuid.uuid4()), title=thread.title, agent_name=thread.agent_name)
+        db.add(db_thread)
+        db.commit()
+        db.refresh(db_thread)
+        return db_thread
+
+    @router.get("/threads", response_model=list[cruse_endpoints.ThreadResponse])
+    async def list_threads(db: Session = Depends(get_db)):
+        return db.query(Thread).order_by(Thread.updated_at.desc()).all()
+
+    @router.get("/threads/{thread_id}/messages")
+    async def get_messages(thread_id: str, limit: int = 100, db: Session = Depends(get_db)):
+        db.query(Thread).filter(Thread.id == thread_id).first()
+        messages = db.query(Message).filter(Message.thread_id == thread_id).order_by(Message.created_at)
+        return [{"id": msg.id, "text": msg.text} for msg in messages.limit(limit).all()]
+
+    @router.post("/threads/{thread_id}/messages")
+    async def add_message(thread_id: str, message: cruse_endpoints.MessageCreate, db: Session = Depends(get_db)):
+        thread = db.query(Thread).filter(Thread.id == thread_id).first()
+        origin = json.dumps([origin.model_dump() for origin in message.origin])
+        db.add(
+            Message(id=str(uuid.uuid4()), thread_id=thread_id, sender=message.sender, origin=origin, text=message.text)
+        )
+        thread.updated_at = datetime.now(timezone.utc)
+        db.commit()
+        return {"thread_id": thread_id}
+
+    return router
+
+
+def seed(path, threads, messages):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        for thread_index in range(threads):
+            thread_id = str(uuid.uuid4())
+            db.add(Thread(id=thread_id, title=f"Thread {thread_index}", agent_name="bench"))
+            for index in range(messages):
+                db.add(
+                    Message(
+                        id=str(uuid.uuid4()),
+                        thread_id=thread_id,
+                        sender="AI",
+                        origin="[]",
+                        text=f"m{index}",
+                        seq=index + 1,
+                    )
+                )
+        db.commit()
+        thread_ids = [thread.id for thread in db.query(Thread).all()]
+    engine.dispose()
+    return thread_ids
+
+
+async def chat_stream(interval, stop, lateness):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lateness.append(time.perf_counter() - start - interval)
+
+
+async def client(http, thread_ids, stop, counts, index, skip_list):
+    message = {"sender": "HUMAN", "origin": [{"tool": "bench", "instantiation_index": 1}], "text": "hello"}
+    step = index
+    while not stop.is_set():
+        thread_id = thread_ids[step % len(thread_ids)]
+        kind = step % 4
+        if kind == 0:
+            response = await http.post("/cruse/threads", json={"title": "new", "agent_name": "bench"})
+        elif kind == 1:
+            response = await http.post(f"/cruse/threads/{thread_id}/messages", json=message)
+        elif kind == 2 and not skip_list:
+            response = await http.get("/cruse/threads")
+        else:
+            response = await http.get(f"/cruse/threads/{thread_id}/messages")
+        assert response.status_code == 200, response.text
+        counts[kind] += 1
+        step += 1
+
+
+async def measure(app, thread_ids, args):
+    stop = asyncio.Event()
+    lateness, counts = [], [0, 0, 0, 0]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        tasks = [asyncio.create_task(chat_stream(args.interval_ms / 1000, stop, lateness)) for _ in range(args.chats)]
+        tasks += [
+            asyncio.create_task(client(http, thread_ids, stop, counts, index, args.skip_list))
+            for index in range(args.clients)
+        ]
+        await asyncio.sleep(args.seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    lateness.sort()
+    return {
+        "requests/s": sum(counts) / args.seconds,
+        "late p50 ms": statistics.median(lateness) * 1000,
+        "late p99 ms": lateness[int(len(lateness) * 0.99)] * 1000,
+        "late max ms": lateness[-1] * 1000,
+    }
+
+
+async def run_async_mode(path, thread_ids, args):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=args.clients)
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragma)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def get_session():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(cruse_endpoints.router)
+    app.dependency_overrides[get_threads_session] = get_session
+    try:
+        return await measure(app, thread_ids, args)
+    finally:
+        await engine.dispose()
+
+
+async def run_blocking_mode(path, thread_ids, args):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", foreign_keys_only)
+    app = FastAPI()
+    app.include_router(blocking_router(sessionmaker(bind=engine, autocommit=False, autoflush=False)))
+    try:
+        return await measure(app, thread_ids, args)
+    finally:
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=300)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--interval-ms", type=float, default=10)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument(
+        "--skip-list", action="store_true", help="Read a thread's messages instead of listing all threads"
+    )
+    args = parser.parse_args()
+
+    print(f"threads={args.threads}x{args.messages} clients={args.clients} chats={args.chats} seconds={args.seconds}")
+    for label, run in (("blocking", run_blocking_mode), ("async", run_async_mode)):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "threads.db")
+            thread_ids = seed(path, args.threads, args.messages)
+            result = asyncio.run(run(path, thread_ids, args))
+        print(f"  {label:<8}  " + "  ".join(f"{key}={value:8.1f}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
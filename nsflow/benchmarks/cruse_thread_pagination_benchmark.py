@@ -0,0 +1,161 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Thread sidebar and long-thread reads: full listings and offsets vs. keyset pages.
+
+Seeds an SQLite threads database with --threads threads, one of which holds --long-messages
+messages with a widget each, and times requests against the app in process:
+the full thread list the sidebar loaded before, the first and a deep page of thread summaries,
+and a deep page of the long thread's messages by offset and by cursor, with and without widgets.
+
+Usage: python benchmarks/cruse_thread_pagination_benchmark.py [--threads 5000] [--long-messages 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from nsflow.backend.api.v1 import cruse_endpoints
+from nsflow.backend.db.database import Base, get_threads_session, set_sqlite_pragma
+from nsflow.backend.db.models import Message, Thread
+
+
+def seed(path, args):
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "connect", set_sqlite_pragma)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    widget = json.dumps({"title": "Form", "schema": {"type": "object", "properties": {"a": {"type": "string"}}}})
+    with sessionmaker(bind=engine)() as db:
+        thread_ids = [str(uuid.uuid4()) for _ in range(args.threads)]
+        db.add_all(
+            Thread(
+                id=thread_id,
+                title=f"Thread {index}",
+                agent_name="bench",
+                updated_at=start + timedelta(seconds=index),
+                message_count=1,
+                last_message_preview="The last thing that was said in this thread",
+            )
+            for index, thread_id in enumerate(thread_ids)
+        )
+        db.flush()
+        db.add_all(
+            Message(
+                id=str(uuid.uuid4()),
+                thread_id=thread_ids[0],
+                sender="AI",
+                origin="[]",
+                text=f"Message {index} of a long conversation",
+                widget_json=widget,
+                created_at=start + timedelta(milliseconds=index),
+                seq=index + 1,
+            )
+            for index in range(args.long_messages)
+        )
+        db.commit()
+    engine.dispose()
+    return thread_ids[0]
+
+
+async def timed(http, repeats, url, params=None):
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        response = await http.get(url, params=params)
+        durations.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    return statistics.median(durations), response
+
+
+async def deep_cursor(http, url, pages, limit, params):
+    """The cursor after pages pages, walked once up front."""
+    cursor = None
+    for _ in range(pages):
+        response = await http.get(url, params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        body = response.json()
+        cursor = body["next_cursor"] if isinstance(body, dict) else response.headers["X-Next-Cursor"]
+    return cursor
+
+
+async def run(path, long_thread, args):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragma)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def get_session():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(cruse_endpoints.router)
+    app.dependency_overrides[get_threads_session] = get_session
+    results = []
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+            results.append(("all threads", *await timed(http, args.repeats, "/cruse/threads")))
+            summaries = "/cruse/threads/summaries"
+            results.append(("summaries page 1", *await timed(http, args.repeats, summaries, {"limit": args.page})))
+            deep_pages = args.threads // args.page - 1
+            cursor = await deep_cursor(http, summaries, deep_pages, args.page, {})
+            params = {"limit": args.page, "cursor": cursor}
+            results.append((f"summaries page {deep_pages + 1}", *await timed(http, args.repeats, summaries, params)))
+
+            messages = f"/cruse/threads/{long_thread}/messages"
+            deep_pages = args.long_messages // args.page - 1
+            offset = deep_pages * args.page
+            params = {"limit": args.page, "offset": offset}
+            results.append((f"messages offset {offset}", *await timed(http, args.repeats, messages, params)))
+            cursor = await deep_cursor(http, messages, deep_pages, args.page, {})
+            params = {"limit": args.page, "cursor": cursor}
+            results.append((f"messages cursor @{offset}", *await timed(http, args.repeats, messages, params)))
+            params["include_widgets"] = False
+            results.append(("  without widgets", *await timed(http, args.repeats, messages, params)))
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=5000)
+    parser.add_argument("--long-messages", type=int, default=20000)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"threads={args.threads} long thread={args.long_messages} messages page={args.page}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "threads.db")
+        long_thread = seed(path, args)
+        for label, seconds, response in asyncio.run(run(path, long_thread, args)):
+            print(f"  {label:<24}  p50={seconds * 1000:8.2f}ms  body={len(response.content) / 1024:9.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
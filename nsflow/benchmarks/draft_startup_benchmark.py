@@ -0,0 +1,127 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Editor startup time with many saved drafts.
+
+Creates --drafts draft directories, each with --ops operations of history, and compares:
+  eager replay    the previous startup: every draft loaded by replaying its whole history
+  eager snapshot  every draft loaded from its snapshot checkpoint
+  lazy            SimpleStateRegistry startup, registering drafts from meta.json only
+plus the cost of the first access to a lazily registered draft.
+
+Usage: python benchmarks/draft_startup_benchmark.py [--drafts 500] [--ops 200] [--agents 20]
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from nsflow.backend.utils.editor import ops_store
+from nsflow.backend.utils.editor.ops_store import OperationStore
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+from nsflow.backend.utils.editor.simple_state_registry import SimpleStateRegistry
+
+
+def make_template(args):
+    """One draft built through the OperationStore, copied to make the rest."""
+    manager = SimpleStateManager("template")
+    manager._initialize_empty_state()  # pylint: disable=protected-access
+    store = OperationStore("template", manager)
+    store.apply({"op": "add_agent", "args": {"name": "agent_0"}})
+    for index in range(1, args.agents):
+        store.apply({"op": "create_agent_with_parent", "args": {"name": f"agent_{index}", "parent": "agent_0"}})
+    for index in range(args.ops - args.agents):
+        updates = {"instructions": f"Revision {index}: answer questions about the network."}
+        store.apply({"op": "update_agent", "args": {"name": f"agent_{index % args.agents}", "updates": updates}})
+    store.save_draft()
+    return store.root
+
+
+def make_drafts(template_root, count):
+    draft_root = os.path.dirname(template_root)
+    design_ids = []
+    for index in range(count):
+        design_id = f"draft-{index:04d}"
+        path = os.path.join(draft_root, design_id)
+        shutil.copytree(template_root, path)
+        meta_file = os.path.join(path, "meta.json")
+        with open(meta_file, encoding="utf-8") as f:
+            meta = json.load(f)
+        meta.update({"design_id": design_id, "network_name": f"network_{index}"})
+        with open(meta_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        design_ids.append(design_id)
+    shutil.rmtree(template_root)
+    return design_ids
+
+
+def eager_startup():
+    """The previous SimpleStateRegistry startup loop: load every draft."""
+    managers = {}
+    for draft in OperationStore.list_all_drafts():
+        manager = SimpleStateManager(draft["design_id"])
+        if OperationStore.load_draft(draft["design_id"], manager):
+            managers[draft["design_id"]] = manager
+    return managers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drafts", type=int, default=500)
+    parser.add_argument("--ops", type=int, default=200, help="Operations of history per draft")
+    parser.add_argument("--agents", type=int, default=20)
+    args = parser.parse_args()
+
+    ops_store.log.setLevel(logging.WARNING)
+    logging.getLogger("nsflow").setLevel(logging.WARNING)
+    print(f"drafts={args.drafts} ops/draft={args.ops} agents={args.agents}")
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(ops_store, "ROOT_DIR", tmp):
+        design_ids = make_drafts(make_template(args), args.drafts)
+
+        # Without snapshots every load replays from base_state.json, as before
+        with mock.patch.object(OperationStore, "_read_snapshot_seq", return_value=None), mock.patch.object(
+            OperationStore, "write_snapshot"
+        ):
+            start = time.perf_counter()
+            replayed = eager_startup()
+            print(f"  eager replay    startup={time.perf_counter() - start:8.3f}s")
+
+        start = time.perf_counter()
+        snapshotted = eager_startup()
+        print(f"  eager snapshot  startup={time.perf_counter() - start:8.3f}s")
+
+        start = time.perf_counter()
+        registry = SimpleStateRegistry()
+        print(f"  lazy            startup={(time.perf_counter() - start) * 1000:8.1f}ms  "
+              f"registered={len(registry.pending_drafts)}")
+
+        start = time.perf_counter()
+        manager = registry.get_manager(design_ids[0])
+        print(f"  lazy first access to one draft={(time.perf_counter() - start) * 1000:.1f}ms")
+
+        same = all(
+            replayed[d].get_state()["agents"] == snapshotted[d].get_state()["agents"] for d in design_ids
+        ) and manager.get_state()["agents"] == replayed[design_ids[0]].get_state()["agents"]
+        print(f"  same restored states: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Editor API cost of building a network with individual requests vs. one batch request.
+
+Each round adds --ops operations to a fresh network, the mix a copilot or template instantiation
+issues: create agents under a parent, then update their instructions. The individual mode sends
+one editor request per operation (POST /agents, PUT /agents/{name}); the batch mode sends them as
+one POST /batch. Requests go through the FastAPI app in process, without a network hop.
+
+Usage: python benchmarks/editor_batch_benchmark.py [--ops 200] [--rounds 5]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from nsflow.backend.api.v1 import editor_endpoints
+from nsflow.backend.utils.editor import ops_store
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+from nsflow.backend.utils.editor.simple_state_registry import SimpleStateRegistry
+
+
+def agent_names(count):
+    return [f"agent_{index}" for index in range(count // 2)]
+
+
+def run_individual(client, url, ops):
+    for name in agent_names(ops):
+        response = client.post(f"{url}/agents", json={"name": name, "parent_name": "frontman"})
+        assert response.status_code == 200, response.text
+    for name in agent_names(ops):
+        response = client.put(f"{url}/agents/{name}", json={"instructions": f"Handle {name} requests"})
+        assert response.status_code == 200, response.text
+
+
+def run_batch(client, url, ops):
+    names = agent_names(ops)
+    batch = [{"op": "create_agent_with_parent", "args": {"name": name, "parent": "frontman"}} for name in names]
+    batch += [
+        {"op": "update_agent", "args": {"name": name, "updates": {"instructions": f"Handle {name} requests"}}}
+        for name in names
+    ]
+    response = client.post(f"{url}/batch", json={"ops": batch})
+    assert response.status_code == 200, response.text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=200, help="Operations per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    ops_store.log.setLevel(logging.WARNING)
+    logging.getLogger("nsflow").setLevel(logging.WARNING)
+    print(f"ops/round={args.ops} rounds={args.rounds}")
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(ops_store, "ROOT_DIR", tmp), mock.patch.object(
+        SimpleStateManager, "NSFLOW_PLUGIN_MANUAL_EDITOR", True
+    ):
+        registry = SimpleStateRegistry()
+        app = FastAPI()
+        app.include_router(editor_endpoints.router)
+        client = TestClient(app)
+        with mock.patch.object(editor_endpoints, "get_registry", return_value=registry):
+            for label, run in (("individual", run_individual), ("batch", run_batch)):
+                elapsed = 0.0
+                for _ in range(args.rounds):
+                    design_id, _manager = registry.create_new_network("bench", "single_agent")
+                    start = time.perf_counter()
+                    run(client, f"/api/v1/andeditor/networks/{design_id}", args.ops)
+                    elapsed += time.perf_counter() - start
+                    store = registry.get_operation_store(design_id)
+                    with open(store.hist_file, encoding="utf-8") as f:
+                        records = sum(1 for _ in f)
+                    log_bytes = os.path.getsize(store.hist_file)
+                    undo_steps = store.operation_count
+                print(
+                    f"  {label:<10}  per round={elapsed / args.rounds * 1000:8.1f}ms"
+                    f"  per op={elapsed / args.rounds / args.ops * 1000:6.2f}ms  log records={records:4d}"
+                    f"  log={log_bytes / 1024:6.1f}KB  undo steps={undo_steps}"
+                )
+
+
+if __name__ == "__main__":
+    main()
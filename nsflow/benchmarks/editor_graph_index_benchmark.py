@@ -0,0 +1,136 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Cycle checks and validation while a large network is built edge by edge.
+
+Adds --agents agents without edges in random order, then the edges of a random tree over them
+in random order, each followed by validate_network() as the editor does after an edit. Every
+agent's parent is one of the --window agents before it in a shuffled order, which makes the
+tree deep. Every --reject-every edge also tries a back edge that would close a cycle. On the
+finished network it then checks --probes random edges and validates once per probe.
+Compares the previous full-graph walks (replicated by a subclass) against the incrementally
+kept graph index.
+
+Usage: python benchmarks/editor_graph_index_benchmark.py [--agents 2000] [--window 16] [--reject-every 10]
+"""
+
+import argparse
+import random
+import time
+
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+
+
+class WalkingStateManager(SimpleStateManager):
+    """The previous SimpleStateManager: a DFS per cycle check and a scan of all agents per validation."""
+
+    def _would_create_cycle(self, source, target):
+        visited = set()
+        agents = self.current_state["agents"]
+        stack = [target]
+        while stack:
+            current = stack.pop()
+            if current == source:
+                return True
+            if current in visited or current not in agents:
+                continue
+            visited.add(current)
+            stack.extend(child for child in agents[current].get("tools", []) if child in agents)
+        return False
+
+    def validate_network(self):
+        result = {"valid": True, "warnings": [], "errors": []}
+        frontmen = [name for name, agent in self.current_state["agents"].items() if not agent.get("_parent")]
+        if len(frontmen) > 1:
+            result["warnings"].append(f"Network has multiple frontmen: {', '.join(frontmen)}.")
+        return result
+
+
+def plan(args):
+    rng = random.Random(args.seed)
+    names = [f"agent_{index}" for index in range(args.agents)]
+    # Parents come from earlier agents of a shuffled order, so edge order and creation order differ
+    tree_order = names[:]
+    rng.shuffle(tree_order)
+    edges = [
+        (tree_order[rng.randrange(max(0, index - args.window), index)], tree_order[index])
+        for index in range(1, len(tree_order))
+    ]
+    rng.shuffle(edges)
+    creation = names[:]
+    rng.shuffle(creation)
+    return creation, edges
+
+
+def run(manager_class, creation, edges, args):
+    manager = manager_class("bench_graph")
+    manager._initialize_empty_state()  # pylint: disable=protected-access
+    for name in creation:
+        manager.add_agent(name)
+
+    check_time = validate_time = 0.0
+    rejected = 0
+    for index, (source, target) in enumerate(edges):
+        start = time.perf_counter()
+        cycle = manager._would_create_cycle(source, target)  # pylint: disable=protected-access
+        check_time += time.perf_counter() - start
+        assert not cycle
+        manager.add_edge(source, target)
+        if index % args.reject_every == 0:
+            start = time.perf_counter()
+            # The reverse of a tree edge always closes a cycle
+            rejected += manager._would_create_cycle(target, source)  # pylint: disable=protected-access
+            check_time += time.perf_counter() - start
+        start = time.perf_counter()
+        manager.validate_network()
+        validate_time += time.perf_counter() - start
+    build = (check_time / (len(edges) + rejected), validate_time / len(edges), rejected)
+
+    rng = random.Random(args.seed)
+    probes = [(rng.choice(creation), rng.choice(creation)) for _ in range(args.probes)]
+    start = time.perf_counter()
+    cycles = sum(manager._would_create_cycle(source, target) for source, target in probes)  # pylint: disable=W0212
+    probe_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in probes:
+        manager.validate_network()
+    finished = (probe_time / len(probes), (time.perf_counter() - start) / len(probes), cycles)
+    return build, finished
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=2000)
+    parser.add_argument("--window", type=int, default=16)
+    parser.add_argument("--reject-every", type=int, default=10)
+    parser.add_argument("--probes", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    creation, edges = plan(args)
+    print(f"agents={args.agents} edges={len(edges)}")
+    for label, manager_class in (("walk", WalkingStateManager), ("index", SimpleStateManager)):
+        for phase, (per_check, per_validate, cycles) in zip(
+            ("building", "finished"), run(manager_class, creation, edges, args)
+        ):
+            print(
+                f"  {label:<5} {phase:<8}  cycle check={per_check * 1e6:9.1f}us  validate={per_validate * 1e6:9.1f}us"
+                f"  cycles found={cycles}"
+            )
+
+
+if __name__ == "__main__":
+    main()
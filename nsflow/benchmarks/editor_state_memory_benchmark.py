@@ -0,0 +1,140 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Cost of an editor edit and of its history entry for a network with long instructions.
+
+Builds --agents agents with --instructions-kb of instructions each and applies --edits
+update_agent operations through an OperationStore. Compares the previous deep-copying state
+(history entries and get_state() results are deep copies; replicated by a subclass) against
+the structurally shared state. Memory per history entry is what dropping the history frees.
+
+Usage: python benchmarks/editor_state_memory_benchmark.py [--agents 50] [--instructions-kb 4] [--edits 500]
+"""
+
+import argparse
+import gc
+import logging
+import tempfile
+import time
+import tracemalloc
+from copy import deepcopy
+from unittest import mock
+
+from nsflow.backend.utils.editor import ops_store
+from nsflow.backend.utils.editor.ops_store import OperationStore
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+
+
+class DeepCopyStateManager(SimpleStateManager):
+    """The previous SimpleStateManager: deep copies for every history entry and every read."""
+
+    def _save_to_history(self):
+        if self.history_index < len(self.state_history) - 1:
+            self.state_history = self.state_history[: self.history_index + 1]
+        self.state_history.append(deepcopy(self.current_state))
+        self.history_index = len(self.state_history) - 1
+        if len(self.state_history) > self.max_history:
+            self.state_history.pop(0)
+            self.history_index -= 1
+
+    def get_state(self):
+        return deepcopy(self.current_state)
+
+
+def build(manager_class, args):
+    manager = manager_class(f"bench_{manager_class.__name__}")
+    manager._initialize_empty_state()  # pylint: disable=protected-access
+    for index in range(args.agents):
+        manager.add_agent(f"agent_{index}", "agent_0" if index else None, agent_data(index, args.instructions_kb))
+    return manager
+
+
+def agent_data(index, instructions_kb):
+    """An agent with the fields and nesting of one loaded from a HOCON network."""
+    return {
+        "instructions": (
+            f"Agent {index}. " + "Follow the escalation policy and answer briefly. " * instructions_kb * 20
+        ),
+        "function": {
+            "description": f"Handles requests routed to agent {index}",
+            "parameters": {
+                "type": "object",
+                "properties": {name: {"type": "string", "description": f"The {name}"} for name in ("inquiry", "mode")},
+                "required": ["inquiry"],
+            },
+        },
+        "args": {"retries": 2, "timeout": 30},
+        "allow": {"to_downstream": {"sly_data": ["user_id"]}, "from_upstream": {"sly_data": ["session"]}},
+        "llm_config": {"model_name": "gpt-4o", "temperature": 0.2},
+        "display_as": "llm_agent",
+        "max_message_history": 20,
+        "verbose": False,
+        "max_iterations": 10,
+        "max_execution_seconds": 60,
+        "error_formatter": "string",
+        "error_fragments": ["Error:", "Traceback"],
+        "structure_formats": ["json"],
+    }
+
+
+def run(manager_class, args):
+    manager = build(manager_class, args)
+    store = OperationStore(f"bench_{manager_class.__name__}", manager)
+    start = time.perf_counter()
+    for index in range(args.edits):
+        updates = {"instructions": f"Revision {index}: keep answers short."}
+        store.apply({"op": "update_agent", "args": {"name": f"agent_{index % args.agents}", "updates": updates}})
+    per_edit = (time.perf_counter() - start) / args.edits
+
+    gc.collect()
+    tracemalloc.start()
+    for index in range(manager.max_history):
+        manager.update_agent(f"agent_{index % args.agents}", {"instructions": f"Entry {index}"})
+    entries = len(manager.state_history)
+    gc.collect()
+    with_history = tracemalloc.get_traced_memory()[0]
+    manager.state_history = []
+    gc.collect()
+    per_entry = (with_history - tracemalloc.get_traced_memory()[0]) / entries
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(args.edits):
+        manager.get_state()
+    per_read = (time.perf_counter() - start) / args.edits
+    return per_edit, per_entry, per_read
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--instructions-kb", type=int, default=4)
+    parser.add_argument("--edits", type=int, default=500)
+    args = parser.parse_args()
+
+    ops_store.log.setLevel(logging.WARNING)
+    print(f"agents={args.agents} instructions={args.instructions_kb}KB/agent edits={args.edits}")
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(ops_store, "ROOT_DIR", tmp):
+        for label, manager_class in (("deep copy", DeepCopyStateManager), ("shared", SimpleStateManager)):
+            per_edit, per_entry, per_read = run(manager_class, args)
+            print(
+                f"  {label:<9}  edit (OperationStore.apply)={per_edit * 1000:7.3f}ms"
+                f"  history entry={per_entry / 1024:9.1f}KB  get_state={per_read * 1e6:9.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Bytes sent to an editor client per edit: the full network state vs. the JSON patch of the edit.
+
+Builds --agents agents with --instructions-kb of instructions each and applies --edits edits through
+an OperationStore: instruction updates, new agents with a parent, edges and undos. The full mode
+is what a client polling GET /networks/{design_id} receives after each edit; the patch mode is the
+message the sync channel publishes. Also reports the time to diff and publish an edit.
+
+Usage: python benchmarks/editor_sync_payload_benchmark.py [--agents 50] [--instructions-kb 4] [--edits 400]
+"""
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from unittest import mock
+
+from nsflow.backend.utils.editor import ops_store
+from nsflow.backend.utils.editor.ops_store import OperationStore
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+from nsflow.backend.utils.editor.state_sync import DesignSync, apply_patch
+
+
+def build(args):
+    manager = SimpleStateManager("bench_sync")
+    manager._initialize_empty_state()  # pylint: disable=protected-access
+    for index in range(args.agents):
+        repeats = args.instructions_kb * 20
+        instructions = f"Agent {index}. " + "Follow the escalation policy and answer briefly. " * repeats
+        data = {"instructions": instructions, "llm_config": {"model_name": "gpt-4o", "temperature": 0.2}}
+        manager.add_agent(f"agent_{index}", "agent_0" if index else None, data)
+    return manager
+
+
+def edit(store, index, agents):
+    kind = index % 4
+    if kind == 0:
+        updates = {"instructions": f"Revision {index}: keep answers short."}
+        store.apply({"op": "update_agent", "args": {"name": f"agent_{index % agents}", "updates": updates}})
+    elif kind == 1:
+        store.apply({"op": "create_agent_with_parent", "args": {"name": f"extra_{index}", "parent": "agent_1"}})
+    elif kind == 2:
+        store.apply({"op": "add_edge", "args": {"src": "agent_2", "dst": f"extra_{index - 1}"}})
+    else:
+        store.undo()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--instructions-kb", type=int, default=4)
+    parser.add_argument("--edits", type=int, default=400)
+    args = parser.parse_args()
+
+    ops_store.log.setLevel(logging.WARNING)
+    print(f"agents={args.agents} instructions={args.instructions_kb}KB/agent edits={args.edits}")
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(ops_store, "ROOT_DIR", tmp):
+        manager = build(args)
+        store = OperationStore("bench_sync", manager)
+        sync = DesignSync("bench_sync", manager)
+        client_state = json.loads(json.dumps(sync.snapshot_message()["state"]))
+
+        full_bytes = patch_bytes = 0
+        publish_time = 0.0
+        for index in range(args.edits):
+            edit(store, index, args.agents)
+            full_bytes += len(json.dumps(manager.get_state()))
+            start = time.perf_counter()
+            message = sync.flush()
+            publish_time += time.perf_counter() - start
+            if message is not None:
+                patch_bytes += len(json.dumps(message))
+                client_state = apply_patch(client_state, message["ops"])
+        assert client_state == json.loads(json.dumps(manager.get_state())), "client state diverged"
+
+        for label, total in (("full state", full_bytes), ("patch", patch_bytes)):
+            print(f"  {label:<10}  per edit={total / args.edits / 1024:9.2f}KB  total={total / 1024 / 1024:8.2f}MB")
+        print(
+            f"  patches are {full_bytes / max(patch_bytes, 1):.0f}x smaller;"
+            f" diff+publish per edit={publish_time / args.edits * 1e6:.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
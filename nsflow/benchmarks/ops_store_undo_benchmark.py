@@ -0,0 +1,122 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Undo cost of the editor operation log after a long editing session.
+
+Applies --ops update_agent operations through an OperationStore, then undoes --undos of them.
+Compares the previous log handling (every undo reads history.jsonl, rewrites it without its
+last entry and rewrites redo_stack.jsonl; replicated inline) against the indexed append-only
+log, reporting time and bytes of file I/O per undo.
+
+Usage: python benchmarks/ops_store_undo_benchmark.py [--ops 10000] [--undos 1000] [--agents 20]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from nsflow.backend.utils.editor import ops_store
+from nsflow.backend.utils.editor.ops_store import OperationStore
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+
+
+def make_store(design_id, agents):
+    manager = SimpleStateManager(design_id)
+    manager._initialize_empty_state()  # pylint: disable=protected-access
+    for index in range(agents):
+        manager.add_agent(f"agent_{index}", "agent_0" if index else None)
+    return OperationStore(design_id, manager)
+
+
+def apply_ops(store, count, agents):
+    for index in range(count):
+        updates = {"instructions": f"Revision {index}: " + "Answer questions about the network. " * 8}
+        store.apply({"op": "update_agent", "args": {"name": f"agent_{index % agents}", "updates": updates}})
+
+
+def write_jsonl(path, items):
+    data = "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+    return len(data.encode("utf-8"))
+
+
+def legacy_undo(store, io):
+    """The previous OperationStore.undo: whole-file read and two whole-file rewrites."""
+    io["read"] += os.path.getsize(store.hist_file) + os.path.getsize(store.redo_file)
+    history = OperationStore.read_jsonl(store.hist_file)
+    redo_stack = OperationStore.read_jsonl(store.redo_file)
+    entry = history.pop()
+    inverse = entry["inverse"]
+    store._execute(inverse["op"], inverse.get("args", {}))  # pylint: disable=protected-access
+    redo_stack.append(entry)
+    io["written"] += write_jsonl(store.hist_file, history)
+    io["written"] += write_jsonl(store.redo_file, redo_stack)
+
+
+def indexed_undo(store, io):
+    size = os.path.getsize(store.hist_file)
+    # One entry is read at its offset; one short marker record is appended
+    io["read"] += len(store._read_lines([store._offsets[store.cursor - 1]])[0])  # pylint: disable=protected-access
+    store.undo()
+    io["written"] += os.path.getsize(store.hist_file) - size
+
+
+def run(mode, args):
+    store = make_store(f"bench_{mode}", args.agents)
+    apply_ops(store, args.ops, args.agents)
+    if mode == "legacy":
+        # The previous format: plain entries in history.jsonl and an empty redo stack
+        entries = store.applied_entries()
+        write_jsonl(store.hist_file, [{key: e[key] for key in ("ts", "forward", "inverse")} for e in entries])
+        open(store.redo_file, "w", encoding="utf-8").close()
+    log_bytes = os.path.getsize(store.hist_file)
+    undo = legacy_undo if mode == "legacy" else indexed_undo
+    io = {"read": 0, "written": 0}
+    start = time.perf_counter()
+    for _ in range(args.undos):
+        undo(store, io)
+    elapsed = time.perf_counter() - start
+    return log_bytes, elapsed, io, store.manager.get_state()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=10000)
+    parser.add_argument("--undos", type=int, default=1000)
+    parser.add_argument("--agents", type=int, default=20)
+    args = parser.parse_args()
+
+    ops_store.log.setLevel("WARNING")
+    print(f"ops={args.ops} undos={args.undos} agents={args.agents}")
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(ops_store, "ROOT_DIR", tmp):
+        states = []
+        for mode in ("legacy", "indexed"):
+            log_bytes, elapsed, io, state = run(mode, args)
+            states.append(state)
+            print(
+                f"  {mode:<7} log={log_bytes / 1e6:6.1f}MB  undo avg={elapsed / args.undos * 1000:8.3f}ms"
+                f"  total={elapsed:7.2f}s  read/undo={io['read'] / args.undos / 1024:9.1f}KB"
+                f"  written/undo={io['written'] / args.undos / 1024:9.1f}KB"
+            )
+        print(f"  same final state: {states[0]['agents'] == states[1]['agents']}")
+
+
+if __name__ == "__main__":
+    main()
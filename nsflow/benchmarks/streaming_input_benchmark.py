@@ -0,0 +1,161 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Concurrent streaming chat throughput against a local stub neuro-san HTTP server.
+
+Each session posts to /api/v1/<agent>/streaming_chat on the stub, which answers with
+--messages NDJSON chat responses spaced --interval-ms apart, and reads them through the
+blocking neuro-san HttpServiceAgentSession. --slow of the sessions wait --think-ms before
+their first response, like an agent network working before it answers. Compares the previous
+path (asyncio.to_thread per streamed message, sharing the default executor) against the
+per-session reader thread.
+
+Usage: python benchmarks/streaming_input_benchmark.py [--sessions 50] [--messages 100] [--slow 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from neuro_san.session.http_service_agent_session import HttpServiceAgentSession
+
+from nsflow.backend.utils.agentutils.async_streaming_input_processor import StreamReaderThread
+
+_SENTINEL = object()
+
+
+def make_stub_handler(messages: int, interval: float, think: float):
+    """A request handler streaming `messages` chat responses per streaming_chat call."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        # Chunked like the neuro-san server, so the client sees each response as soon as it is written
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            if request["user_message"]["text"] == "slow":
+                time.sleep(think)
+            for index in range(messages):
+                time.sleep(interval)
+                message_type = "AI" if index == messages - 1 else "AGENT"
+                line = json.dumps({"response": {"type": message_type, "text": f"chunk {index}"}}) + "\n"
+                data = line.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+class StubServer(ThreadingHTTPServer):
+    """Listen backlog large enough for every session to connect at once."""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+
+async def legacy_wrap_iter(sync_iterable):
+    """The previous AsyncStreamingInputProcessor.async_wrap_iter: one executor hop per message."""
+    iterator = iter(sync_iterable)
+    while True:
+        item = await asyncio.to_thread(next, iterator, _SENTINEL)
+        if item is _SENTINEL:
+            break
+        yield item
+
+
+async def run_session(port, mode, slow, gaps, first):
+    session = HttpServiceAgentSession(host="127.0.0.1", port=port, agent_name="stub")
+    request = {"user_message": {"type": "HUMAN", "text": "slow" if slow else "hello"}}
+    reader = StreamReaderThread() if mode == "reader" else None
+    if reader is None:
+        stream = legacy_wrap_iter(session.streaming_chat(request))
+    else:
+        stream = reader.iterate(lambda: session.streaming_chat(request))
+    received = 0
+    start = last = time.perf_counter()
+    async for _response in stream:
+        now = time.perf_counter()
+        # The slow sessions' think time is expected; measure the gaps between streamed messages
+        if received:
+            gaps.append(now - last)
+        elif not slow:
+            first.append(now - start)
+        last = now
+        received += 1
+    if reader is not None:
+        reader.close()
+    return received
+
+
+async def run_mode(port, mode, args):
+    gaps = []
+    first = []
+    start = time.perf_counter()
+    sessions = (run_session(port, mode, index < args.slow, gaps, first) for index in range(args.sessions))
+    counts = await asyncio.gather(*sessions)
+    return sum(counts), time.perf_counter() - start, gaps, first
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100.0 * len(ordered)) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=100, help="Chat responses per session")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Stub server delay between responses")
+    parser.add_argument("--slow", type=int, default=10, help="Sessions that think before their first response")
+    parser.add_argument("--think-ms", type=float, default=2000.0)
+    args = parser.parse_args()
+
+    handler = make_stub_handler(args.messages, args.interval_ms / 1000.0, args.think_ms / 1000.0)
+    server = StubServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    executor_workers = min(32, (os.cpu_count() or 1) + 4)
+    print(f"sessions={args.sessions} messages={args.messages} interval={args.interval_ms}ms "
+          f"slow={args.slow} think={args.think_ms}ms default executor workers={executor_workers}")
+    ideal = args.messages * args.interval_ms / 1000.0 + (args.think_ms / 1000.0 if args.slow else 0.0)
+    for mode in ("to_thread", "reader"):
+        received, elapsed, gaps, first = asyncio.run(run_mode(port, mode, args))
+        print(
+            f"  {mode:<9} received={received:6d}  wall={elapsed:6.2f}s (ideal {ideal:.2f}s)"
+            f"  msgs/s={received / elapsed:6.0f}  inter-message p50={percentile(gaps, 50) * 1000:6.1f}ms"
+            f"  p99={percentile(gaps, 99) * 1000:6.1f}ms  fast sessions first message p99="
+            f"{percentile(first, 99) * 1000:7.1f}ms"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Load benchmark for log fan-out with many simulated WebSocket subscribers.
+
+Compares the previous fan-out (one json.dumps and one awaited send per subscriber, in
+turn, plus a sleep-polling coroutine per socket) against the pub/sub channel. Each
+simulated send costs --send-ms; --slow subscribers take --slow-factor times longer.
+
+Usage: python benchmarks/websocket_fanout_benchmark.py [--subscribers 1000] [--events 50]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from unittest import mock
+
+from nsflow.backend.utils.logutils.websocket_pubsub import Channel, OverflowPolicy
+
+
+class SimulatedWebSocket:
+    """Counts frames and spends a fixed time in each send."""
+
+    def __init__(self, send_delay: float):
+        self.send_delay = send_delay
+        self.received = 0
+
+    async def send_text(self, _text: str):
+        await asyncio.sleep(self.send_delay)
+        self.received += 1
+
+
+def make_sockets(args):
+    sockets = []
+    for index in range(args.subscribers):
+        slow = index < args.slow
+        sockets.append(SimulatedWebSocket(args.send_ms / 1000.0 * (args.slow_factor if slow else 1)))
+    return sockets
+
+
+def entry(index):
+    return {
+        "timestamp": "2025-01-01 00:00:00",
+        "message": f"log line {index}",
+        "source": "neuro-san",
+        "agent": "bench",
+    }
+
+
+async def run_serial(args, dumps_calls):
+    """The previous broadcast_to_websocket: serialize and await every socket in turn."""
+    sockets = make_sockets(args)
+    publish_times = []
+    start = time.perf_counter()
+    for index in range(args.events):
+        publish_start = time.perf_counter()
+        for websocket in sockets:
+            await websocket.send_text(json.dumps(entry(index)))
+        publish_times.append(time.perf_counter() - publish_start)
+        await asyncio.sleep(args.interval_ms / 1000.0)
+    return sockets, publish_times, time.perf_counter() - start
+
+
+async def run_pubsub(args, dumps_calls):
+    channel = Channel("logs", max_queue=args.queue, policy=OverflowPolicy.DROP_OLDEST)
+    sockets = make_sockets(args)
+    for websocket in sockets:
+        channel.subscribe(websocket)
+    publish_times = []
+    start = time.perf_counter()
+    for index in range(args.events):
+        publish_start = time.perf_counter()
+        channel.publish(entry(index))
+        publish_times.append(time.perf_counter() - publish_start)
+        await asyncio.sleep(args.interval_ms / 1000.0)
+    # Wait until every fast subscriber has drained its queue
+    fast = sockets[args.slow:]
+    while any(websocket.received < args.events for websocket in fast):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    stats = channel.stats()
+    for websocket in sockets:
+        channel.unsubscribe(websocket)
+    return sockets, publish_times, elapsed, stats
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100.0 * len(ordered)) - 1))]
+
+
+def report(label, sockets, publish_times, elapsed, dumps_calls, args):
+    fast = sockets[args.slow:]
+    print(
+        f"  {label:<8} total={elapsed * 1000:9.1f}ms  publish p50={percentile(publish_times, 50) * 1000:8.2f}ms"
+        f"  p99={percentile(publish_times, 99) * 1000:8.2f}ms  json.dumps={dumps_calls:7d}"
+        f"  fast clients complete={sum(ws.received == args.events for ws in fast)}/{len(fast)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Time between published events")
+    parser.add_argument("--send-ms", type=float, default=0.05, help="Simulated cost of one send")
+    parser.add_argument("--slow", type=int, default=10, help="Number of slow subscribers")
+    parser.add_argument("--slow-factor", type=float, default=200.0)
+    parser.add_argument("--queue", type=int, default=256, help="Per-subscriber queue size")
+    args = parser.parse_args()
+
+    print(f"subscribers={args.subscribers} events={args.events} slow={args.slow}")
+    real_dumps = json.dumps
+    for label, runner in (("serial", run_serial), ("pubsub", run_pubsub)):
+        calls = [0]
+
+        def counting_dumps(*dumps_args, **kwargs):
+            calls[0] += 1
+            return real_dumps(*dumps_args, **kwargs)
+
+        with mock.patch("json.dumps", counting_dumps):
+            result = asyncio.run(runner(args, calls))
+        sockets, publish_times, elapsed = result[:3]
+        report(label, sockets, publish_times, elapsed, calls[0], args)
+        if label == "pubsub":
+            print(f"  pubsub channel stats: {result[3]}")
+
+    # Idle cost of keeping the sockets open for a minute with no traffic
+    legacy_wakeups = args.subscribers * 60 / 2.0
+    print(f"idle minute: sleep-poll wakeups={legacy_wakeups:.0f} (logs, 2s interval), receive-based wakeups=0")
+
+
+if __name__ == "__main__":
+    main()
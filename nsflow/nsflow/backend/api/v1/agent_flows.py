@@ -23,6 +23,7 @@ from fastapi.responses import JSONResponse
 from nsflow.backend.utils.agentutils.agent_network_utils import AgentNetworkUtils
 from nsflow.backend.utils.agentutils.ns_grpc_network_utils import NsGrpcNetworkUtils
 from nsflow.backend.utils.agentutils.ns_websocket_utils import NsWebsocketUtils
+from nsflow.backend.utils.agentutils.session_registry import SESSION_REGISTRY
 
 router = APIRouter(prefix="/api/v1")
 agent_utils = AgentNetworkUtils()  # Instantiate utility class
@@ -34,6 +35,49 @@ def get_networks():
     return agent_utils.list_available_networks()
 
 
+@router.get("/networks/cache/stats")
+def get_network_cache_stats():
+    """Returns hit/miss statistics of the parsed agent network cache."""
+    return agent_utils.get_cache_stats()
+
+
+@router.get("/sessions/stats")
+def get_session_stats():
+    """Returns live/evicted session counts and the approximate memory held per session store."""
+    return SESSION_REGISTRY.stats()
+
+
+@router.get("/registry/index")
+def get_registry_index_stats():
+    """Returns a summary of the registry dependency index and its manifests."""
+    index = agent_utils.get_registry_index()
+    return {"stats": index.stats(), "manifests": index.manifests()}
+
+
+@router.get(
+    "/registry/dependents",
+    responses={200: {"description": "Networks depending on the reference"}},
+)
+def get_registry_dependents(ref: str):
+    """
+    Lists the networks that include a HOCON file (e.g. aaosa.hocon), use a coded tool
+    class or module (e.g. coded_tools.tools.pdf_rag) or call a sub-network (e.g. /industry/airbnb).
+    """
+    return {"ref": ref, "networks": agent_utils.get_registry_index().networks_using(ref)}
+
+
+@router.get(
+    "/registry/dependencies/{network_name:path}",
+    responses={200: {"description": "Network dependencies"}, 404: {"description": "Network not in any manifest"}},
+)
+def get_registry_dependencies(network_name: str):
+    """Lists the includes, coded tools and sub-networks a registry network depends on."""
+    dependencies = agent_utils.get_registry_index().network_dependencies(network_name)
+    if dependencies is None:
+        raise HTTPException(status_code=404, detail=f"Network '{network_name}' is not in any manifest.")
+    return {"network": network_name, **dependencies}
+
+
 @router.get(
     "/connectivity/{network_name:path}",
     responses={200: {"description": "Agent Network found"}, 404: {"description": "Agent Network not found"}},
@@ -14,24 +14,171 @@
 #
 # END COPYRIGHT
 
+import base64
 import json
 import logging
 import os
+import uuid
 from datetime import datetime
 from datetime import timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel, Field
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from nsflow.backend.db.database import get_threads_db
-from nsflow.backend.db.models import Message, Thread, Theme
+from nsflow.backend.db.chat_context_cache import CHAT_CONTEXT_CACHE, build_chat_context, to_chat_message
+from nsflow.backend.db.database import THREADS_MESSAGE_PREVIEW_CHARS, get_threads_session
+from nsflow.backend.db.models import Message, Thread, Theme, utc_now
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/cruse", tags=["cruse"])
 
+MAX_PAGE_SIZE = 500
+# Response header carrying the cursor of the next page of a paginated list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Message columns returned to clients; widget_json is added only when widgets are requested
+_MESSAGE_COLUMNS = (
+    Message.id, Message.thread_id, Message.sender, Message.origin, Message.text, Message.created_at, Message.seq
+)
+
+
+async def _get_thread_or_404(db: AsyncSession, thread_id: str) -> Thread:
+    """Load a thread by ID or raise a 404."""
+    thread = await db.get(Thread, thread_id)
+    if not thread:
+        raise HTTPException(status_code=404, detail="Thread not found")
+    return thread
+
+
+async def _get_theme_or_404(db: AsyncSession, agent_name: str) -> Theme:
+    """Load an agent's theme entry or raise a 404."""
+    theme = await db.get(Theme, agent_name)
+    if not theme:
+        raise HTTPException(status_code=404, detail=f"No themes found for agent: {agent_name}")
+    return theme
+
+
+def _encode_cursor(key: Union[datetime, int], row_id: str) -> str:
+    """Opaque cursor naming the last row of a page by its sort key: a timestamp or a sequence number."""
+    raw = json.dumps([key.isoformat() if isinstance(key, datetime) else key, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str, key_type: type) -> Tuple[Union[datetime, int], str]:
+    """Sort key of the row a cursor names, or a 400 for a malformed cursor or one of another listing."""
+    try:
+        key, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if key_type is datetime:
+            key = datetime.fromisoformat(key)
+        elif type(key) is not key_type:  # pylint: disable=unidiomatic-typecheck
+            raise TypeError(f"Cursor key {key!r} is not a {key_type.__name__}")
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if isinstance(key, datetime) and key.tzinfo is not None:
+        # The columns hold naive UTC times
+        key = key.astimezone(timezone.utc).replace(tzinfo=None)
+    return key, str(row_id)
+
+
+def _after_cursor(key_column, id_column, cursor: str, descending: bool):
+    """
+    Keyset condition for the rows after a cursor in (key, id) order, so a page
+    is read straight from the index however deep it is. The plain bound on the key
+    is redundant but lets the database seek the index instead of filtering it.
+    """
+    key, row_id = _decode_cursor(cursor, key_column.type.python_type)
+    if descending:
+        return and_(
+            key_column <= key,
+            or_(key_column < key, and_(key_column == key, id_column < row_id)),
+        )
+    return and_(
+        key_column >= key,
+        or_(key_column > key, and_(key_column == key, id_column > row_id)),
+    )
+
+
+def _split_page(rows: list, limit: int, key_attr: str) -> Tuple[list, Optional[str]]:
+    """Cut rows fetched with limit + 1 to a page and the cursor of the next page, if there is one."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, _encode_cursor(getattr(rows[-1], key_attr), rows[-1].id)
+
+
+def _message_response(row) -> "MessageResponse":
+    """Build a message response from a message row, parsing its widget JSON if it was selected."""
+    widget_data = None
+    widget_json = getattr(row, "widget_json", None)
+    if widget_json:
+        try:
+            widget_data = json.loads(widget_json)
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse widget JSON for message {row.id}")
+    return MessageResponse(
+        id=row.id,
+        thread_id=row.thread_id,
+        sender=row.sender,
+        origin=row.origin,  # Already a JSON string from DB
+        text=row.text,
+        widget=widget_data,
+        created_at=row.created_at,
+    )
+
+
+def _message_row(thread_id: str, seq: int, message: "MessageCreate") -> dict:
+    """Column values of a new message; the origin and widget are stored as JSON strings."""
+    return {
+        "id": str(uuid.uuid4()),
+        "thread_id": thread_id,
+        "seq": seq,
+        "sender": message.sender,
+        "origin": json.dumps([origin.model_dump() for origin in message.origin]),
+        "text": message.text,
+        "widget_json": json.dumps(message.widget.model_dump()) if message.widget else None,
+    }
+
+
+async def _record_new_messages(db: AsyncSession, thread_id: str, count: int, last_text: str) -> Optional[int]:
+    """
+    Bump a thread's timestamp and summary for count added messages in one statement,
+    so concurrent adds keep the count right. The statement locks the thread's row until
+    the transaction ends, so the new count also numbers the added messages: the last
+    of them is message number message_count of the thread.
+    :return: The thread's new message_count, or None if the thread does not exist.
+    """
+    return await db.scalar(
+        update(Thread)
+        .where(Thread.id == thread_id)
+        .values(
+            updated_at=utc_now(),
+            message_count=Thread.message_count + count,
+            last_message_preview=last_text[:THREADS_MESSAGE_PREVIEW_CHARS],
+        )
+        .returning(Thread.message_count)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _cache_new_messages(thread_id: str, message_count: int, rows: List[dict]):
+    """Append committed message rows to the thread's cached chat_context window."""
+    chat_messages = [to_chat_message(row["id"], row["sender"], row["origin"], row["text"]) for row in rows]
+    CHAT_CONTEXT_CACHE.append(thread_id, message_count, chat_messages)
+
+
+def _select_messages(thread_id: str, include_widgets: bool):
+    """Select a thread's messages in the order they were added, as plain rows instead of ORM objects."""
+    columns = _MESSAGE_COLUMNS + (Message.widget_json,) if include_widgets else _MESSAGE_COLUMNS
+    return (
+        select(*columns)
+        .where(Message.thread_id == thread_id)
+        .order_by(Message.seq.asc(), Message.id.asc())
+    )
+
 
 # Pydantic models for request/response
 class WidgetDefinition(BaseModel):
@@ -55,6 +202,15 @@ class MessageCreate(BaseModel):
     widget: Optional[WidgetDefinition] = None
 
 
+class MessageBulkCreate(BaseModel):
+    messages: List[MessageCreate] = Field(..., min_length=1)  # In conversation order
+
+
+class MessageBulkResponse(BaseModel):
+    thread_id: str
+    message_ids: List[str]  # In the order the messages were given
+
+
 class MessageResponse(BaseModel):
     id: str
     thread_id: str
@@ -79,6 +235,8 @@ class ThreadResponse(BaseModel):
     agent_name: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    message_count: int = 0
+    last_message_preview: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -86,6 +244,22 @@ class ThreadResponse(BaseModel):
 
 class ThreadWithMessages(ThreadResponse):
     messages: List[MessageResponse] = []
+    next_cursor: Optional[str] = None  # Set when message_limit left messages out
+
+
+class ThreadSummary(BaseModel):
+    """The columns a thread sidebar shows, without touching the messages table."""
+    id: str
+    title: str
+    agent_name: Optional[str] = None
+    updated_at: datetime
+    message_count: int = 0
+    last_message_preview: Optional[str] = None
+
+
+class ThreadSummaryPage(BaseModel):
+    threads: List[ThreadSummary]
+    next_cursor: Optional[str] = None
 
 
 class ThemeCreate(BaseModel):
@@ -112,12 +286,10 @@ class ThemeResponse(BaseModel):
 
 # Thread endpoints
 @router.post("/threads", response_model=ThreadResponse)
-async def create_thread(thread: ThreadCreate, db: Session = Depends(get_threads_db)):
+async def create_thread(thread: ThreadCreate, db: AsyncSession = Depends(get_threads_session)):
     """
     Create a new chat thread.
     """
-    import uuid
-
     thread_id = str(uuid.uuid4())
     db_thread = Thread(
         id=thread_id,
@@ -125,61 +297,86 @@ async def create_thread(thread: ThreadCreate, db: Session = Depends(get_threads_
         agent_name=thread.agent_name,
     )
     db.add(db_thread)
-    db.commit()
-    db.refresh(db_thread)
+    await db.commit()
 
     logger.info(f"Created new thread: {thread_id} - {thread.title}")
     return db_thread
 
 
 @router.get("/threads", response_model=List[ThreadResponse])
-async def list_threads(db: Session = Depends(get_threads_db)):
+async def list_threads(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_threads_session),
+):
     """
-    List all chat threads, ordered by most recently updated.
+    List chat threads, ordered by most recently updated.
+    Without a limit all threads are returned; with one, a page of them, and the
+    X-Next-Cursor header carries the cursor of the next page.
     """
-    threads = db.query(Thread).order_by(Thread.updated_at.desc()).all()
+    query = select(Thread).order_by(Thread.updated_at.desc(), Thread.id.desc())
+    if cursor:
+        query = query.where(_after_cursor(Thread.updated_at, Thread.id, cursor, descending=True))
+    if limit is None:
+        threads = (await db.scalars(query)).all()
+    else:
+        threads, next_cursor = _split_page((await db.scalars(query.limit(limit + 1))).all(), limit, "updated_at")
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
     logger.info(f"Retrieved {len(threads)} threads")
     return threads
 
 
-@router.get("/threads/{thread_id}", response_model=ThreadWithMessages)
-async def get_thread(thread_id: str, db: Session = Depends(get_threads_db)):
+@router.get("/threads/summaries", response_model=ThreadSummaryPage)
+async def list_thread_summaries(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_threads_session),
+):
     """
-    Get a specific thread with all its messages.
+    A page of thread summaries for the thread sidebar, most recently updated first.
+    Pass the returned next_cursor to get the following page; every page costs the same.
     """
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread not found")
-
-    messages = (
-        db.query(Message)
-        .filter(Message.thread_id == thread_id)
-        .order_by(Message.created_at.asc())
-        .all()
+    query = select(
+        Thread.id,
+        Thread.title,
+        Thread.agent_name,
+        Thread.updated_at,
+        Thread.message_count,
+        Thread.last_message_preview,
+    ).order_by(Thread.updated_at.desc(), Thread.id.desc())
+    if cursor:
+        query = query.where(_after_cursor(Thread.updated_at, Thread.id, cursor, descending=True))
+    rows, next_cursor = _split_page((await db.execute(query.limit(limit + 1))).all(), limit, "updated_at")
+    return ThreadSummaryPage(
+        threads=[ThreadSummary.model_validate(row._mapping) for row in rows],  # pylint: disable=protected-access
+        next_cursor=next_cursor,
     )
 
-    # Parse widget JSON for each message
-    message_responses = []
-    for msg in messages:
-        import json
-
-        widget_data = None
-        if msg.widget_json:
-            try:
-                widget_data = json.loads(msg.widget_json)
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse widget JSON for message {msg.id}")
-
-        message_responses.append(
-            MessageResponse(
-                id=msg.id,
-                thread_id=msg.thread_id,
-                sender=msg.sender,
-                origin=msg.origin,  # Already a JSON string from DB
-                text=msg.text,
-                widget=widget_data,
-                created_at=msg.created_at,
-            )
+
+@router.get("/threads/{thread_id}", response_model=ThreadWithMessages)
+async def get_thread(
+    thread_id: str,
+    include_widgets: bool = True,
+    message_limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_threads_session),
+):
+    """
+    Get a specific thread with its messages.
+    With message_limit only the first messages are returned, and next_cursor continues
+    them through GET /threads/{thread_id}/messages. include_widgets=false leaves out
+    the widget definitions.
+    """
+    thread = await _get_thread_or_404(db, thread_id)
+
+    query = _select_messages(thread_id, include_widgets)
+    next_cursor = None
+    if message_limit is None:
+        messages = (await db.execute(query)).all()
+    else:
+        messages, next_cursor = _split_page(
+            (await db.execute(query.limit(message_limit + 1))).all(), message_limit, "seq"
         )
 
     return ThreadWithMessages(
@@ -188,20 +385,21 @@ async def get_thread(thread_id: str, db: Session = Depends(get_threads_db)):
         agent_name=thread.agent_name,
         created_at=thread.created_at,
         updated_at=thread.updated_at,
-        messages=message_responses,
+        message_count=thread.message_count,
+        last_message_preview=thread.last_message_preview,
+        messages=[_message_response(msg) for msg in messages],
+        next_cursor=next_cursor,
     )
 
 
 @router.patch("/threads/{thread_id}", response_model=ThreadResponse)
 async def update_thread(
-    thread_id: str, thread_update: ThreadCreate, db: Session = Depends(get_threads_db)
+    thread_id: str, thread_update: ThreadCreate, db: AsyncSession = Depends(get_threads_session)
 ):
     """
     Update a thread's title and/or agent_name.
     """
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread not found")
+    thread = await _get_thread_or_404(db, thread_id)
 
     # Update fields
     if thread_update.title is not None:
@@ -210,48 +408,45 @@ async def update_thread(
         thread.agent_name = thread_update.agent_name
 
     # Update timestamp
-    thread.updated_at = datetime.now(timezone.utc)
+    thread.updated_at = utc_now()
 
-    db.commit()
-    db.refresh(thread)
+    await db.commit()
 
     logger.info(f"Updated thread: {thread_id} - {thread.title}")
     return thread
 
 
 @router.delete("/threads/{thread_id}")
-async def delete_thread(thread_id: str, db: Session = Depends(get_threads_db)):
+async def delete_thread(thread_id: str, db: AsyncSession = Depends(get_threads_session)):
     """
     Delete a thread and all its messages (CASCADE).
     """
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread not found")
+    thread = await _get_thread_or_404(db, thread_id)
 
-    db.delete(thread)
-    db.commit()
+    await db.delete(thread)
+    await db.commit()
+    CHAT_CONTEXT_CACHE.invalidate(thread_id)
 
     logger.info(f"Deleted thread: {thread_id}")
     return {"message": "Thread deleted successfully", "thread_id": thread_id}
 
 
 @router.delete("/threads/agent/{agent_name:path}")
-async def delete_all_threads_for_agent(agent_name: str, db: Session = Depends(get_threads_db)):
+async def delete_all_threads_for_agent(agent_name: str, db: AsyncSession = Depends(get_threads_session)):
     """
     Delete all threads for a specific agent.
     """
-    threads = db.query(Thread).filter(Thread.agent_name == agent_name).all()
+    # One DELETE statement; the messages go with their threads (CASCADE)
+    deleted_ids = (await db.scalars(delete(Thread).where(Thread.agent_name == agent_name).returning(Thread.id))).all()
+    deleted_count = len(deleted_ids)
 
-    if not threads:
+    if not deleted_count:
         logger.info(f"No threads found for agent: {agent_name}")
         return {"message": "No threads found for this agent", "agent_name": agent_name, "deleted_count": 0}
 
-    deleted_count = len(threads)
-
-    for thread in threads:
-        db.delete(thread)
-
-    db.commit()
+    await db.commit()
+    for thread_id in deleted_ids:
+        CHAT_CONTEXT_CACHE.invalidate(thread_id)
 
     logger.info(f"Deleted {deleted_count} threads for agent: {agent_name}")
     return {"message": f"Deleted {deleted_count} threads successfully", "agent_name": agent_name, "deleted_count": deleted_count}
@@ -260,108 +455,80 @@ async def delete_all_threads_for_agent(agent_name: str, db: Session = Depends(ge
 # Message endpoints
 @router.post("/threads/{thread_id}/messages", response_model=MessageResponse)
 async def add_message(
-    thread_id: str, message: MessageCreate, db: Session = Depends(get_threads_db)
+    thread_id: str, message: MessageCreate, db: AsyncSession = Depends(get_threads_session)
 ):
     """
     Add a message to a thread.
     """
-    import json
-    import uuid
-
-    # Verify thread exists
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
+    # The thread update doubles as the existence check and numbers the message
+    message_count = await _record_new_messages(db, thread_id, 1, message.text)
+    if message_count is None:
         raise HTTPException(status_code=404, detail="Thread not found")
 
-    # Convert widget to JSON string if present
-    widget_json = None
-    if message.widget:
-        widget_json = json.dumps(message.widget.model_dump())
-
-    # Convert origin to JSON string (required field)
-    origin_json = json.dumps([origin.model_dump() for origin in message.origin])
-
-    message_id = str(uuid.uuid4())
-    db_message = Message(
-        id=message_id,
-        thread_id=thread_id,
-        sender=message.sender,
-        origin=origin_json,
-        text=message.text,
-        widget_json=widget_json,
-    )
+    row = _message_row(thread_id, message_count, message)
+    db_message = Message(**row)
     db.add(db_message)
 
-    # Update thread's updated_at timestamp
-    thread.updated_at = datetime.now(timezone.utc)
+    await db.commit()
+    _cache_new_messages(thread_id, message_count, [row])
 
-    db.commit()
-    db.refresh(db_message)
+    logger.info(f"Added message to thread {thread_id}: {db_message.id}")
+    return _message_response(db_message)
 
-    logger.info(f"Added message to thread {thread_id}: {message_id}")
 
-    # Parse widget back for response
-    widget_data = None
-    if widget_json:
-        widget_data = json.loads(widget_json)
+@router.post("/threads/{thread_id}/messages:bulk", response_model=MessageBulkResponse)
+async def add_messages_bulk(
+    thread_id: str, bulk: MessageBulkCreate, db: AsyncSession = Depends(get_threads_session)
+):
+    """
+    Add a list of messages to a thread in one transaction, e.g. an imported conversation
+    or a multi-part agent reply. The thread update doubles as the existence check, the
+    messages go in as one executemany insert and everything is committed once.
+    """
+    messages = bulk.messages
+    message_count = await _record_new_messages(db, thread_id, len(messages), messages[-1].text)
+    if message_count is None:
+        raise HTTPException(status_code=404, detail="Thread not found")
 
-    return MessageResponse(
-        id=db_message.id,
-        thread_id=db_message.thread_id,
-        sender=db_message.sender,
-        origin=db_message.origin,  # Already a JSON string from DB
-        text=db_message.text,
-        widget=widget_data,
-        created_at=db_message.created_at,
-    )
+    # The messages take the sequence numbers up to the new count, in the given order
+    first_seq = message_count - len(messages) + 1
+    rows = [_message_row(thread_id, first_seq + position, message) for position, message in enumerate(messages)]
+    await db.execute(insert(Message), rows)
+
+    await db.commit()
+    _cache_new_messages(thread_id, message_count, rows)
+
+    logger.info(f"Added {len(rows)} messages to thread {thread_id}")
+    return MessageBulkResponse(thread_id=thread_id, message_ids=[row["id"] for row in rows])
 
 
 @router.get("/threads/{thread_id}/messages", response_model=List[MessageResponse])
 async def get_messages(
     thread_id: str,
-    limit: int = 100,
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     offset: int = 0,
-    db: Session = Depends(get_threads_db)):
+    cursor: Optional[str] = None,
+    include_widgets: bool = True,
+    db: AsyncSession = Depends(get_threads_session)):
     """
-    Get all messages for a specific thread.
+    Get a page of messages for a specific thread, oldest first.
+    The X-Next-Cursor header carries the cursor of the next page; passing it as cursor reads
+    the page straight from the (thread_id, seq) index, where a deep offset has to skip
+    every earlier message. include_widgets=false leaves out the widget definitions.
     """
-    import json
-
     # Verify thread exists
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread not found")
-
-    messages = (
-        db.query(Message)
-        .filter(Message.thread_id == thread_id)
-        .order_by(Message.created_at.asc())
-        .limit(limit)
-        .offset(offset)
-        .all()
-    )
-
-    # Parse widget JSON for each message
-    message_responses = []
-    for msg in messages:
-        widget_data = None
-        if msg.widget_json:
-            try:
-                widget_data = json.loads(msg.widget_json)
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse widget JSON for message {msg.id}")
-
-        message_responses.append(
-            MessageResponse(
-                id=msg.id,
-                thread_id=msg.thread_id,
-                sender=msg.sender,
-                origin=msg.origin,  # Already a JSON string from DB
-                text=msg.text,
-                widget=widget_data,
-                created_at=msg.created_at,
-            )
-        )
+    await _get_thread_or_404(db, thread_id)
+
+    query = _select_messages(thread_id, include_widgets)
+    if cursor:
+        query = query.where(_after_cursor(Message.seq, Message.id, cursor, descending=False))
+    elif offset:
+        query = query.offset(offset)
+    messages, next_cursor = _split_page((await db.execute(query.limit(limit + 1))).all(), limit, "seq")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    message_responses = [_message_response(msg) for msg in messages]
 
     logger.info(f"Retrieved {len(message_responses)} messages for thread {thread_id}")
     return message_responses
@@ -371,7 +538,7 @@ async def get_messages(
 async def get_chat_context(
     thread_id: str,
     max_history: Optional[int] = None,
-    db: Session = Depends(get_threads_db)):
+    db: AsyncSession = Depends(get_threads_session)):
     """
     Build chat_context from the last N messages in a thread.
 
@@ -387,82 +554,37 @@ async def get_chat_context(
         max_history = int(os.getenv('MAX_MESSAGE_HISTORY', '10'))
 
     # Verify thread exists
-    thread = db.query(Thread).filter(Thread.id == thread_id).first()
-    if not thread:
-        raise HTTPException(status_code=404, detail="Thread not found")
-
-    # Get the last N messages for the thread
-    messages = (
-        db.query(Message)
-        .filter(Message.thread_id == thread_id)
-        .order_by(Message.created_at.desc())
-        .limit(max_history)
-        .all()
-    )
-
-    # Reverse to get chronological order (oldest to newest)
-    messages = list(reversed(messages))
+    thread = await _get_thread_or_404(db, thread_id)
+
+    chat_context = CHAT_CONTEXT_CACHE.get(thread_id, thread.message_count, max_history)
+    if chat_context is None:
+        # Read a whole cache window so later turns, and other history lengths, are served from it.
+        # The count comes from the same statement, so the window is stamped with the state it was read at.
+        current_count = select(Thread.message_count).where(Thread.id == thread_id).scalar_subquery()
+        rows = (
+            await db.execute(
+                select(Message.id, Message.sender, Message.origin, Message.text, current_count.label("message_count"))
+                .where(Message.thread_id == thread_id)
+                .order_by(Message.seq.desc(), Message.id.desc())
+                .limit(max(max_history, CHAT_CONTEXT_CACHE.window))
+            )
+        ).all()
 
-    # If no messages, return empty chat_context
-    if not messages:
-        return {"chat_context": {"chat_histories": []}}
+        # Reverse to get chronological order (oldest to newest)
+        chat_messages = [to_chat_message(row.id, row.sender, row.origin, row.text) for row in reversed(rows)]
+        if max_history <= CHAT_CONTEXT_CACHE.window:
+            CHAT_CONTEXT_CACHE.store(thread_id, rows[0].message_count if rows else 0, chat_messages)
+        chat_context = build_chat_context(chat_messages[-max_history:] if max_history > 0 else [])
 
-    # Parse origin from the first message to use as chat_history origin
-    first_origin = []
-    if messages[0].origin:
-        try:
-            origin_data = json.loads(messages[0].origin) if isinstance(messages[0].origin, str) else messages[0].origin
-            if isinstance(origin_data, list):
-                first_origin = origin_data
-            elif isinstance(origin_data, dict):
-                first_origin = [origin_data]
-        except (json.JSONDecodeError, ValueError):
-            logger.warning(f"Could not parse origin for message {messages[0].id}")
-            first_origin = []
-
-    # Build messages array
-    chat_messages = []
-    for msg in messages:
-        # Parse origin for this message
-        msg_origin = []
-        if msg.origin:
-            try:
-                origin_data = json.loads(msg.origin) if isinstance(msg.origin, str) else msg.origin
-                if isinstance(origin_data, list):
-                    msg_origin = origin_data
-                elif isinstance(origin_data, dict):
-                    msg_origin = [origin_data]
-            except (json.JSONDecodeError, ValueError):
-                logger.warning(f"Could not parse origin for message {msg.id}")
-                msg_origin = []
-
-        # Map sender to type (HUMAN or AI)
-        message_type = "HUMAN" if msg.sender in ["user", "HUMAN"] else "AI"
-
-        chat_messages.append({
-            "type": message_type,
-            "origin": msg_origin,
-            "text": msg.text
-        })
-
-    # Build the chat_context structure (note: no outer wrapper, this IS the chat_context)
-    chat_context = {
-        "chat_histories": [
-            {
-                "origin": first_origin,
-                "messages": chat_messages
-            }
-        ]
-    }
-
-    logger.info(f"Built chat_context for thread {thread_id} with {len(chat_messages)} messages")
+    history = chat_context["chat_histories"][0]["messages"] if chat_context["chat_histories"] else []
+    logger.info(f"Built chat_context for thread {thread_id} with {len(history)} messages")
     return {"chat_context": chat_context}
 
 
 # ==================== Theme API ====================
 
 @router.post("/themes", response_model=ThemeResponse)
-async def create_or_add_theme(theme_request: ThemeCreate, db: Session = Depends(get_threads_db)):
+async def create_or_add_theme(theme_request: ThemeCreate, db: AsyncSession = Depends(get_threads_session)):
     """
     Create or add a theme for an agent.
     If the agent already has a theme entry, updates the specified theme_type (static or dynamic).
@@ -478,7 +600,7 @@ async def create_or_add_theme(theme_request: ThemeCreate, db: Session = Depends(
         raise HTTPException(status_code=400, detail="theme_type must be 'static' or 'dynamic'")
 
     # Check if theme already exists for this agent
-    existing_theme = db.query(Theme).filter(Theme.agent_name == theme_request.agent_name).first()
+    existing_theme = await db.get(Theme, theme_request.agent_name)
 
     if existing_theme:
         # Update the specified theme type
@@ -487,9 +609,8 @@ async def create_or_add_theme(theme_request: ThemeCreate, db: Session = Depends(
         else:  # dynamic
             existing_theme.dynamic_theme = theme_request.theme_json
 
-        existing_theme.updated_at = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(existing_theme)
+        existing_theme.updated_at = utc_now()
+        await db.commit()
 
         logger.info(f"Updated {theme_request.theme_type} theme for agent: {theme_request.agent_name}")
         return existing_theme
@@ -501,15 +622,14 @@ async def create_or_add_theme(theme_request: ThemeCreate, db: Session = Depends(
             dynamic_theme=theme_request.theme_json if theme_request.theme_type == 'dynamic' else None,
         )
         db.add(new_theme)
-        db.commit()
-        db.refresh(new_theme)
+        await db.commit()
 
         logger.info(f"Created {theme_request.theme_type} theme for agent: {theme_request.agent_name}")
         return new_theme
 
 
 @router.get("/themes/{agent_name:path}", response_model=ThemeResponse)
-async def get_theme(agent_name: str, db: Session = Depends(get_threads_db)):
+async def get_theme(agent_name: str, db: AsyncSession = Depends(get_threads_session)):
     """
     Get both static and dynamic themes for an agent.
 
@@ -519,10 +639,7 @@ async def get_theme(agent_name: str, db: Session = Depends(get_threads_db)):
     Returns:
         ThemeResponse containing both static_theme and dynamic_theme (null if not set)
     """
-    theme = db.query(Theme).filter(Theme.agent_name == agent_name).first()
-
-    if not theme:
-        raise HTTPException(status_code=404, detail=f"No themes found for agent: {agent_name}")
+    theme = await _get_theme_or_404(db, agent_name)
 
     logger.info(f"Retrieved themes for agent: {agent_name}")
     return theme
@@ -532,7 +649,7 @@ async def get_theme(agent_name: str, db: Session = Depends(get_threads_db)):
 async def update_theme(
     agent_name: str,
     theme_update: ThemeUpdate,
-    db: Session = Depends(get_threads_db)
+    db: AsyncSession = Depends(get_threads_session)
 ):
     """
     Update a specific theme type (static or dynamic) for an agent.
@@ -547,10 +664,7 @@ async def update_theme(
     if theme_update.theme_type not in ['static', 'dynamic']:
         raise HTTPException(status_code=400, detail="theme_type must be 'static' or 'dynamic'")
 
-    theme = db.query(Theme).filter(Theme.agent_name == agent_name).first()
-
-    if not theme:
-        raise HTTPException(status_code=404, detail=f"No themes found for agent: {agent_name}")
+    theme = await _get_theme_or_404(db, agent_name)
 
     # Update the specified theme type
     if theme_update.theme_type == 'static':
@@ -558,9 +672,8 @@ async def update_theme(
     else:  # dynamic
         theme.dynamic_theme = theme_update.theme_json
 
-    theme.updated_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(theme)
+    theme.updated_at = utc_now()
+    await db.commit()
 
     logger.info(f"Updated {theme_update.theme_type} theme for agent: {agent_name}")
     return theme
@@ -22,13 +22,15 @@ from functools import lru_cache
 from typing import Any, Dict, Optional
 
 import aiofiles
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, WebSocket
 
 from nsflow.backend.models.editor_models import (
     AgentCreateRequest,
     AgentDuplicateRequest,
     AgentUpdateRequest,
     BaseAgentProperties,
+    BatchRequest,
+    BatchResponse,
     EdgeRequest,
     EditorState,
     NetworkConnectivity,
@@ -47,7 +49,9 @@ from nsflow.backend.models.editor_models import (
     ValidationResult,
 )
 from nsflow.backend.utils.editor.hocon_reader import IndependentHoconReader
+from nsflow.backend.utils.editor.ops_store import BatchOperationError
 from nsflow.backend.utils.editor.simple_state_registry import get_registry
+from nsflow.backend.utils.editor.state_sync import EDITOR_STATE_SYNC
 from nsflow.backend.utils.editor.toolbox_service import get_toolbox_service
 
 logger = logging.getLogger(__name__)
@@ -573,6 +577,66 @@ async def remove_edge(design_id: str, request: EdgeRequest):
         raise HTTPException(status_code=500, detail=f"Error removing edge: {str(e)}") from e
 
 
+# Batch operations
+
+
+@router.post("/networks/{design_id}/batch", response_model=BatchResponse)
+async def apply_batch(design_id: str, request: BatchRequest):
+    """
+    Apply an ordered list of operations atomically: one history entry (undone as a whole),
+    one write to the operation log and one validation. Nothing is applied if any operation fails.
+    """
+    try:
+        registry = get_registry()
+        operation_store = registry.get_operation_store(design_id)
+        if not operation_store:
+            raise HTTPException(status_code=404, detail=f"Network with design_id '{design_id}' not found")
+
+        ops = [{"op": operation.op.value, "args": operation.args} for operation in request.ops]
+        try:
+            operation_store.apply_batch(ops)
+        except BatchOperationError as e:
+            raise HTTPException(status_code=400, detail={"message": str(e), "index": e.index, "op": e.op}) from e
+
+        validation = operation_store.manager.validate_network()
+        return BatchResponse(
+            success=True,
+            applied=len(ops),
+            can_undo=operation_store.can_undo(),
+            can_redo=operation_store.can_redo(),
+            validation=validation,
+            message=f"Applied {len(ops)} operations",
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error applying batch: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error applying batch: {str(e)}") from e
+
+
+# State sync
+
+
+@router.websocket("/networks/{design_id}/sync")
+async def sync_network_state(websocket: WebSocket, design_id: str):
+    """
+    Push the network's state: a snapshot on connect, then a JSON patch (RFC 6902) per edit,
+    each with a version. ?since=<version> resumes from a version the client already holds;
+    a {"type": "resync", "since": <version>} frame recovers from a version gap.
+    """
+    manager = get_registry().get_manager(design_id)
+    if not manager:
+        await websocket.close(code=4404, reason=f"Network with design_id '{design_id}' not found")
+        return
+    await EDITOR_STATE_SYNC.serve(websocket, design_id, manager)
+
+
+@router.get("/sync/stats")
+async def get_sync_stats():
+    """Version, patch log and subscriber counters of the networks with sync clients."""
+    return EDITOR_STATE_SYNC.stats()
+
+
 # Toolbox operations
 
 
@@ -793,14 +857,10 @@ async def undo_operation(design_id: str):
 
         success = operation_store.undo()
 
-        # Get updated undo/redo status
-        history = operation_store.read_jsonl(operation_store.hist_file)
-        redo_stack = operation_store.read_jsonl(operation_store.redo_file)
-
         return UndoRedoResponse(
             success=success,
-            can_undo=len(history) > 0,
-            can_redo=len(redo_stack) > 0,
+            can_undo=operation_store.can_undo(),
+            can_redo=operation_store.can_redo(),
             message="Undo successful" if success else "Nothing to undo",
         )
     except HTTPException:
@@ -821,14 +881,10 @@ async def redo_operation(design_id: str):
 
         success = operation_store.redo()
 
-        # Get updated undo/redo status
-        history = operation_store.read_jsonl(operation_store.hist_file)
-        redo_stack = operation_store.read_jsonl(operation_store.redo_file)
-
         return UndoRedoResponse(
             success=success,
-            can_undo=len(history) > 0,
-            can_redo=len(redo_stack) > 0,
+            can_undo=operation_store.can_undo(),
+            can_redo=operation_store.can_redo(),
             message="Redo successful" if success else "Nothing to redo",
         )
     except HTTPException:
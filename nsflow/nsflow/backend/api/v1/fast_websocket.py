@@ -18,23 +18,42 @@
 """
 This is the FastAPI endpoints for streaming_chat, logs, connectivity & function
 For now, we have separate end-points for OpenAPI specs
+
+/session/{agent_name}/{session_id} multiplexes all of the per-channel routes below over one
+socket; the per-channel routes remain for existing clients and share the same channels.
 """
 
 from fastapi import APIRouter, WebSocket
 
 from nsflow.backend.trust.rai_service import RaiService
-from nsflow.backend.utils.agentutils.ns_websocket_utils import NsWebsocketUtils
+from nsflow.backend.utils.agentutils.ns_websocket_utils import CHAT_MODE_FINAL, NsWebsocketUtils
+from nsflow.backend.utils.agentutils.session_multiplexer import SessionMultiplexer
 from nsflow.backend.utils.logutils.websocket_logs_registry import LogsRegistry
 
 router = APIRouter(prefix="/api/v1/ws")
 
 
+@router.websocket("/session/{agent_name:path}/{session_id}")
+async def websocket_session(websocket: WebSocket, agent_name: str, session_id: str):
+    """
+    Multiplexed WebSocket route: chat, logs, internal chat, sly_data, progress and sustainability
+    as channel-tagged frames. Optional ?channels=logs,progress limits the initial subscription.
+    """
+    channels = websocket.query_params.get("channels")
+    multiplexer = SessionMultiplexer(agent_name, session_id, websocket)
+    await multiplexer.run(channels.split(",") if channels else None)
+
+
 # If we want to use StreamingInputProcessor:
 @router.websocket("/chat/{agent_name:path}/{session_id}")
 async def websocket_chat(websocket: WebSocket, agent_name: str, session_id: str):
-    """WebSocket route for streaming chat communication."""
+    """
+    WebSocket route for streaming chat communication.
+    ?mode=stream forwards partial AI/AGENT messages as they arrive; the default mode=final sends one frame per turn.
+    """
     # Instantiate the service API class
-    ns_api = NsWebsocketUtils(agent_name, websocket, session_id)
+    chat_mode = websocket.query_params.get("mode", CHAT_MODE_FINAL)
+    ns_api = NsWebsocketUtils(agent_name, websocket, session_id, chat_mode)
     await ns_api.handle_user_input()
 
 
@@ -0,0 +1,181 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+"""
+Per-thread cache of the neuro-san chat messages a CRUSE chat_context is built from.
+
+Each cached thread keeps its most recent messages, already converted, in a bounded window.
+Messages added through the API are appended to the window, so building a chat_context on
+each turn costs the requested history rather than a query and re-parse of it. Entries are
+stamped with the thread's message_count: a thread that gained messages elsewhere (another
+worker) no longer matches its stamp and is reloaded. Deleting a thread drops its entry.
+"""
+
+import json
+import logging
+import os
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Threads kept before the least recently used is dropped
+CHAT_CONTEXT_CACHE_THREADS = int(os.getenv("NSFLOW_CHAT_CONTEXT_CACHE_THREADS", "256"))
+# Most recent messages kept per thread; larger max_history requests bypass the cache
+CHAT_CONTEXT_CACHE_WINDOW = int(os.getenv("NSFLOW_CHAT_CONTEXT_CACHE_WINDOW", "100"))
+
+
+def parse_origin(origin: Any, message_id: str) -> List[Any]:
+    """The origin of a stored message as a list, tolerating dicts and malformed JSON."""
+    if not origin:
+        return []
+    try:
+        origin_data = json.loads(origin) if isinstance(origin, str) else origin
+    except (json.JSONDecodeError, ValueError):
+        logger.warning(f"Could not parse origin for message {message_id}")
+        return []
+    if isinstance(origin_data, list):
+        return origin_data
+    if isinstance(origin_data, dict):
+        return [origin_data]
+    return []
+
+
+def to_chat_message(message_id: str, sender: str, origin: Any, text: str) -> Dict[str, Any]:
+    """Convert a stored message to a chat_context message, mapping the sender to HUMAN or AI."""
+    return {
+        "type": "HUMAN" if sender in ["user", "HUMAN"] else "AI",
+        "origin": parse_origin(origin, message_id),
+        "text": text,
+    }
+
+
+def build_chat_context(chat_messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    The chat_context for messages in chronological order (no outer wrapper, this IS the chat_context).
+    The first message's origin is used as the chat_history origin.
+    """
+    if not chat_messages:
+        return {"chat_histories": []}
+    return {"chat_histories": [{"origin": chat_messages[0]["origin"], "messages": chat_messages}]}
+
+
+@dataclass
+class ThreadWindow:
+    """The most recent converted messages of a thread and the message_count they match."""
+
+    message_count: int
+    messages: Deque[Dict[str, Any]] = field(default_factory=deque)
+
+    def serves(self, max_history: int) -> bool:
+        """Whether the window holds the last max_history messages of the thread."""
+        return len(self.messages) >= min(max_history, self.message_count)
+
+
+class ChatContextCache:
+    """
+    Bounded LRU of thread windows, used from the event loop only.
+    """
+
+    def __init__(self, max_threads: int = CHAT_CONTEXT_CACHE_THREADS, window: int = CHAT_CONTEXT_CACHE_WINDOW):
+        """
+        :param max_threads: Maximum number of threads kept before the least recently used is evicted.
+        :param window: Maximum number of recent messages kept per thread.
+        """
+        self.max_threads = max_threads
+        self.window = window
+        self._threads: "OrderedDict[str, ThreadWindow]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, thread_id: str, message_count: int, max_history: int) -> Optional[Dict[str, Any]]:
+        """
+        The chat_context of the last max_history messages if the cached window is current and holds them.
+        :param thread_id: The thread ID.
+        :param message_count: The thread's current message_count.
+        :param max_history: Maximum number of messages to include.
+        :return: The chat_context, or None on a miss.
+        """
+        entry = self._threads.get(thread_id)
+        if entry is not None and entry.message_count != message_count:
+            del self._threads[thread_id]
+            self.invalidations += 1
+            entry = None
+        if entry is None or max_history > self.window or not entry.serves(max_history):
+            self.misses += 1
+            return None
+        self._threads.move_to_end(thread_id)
+        self.hits += 1
+        messages = list(entry.messages)
+        return build_chat_context(messages[-max_history:] if max_history > 0 else [])
+
+    def store(self, thread_id: str, message_count: int, chat_messages: Iterable[Dict[str, Any]]):
+        """
+        Cache the most recent messages of a thread.
+        :param thread_id: The thread ID.
+        :param message_count: The thread's message_count the messages were read at.
+        :param chat_messages: Its last messages, oldest first, at least the window's worth if it has that many.
+        """
+        self._threads[thread_id] = ThreadWindow(message_count, deque(chat_messages, maxlen=self.window))
+        self._threads.move_to_end(thread_id)
+        while len(self._threads) > self.max_threads:
+            self._threads.popitem(last=False)
+            self.evictions += 1
+
+    def append(self, thread_id: str, message_count: int, chat_messages: List[Dict[str, Any]]):
+        """
+        Add newly stored messages to a cached thread.
+        :param thread_id: The thread ID.
+        :param message_count: The thread's message_count including the new messages.
+        :param chat_messages: The new messages, oldest first.
+        """
+        entry = self._threads.get(thread_id)
+        if entry is None:
+            return
+        if entry.message_count + len(chat_messages) != message_count:
+            # Messages were added elsewhere in between, or the window was reloaded with these already in it
+            self.invalidate(thread_id)
+            return
+        entry.messages.extend(chat_messages)
+        entry.message_count = message_count
+
+    def invalidate(self, thread_id: Optional[str] = None):
+        """Drop one thread, or everything when no thread ID is given."""
+        if thread_id is None:
+            self.invalidations += len(self._threads)
+            self._threads.clear()
+        elif self._threads.pop(thread_id, None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "threads": len(self._threads),
+            "max_threads": self.max_threads,
+            "window": self.window,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+CHAT_CONTEXT_CACHE = ChatContextCache()
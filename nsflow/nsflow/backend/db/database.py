@@ -15,8 +15,10 @@
 # END COPYRIGHT
 
 import os
+from typing import AsyncIterator
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 
@@ -26,6 +28,17 @@ Base = declarative_base()
 # Supports both SQLite (default) and PostgreSQL
 THREADS_DB_TYPE = os.getenv("THREADS_DB_TYPE", "sqlite").lower()
 THREADS_DB_URL = None
+# The endpoints use an async engine on the same database: aiosqlite for SQLite, asyncpg for PostgreSQL
+THREADS_DB_ASYNC_URL = None
+
+# Connection pool of the async engine
+THREADS_DB_POOL_SIZE = int(os.getenv("THREADS_DB_POOL_SIZE", "5"))
+THREADS_DB_MAX_OVERFLOW = int(os.getenv("THREADS_DB_MAX_OVERFLOW", "10"))
+THREADS_DB_POOL_TIMEOUT = float(os.getenv("THREADS_DB_POOL_TIMEOUT", "30"))
+# How long an SQLite connection waits for a competing writer's lock before failing with "database is locked"
+THREADS_DB_BUSY_TIMEOUT_MS = int(os.getenv("THREADS_DB_BUSY_TIMEOUT_MS", "5000"))
+# Length of the last-message preview kept on each thread
+THREADS_MESSAGE_PREVIEW_CHARS = int(os.getenv("THREADS_MESSAGE_PREVIEW_CHARS", "120"))
 
 if THREADS_DB_TYPE == "postgresql":
     # PostgreSQL configuration
@@ -35,34 +48,60 @@ if THREADS_DB_TYPE == "postgresql":
     THREADS_DB_USER = os.getenv("THREADS_DB_USER", "postgres")
     THREADS_DB_PASSWORD = os.getenv("THREADS_DB_PASSWORD", "postgres")
     THREADS_DB_URL = f"postgresql://{THREADS_DB_USER}:{THREADS_DB_PASSWORD}@{THREADS_DB_HOST}:{THREADS_DB_PORT}/{THREADS_DB_NAME}"
+    THREADS_DB_ASYNC_URL = THREADS_DB_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 else:
     # SQLite configuration (default)
     THREADS_DB_PATH = os.getenv("THREADS_DB_PATH", "./cruse_threads.db")
     THREADS_DB_URL = f"sqlite:///{THREADS_DB_PATH}"
+    THREADS_DB_ASYNC_URL = f"sqlite+aiosqlite:///{THREADS_DB_PATH}"
+
+
+def set_sqlite_pragma(dbapi_conn, connection_record):
+    """
+    Configure each new SQLite connection: foreign keys (required for CASCADE DELETE), WAL so readers
+    do not wait for the writer, and a busy timeout so concurrent writers queue instead of failing.
+    """
+    _ = connection_record  # Unused
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # NORMAL is durable across application crashes in WAL mode and avoids an fsync per commit
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={THREADS_DB_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
 
 # Create threads engine and session
 if THREADS_DB_URL:
     threads_engine_args = {"connect_args": {"check_same_thread": False}} if THREADS_DB_TYPE == "sqlite" else {}
     threads_engine = create_engine(THREADS_DB_URL, **threads_engine_args)
 
-    # Enable foreign key constraints for SQLite (required for CASCADE DELETE)
+    threads_async_engine = create_async_engine(
+        THREADS_DB_ASYNC_URL,
+        pool_size=THREADS_DB_POOL_SIZE,
+        max_overflow=THREADS_DB_MAX_OVERFLOW,
+        pool_timeout=THREADS_DB_POOL_TIMEOUT,
+        pool_pre_ping=THREADS_DB_TYPE == "postgresql",
+    )
+
     if THREADS_DB_TYPE == "sqlite":
-        @event.listens_for(threads_engine, "connect")
-        def set_sqlite_pragma(dbapi_conn, connection_record):
-            _ = connection_record  # Unused
-            cursor = dbapi_conn.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
-            cursor.close()
+        event.listen(threads_engine, "connect", set_sqlite_pragma)
+        event.listen(threads_async_engine.sync_engine, "connect", set_sqlite_pragma)
 
     ThreadsSessionLocal = sessionmaker(bind=threads_engine, autocommit=False, autoflush=False)
+    # expire_on_commit=False: attributes stay loaded after commit, an async session cannot lazy-load them
+    ThreadsAsyncSessionLocal = async_sessionmaker(threads_async_engine, autoflush=False, expire_on_commit=False)
 else:
     threads_engine = None
+    threads_async_engine = None
     ThreadsSessionLocal = None
+    ThreadsAsyncSessionLocal = None
 
 
 def get_threads_db():
     """
-    Dependency function for FastAPI endpoints to get a threads database session.
+    Dependency function for synchronous callers to get a threads database session.
+    Blocks the calling thread on every query; async endpoints use get_threads_session instead.
     Usage: db: Session = Depends(get_threads_db)
     """
     if ThreadsSessionLocal is None:
@@ -74,6 +113,18 @@ def get_threads_db():
         db.close()
 
 
+async def get_threads_session() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency function for async FastAPI endpoints to get a threads database session.
+    Queries run without blocking the event loop.
+    Usage: db: AsyncSession = Depends(get_threads_session)
+    """
+    if ThreadsAsyncSessionLocal is None:
+        raise RuntimeError("Threads database is not configured")
+    async with ThreadsAsyncSessionLocal() as db:
+        yield db
+
+
 def init_threads_db():
     """
     Initialize threads database tables.
@@ -82,3 +133,53 @@ def init_threads_db():
     if threads_engine is None:
         raise RuntimeError("Threads database engine is not configured")
     Base.metadata.create_all(bind=threads_engine)
+    upgrade_threads_schema()
+
+
+def upgrade_threads_schema():
+    """
+    Add the thread summary columns, the message sequence numbers and their indexes to a database
+    created before them; create_all() only creates missing tables. The new columns are filled from the messages.
+    """
+    columns = {column["name"] for column in inspect(threads_engine).get_columns("threads")}
+    message_columns = {column["name"] for column in inspect(threads_engine).get_columns("messages")}
+    with threads_engine.begin() as connection:
+        if "message_count" not in columns:
+            connection.execute(text("ALTER TABLE threads ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0"))
+            connection.execute(
+                text(
+                    "UPDATE threads SET message_count = "
+                    "(SELECT COUNT(*) FROM messages WHERE messages.thread_id = threads.id)"
+                )
+            )
+        if "last_message_preview" not in columns:
+            connection.execute(text("ALTER TABLE threads ADD COLUMN last_message_preview VARCHAR"))
+            connection.execute(
+                text(
+                    "UPDATE threads SET last_message_preview = "
+                    "(SELECT substr(messages.text, 1, :chars) FROM messages WHERE messages.thread_id = threads.id "
+                    "ORDER BY messages.created_at DESC, messages.id DESC LIMIT 1)"
+                ),
+                {"chars": THREADS_MESSAGE_PREVIEW_CHARS},
+            )
+        if "seq" not in message_columns:
+            connection.execute(text("ALTER TABLE messages ADD COLUMN seq INTEGER"))
+            # Number the messages of each thread in the (created_at, id) order they were listed in before
+            connection.execute(
+                text(
+                    "UPDATE messages SET seq = (SELECT COUNT(*) FROM messages AS earlier "
+                    "WHERE earlier.thread_id = messages.thread_id AND (earlier.created_at < messages.created_at "
+                    "OR (earlier.created_at = messages.created_at AND earlier.id <= messages.id)))"
+                )
+            )
+        connection.execute(text("CREATE INDEX IF NOT EXISTS idx_threads_updated_id ON threads (updated_at, id)"))
+        connection.execute(text("CREATE INDEX IF NOT EXISTS idx_messages_thread_seq ON messages (thread_id, seq)"))
+
+
+async def dispose_threads_db():
+    """
+    Close the pooled connections of the async threads engine.
+    Should be called on application shutdown.
+    """
+    if threads_async_engine is not None:
+        await threads_async_engine.dispose()
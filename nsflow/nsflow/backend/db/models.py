@@ -17,14 +17,17 @@
 from datetime import datetime
 from datetime import timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, JSON, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text
 
 from nsflow.backend.db.database import Base
 
 
-def _get_utc_now():
-    """Helper function to get current UTC time for SQLAlchemy defaults."""
-    return datetime.now(timezone.utc)
+def utc_now() -> datetime:
+    """
+    Current UTC time for the timestamp columns. The columns are TIMESTAMP WITHOUT TIME ZONE,
+    so the time is naive: asyncpg rejects timezone-aware values for them.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 # CRUSE (Context-Reactice User Experience) Models
@@ -36,8 +39,8 @@ class Theme(Base):
     agent_name = Column(String, primary_key=True, index=True)
     static_theme = Column(JSON, nullable=True)  # JSON string containing static theme definition
     dynamic_theme = Column(JSON, nullable=True)  # JSON string containing dynamic theme definition
-    created_at = Column(DateTime, default=_get_utc_now)
-    updated_at = Column(DateTime, default=_get_utc_now, onupdate=_get_utc_now)
+    created_at = Column(DateTime, default=utc_now)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
 
 
 class Thread(Base):
@@ -49,8 +52,11 @@ class Thread(Base):
     id = Column(String, primary_key=True, index=True)
     title = Column(String, nullable=False)
     agent_name = Column(String, nullable=True)
-    created_at = Column(DateTime, default=_get_utc_now)
-    updated_at = Column(DateTime, default=_get_utc_now, onupdate=_get_utc_now)
+    created_at = Column(DateTime, default=utc_now)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+    # Kept up to date when messages are added, so listings need not read the messages table
+    message_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_message_preview = Column(String, nullable=True)
 
 
 class Message(Base):
@@ -65,6 +71,13 @@ class Message(Base):
     origin = Column(Text, nullable=False)
     text = Column(Text, nullable=False)
     widget_json = Column(JSON, nullable=True)  # JSON string containing widget schema
-    created_at = Column(DateTime, default=_get_utc_now, index=True)
+    created_at = Column(DateTime, default=utc_now, index=True)
+    # Position of the message in its thread, from 1: the thread's message_count once it was added.
+    # Messages are ordered by it, as messages added in one transaction share their timestamps.
+    seq = Column(Integer, nullable=True)
 
 Index("idx_messages_thread_created", Message.thread_id, Message.created_at)
+# Keyset pagination of a thread's messages, in the order they were added
+Index("idx_messages_thread_seq", Message.thread_id, Message.seq)
+# Keyset pagination of the thread list, most recently updated first
+Index("idx_threads_updated_id", Thread.updated_at, Thread.id)
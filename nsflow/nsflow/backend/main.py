@@ -13,6 +13,7 @@
 # limitations under the License.
 #
 # END COPYRIGHT
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -24,7 +25,8 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
 from nsflow.backend.api.router import router
-from nsflow.backend.db.database import init_threads_db
+from nsflow.backend.db.database import dispose_threads_db, init_threads_db
+from nsflow.backend.utils.agentutils.session_registry import SESSION_REGISTRY
 from nsflow.backend.utils.tools.ns_configs_registry import NsConfigsRegistry
 
 # Get configurations from the environment
@@ -74,10 +76,13 @@ async def lifespan(_app: FastAPI):
     logging.info("Initializing threads database...")
     init_threads_db()
     logging.info("Threads database initialized successfully")
+    session_sweeper = asyncio.create_task(SESSION_REGISTRY.sweep_periodically())
     try:
         yield
     finally:
         logging.info("FastAPI is shutting down...")
+        session_sweeper.cancel()
+        await dispose_threads_db()
 
 
 # Initialize FastAPI app with lifespan event
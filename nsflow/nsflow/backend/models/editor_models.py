@@ -408,6 +408,47 @@ class UndoRedoResponse(BaseModel):
     message: str = Field(..., description="Result message")
 
 
+class BatchOperationType(str, Enum):
+    """Operations accepted in a batch, as recorded in the operation log"""
+
+    SET_NETWORK_NAME = "set_network_name"
+    UPDATE_NETWORK_STATE = "update_network_state"
+    UPDATE_TOP_LEVEL_CONFIG = "update_top_level_config"
+    ADD_AGENT = "add_agent"
+    CREATE_AGENT_WITH_PARENT = "create_agent_with_parent"
+    ADD_TOOLBOX_AGENT = "add_toolbox_agent"
+    CREATE_TOOLBOX_AGENT_WITH_PARENT = "create_toolbox_agent_with_parent"
+    DELETE_AGENT = "delete_agent"
+    UPDATE_AGENT = "update_agent"
+    DUPLICATE_AGENT = "duplicate_agent"
+    ADD_EDGE = "add_edge"
+    REMOVE_EDGE = "remove_edge"
+
+
+class BatchOperation(BaseModel):
+    """One operation of a batch, e.g. {"op": "add_edge", "args": {"src": "a", "dst": "b"}}"""
+
+    op: BatchOperationType = Field(..., description="Operation name")
+    args: Dict[str, Any] = Field(default_factory=dict, description="Operation arguments")
+
+
+class BatchRequest(BaseModel):
+    """Ordered operations applied atomically as a single undoable step"""
+
+    ops: List[BatchOperation] = Field(..., min_length=1, description="Operations, applied in order")
+
+
+class BatchResponse(BaseModel):
+    """Response for a batch of operations"""
+
+    success: bool = Field(..., description="Whether the batch was applied")
+    applied: int = Field(..., description="Number of operations applied")
+    can_undo: bool = Field(..., description="Whether undo is available")
+    can_redo: bool = Field(..., description="Whether redo is available")
+    validation: ValidationResult = Field(..., description="Validation of the network after the batch")
+    message: str = Field(..., description="Result message")
+
+
 # NetworkConnectivity is used by legacy endpoints
 class NetworkConnectivity(BaseModel):
     """Model for network connectivity information"""
@@ -14,14 +14,15 @@
 #
 # END COPYRIGHT
 
-import asyncio
-import json
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict
 
-from fastapi import WebSocket, WebSocketDisconnect
+from fastapi import WebSocket
 
 from nsflow.backend.trust.sustainability_calculator import SustainabilityCalculator
+from nsflow.backend.utils.agentutils.session_registry import SESSION_REGISTRY, SessionRecord, approx_size
+from nsflow.backend.utils.logutils.websocket_logs_manager import SUBSCRIBER_QUEUE_SIZE
+from nsflow.backend.utils.logutils.websocket_pubsub import Channel, OverflowPolicy
 
 
 class RaiService:
@@ -35,14 +36,15 @@ class RaiService:
 
     def __init__(self):
         """Initialize the RAI service with default metrics and connection management."""
-        # Dictionary mapping session_id to list of WebSocket connections
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+        # Dictionary mapping session_id to the channel its metrics clients subscribe to
+        self.channels: Dict[str, Channel] = {}
         # Dictionary mapping session_id to current metrics
         self.session_metrics: Dict[str, Dict[str, str]] = {}
         self.calculator = SustainabilityCalculator()
         # Turning off some of the logs in this class to reduce terminal noise
         self.logger = logging.getLogger(self.__class__.__name__)
         self.current_metrics = self._get_default_metrics("unknown")
+        SESSION_REGISTRY.register_owner("session_metrics", self.evict_session, self.session_bytes)
 
     @classmethod
     def get_instance(cls):
@@ -152,6 +154,77 @@ class RaiService:
                 "cost": "$0.00",
             }  # Return default metrics on error
 
+    def get_channel(self, session_id: str = "global") -> Channel:
+        """
+        Get or create the metrics channel for a session.
+
+        Args:
+            session_id: The unique session identifier for this user connection
+
+        Returns:
+            The session's Channel; each client only needs the newest metrics, so updates coalesce
+        """
+        if session_id not in self.channels:
+            self.channels[session_id] = Channel("sustainability", SUBSCRIBER_QUEUE_SIZE, OverflowPolicy.COALESCE)
+        return self.channels[session_id]
+
+    def subscribe(self, websocket: WebSocket, session_id: str = "global", tagged: bool = False):
+        """
+        Subscribe an accepted WebSocket to a session's metrics and queue the current metrics for it.
+
+        Args:
+            websocket: The connected WebSocket instance
+            session_id: The unique session identifier for this user connection
+            tagged: Send channel-tagged frames (multiplexed session sockets)
+        """
+        channel = self.get_channel(session_id)
+        channel.subscribe(websocket, tagged)
+        session_metrics = self.session_metrics.get(session_id)
+        if session_metrics and isinstance(session_metrics, dict):
+            channel.send_to(websocket, session_metrics)
+
+    def unsubscribe(self, websocket: WebSocket, session_id: str = "global"):
+        """
+        Remove a WebSocket from a session's metrics, dropping the channel once nobody listens.
+
+        Args:
+            websocket: The WebSocket to remove
+            session_id: The unique session identifier for this user connection
+        """
+        channel = self.channels.get(session_id)
+        if channel is None:
+            return
+        channel.unsubscribe(websocket)
+        if not channel.subscribers:
+            del self.channels[session_id]
+
+    def evict_session(self, record: SessionRecord):
+        """
+        Drop the metrics of a session evicted by the session registry.
+
+        Args:
+            record: The evicted session
+        """
+        # Metrics are keyed by session id alone; keep them while another agent still uses the id
+        if SESSION_REGISTRY.has_session_id(record.session_id):
+            return
+        self.session_metrics.pop(record.session_id, None)
+        channel = self.channels.get(record.session_id)
+        if channel is not None and not channel.subscribers:
+            del self.channels[record.session_id]
+
+    def session_bytes(self, record: SessionRecord) -> int:
+        """
+        Approximate size of a session's metrics.
+
+        Args:
+            record: A live session
+
+        Returns:
+            Bytes held for the session
+        """
+        return approx_size(self.session_metrics.get(record.session_id))
+
     async def handle_websocket(self, websocket: WebSocket, agent_name: str = "ollama", session_id: str = "global"):
         """
         Handle a new WebSocket connection for real-time sustainability metrics.
@@ -162,41 +235,12 @@ class RaiService:
             session_id: The unique session identifier for this user connection
         """
         await websocket.accept()
-
-        # Initialize session connections list if not exists
-        if session_id not in self.active_connections:
-            self.active_connections[session_id] = []
-
-        self.active_connections[session_id].append(websocket)
-        # self.logger.info(f"New sustainability metrics WebSocket client connected for session: {session_id}")
-
-        # Send current metrics immediately upon connection
+        self.subscribe(websocket, session_id)
         try:
-            # Get session-specific metrics or defaults
-            session_metrics = self.session_metrics.get(session_id)
-            if session_metrics and isinstance(session_metrics, dict):
-                await websocket.send_text(json.dumps(session_metrics))
-        except Exception as e:
-            self.logger.error(f"Error sending initial metrics: {e}")
-
-        try:
-            # Keep connection alive and handle any incoming messages
-            while True:
-                await asyncio.sleep(1)
-        except WebSocketDisconnect:
-            if session_id in self.active_connections and websocket in self.active_connections[session_id]:
-                self.active_connections[session_id].remove(websocket)
-                # Clean up empty session lists
-                if not self.active_connections[session_id]:
-                    del self.active_connections[session_id]
-            # self.logger.info(f"Sustainability metrics WebSocket client disconnected for session: {session_id}")
-        except Exception as e:
-            self.logger.error(f"WebSocket error: {e}")
-            if session_id in self.active_connections and websocket in self.active_connections[session_id]:
-                self.active_connections[session_id].remove(websocket)
-                # Clean up empty session lists
-                if not self.active_connections[session_id]:
-                    del self.active_connections[session_id]
+            with SESSION_REGISTRY.attached(agent_name, session_id):
+                await self.get_channel(session_id).wait_for_disconnect(websocket)
+        finally:
+            self.unsubscribe(websocket, session_id)
 
     async def update_metrics_from_token_accounting(
         self, token_accounting: Dict[str, Any], agent_name: str = "ollama", session_id: str = "global"
@@ -216,6 +260,7 @@ class RaiService:
             new_metrics = self._calculate_metrics_from_token_accounting(token_accounting, agent_name)
 
             # Store metrics for this session
+            SESSION_REGISTRY.touch(agent_name, session_id)
             self.session_metrics[session_id] = new_metrics
 
             # Also update global current_metrics for backward compatibility
@@ -234,37 +279,14 @@ class RaiService:
         Broadcast current sustainability metrics to all connected WebSocket clients for a specific session.
 
         Args:
-            session_id: The session to broadcast to. If not provided, broadcasts to all sessions.
+            session_id: The session to broadcast to.
         """
-        if session_id not in self.active_connections or not self.active_connections[session_id]:
+        channel = self.channels.get(session_id)
+        if channel is None or not channel.subscribers:
             return
 
         # Get session-specific metrics
-        metrics = self.session_metrics.get(session_id, self.current_metrics)
-        message = json.dumps(metrics)
-        disconnected_clients = []
-
-        for websocket in self.active_connections[session_id]:
-            try:
-                await websocket.send_text(message)
-            except WebSocketDisconnect:
-                disconnected_clients.append(websocket)
-            except Exception as e:
-                self.logger.error(f"Error broadcasting to WebSocket client: {e}")
-                disconnected_clients.append(websocket)
-
-        # Remove disconnected clients
-        for websocket in disconnected_clients:
-            self.active_connections[session_id].remove(websocket)
-
-        # Clean up empty session lists
-        if not self.active_connections[session_id]:
-            del self.active_connections[session_id]
-
-        if disconnected_clients:
-            self.logger.info(
-                f"Removed {len(disconnected_clients)} disconnected WebSocket clients from session {session_id}"
-            )
+        channel.publish(self.session_metrics.get(session_id, self.current_metrics))
 
     def get_current_metrics(self) -> Dict[str, str]:
         """
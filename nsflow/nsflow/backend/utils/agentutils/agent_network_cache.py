@@ -0,0 +1,164 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Matches `include "x"`, `include file("x")`, `include required("x")` and `include required(file("x"))`
+INCLUDE_PATTERN = re.compile(r'^\s*include\s+(?:required\s*\(\s*)?(?:file\s*\(\s*)?"([^"]+)"', re.MULTILINE)
+
+# (path, mtime_ns, size); mtime_ns and size are None when the path does not exist
+FileStamp = Tuple[str, Optional[int], Optional[int]]
+
+
+@dataclass
+class CacheEntry:
+    """A resolved network together with the stamps of every file it was built from."""
+
+    value: Any
+    stamps: List[FileStamp]
+
+
+class AgentNetworkCache:
+    """
+    Bounded LRU of resolved agent networks, keyed by the file path and validated against
+    the (mtime, size) of the file and of every HOCON file it pulls in through `include`.
+    Editing a shared include such as registries/aaosa.hocon therefore invalidates every
+    network that includes it, without having to know the dependents up front.
+    """
+
+    def __init__(self, max_entries: int = 128, search_dirs: Optional[List[str]] = None):
+        """
+        :param max_entries: Maximum number of networks kept before the least recently used is evicted.
+        :param search_dirs: Extra directories include paths are resolved against, in addition to
+                            the including file's directory and the working directory.
+        """
+        self.max_entries = max_entries
+        self.search_dirs = list(search_dirs or [])
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def stamp(path: str) -> FileStamp:
+        """Returns the (path, mtime_ns, size) stamp for a file, tolerating missing files."""
+        try:
+            stat = os.stat(path)
+            return (path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return (path, None, None)
+
+    def include_candidates(self, file_path: str, include: str) -> List[str]:
+        """
+        Returns every location an include could resolve to. Which one pyhocon picks depends on
+        the basedir used by the caller, so all of them are tracked (missing ones included, so a
+        file appearing later is noticed too).
+        """
+        if os.path.isabs(include):
+            return [include]
+        bases = [os.path.dirname(file_path), os.getcwd()] + self.search_dirs
+        candidates = []
+        for base in bases:
+            candidate = os.path.normpath(os.path.join(base, include))
+            if candidate not in candidates:
+                candidates.append(candidate)
+        return candidates
+
+    def collect_stamps(self, file_path: str) -> List[FileStamp]:
+        """Stamps the file and, recursively, every file reachable through its includes."""
+        stamps: List[FileStamp] = []
+        seen = set()
+        pending = [os.path.normpath(file_path)]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            file_stamp = self.stamp(path)
+            stamps.append(file_stamp)
+            if file_stamp[1] is None:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as hocon_file:
+                    content = hocon_file.read()
+            except (OSError, UnicodeDecodeError) as exc:
+                logging.debug("Could not scan %s for includes: %s", path, exc)
+                continue
+            for include in INCLUDE_PATTERN.findall(content):
+                pending.extend(self.include_candidates(path, include))
+        return stamps
+
+    def _is_current(self, entry: CacheEntry) -> bool:
+        return all(self.stamp(path) == (path, mtime, size) for path, mtime, size in entry.stamps)
+
+    def get(self, file_path: str, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for file_path if neither it nor any of its includes changed,
+        otherwise calls loader() and caches its result.
+        """
+        key = os.path.normpath(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_current(entry):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+
+        # Stamp before loading so an edit that lands mid-parse is picked up on the next call.
+        stamps = self.collect_stamps(key)
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = CacheEntry(value=value, stamps=stamps)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, file_path: Optional[str] = None):
+        """Drops one network, or everything when no path is given."""
+        with self._lock:
+            if file_path is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+            elif self._entries.pop(os.path.normpath(file_path), None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
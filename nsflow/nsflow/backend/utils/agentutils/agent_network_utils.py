@@ -24,7 +24,9 @@ from fastapi import HTTPException
 from neuro_san.internals.graph.persistence.agent_network_restorer import AgentNetworkRestorer
 from neuro_san.internals.graph.registry.agent_network import AgentNetwork
 from neuro_san.session.missing_agent_check import MissingAgentCheck
-from pyhocon import ConfigFactory
+
+from nsflow.backend.utils.agentutils.agent_network_cache import AgentNetworkCache
+from nsflow.backend.utils.agentutils.registry_index import RegistryIndex, get_registry_index
 
 AGENT_MANIFEST_FILE = os.getenv("AGENT_MANIFEST_FILE")
 if not AGENT_MANIFEST_FILE:
@@ -38,6 +40,12 @@ CODED_TOOLS_DIR = os.path.join(ROOT_DIR, "coded_tools")
 FIXTURES_DIR = os.path.join(ROOT_DIR, "tests", "fixtures")
 TEST_NETWORK = os.path.join(FIXTURES_DIR, "test_network.hocon")
 
+# Shared by every AgentNetworkUtils instance so all endpoints benefit from the same parses.
+AGENT_NETWORK_CACHE = AgentNetworkCache(
+    max_entries=int(os.getenv("NSFLOW_NETWORK_CACHE_SIZE", "128")),
+    search_dirs=[REGISTRY_DIR, ROOT_DIR],
+)
+
 
 @dataclass
 class AgentData:
@@ -101,14 +109,12 @@ class AgentNetworkUtils:
         if not os.path.exists(manifest_path):
             return {"networks": []}
 
-        config = ConfigFactory.parse_file(str(manifest_path))
-        networks = [
-            os.path.splitext(os.path.basename(file))[0].replace('"', "").strip()
-            for file, enabled in config.items()
-            if enabled is True
-        ]
+        return self.get_registry_index().list_available_networks()
 
-        return {"networks": networks}
+    @staticmethod
+    def get_registry_index() -> RegistryIndex:
+        """Returns the watched dependency index of the registry behind AGENT_MANIFEST_FILE."""
+        return get_registry_index(AGENT_MANIFEST_FILE)
 
     def get_agent_network(self, agent_network_name: str) -> AgentNetwork:
         """
@@ -124,7 +130,10 @@ class AgentNetworkUtils:
         if not (agent_network_name.endswith(".hocon") or agent_network_name.endswith(".json")):
             agent_network_name = agent_network_name + ".hocon"
 
-        agent_network = self.agent_network_restorer.restore(agent_network_name)
+        network_file = os.path.join(self.registry_dir, agent_network_name)
+        agent_network = AGENT_NETWORK_CACHE.get(
+            network_file, lambda: self.agent_network_restorer.restore(agent_network_name)
+        )
 
         # Common place for nice error messages when networks are not found
         MissingAgentCheck.check_agent_network(agent_network, agent_network_name)
@@ -141,12 +150,8 @@ class AgentNetworkUtils:
         agent_details = {}
         node_lookup = {}
 
-        tools = config.get("tools", [])
-
-        # Ensure all tools have a "command" key
-        for tool in tools:
-            if "command" not in tool:
-                tool["command"] = ""
+        # Ensure all tools have a "command" key, without touching the cached network's config
+        tools = [tool if "command" in tool else {**tool, "command": ""} for tool in config.get("tools", [])]
 
         # Build lookup dictionary for agents
         for tool in tools:
@@ -164,6 +169,11 @@ class AgentNetworkUtils:
 
         return {"nodes": nodes, "edges": edges, "agent_details": agent_details}
 
+    @staticmethod
+    def get_cache_stats() -> Dict[str, Any]:
+        """Returns hit/miss statistics of the shared parsed-network cache."""
+        return AGENT_NETWORK_CACHE.stats()
+
     @staticmethod
     def is_url_like(s: str) -> bool:
         """Simple check to see if a string is URL-like."""
@@ -13,15 +13,138 @@
 # limitations under the License.
 #
 # END COPYRIGHT
+"""
+Streaming chat for the WebSocket clients without a thread-pool hop per streamed message.
+
+Sessions with an async streaming_chat are iterated directly on the event loop. Blocking
+sessions are drained by one reader thread per input processor (i.e. per user session), which
+hands each message to the loop through an asyncio.Queue, so the number of concurrent chats is
+not capped by the size of the default executor.
+"""
 
 import asyncio
+import inspect
+import queue
+import threading
 from copy import copy
-from typing import Any, Dict, Generator, Optional
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional
 
 from neuro_san.client.streaming_input_processor import StreamingInputProcessor
 from neuro_san.interfaces.agent_session import AgentSession
 from neuro_san.internals.messages.origination import Origination
 
+# Messages the reader thread may run ahead of the consumer before it waits
+STREAM_BUFFER_SIZE = 256
+
+
+@dataclass
+class _StreamFailure:
+    """Carries an exception raised by a blocking iterator over to the event loop."""
+
+    error: BaseException
+
+
+@dataclass
+class _StreamJob:
+    """One blocking stream for the reader thread to drain into an asyncio.Queue."""
+
+    open_stream: Callable[[], Iterable[Any]]
+    loop: asyncio.AbstractEventLoop
+    output: asyncio.Queue
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    window: threading.Semaphore = field(default_factory=lambda: threading.Semaphore(STREAM_BUFFER_SIZE))
+
+
+class StreamReaderThread:
+    """
+    A daemon thread that drains blocking iterators, one at a time, into asyncio queues.
+    """
+
+    _end = object()
+
+    def __init__(self, name: str = "nsflow-stream-reader"):
+        """
+        :param name: Thread name, shown in thread dumps.
+        """
+        self.name = name
+        self.jobs: "queue.Queue[Optional[_StreamJob]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.closed = False
+
+    async def iterate(self, open_stream: Callable[[], Iterable[Any]]) -> AsyncIterator[Any]:
+        """
+        Iterate a blocking stream from the event loop.
+        :param open_stream: Called on the reader thread to open the stream, so that a blocking
+                            request made when the stream is opened does not block the loop either.
+        :return: An async iterator over the stream's items; errors in the stream are re-raised here.
+        """
+        if self.closed:
+            raise RuntimeError(f"{self.name} is closed")
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+        job = _StreamJob(open_stream, asyncio.get_running_loop(), asyncio.Queue())
+        self.jobs.put(job)
+        try:
+            while True:
+                item = await job.output.get()
+                if item is self._end:
+                    return
+                if isinstance(item, _StreamFailure):
+                    raise item.error
+                job.window.release()
+                yield item
+        finally:
+            # The consumer stopped early (disconnect, cancellation): stop reading at the next item
+            job.cancelled.set()
+
+    def close(self):
+        """
+        Stop the thread once the current stream, if any, is done. Safe to call more than once.
+        """
+        if not self.closed:
+            self.closed = True
+            self.jobs.put(None)
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            self._drain(job)
+
+    def _drain(self, job: _StreamJob):
+        try:
+            iterator = iter(job.open_stream())
+            for item in iterator:
+                if not self._wait_for_room(job):
+                    close = getattr(iterator, "close", None)
+                    if close is not None:
+                        close()
+                    break
+                self._deliver(job, item)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            self._deliver(job, _StreamFailure(exc))
+        finally:
+            self._deliver(job, self._end)
+
+    @staticmethod
+    def _wait_for_room(job: _StreamJob) -> bool:
+        # Block while the consumer is STREAM_BUFFER_SIZE messages behind; False once it has gone away
+        while not job.window.acquire(timeout=0.1):
+            if job.cancelled.is_set():
+                return False
+        return not job.cancelled.is_set()
+
+    @staticmethod
+    def _deliver(job: _StreamJob, item: Any):
+        try:
+            job.loop.call_soon_threadsafe(job.output.put_nowait, item)
+        except RuntimeError:
+            # The loop is gone; nobody is waiting for the rest of the stream
+            job.cancelled.set()
+
 
 # pylint: disable=too-many-locals, useless-parent-delegation
 class AsyncStreamingInputProcessor(StreamingInputProcessor):
@@ -29,8 +152,6 @@ class AsyncStreamingInputProcessor(StreamingInputProcessor):
     Processes AgentCli input by using the neuro-san streaming API.
     """
 
-    _sentinel = object()
-
     def __init__(
         self,
         default_input: str = "",
@@ -42,11 +163,18 @@ class AsyncStreamingInputProcessor(StreamingInputProcessor):
         Constructor
         """
         super().__init__(default_input, thinking_file, session, thinking_dir)
+        self.reader = StreamReaderThread()
 
-    async def async_process_once(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    async def async_process_once(
+        self,
+        state: Dict[str, Any],
+        on_response: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
         """
         Use polling strategy to communicate with agent.
         :param state: The state dictionary to pass around
+        :param on_response: Optional coroutine function called with each streamed chat message
+                            as soon as it has been processed, e.g. to forward partial answers
         :return: An updated state dictionary
         """
         empty: Dict[str, Any] = {}
@@ -69,12 +197,13 @@ class AsyncStreamingInputProcessor(StreamingInputProcessor):
 
         return_state: Dict[str, Any] = copy(state)
         returned_sly_data: Optional[Dict[str, Any]] = None
-        chat_responses: Generator[Dict[str, Any], None, None] = self.session.streaming_chat(chat_request)
-        async for chat_response in self.async_wrap_iter(chat_responses):
+        async for chat_response in self.stream_chat(chat_request):
 
             response: Dict[str, Any] = chat_response.get("response", empty)
             # Use the async version of the message processor
             await self.processor.async_process_message(response)
+            if on_response is not None:
+                await on_response(response)
             # Optionally add sleep(0) to ensure fair scheduling
             await asyncio.sleep(0)
 
@@ -107,13 +236,19 @@ class AsyncStreamingInputProcessor(StreamingInputProcessor):
 
         return return_state
 
-    @staticmethod
-    async def async_wrap_iter(sync_iterable):
-        """Safely wraps a synchronous iterable into an async generator."""
-        iterator = iter(sync_iterable)
-        while True:
-            # Use sentinel to avoid StopIteration entirely
-            item = await asyncio.to_thread(next, iterator, AsyncStreamingInputProcessor._sentinel)
-            if item is AsyncStreamingInputProcessor._sentinel:
-                break
-            yield item
+    def stream_chat(self, chat_request: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the session's chat responses without blocking the event loop.
+        :param chat_request: The chat request dictionary.
+        :return: An async iterator of chat response dictionaries.
+        """
+        streaming_chat = self.session.streaming_chat
+        if inspect.isasyncgenfunction(streaming_chat):
+            return streaming_chat(chat_request)
+        return self.reader.iterate(lambda: streaming_chat(chat_request))
+
+    def close(self):
+        """
+        Release the session's reader thread.
+        """
+        self.reader.close()
@@ -19,17 +19,28 @@ import json
 import logging
 import os
 import tempfile
+import time
 import uuid
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from fastapi import WebSocket, WebSocketDisconnect
 from neuro_san.client.agent_session_factory import AgentSessionFactory
+from neuro_san.internals.messages.chat_message_type import ChatMessageType
 
 from nsflow.backend.utils.agentutils.agent_log_processor import AgentLogProcessor
 from nsflow.backend.utils.agentutils.async_streaming_input_processor import AsyncStreamingInputProcessor
+from nsflow.backend.utils.agentutils.session_registry import SESSION_REGISTRY, SessionRecord, approx_size
 from nsflow.backend.utils.logutils.websocket_logs_registry import LogsRegistry
 from nsflow.backend.utils.tools.ns_configs_registry import NsConfigsRegistry
 
+# Chat modes a client can ask for, with ?mode= on the chat socket or "mode" in a chat frame.
+# "final" sends one AI frame per turn (the default and previous behaviour); "stream" also
+# forwards AI and AGENT messages as they arrive, marked "partial", and marks the last frame "final".
+CHAT_MODE_FINAL = "final"
+CHAT_MODE_STREAM = "stream"
+CHAT_MODES = (CHAT_MODE_FINAL, CHAT_MODE_STREAM)
+PARTIAL_MESSAGE_TYPES = (ChatMessageType.AI, ChatMessageType.AGENT)
+
 # Initialize a lock
 user_sessions_lock = asyncio.Lock()
 user_sessions = {}
@@ -39,6 +50,41 @@ user_sessions = {}
 latest_sly_data_storage: Dict[str, Any] = {}
 
 
+def evict_session_state(record: SessionRecord):
+    """
+    Drop the user session and latest sly_data of a session evicted by the session registry.
+    :param record: The evicted session.
+    """
+    latest_sly_data_storage.pop(record.key, None)
+    # user_sessions is keyed by session id alone; keep it while another agent still uses the id
+    if not SESSION_REGISTRY.has_session_id(record.session_id):
+        close_input_processor(user_sessions.pop(record.session_id, None))
+
+
+def close_input_processor(user_session: Optional[Dict[str, Any]]):
+    """
+    Stop the streaming reader of a user session that is being dropped.
+    :param user_session: The dropped user_session dictionary, or None.
+    """
+    input_processor = user_session.get("input_processor") if user_session else None
+    if input_processor is not None:
+        input_processor.close()
+
+
+def session_state_bytes(record: SessionRecord) -> int:
+    """
+    Approximate size of a session's chat state and latest sly_data.
+    :param record: A live session.
+    :return: Bytes held for the session.
+    """
+    user_session = user_sessions.get(record.session_id)
+    state = user_session.get("state") if user_session else None
+    return approx_size(state) + approx_size(latest_sly_data_storage.get(record.key))
+
+
+SESSION_REGISTRY.register_owner("user_sessions", evict_session_state, session_state_bytes)
+
+
 # pylint: disable=too-many-instance-attributes
 class NsWebsocketUtils:
     """
@@ -53,13 +99,16 @@ class NsWebsocketUtils:
     DEFAULT_INPUT: str = ""
     DEFAULT_PROMPT: str = "Please enter your response ('quit' to terminate):\n"
 
-    def __init__(self, agent_name: str, websocket: WebSocket, session_id: str = None):
+    def __init__(
+        self, agent_name: str, websocket: WebSocket, session_id: str = None, chat_mode: str = CHAT_MODE_FINAL
+    ):
         """
         Initialize the Agent service API wrapper.
         :param agent_name: Name of the NeuroSAN agent(Network) to connect to.
         :param websocket: The WebSocket connection instance.
         :param session_id: Unique session identifier for this user connection.
                           If not provided, a new one will be generated.
+        :param chat_mode: CHAT_MODE_FINAL or CHAT_MODE_STREAM, for messages that do not ask for a mode.
         """
         try:
             config = NsConfigsRegistry.get_current()
@@ -79,6 +128,9 @@ class NsWebsocketUtils:
         self.websocket = websocket
         self.active_chat_connections: Dict[str, WebSocket] = {}
         self.chat_context: Dict[str, Any] = {}
+        self.chat_mode = chat_mode if chat_mode in CHAT_MODES else CHAT_MODE_FINAL
+        # Seconds from receiving the last chat message to sending its first frame
+        self.last_time_to_first_frame: Optional[float] = None
         # Set up the thinking file and directory from environment variables or defaults
         if "THINKING_FILE" not in os.environ:
             logging.warning("THINKING_FILE environment variable is not set. Using default temporary file.")
@@ -101,53 +153,13 @@ class NsWebsocketUtils:
         await self.logs_manager.log_event(
             f"Chat client {self.session_id} connected to agent: {self.agent_name}", "nsflow"
         )
-
-        async with user_sessions_lock:
-            if self.session_id not in user_sessions:
-                user_sessions[self.session_id] = await self.create_user_session(self.session_id)
-            user_session = user_sessions[self.session_id]
+        await self.open_user_session()
 
         try:
-            while True:
-                websocket_data = await websocket.receive_text()
-                message_data = json.loads(websocket_data)
-                user_input = message_data.get("message", "")
-                sly_data = message_data.get("sly_data", {})
-                chat_context = message_data.get("chat_context", {})
-                # log the chat_context message
-                await self.logs_manager.log_event(f"chat_context received: {chat_context}", "nsflow")
-
-                input_processor = user_session["input_processor"]
-                state = user_session.get("state")
-                # Update user input in state
-                state["user_input"] = user_input
-                # Update sly_data in state based on user input
-                state["sly_data"].update(sly_data)
-                # Update chat context in state based on user input
-                if bool(chat_context):
-                    state["chat_context"].update(chat_context)
-                # Update the state
-                state = await input_processor.async_process_once(state)
-                await self.logs_manager.log_event(f"state after process_once: {state}", "nsflow")
-                user_session["state"] = state
-                last_chat_response = state.get("last_chat_response")
-
-                # Start a background task and pass necessary data
-                if last_chat_response:
-                    # try:
-                    response_str = json.dumps({"message": {"type": "AI", "text": last_chat_response}})
-                    sly_data_str = {"text": state["sly_data"]}
-                    await websocket.send_text(response_str)
-                    await self.logs_manager.log_event(f"Streaming response sent: {response_str}", "nsflow")
-                    await self.logs_manager.sly_data_event(sly_data_str)
-
-                # Store the latest sly_data for this network and session
-                if state.get("sly_data") is not None:
-                    storage_key = f"{self.agent_name}:{self.session_id}"
-                    latest_sly_data_storage[storage_key] = state["sly_data"]
-                    # logging.info("Updated latest sly_data for network %s session %s", self.agent_name, self.session_id)
-
-                await self.logs_manager.log_event(f"Streaming chat finished for client: {self.session_id}", "nsflow")
+            with SESSION_REGISTRY.attached(self.agent_name, self.session_id):
+                while True:
+                    websocket_data = await websocket.receive_text()
+                    await self.process_message(json.loads(websocket_data), websocket.send_text)
 
         except WebSocketDisconnect:
             await self.logs_manager.log_event(f"WebSocket chat client disconnected: {self.session_id}", "nsflow")
@@ -157,8 +169,103 @@ class NsWebsocketUtils:
         finally:
             # clean up
             self.active_chat_connections.pop(self.session_id, None)
-            async with user_sessions_lock:
-                user_sessions.pop(self.session_id, None)
+            await self.close_user_session()
+
+    async def open_user_session(self) -> Dict[str, Any]:
+        """
+        Get or create the user session (input processor and chat state) for this session id.
+        :return: The user_session dictionary.
+        """
+        SESSION_REGISTRY.touch(self.agent_name, self.session_id)
+        async with user_sessions_lock:
+            if self.session_id not in user_sessions:
+                user_sessions[self.session_id] = await self.create_user_session(self.session_id)
+            return user_sessions[self.session_id]
+
+    async def close_user_session(self):
+        """Drop the user session for this session id."""
+        async with user_sessions_lock:
+            close_input_processor(user_sessions.pop(self.session_id, None))
+
+    async def process_message(self, message_data: Dict[str, Any], send: Callable[[str], Awaitable[None]]):
+        """
+        Run one chat message from the client through the agent session and send back the response.
+        :param message_data: The decoded client frame with "message", "sly_data", "chat_context"
+                             and optionally "mode" (one of CHAT_MODES).
+        :param send: Coroutine function that delivers the serialized AI response frame to the client.
+        """
+        received = time.perf_counter()
+        mode = message_data.get("mode") or self.chat_mode
+        streaming = mode == CHAT_MODE_STREAM
+        self.last_time_to_first_frame = None
+
+        async def send_frame(frame_str: str):
+            if self.last_time_to_first_frame is None:
+                self.last_time_to_first_frame = time.perf_counter() - received
+            await send(frame_str)
+
+        async def send_partial(response: Dict[str, Any]):
+            frame_str = self.partial_frame(response)
+            if frame_str is not None:
+                await send_frame(frame_str)
+
+        user_session = await self.open_user_session()
+        user_input = message_data.get("message", "")
+        sly_data = message_data.get("sly_data", {})
+        chat_context = message_data.get("chat_context", {})
+        # log the chat_context message
+        await self.logs_manager.log_event(f"chat_context received: {chat_context}", "nsflow")
+
+        input_processor = user_session["input_processor"]
+        state = user_session.get("state")
+        # Update user input in state
+        state["user_input"] = user_input
+        # Update sly_data in state based on user input
+        state["sly_data"].update(sly_data)
+        # Update chat context in state based on user input
+        if bool(chat_context):
+            state["chat_context"].update(chat_context)
+        # Update the state
+        state = await input_processor.async_process_once(state, send_partial if streaming else None)
+        await self.logs_manager.log_event(f"state after process_once: {state}", "nsflow")
+        user_session["state"] = state
+        last_chat_response = state.get("last_chat_response")
+
+        if last_chat_response:
+            final_message = {"type": "AI", "text": last_chat_response}
+            if streaming:
+                final_message["final"] = True
+            response_str = json.dumps({"message": final_message})
+            sly_data_str = {"text": state["sly_data"]}
+            await send_frame(response_str)
+            await self.logs_manager.log_event(f"Streaming response sent: {response_str}", "nsflow")
+            await self.logs_manager.sly_data_event(sly_data_str)
+
+        # Store the latest sly_data for this network and session
+        if state.get("sly_data") is not None:
+            storage_key = f"{self.agent_name}:{self.session_id}"
+            latest_sly_data_storage[storage_key] = state["sly_data"]
+
+        await self.logs_manager.log_event(f"Streaming chat finished for client: {self.session_id}", "nsflow")
+        if self.last_time_to_first_frame is not None:
+            await self.logs_manager.log_event(
+                f"Time to first chat frame ({mode}): {self.last_time_to_first_frame * 1000:.0f} ms", "nsflow"
+            )
+
+    @staticmethod
+    def partial_frame(response: Dict[str, Any]) -> Optional[str]:
+        """
+        Build the partial chat frame for a streamed chat message, if it is one clients should see.
+        :param response: A chat message from the agent session's stream.
+        :return: The serialized frame, or None for framework, tool and empty messages.
+        """
+        message_type = ChatMessageType.from_response_type(response.get("type"))
+        text = response.get("text")
+        if message_type not in PARTIAL_MESSAGE_TYPES or not text:
+            return None
+        origin = [item.get("tool") for item in response.get("origin") or [] if isinstance(item, dict)]
+        message = {"type": ChatMessageType.to_string(message_type), "text": text, "partial": True, "origin": origin}
+        return json.dumps({"message": message})
 
     async def create_user_session(self, sid: str) -> Dict[str, Any]:
         """method to create a user session with the given WebSocket connection.
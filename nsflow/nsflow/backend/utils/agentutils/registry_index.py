@@ -0,0 +1,409 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from pyhocon import ConfigFactory
+
+from nsflow.backend.utils.agentutils.agent_network_cache import INCLUDE_PATTERN, AgentNetworkCache, FileStamp
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - watchdog is optional
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+# Cheap extraction of the dependency edges we care about; a full parse is not needed for these.
+CLASS_PATTERN = re.compile(r'"?class"?\s*[=:]\s*"([\w.]+)"')
+TOOLS_LIST_PATTERN = re.compile(r'"?tools"?\s*[=:]\s*\[([^\]]*)\]')
+SUB_NETWORK_PATTERN = re.compile(r'"(/[\w\-/]+)"')
+INCLUDE_LINE_PATTERN = re.compile(r"^\s*include\s+.*$", re.MULTILINE)
+
+
+@dataclass
+class NetworkRecord:
+    """What a single agent network file depends on."""
+
+    path: str
+    includes: Set[str] = field(default_factory=set)
+    coded_tools: Set[str] = field(default_factory=set)
+    sub_networks: Set[str] = field(default_factory=set)
+    dependency_keys: Set[str] = field(default_factory=set)
+
+
+class RegistryIndex:
+    """
+    In-memory graph of a registry: manifests -> networks -> includes -> coded-tool classes
+    -> sub-network references, plus the reverse edges so that questions such as
+    "which networks use aaosa.hocon" or "which networks use tools.pdf_rag" are dict lookups.
+
+    The index is built once and then kept current by a file watcher (watchdog when it is
+    installed, otherwise a polling thread). Only the files that changed are re-scanned.
+    """
+
+    def __init__(self, manifest_file: str, watch: bool = True, poll_interval: float = 2.0):
+        """
+        :param manifest_file: Root manifest.hocon of the registry.
+        :param watch: Start a watcher thread to keep the index current.
+        :param poll_interval: Seconds between checks when falling back to polling.
+        """
+        self.manifest_file = os.path.normpath(os.path.abspath(manifest_file))
+        self.registry_dir = os.path.dirname(self.manifest_file)
+        # Includes are written as "registries/...", i.e. relative to the registry's parent.
+        self.root_dir = os.path.dirname(self.registry_dir)
+        self.poll_interval = poll_interval
+
+        self._lock = threading.RLock()
+        self._stamps: Dict[str, FileStamp] = {}
+        self._manifest_files: Set[str] = set()
+        self._manifest_entries: Dict[str, Dict[str, Any]] = {}
+        self._listed_networks: List[str] = []
+        self._networks: Dict[str, NetworkRecord] = {}
+        self._include_graph: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self.rebuilds = 0
+
+        self._stop = threading.Event()
+        self._observer = None
+        self._poller: Optional[threading.Thread] = None
+        self.watch_mode = "none"
+
+        self.rebuild()
+        if watch:
+            self.start_watching()
+
+    # ----- building -----
+
+    def rebuild(self):
+        """Builds the whole index from scratch."""
+        with self._lock:
+            self._stamps.clear()
+            self._networks.clear()
+            self._include_graph.clear()
+            self._dependents.clear()
+            self._load_manifests()
+            self.rebuilds += 1
+
+    def _read(self, path: str) -> Optional[str]:
+        try:
+            with open(path, "r", encoding="utf-8") as hocon_file:
+                return hocon_file.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _track(self, path: str):
+        self._stamps[path] = AgentNetworkCache.stamp(path)
+
+    def _resolve_includes(self, path: str, content: str) -> Set[str]:
+        """Resolves include directives to the existing files they can refer to."""
+        resolved = set()
+        for include in INCLUDE_PATTERN.findall(content):
+            if os.path.isabs(include):
+                candidates = [include]
+            else:
+                candidates = [
+                    os.path.join(base, include) for base in (self.root_dir, os.path.dirname(path), self.registry_dir)
+                ]
+            for candidate in candidates:
+                candidate = os.path.normpath(candidate)
+                if os.path.isfile(candidate):
+                    resolved.add(candidate)
+                    break
+        return resolved
+
+    def _load_manifests(self):
+        """Reads the manifest include tree and (re)indexes the networks it references."""
+        manifest_files: Set[str] = set()
+        entries: Dict[str, Dict[str, Any]] = {}
+        pending = [self.manifest_file]
+        while pending:
+            path = pending.pop()
+            if path in manifest_files:
+                continue
+            manifest_files.add(path)
+            self._track(path)
+            content = self._read(path)
+            if content is None:
+                continue
+            pending.extend(self._resolve_includes(path, content))
+            try:
+                # Each manifest's own entries, without whatever it includes
+                own = ConfigFactory.parse_string(INCLUDE_LINE_PATTERN.sub("", content))
+                entries[path] = {key.replace('"', "").strip(): value for key, value in own.items()}
+            except Exception as exc:
+                logger.warning("Could not parse manifest %s: %s", path, exc)
+                entries[path] = {}
+
+        listed: List[str] = []
+        if os.path.exists(self.manifest_file):
+            try:
+                # Resolve includes from the registry's parent, the same way neuro-san does.
+                merged = ConfigFactory.parse_string(self._read(self.manifest_file) or "", basedir=self.root_dir)
+                listed = [
+                    os.path.splitext(os.path.basename(file))[0].replace('"', "").strip()
+                    for file, enabled in merged.items()
+                    if enabled is True
+                ]
+            except Exception as exc:
+                logger.warning("Could not parse manifest %s: %s", self.manifest_file, exc)
+
+        for stale in self._manifest_files - manifest_files:
+            self._stamps.pop(stale, None)
+        self._manifest_files = manifest_files
+        self._manifest_entries = entries
+        self._listed_networks = listed
+
+        wanted = {key for manifest in entries.values() for key in manifest}
+        for key in set(self._networks) - wanted:
+            self._drop_network(key)
+        for key in wanted - set(self._networks):
+            self._index_network(key)
+
+    def _network_path(self, key: str) -> str:
+        return os.path.normpath(os.path.join(self.registry_dir, key))
+
+    def _include_key(self, path: str) -> str:
+        if path.startswith(self.registry_dir + os.sep):
+            return os.path.relpath(path, self.registry_dir).replace(os.sep, "/")
+        return path
+
+    def _transitive_includes(self, path: str, content: str) -> Set[str]:
+        direct = self._resolve_includes(path, content)
+        self._include_graph[path] = direct
+        result: Set[str] = set()
+        pending = list(direct)
+        while pending:
+            include = pending.pop()
+            if include in result:
+                continue
+            result.add(include)
+            self._track(include)
+            if include not in self._include_graph:
+                self._include_graph[include] = self._resolve_includes(include, self._read(include) or "")
+            pending.extend(self._include_graph[include])
+        return result
+
+    def _drop_network(self, key: str):
+        record = self._networks.pop(key, None)
+        if record is None:
+            return
+        for dependency in record.dependency_keys:
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._dependents[dependency]
+        if record.path not in self._include_graph:
+            self._stamps.pop(record.path, None)
+
+    def _index_network(self, key: str):
+        self._drop_network(key)
+        path = self._network_path(key)
+        record = NetworkRecord(path=path)
+        self._track(path)
+        content = self._read(path)
+        if content is not None:
+            record.includes = self._transitive_includes(path, content)
+            record.coded_tools = set(CLASS_PATTERN.findall(content))
+            for tools_list in TOOLS_LIST_PATTERN.findall(content):
+                record.sub_networks.update(ref.lstrip("/") for ref in SUB_NETWORK_PATTERN.findall(tools_list))
+
+        keys = {f"include:{self._include_key(include)}" for include in record.includes}
+        keys.update(f"network:{sub_network}" for sub_network in record.sub_networks)
+        for coded_tool in record.coded_tools:
+            # Index the class and every module prefix: tools.pdf_rag.PdfRag -> tools.pdf_rag, tools
+            parts = coded_tool.split(".")
+            keys.update(f"class:{'.'.join(parts[:end])}" for end in range(1, len(parts) + 1))
+        record.dependency_keys = keys
+        for dependency in keys:
+            self._dependents.setdefault(dependency, set()).add(key)
+        self._networks[key] = record
+
+    # ----- incremental updates -----
+
+    def refresh_path(self, path: str):
+        """Re-scans whatever depends on a single changed file."""
+        path = os.path.normpath(os.path.abspath(path))
+        with self._lock:
+            self._track(path)
+            if path in self._manifest_files or path == self.manifest_file:
+                self._load_manifests()
+                return
+            if path in self._include_graph:
+                self._include_graph[path] = self._resolve_includes(path, self._read(path) or "")
+            for key, record in list(self._networks.items()):
+                if record.path == path or path in record.includes:
+                    self._index_network(key)
+
+    def poll(self) -> List[str]:
+        """Checks every tracked file once and refreshes the changed ones. Returns the changed paths."""
+        with self._lock:
+            changed = [path for path, stamp in self._stamps.items() if AgentNetworkCache.stamp(path) != stamp]
+        for path in changed:
+            self.refresh_path(path)
+        return changed
+
+    def start_watching(self):
+        """Starts a watchdog observer on the registry, or a polling thread if watchdog is missing."""
+        if Observer is not None and os.path.isdir(self.registry_dir):
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_RegistryEventHandler(self), self.registry_dir, recursive=True)
+                self._observer.daemon = True
+                self._observer.start()
+                self.watch_mode = "watchdog"
+                return
+            except Exception as exc:
+                logger.warning("Falling back to polling the registry: %s", exc)
+                self._observer = None
+
+        self._poller = threading.Thread(target=self._poll_loop, name="registry-index-poller", daemon=True)
+        self._poller.start()
+        self.watch_mode = "polling"
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as exc:
+                logger.warning("Registry poll failed: %s", exc)
+
+    def stop(self):
+        """Stops the watcher thread."""
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+        if self._poller is not None:
+            self._poller.join(timeout=2)
+
+    # ----- queries -----
+
+    def list_available_networks(self) -> Dict[str, List[str]]:
+        """Networks enabled in the manifest tree, in the same shape as the old manifest parse."""
+        with self._lock:
+            return {"networks": list(self._listed_networks)}
+
+    def manifests(self) -> Dict[str, Dict[str, Any]]:
+        """Every manifest in the include tree with its own entries."""
+        with self._lock:
+            return {self._include_key(path): dict(entries) for path, entries in self._manifest_entries.items()}
+
+    def network_dependencies(self, network: str) -> Optional[Dict[str, List[str]]]:
+        """Forward edges of a single network, or None if it is not in any manifest."""
+        with self._lock:
+            record = self._networks.get(self._normalize_network(network))
+            if record is None:
+                return None
+            return {
+                "includes": sorted(self._include_key(include) for include in record.includes),
+                "coded_tools": sorted(record.coded_tools),
+                "sub_networks": sorted(record.sub_networks),
+            }
+
+    def networks_using(self, reference: str) -> List[str]:
+        """
+        Reverse lookup: the networks that include a file, use a coded tool class or module,
+        or call a sub-network. Accepts "aaosa.hocon", "registries/aaosa.hocon",
+        "coded_tools.tools.pdf_rag", "tools.pdf_rag.PdfRag" or "/industry/airbnb".
+        """
+        reference = reference.strip()
+        candidates = []
+        if reference.endswith(".hocon"):
+            include = reference[len("registries/"):] if reference.startswith("registries/") else reference
+            candidates.append(f"include:{include}")
+        else:
+            module = reference[len("coded_tools."):] if reference.startswith("coded_tools.") else reference
+            candidates.append(f"class:{module}")
+            candidates.append(f"network:{reference.lstrip('/')}")
+        with self._lock:
+            found: Set[str] = set()
+            for candidate in candidates:
+                found.update(self._dependents.get(candidate, ()))
+            return sorted(key[: -len(".hocon")] if key.endswith(".hocon") else key for key in found)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size of the index and how it is being kept current."""
+        with self._lock:
+            return {
+                "manifest_file": self.manifest_file,
+                "manifests": len(self._manifest_files),
+                "networks": len(self._networks),
+                "tracked_files": len(self._stamps),
+                "dependency_keys": len(self._dependents),
+                "watch_mode": self.watch_mode,
+                "rebuilds": self.rebuilds,
+            }
+
+    @staticmethod
+    def _normalize_network(network: str) -> str:
+        network = network.lstrip("/")
+        return network if network.endswith(".hocon") else f"{network}.hocon"
+
+
+class _RegistryEventHandler(FileSystemEventHandler):
+    """Forwards watchdog events for .hocon files to the index."""
+
+    def __init__(self, index: RegistryIndex):
+        super().__init__()
+        self.index = index
+
+    # Only changes are handled: refresh_path() reads the file, and handling the opened and
+    # closed-without-write events of that read would refresh it again, endlessly.
+    def on_created(self, event):
+        self._refresh(event)
+
+    def on_modified(self, event):
+        self._refresh(event)
+
+    def on_deleted(self, event):
+        self._refresh(event)
+
+    def on_moved(self, event):
+        self._refresh(event)
+
+    def _refresh(self, event):
+        if event.is_directory:
+            return
+        for path in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if path and str(path).endswith(".hocon"):
+                try:
+                    self.index.refresh_path(str(path))
+                except Exception as exc:
+                    logger.warning("Failed to refresh registry index for %s: %s", path, exc)
+
+
+_INDEXES: Dict[str, RegistryIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_registry_index(manifest_file: str) -> RegistryIndex:
+    """Returns the process-wide index for a manifest, building and watching it on first use."""
+    key = os.path.normpath(os.path.abspath(manifest_file))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            watch = os.getenv("NSFLOW_REGISTRY_WATCH", "true").lower() != "false"
+            index = RegistryIndex(key, watch=watch)
+            _INDEXES[key] = index
+        return index
@@ -0,0 +1,246 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+One WebSocket per (agent, session) carrying chat, logs, internal chat, sly_data,
+progress and sustainability as channel-tagged frames.
+
+Server -> client frames:
+    {"channel": "<name>", "data": <payload>}          payload as the per-channel route would send it
+    {"channel": "control", "type": "subscribed", "channels": [...]}
+    {"channel": "control", "type": "error", "error": "..."}
+    {"channel": "control", "type": "pong"}
+
+Client -> server frames:
+    {"type": "subscribe", "channels": [...]}
+    {"type": "unsubscribe", "channels": [...]}
+    {"type": "chat", "message": "...", "sly_data": {...}, "chat_context": {...}, "mode": "final"|"stream"}
+    {"type": "ping"}
+
+Streamed channels reuse the pub/sub channels of the per-channel routes, so each keeps its own
+bounded queue and overflow policy on the shared socket. Chat messages are processed in order
+on a background task, so subscribe/unsubscribe frames are answered while the agent is working.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from nsflow.backend.trust.rai_service import RaiService
+from nsflow.backend.utils.agentutils.ns_websocket_utils import NsWebsocketUtils
+from nsflow.backend.utils.agentutils.session_registry import SESSION_REGISTRY
+from nsflow.backend.utils.logutils.websocket_logs_manager import (
+    INTERNAL_CHAT_CHANNEL,
+    LOGS_CHANNEL,
+    PROGRESS_CHANNEL,
+    SLY_DATA_CHANNEL,
+)
+from nsflow.backend.utils.logutils.websocket_logs_registry import LogsRegistry
+
+CHAT_CHANNEL = "chat"
+CONTROL_CHANNEL = "control"
+SUSTAINABILITY_CHANNEL = "sustainability"
+
+STREAM_CHANNELS = (LOGS_CHANNEL, INTERNAL_CHAT_CHANNEL, SLY_DATA_CHANNEL, PROGRESS_CHANNEL, SUSTAINABILITY_CHANNEL)
+ALL_CHANNELS = (CHAT_CHANNEL,) + STREAM_CHANNELS
+
+# Chat messages waiting behind the one being processed
+CHAT_QUEUE_SIZE = 16
+
+
+class SerializedSender:
+    """
+    Wraps the shared socket so per-channel sender tasks never write frames concurrently.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.lock = asyncio.Lock()
+
+    async def send_text(self, text: str):
+        """Send one frame, waiting for any frame already being written."""
+        async with self.lock:
+            await self.websocket.send_text(text)
+
+
+# pylint: disable=too-many-instance-attributes
+class SessionMultiplexer:
+    """
+    Serves the multiplexed session socket for one agent/session pair.
+    """
+
+    def __init__(self, agent_name: str, session_id: str, websocket: WebSocket):
+        """
+        :param agent_name: Name of the agent network.
+        :param session_id: The unique session identifier for this user connection.
+        :param websocket: The (not yet accepted) WebSocket.
+        """
+        self.agent_name = agent_name
+        self.session_id = session_id
+        self.websocket = websocket
+        self.sender = SerializedSender(websocket)
+        self.logs_manager = LogsRegistry.register(agent_name, session_id)
+        self.rai_service = RaiService.get_instance()
+        self.subscribed: List[str] = []
+        self.chat_utils = None
+        self.chat_queue: asyncio.Queue = asyncio.Queue(maxsize=CHAT_QUEUE_SIZE)
+        self.chat_task: Optional[asyncio.Task] = None
+
+    async def run(self, channels: Optional[Iterable[str]] = None):
+        """
+        Accept the socket, subscribe the initial channels and serve frames until disconnect.
+        :param channels: Channels to start with; all channels if None.
+        """
+        await self.websocket.accept()
+        await self.subscribe(ALL_CHANNELS if channels is None else channels)
+        await self.logs_manager.log_event(f"Session client connected: {self.session_id}", "nsflow")
+        try:
+            with SESSION_REGISTRY.attached(self.agent_name, self.session_id):
+                while True:
+                    message = await self.websocket.receive()
+                    if message.get("type") == "websocket.disconnect":
+                        break
+                    if message.get("text") is not None:
+                        await self.handle_frame(message["text"])
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await self.close()
+
+    async def handle_frame(self, text: str):
+        """
+        Dispatch one client frame.
+        :param text: The raw frame text.
+        """
+        try:
+            frame = json.loads(text)
+        except ValueError:
+            await self.send_control({"type": "error", "error": "Frames must be JSON objects"})
+            return
+        frame_type = frame.get("type") if isinstance(frame, dict) else None
+        if frame_type in ("subscribe", "unsubscribe"):
+            channels = frame.get("channels") or []
+            # A bare string would otherwise be taken as a list of one-letter channels
+            if not isinstance(channels, list) or not all(isinstance(name, str) for name in channels):
+                await self.send_control({"type": "error", "error": "channels must be a list of channel names"})
+            elif frame_type == "subscribe":
+                await self.subscribe(channels)
+            else:
+                await self.unsubscribe(channels)
+        elif frame_type == "chat":
+            await self.enqueue_chat(frame)
+        elif frame_type == "ping":
+            await self.send_control({"type": "pong"})
+        else:
+            await self.send_control({"type": "error", "error": f"Unknown frame type: {frame_type}"})
+
+    async def subscribe(self, channels: Iterable[str]):
+        """
+        Start streaming the given channels on this socket.
+        :param channels: Channel names from ALL_CHANNELS.
+        """
+        unknown = [name for name in channels if name not in ALL_CHANNELS]
+        if unknown:
+            await self.send_control({"type": "error", "error": f"Unknown channels: {unknown}"})
+        for name in channels:
+            if name in unknown or name in self.subscribed:
+                continue
+            self._attach(name)
+            self.subscribed.append(name)
+        await self.send_control({"type": "subscribed", "channels": self.subscribed})
+
+    async def unsubscribe(self, channels: Iterable[str]):
+        """
+        Stop streaming the given channels on this socket.
+        :param channels: Channel names from ALL_CHANNELS.
+        """
+        for name in channels:
+            if name not in self.subscribed:
+                continue
+            self._detach(name)
+            self.subscribed.remove(name)
+        await self.send_control({"type": "subscribed", "channels": self.subscribed})
+
+    def _attach(self, name: str):
+        # Chat responses are sent directly; everything else is a pub/sub channel
+        if name == SUSTAINABILITY_CHANNEL:
+            self.rai_service.subscribe(self.sender, self.session_id, tagged=True)
+        elif name != CHAT_CHANNEL:
+            self.logs_manager.channels[name].subscribe(self.sender, tagged=True)
+
+    def _detach(self, name: str):
+        if name == SUSTAINABILITY_CHANNEL:
+            self.rai_service.unsubscribe(self.sender, self.session_id)
+        elif name != CHAT_CHANNEL:
+            self.logs_manager.channels[name].unsubscribe(self.sender)
+
+    async def enqueue_chat(self, frame: Dict[str, Any]):
+        """
+        Queue a chat message for the session's chat task, refusing it if too many are waiting.
+        :param frame: The client chat frame.
+        """
+        if CHAT_CHANNEL not in self.subscribed:
+            await self.send_control({"type": "error", "error": "Subscribe to the chat channel before sending"})
+            return
+        try:
+            self.chat_queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            await self.send_control({"type": "error", "error": "Too many chat messages in flight"})
+            return
+        if self.chat_task is None:
+            self.chat_task = asyncio.create_task(self.run_chat())
+
+    async def run_chat(self):
+        """
+        Process queued chat messages one at a time through the agent session.
+        """
+        while True:
+            frame = await self.chat_queue.get()
+            try:
+                if self.chat_utils is None:
+                    self.chat_utils = NsWebsocketUtils(self.agent_name, self.sender, self.session_id)
+                    await self.chat_utils.open_user_session()
+                await self.chat_utils.process_message(frame, self.send_chat)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logging.error("Chat error on multiplexed session %s: %s", self.session_id, e)
+                await self.logs_manager.log_event(f"Error in session {self.session_id}: {e}", "nsflow")
+                await self.send_control({"type": "error", "error": str(e)})
+
+    async def send_chat(self, response_str: str):
+        """Send an AI response frame on the chat channel."""
+        await self.sender.send_text('{"channel": "' + CHAT_CHANNEL + '", "data": ' + response_str + "}")
+
+    async def send_control(self, frame: Dict[str, Any]):
+        """Send a control frame, ignoring a socket that is already gone."""
+        try:
+            await self.sender.send_text(json.dumps({"channel": CONTROL_CHANNEL, **frame}))
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+
+    async def close(self):
+        """
+        Release every subscription and the chat session.
+        """
+        for name in self.subscribed:
+            self._detach(name)
+        self.subscribed = []
+        if self.chat_task is not None:
+            self.chat_task.cancel()
+        if self.chat_utils is not None:
+            await self.chat_utils.close_user_session()
+            await self.logs_manager.log_event(f"WebSocket chat client disconnected: {self.session_id}", "nsflow")
@@ -0,0 +1,309 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Lifecycle of agent:session pairs across the per-session stores (logs managers, user sessions,
+latest sly_data, sustainability metrics).
+
+Each store keeps its own dictionary and registers an owner here: a callback that drops the
+session's state and, optionally, one that estimates its size. Sockets attach to a session for
+as long as they are connected; a session nobody is attached to is evicted once it has been idle
+for longer than the TTL, or earlier (least recently used first) when the session cap is reached.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds a detached session is kept after its last use
+SESSION_IDLE_TTL = float(os.getenv("NSFLOW_SESSION_IDLE_TTL", "3600"))
+# Sessions kept before the least recently used detached ones are evicted
+MAX_SESSIONS = int(os.getenv("NSFLOW_MAX_SESSIONS", "1000"))
+# Minimum seconds between idle sweeps triggered by session lookups
+SWEEP_INTERVAL = float(os.getenv("NSFLOW_SESSION_SWEEP_INTERVAL", "30"))
+
+
+@dataclass
+class SessionRecord:
+    """Bookkeeping for one agent:session pair."""
+
+    agent_name: str
+    session_id: str
+    created: float
+    last_used: float
+    refs: int = 0
+
+    @property
+    def key(self) -> str:
+        """The agent:session key shared by the per-session stores."""
+        return f"{self.agent_name}:{self.session_id}"
+
+
+@dataclass
+class SessionOwner:
+    """A store holding per-session state, with the callbacks the registry drives it through."""
+
+    name: str
+    evict: Callable[[SessionRecord], None]
+    size: Optional[Callable[[SessionRecord], int]] = None
+
+
+def approx_size(value: Any) -> int:
+    """
+    Cheap size estimate of a JSON-like value: the length of its JSON encoding.
+    :param value: The value to measure.
+    :return: Approximate number of bytes, 0 if the value cannot be encoded.
+    """
+    if value is None:
+        return 0
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class SessionRegistry:
+    """
+    Tracks live sessions in least-recently-used order with reference counts from attached sockets.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        max_sessions: int = MAX_SESSIONS,
+        sweep_interval: float = SWEEP_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param idle_ttl: Seconds a detached session may stay unused before it is evicted.
+        :param max_sessions: Session cap; detached sessions are evicted least recently used first beyond it.
+        :param sweep_interval: Minimum seconds between idle sweeps run as a side effect of lookups.
+        :param clock: Monotonic time source, replaceable in tests.
+        """
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self._sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._owners: Dict[str, SessionOwner] = {}
+        self._lock = threading.RLock()
+        self._last_sweep = clock()
+        self.created = 0
+        self.evicted_idle = 0
+        self.evicted_lru = 0
+
+    def register_owner(
+        self,
+        name: str,
+        evict: Callable[[SessionRecord], None],
+        size: Optional[Callable[[SessionRecord], int]] = None,
+    ):
+        """
+        Register a per-session store. Registering the same name again replaces the callbacks.
+        :param name: Store name used in stats().
+        :param evict: Drops the store's state for a session.
+        :param size: Estimates the bytes the store holds for a session.
+        """
+        with self._lock:
+            self._owners[name] = SessionOwner(name, evict, size)
+
+    def touch(self, agent_name: str, session_id: str) -> SessionRecord:
+        """
+        Get or create a session and mark it as just used.
+        :param agent_name: Name of the agent network.
+        :param session_id: The unique session identifier.
+        :return: The session's record.
+        """
+        return self._use(agent_name, session_id, pin=False)
+
+    def attach(self, agent_name: str, session_id: str) -> SessionRecord:
+        """
+        Pin a session for a connected socket; attached sessions are never evicted.
+        :param agent_name: Name of the agent network.
+        :param session_id: The unique session identifier.
+        :return: The session's record.
+        """
+        return self._use(agent_name, session_id, pin=True)
+
+    def _use(self, agent_name: str, session_id: str, pin: bool) -> SessionRecord:
+        key = f"{agent_name}:{session_id}"
+        evicted: List[SessionRecord] = []
+        with self._lock:
+            now = self.clock()
+            record = self._sessions.get(key)
+            if record is None:
+                record = SessionRecord(agent_name, session_id, created=now, last_used=now)
+                self._sessions[key] = record
+                self.created += 1
+                evicted.extend(self._evict_over_cap(keep=key))
+            else:
+                record.last_used = now
+                self._sessions.move_to_end(key)
+            if pin:
+                record.refs += 1
+            if now - self._last_sweep >= self.sweep_interval:
+                evicted.extend(self._evict_idle(now))
+        self._run_evictions(evicted)
+        return record
+
+    def detach(self, agent_name: str, session_id: str):
+        """
+        Release a socket's pin; the idle TTL starts counting from now.
+        :param agent_name: Name of the agent network.
+        :param session_id: The unique session identifier.
+        """
+        with self._lock:
+            record = self._sessions.get(f"{agent_name}:{session_id}")
+            if record is None:
+                return
+            record.refs = max(0, record.refs - 1)
+            record.last_used = self.clock()
+            self._sessions.move_to_end(record.key)
+
+    @contextmanager
+    def attached(self, agent_name: str, session_id: str) -> Iterator[SessionRecord]:
+        """
+        Keep a session attached for the duration of a with-block, e.g. a WebSocket handler.
+        :param agent_name: Name of the agent network.
+        :param session_id: The unique session identifier.
+        """
+        record = self.attach(agent_name, session_id)
+        try:
+            yield record
+        finally:
+            self.detach(agent_name, session_id)
+
+    def is_live(self, agent_name: str, session_id: str) -> bool:
+        """Whether the session is currently tracked."""
+        with self._lock:
+            return f"{agent_name}:{session_id}" in self._sessions
+
+    def has_session_id(self, session_id: str) -> bool:
+        """Whether any agent still has a live session with this id, for stores keyed by session id alone."""
+        with self._lock:
+            return any(record.session_id == session_id for record in self._sessions.values())
+
+    def sweep(self) -> int:
+        """
+        Evict every detached session idle for longer than the TTL.
+        :return: The number of sessions evicted.
+        """
+        with self._lock:
+            evicted = self._evict_idle(self.clock())
+        self._run_evictions(evicted)
+        return len(evicted)
+
+    async def sweep_periodically(self):
+        """
+        Sweep idle sessions every sweep interval, so a quiet process releases them too. Runs until cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            evicted = self.sweep()
+            if evicted:
+                logger.info("Evicted %d idle sessions", evicted)
+
+    def evict(self, agent_name: str, session_id: str) -> bool:
+        """
+        Drop a session from every store now, attached or not.
+        :param agent_name: Name of the agent network.
+        :param session_id: The unique session identifier.
+        :return: True if the session was live.
+        """
+        with self._lock:
+            record = self._sessions.pop(f"{agent_name}:{session_id}", None)
+        if record is None:
+            return False
+        self._run_evictions([record])
+        return True
+
+    def _evict_idle(self, now: float) -> List[SessionRecord]:
+        # Records are kept in last-used order, so the scan stops at the first one still within the TTL
+        self._last_sweep = now
+        evicted = []
+        for key, record in list(self._sessions.items()):
+            if now - record.last_used < self.idle_ttl:
+                break
+            if record.refs == 0:
+                del self._sessions[key]
+                evicted.append(record)
+        self.evicted_idle += len(evicted)
+        return evicted
+
+    def _evict_over_cap(self, keep: str) -> List[SessionRecord]:
+        evicted = []
+        excess = len(self._sessions) - self.max_sessions
+        if excess <= 0:
+            return evicted
+        for key, record in list(self._sessions.items()):
+            if len(evicted) >= excess:
+                break
+            if record.refs == 0 and key != keep:
+                del self._sessions[key]
+                evicted.append(record)
+        if len(evicted) < excess:
+            logger.warning("%d sessions are attached, above the cap of %d", len(self._sessions), self.max_sessions)
+        self.evicted_lru += len(evicted)
+        return evicted
+
+    def _run_evictions(self, records: List[SessionRecord]):
+        # Owner callbacks run outside the lock; a failing store must not keep the others from cleaning up
+        for record in records:
+            for owner in list(self._owners.values()):
+                try:
+                    owner.evict(record)
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    logger.error("Evicting session %s from %s failed: %s", record.key, owner.name, exc)
+            logger.debug("Evicted session %s", record.key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Live and evicted session counts and the approximate bytes each store holds.
+        :return: A dictionary suitable for a monitoring endpoint.
+        """
+        with self._lock:
+            records = list(self._sessions.values())
+            owners = list(self._owners.values())
+            now = self.clock()
+            stats = {
+                "live": len(records),
+                "attached": sum(1 for record in records if record.refs),
+                "created": self.created,
+                "evicted_idle": self.evicted_idle,
+                "evicted_lru": self.evicted_lru,
+                "max_sessions": self.max_sessions,
+                "idle_ttl": self.idle_ttl,
+                "oldest_idle_seconds": round(now - records[0].last_used, 1) if records else 0.0,
+            }
+        approx_bytes = {}
+        for owner in owners:
+            if owner.size is not None:
+                approx_bytes[owner.name] = sum(owner.size(record) for record in records)
+        stats["approx_bytes"] = approx_bytes
+        stats["approx_bytes_total"] = sum(approx_bytes.values())
+        return stats
+
+
+# Shared by every per-session store in the process
+SESSION_REGISTRY = SessionRegistry()
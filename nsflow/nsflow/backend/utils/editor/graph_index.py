@@ -0,0 +1,213 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+"""
+Incrementally maintained graph index over the agents of an editor state.
+
+Edges are the names in an agent's tools list. The index keeps the adjacency and reverse
+adjacency, the agents without a parent (frontman candidates), the agents nothing points to
+(orphans) and a topological order of the agents. The order is kept with the Pearce-Kelly
+dynamic topological sort: an edge that already goes forward in the order cannot close a cycle,
+and an edge that goes backward only reorders the agents between its two ends. Cycle checks and
+validation therefore cost the affected region instead of a walk over the whole network.
+
+Names in tools that are not agents (coded tools, toolbox tools, sub-networks) are kept in the
+adjacency but take no part in the order; they join it if an agent of that name is added.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+class GraphIndex:
+    """
+    Adjacency, reverse adjacency, topological order, frontman candidates and orphans of a network.
+    Kept in step by calling refresh() with every agent whose tools or parent changed.
+    """
+
+    def __init__(self):
+        self.children: Dict[str, Set[str]] = {}
+        # Reverse adjacency: agents listing a name in their tools; names need not be agents
+        self.parents: Dict[str, Set[str]] = {}
+        # Topological position of each agent; unique, not necessarily contiguous
+        self.position: Dict[str, int] = {}
+        self.next_position = 0
+        # False while the agents contain a cycle; cycle checks then walk the graph
+        self.acyclic = True
+        self.frontman_candidates: Set[str] = set()
+        self.orphans: Set[str] = set()
+
+    @classmethod
+    def build(cls, agents: Dict[str, Dict[str, Any]]) -> "GraphIndex":
+        """
+        Index a whole network.
+        :param agents: The agents of an editor state, by name.
+        :return: The index.
+        """
+        index = cls()
+        for name, agent in agents.items():
+            index.children[name] = cls._tool_names(agent)
+            if not agent.get("_parent"):
+                index.frontman_candidates.add(name)
+        for name, children in index.children.items():
+            for child in children:
+                index.parents.setdefault(child, set()).add(name)
+        index.orphans = {name for name in agents if not index.parents.get(name)}
+        index._sort(list(agents))
+        return index
+
+    def _sort(self, names: List[str]):
+        """
+        Order the agents from scratch with Kahn's algorithm over the edges between them.
+        Agents on or behind a cycle go last, in the given order, and the index is marked cyclic.
+        :param names: The agent names.
+        """
+        self.position = {}
+        self.next_position = 0
+        in_degree = {name: 0 for name in names}
+        for name in names:
+            for child in self.children.get(name, ()):
+                if child in in_degree:
+                    in_degree[child] += 1
+        ready = deque(name for name, degree in in_degree.items() if degree == 0)
+        while ready:
+            name = ready.popleft()
+            self.position[name] = self.next_position
+            self.next_position += 1
+            for child in self.children.get(name, ()):
+                if child in in_degree:
+                    in_degree[child] -= 1
+                    if in_degree[child] == 0:
+                        ready.append(child)
+        self.acyclic = len(self.position) == len(names)
+        for name in names:
+            if name not in self.position:
+                self.position[name] = self.next_position
+                self.next_position += 1
+
+    @staticmethod
+    def _tool_names(agent: Dict[str, Any]) -> Set[str]:
+        return {tool for tool in agent.get("tools") or [] if isinstance(tool, str)}
+
+    def refresh(self, name: str, agent: Optional[Dict[str, Any]]):
+        """
+        Bring the index up to date with one agent's tools and parent.
+        :param name: The agent name.
+        :param agent: The agent's record, or None if the agent was removed.
+        """
+        if agent is None:
+            self._remove(name)
+            return
+        if name not in self.position:
+            # Last in the order: edges into it from existing agents already point forward
+            self.position[name] = self.next_position
+            self.next_position += 1
+            if not self.parents.get(name):
+                self.orphans.add(name)
+        if agent.get("_parent"):
+            self.frontman_candidates.discard(name)
+        else:
+            self.frontman_candidates.add(name)
+
+        old_children = self.children.get(name, set())
+        new_children = self._tool_names(agent)
+        self.children[name] = new_children
+        for child in old_children - new_children:
+            self._unlink(name, child)
+        for child in new_children - old_children:
+            self._link(name, child)
+        if not self.acyclic and old_children - new_children:
+            # The removed edges may have broken the cycle; the order is only kept while there is none
+            self._sort(self.topological_order())
+
+    def _remove(self, name: str):
+        if name not in self.position:
+            return
+        for child in self.children.pop(name, set()):
+            self._unlink(name, child)
+        del self.position[name]
+        self.frontman_candidates.discard(name)
+        self.orphans.discard(name)
+        if not self.acyclic:
+            self._sort(self.topological_order())
+
+    def _link(self, source: str, target: str):
+        self.parents.setdefault(target, set()).add(source)
+        self.orphans.discard(target)
+        if target in self.position and self.acyclic and self.position[source] >= self.position[target]:
+            self._reorder(source, target)
+
+    def _unlink(self, source: str, target: str):
+        sources = self.parents.get(target)
+        if sources is None:
+            return
+        sources.discard(source)
+        if not sources:
+            del self.parents[target]
+            if target in self.position:
+                self.orphans.add(target)
+
+    def _reorder(self, source: str, target: str):
+        """
+        Restore the topological order after adding source -> target with target before source.
+        Only agents positioned between the two are visited and moved (Pearce-Kelly).
+        """
+        lower, upper = self.position[target], self.position[source]
+        forward = self._collect(target, self.children, lambda pos: pos <= upper)
+        if source in forward:
+            self.acyclic = False
+            return
+        backward = self._collect(source, self.parents, lambda pos: pos >= lower)
+        moved = sorted(backward, key=self.position.get) + sorted(forward, key=self.position.get)
+        slots = sorted(self.position[name] for name in moved)
+        for name, slot in zip(moved, slots):
+            self.position[name] = slot
+
+    def _collect(self, start: str, edges: Dict[str, Set[str]], within) -> List[str]:
+        """Agents reachable from start along edges whose position satisfies within."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for neighbour in edges.get(stack.pop(), ()):
+                if neighbour not in seen and neighbour in self.position and within(self.position[neighbour]):
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        return list(seen)
+
+    def would_create_cycle(self, source: str, target: str) -> bool:
+        """
+        Whether adding source -> target would close a cycle, i.e. target already reaches source.
+        :param source: The agent the edge starts at.
+        :param target: The agent the edge points to.
+        :return: True if the edge would create a cycle.
+        """
+        if source == target:
+            return True
+        if not self.acyclic:
+            return source in self._collect(target, self.children, lambda pos: True)
+        if self.position[source] < self.position[target]:
+            # Everything reachable from target comes after it, so source is out of reach
+            return False
+        upper = self.position[source]
+        return source in self._collect(target, self.children, lambda pos: pos <= upper)
+
+    def sources(self, name: str) -> Iterable[str]:
+        """The agents listing name in their tools."""
+        return tuple(self.parents.get(name, ()))
+
+    def topological_order(self) -> List[str]:
+        """The agents, each before every agent it reaches (meaningful while the network is acyclic)."""
+        return sorted(self.position, key=self.position.get)
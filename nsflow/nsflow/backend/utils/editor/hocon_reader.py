@@ -26,6 +26,8 @@ from typing import Any, Dict, List, Optional
 
 from leaf_common.persistence.easy.easy_hocon_persistence import EasyHoconPersistence
 
+from nsflow.backend.utils.agentutils.registry_index import get_registry_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,17 +61,8 @@ class IndependentHoconReader:
             if not os.path.exists(self.manifest_file):
                 return {"networks": []}
 
-            # Use EasyHoconPersistence
-            hocon = EasyHoconPersistence(full_ref=self.manifest_file, must_exist=True)
-            config = hocon.restore()
-
-            networks = [
-                os.path.splitext(os.path.basename(file))[0].replace('"', "").strip()
-                for file, enabled in config.items()
-                if enabled is True
-            ]
-
-            return {"networks": networks}
+            # The shared registry index re-reads manifests only when they change on disk
+            return get_registry_index(self.manifest_file).list_available_networks()
 
         except Exception as e:
             logger.error(f"Failed to list available networks: {e}")
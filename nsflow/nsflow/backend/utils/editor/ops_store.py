@@ -20,8 +20,9 @@ import copy
 import json
 import logging
 import os
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from werkzeug.utils import secure_filename
 
@@ -34,6 +35,24 @@ if not log.handlers:
     log.addHandler(h)
     log.setLevel(logging.INFO)
 
+# Every history.jsonl record starts with its kind and a sequence number, so the log can be indexed
+# without decoding the (possibly large) forward/inverse payloads.
+RECORD_PREFIX = re.compile(rb'^\{"(seq|undo|redo|cursor)": (\d+)')
+# Rewrite the log once it holds this many more records than live entries (and more than the live entries)
+COMPACT_MIN_DEAD_RECORDS = int(os.getenv("NSFLOW_OPS_COMPACT_MIN_DEAD", "1000"))
+# Checkpoint the state once the cursor is this many operations away from the last snapshot
+SNAPSHOT_INTERVAL = int(os.getenv("NSFLOW_OPS_SNAPSHOT_INTERVAL", "100"))
+SNAPSHOT_PREFIX = re.compile(rb'^\{"seq": (\d+)')
+
+
+class BatchOperationError(RuntimeError):
+    """An operation of a batch failed; the batch was rolled back."""
+
+    def __init__(self, index: int, op: str, error: Exception):
+        super().__init__(f"Batch operation {index} ({op}) failed: {error}")
+        self.index = index
+        self.op = op
+
 
 class OperationStore:
     """
@@ -43,9 +62,21 @@ class OperationStore:
 
     Files:
       root/
-        base_state.json      # snapshot when the store is created
-        history.jsonl        # append-only: {"ts", "forward", "inverse"}
-        redo_stack.jsonl     # stack used only after undo
+        base_state.json      # state when the store is created (before entry 1)
+        snapshot.json        # {"seq": n, "state"}: checkpoint of the state after entries 1..n
+        history.jsonl        # append-only log, one record per line:
+                             #   {"seq": n, "ts", "forward", "inverse"}  entry n; drops entries >= n (the redo tail)
+                             #   {"undo": n} / {"redo": n}               cursor moved off / onto entry n
+                             #   {"cursor": n}                           cursor position after a compaction
+        redo_stack.jsonl     # legacy redo stack, folded into history.jsonl when an old draft is opened
+
+    The store keeps the byte offset of every live entry and the cursor (number of applied entries)
+    in memory, so undo and redo read one line and append one short record. Entries dropped by new
+    edits after an undo stay in the file until it is compacted.
+
+    Loading a draft starts from the snapshot and replays only the entries between it and the cursor
+    (backwards through their inverses if the cursor was undone past it). A snapshot is written every
+    SNAPSHOT_INTERVAL operations and on save_draft, and is discarded when an edit replaces an entry it covers.
     """
 
     def __init__(self, design_id: str, manager: Any):
@@ -69,20 +100,28 @@ class OperationStore:
         self.hist_file = os.path.join(self.root, "history.jsonl")
         self.redo_file = os.path.join(self.root, "redo_stack.jsonl")
         self.meta_file = os.path.join(self.root, "meta.json")
+        self.snapshot_file = os.path.join(self.root, "snapshot.json")
 
         # Initialize files if they don't exist
         if not os.path.exists(self.base_file):
-            self._write_json(self.base_file, copy.deepcopy(self.manager.get_state()))
+            self._write_json(self.base_file, self.manager.get_state())
         if not os.path.exists(self.hist_file):
             open(self.hist_file, "w").close()
-        if not os.path.exists(self.redo_file):
-            open(self.redo_file, "w").close()
         if not os.path.exists(self.meta_file):
             self._write_json(
                 self.meta_file,
                 {"design_id": design_id, "created_at": self._now(), "last_saved": self._now(), "version": "1.0"},
             )
 
+        # Byte offsets of the live entries (seq 1..n) and the number of them currently applied
+        self._offsets: List[int] = []
+        self.cursor = 0
+        # Lines in history.jsonl, live or not; drives compaction
+        self._records = 0
+        self._load_index()
+        # Sequence number the snapshot corresponds to, None without a usable one
+        self.snapshot_seq = self._read_snapshot_seq()
+
     # ----------------- Public API -----------------
 
     def apply(self, forward: Dict[str, Any]) -> None:
@@ -107,49 +146,279 @@ class OperationStore:
           Edge-level:
           - add_edge(src, dst)
           - remove_edge(src, dst)
+
+          Compound:
+          - batch(ops)  # Atomic: the ops in order, recorded as one entry (see apply_batch)
         """
-        inv = self._execute_and_make_inverse(forward["op"], forward.get("args", {}))
-        self._append_jsonl(self.hist_file, {"ts": self._now(), "forward": forward, "inverse": inv})
-        # A new edit invalidates redo (classic editor semantics)
-        open(self.redo_file, "w").close()
+        with self.manager.grouped_changes():
+            inv = self._execute_and_make_inverse(forward["op"], forward.get("args", {}))
+        seq = self.cursor + 1
+        if self.snapshot_seq is not None and self.snapshot_seq > self.cursor:
+            # The snapshot includes an undone entry this edit replaces
+            self._discard_snapshot()
+        offset = self._append_record({"seq": seq, "ts": self._now(), "forward": forward, "inverse": inv})
+        # A new edit invalidates redo (classic editor semantics): the entries past the cursor become dead records
+        del self._offsets[self.cursor :]
+        self._offsets.append(offset)
+        self.cursor = seq
+        self._maybe_compact()
+        self._maybe_snapshot()
         log.info("apply: %s  inverse: %s", forward["op"], inv["op"])
 
+    def apply_batch(self, ops: List[Dict[str, Any]]) -> None:
+        """
+        Apply an ordered list of forward operations atomically as one history entry, written once.
+        Its inverse undoes them in reverse order. If an operation fails, the ones before it are
+        rolled back, nothing is recorded and BatchOperationError is raised.
+        """
+        self.apply({"op": "batch", "args": {"ops": ops}})
+
     def undo(self) -> bool:
         """
-        Pop last history entry, apply its inverse, push that entry to redo stack.
+        Apply the inverse of the entry at the cursor and move the cursor back over it.
         """
-        history = self._read_jsonl(self.hist_file)
-        if not history:
+        if self.cursor == 0:
             log.info("undo: empty history")
             return False
-        last = history[-1]
-        inv = last["inverse"]
-        self._execute(inv["op"], inv.get("args", {}))
-        # truncate history
-        self._write_jsonl(self.hist_file, history[:-1])
-        # push to redo
-        self._append_jsonl(self.redo_file, last)
+        entry = self._read_entry(self.cursor)
+        inv = entry["inverse"]
+        with self.manager.grouped_changes():
+            self._execute(inv["op"], inv.get("args", {}))
+        self._append_record({"undo": self.cursor})
+        self.cursor -= 1
+        self._maybe_compact()
+        self._maybe_snapshot()
         log.info("undo: applied %s", inv["op"])
         return True
 
     def redo(self) -> bool:
         """
-        Pop last from redo stack, apply its forward op, append back to history.
+        Re-apply the forward op of the entry just past the cursor and move the cursor onto it.
         """
-        redo_stack = self._read_jsonl(self.redo_file)
-        if not redo_stack:
+        if self.cursor == len(self._offsets):
             log.info("redo: empty")
             return False
-        last = redo_stack[-1]
-        fwd = last["forward"]
-        self._execute(fwd["op"], fwd.get("args", {}))
-        # truncate redo
-        self._write_jsonl(self.redo_file, redo_stack[:-1])
-        # append back to history
-        self._append_jsonl(self.hist_file, last)
+        entry = self._read_entry(self.cursor + 1)
+        fwd = entry["forward"]
+        with self.manager.grouped_changes():
+            self._execute(fwd["op"], fwd.get("args", {}))
+        self._append_record({"redo": self.cursor + 1})
+        self.cursor += 1
+        self._maybe_compact()
+        self._maybe_snapshot()
         log.info("redo: re-applied %s", fwd["op"])
         return True
 
+    def can_undo(self) -> bool:
+        """Whether there is an applied entry to undo."""
+        return self.cursor > 0
+
+    def can_redo(self) -> bool:
+        """Whether there is an undone entry to redo."""
+        return self.cursor < len(self._offsets)
+
+    @property
+    def operation_count(self) -> int:
+        """Number of applied operations (the undo depth)."""
+        return self.cursor
+
+    @property
+    def redo_count(self) -> int:
+        """Number of undone operations that can be redone."""
+        return len(self._offsets) - self.cursor
+
+    def applied_entries(self) -> List[Dict[str, Any]]:
+        """The applied history entries, oldest first."""
+        return [json.loads(line) for line in self._read_lines(self._offsets[: self.cursor])]
+
+    # ----------------- History log -----------------
+
+    @staticmethod
+    def scan_history(path: str) -> Optional[Tuple[List[int], int, int, int]]:
+        """
+        Index a history.jsonl without decoding its entries.
+        :param path: Path of the history log.
+        :return: (offsets of the live entries, cursor, number of complete records, byte length of the
+                 complete records), or None if the file is in the legacy format. A trailing partial line
+                 left by an interrupted write is not counted.
+        """
+        offsets: List[int] = []
+        cursor = 0
+        records = 0
+        position = 0
+        if not os.path.exists(path):
+            return offsets, cursor, records, position
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset = position
+                position += len(line)
+                if not line.strip():
+                    continue
+                match = RECORD_PREFIX.match(line)
+                if match is None:
+                    return None
+                kind, number = match.group(1), int(match.group(2))
+                records += 1
+                if kind == b"seq":
+                    del offsets[number - 1 :]
+                    offsets.append(offset)
+                    cursor = number
+                elif kind == b"undo":
+                    cursor = number - 1
+                else:
+                    # redo and cursor records both leave the cursor on entry `number`
+                    cursor = number
+        return offsets, cursor, records, position
+
+    def _load_index(self):
+        scanned = self.scan_history(self.hist_file)
+        if scanned is None:
+            self._migrate_legacy_history()
+            scanned = self.scan_history(self.hist_file)
+        self._offsets, self.cursor, self._records, length = scanned
+        if os.path.getsize(self.hist_file) > length:
+            # Drop a partial record left by an interrupted write so the next append starts on a new line
+            with open(self.hist_file, "r+b") as f:
+                f.truncate(length)
+
+    def _migrate_legacy_history(self):
+        """Rewrite a history.jsonl/redo_stack.jsonl pair from before the indexed log into the new format."""
+        history = self.read_jsonl(self.hist_file)
+        # The legacy redo stack was pushed on undo, so its last entry is the next one to redo
+        entries = history + list(reversed(self.read_jsonl(self.redo_file)))
+        self._rewrite_history(entries, len(history))
+        if os.path.exists(self.redo_file):
+            os.remove(self.redo_file)
+        log.info("Migrated history of %s to the indexed log (%d entries)", self.design_id, len(entries))
+
+    def _rewrite_history(self, entries: List[Dict[str, Any]], cursor: int) -> List[int]:
+        """Atomically replace history.jsonl with the given entries, returning their offsets."""
+        offsets = []
+        tmp_file = self.hist_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            for seq, entry in enumerate(entries, start=1):
+                offsets.append(f.tell())
+                record = {"seq": seq, "ts": entry.get("ts", self._now()), "forward": entry["forward"]}
+                record["inverse"] = entry["inverse"]
+                f.write(self._encode(record))
+            if cursor < len(entries):
+                f.write(self._encode({"cursor": cursor}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.hist_file)
+        return offsets
+
+    def _maybe_compact(self):
+        dead = self._records - len(self._offsets)
+        if dead >= COMPACT_MIN_DEAD_RECORDS and dead > len(self._offsets):
+            self.compact()
+
+    def compact(self):
+        """
+        Rewrite history.jsonl with only the live entries, dropping undo/redo records and dead entries.
+        Live entry n is already recorded with seq n, so its line is copied as is.
+        """
+        offsets = []
+        tmp_file = self.hist_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            for line in self._read_lines(self._offsets):
+                offsets.append(f.tell())
+                f.write(line)
+            if self.cursor < len(offsets):
+                f.write(self._encode({"cursor": self.cursor}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.hist_file)
+        self._offsets = offsets
+        self._records = len(offsets) + (1 if self.cursor < len(offsets) else 0)
+        log.info("compacted history for %s: %d entries", self.design_id, len(offsets))
+
+    def _append_record(self, record: Dict[str, Any]) -> int:
+        """Append one record to history.jsonl and return its byte offset."""
+        with open(self.hist_file, "ab") as f:
+            offset = f.tell()
+            f.write(self._encode(record))
+        self._records += 1
+        return offset
+
+    def _read_entry(self, seq: int) -> Dict[str, Any]:
+        """Read the live entry with sequence number seq (1-based)."""
+        with open(self.hist_file, "rb") as f:
+            f.seek(self._offsets[seq - 1])
+            return json.loads(f.readline())
+
+    def _read_lines(self, offsets: List[int]) -> List[bytes]:
+        """Read the raw record lines at the given offsets with one open file."""
+        with open(self.hist_file, "rb") as f:
+            lines = []
+            for offset in offsets:
+                f.seek(offset)
+                lines.append(f.readline())
+            return lines
+
+    # ----------------- Snapshots -----------------
+
+    def write_snapshot(self) -> None:
+        """Checkpoint the current state as the state after the applied entries."""
+        data = self._encode({"seq": self.cursor, "ts": self._now(), "state": self.manager.get_state()})
+        tmp_file = self.snapshot_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        os.replace(tmp_file, self.snapshot_file)
+        self.snapshot_seq = self.cursor
+
+    def _maybe_snapshot(self):
+        last = self.snapshot_seq or 0
+        if abs(self.cursor - last) >= SNAPSHOT_INTERVAL:
+            self.write_snapshot()
+
+    def _discard_snapshot(self):
+        if os.path.exists(self.snapshot_file):
+            os.remove(self.snapshot_file)
+        self.snapshot_seq = None
+
+    def _read_snapshot_seq(self) -> Optional[int]:
+        """The snapshot's sequence number, read from its first bytes; None if missing or past the log."""
+        if not os.path.exists(self.snapshot_file):
+            return None
+        with open(self.snapshot_file, "rb") as f:
+            match = SNAPSHOT_PREFIX.match(f.read(32))
+        if match is None or int(match.group(1)) > len(self._offsets):
+            return None
+        return int(match.group(1))
+
+    def _read_start_state(self) -> Tuple[Dict[str, Any], int]:
+        """The state to replay from: the snapshot if there is a readable one, else the base state."""
+        if self.snapshot_seq is not None:
+            try:
+                snapshot = self._read_json(self.snapshot_file)
+                return snapshot["state"], snapshot["seq"]
+            except (ValueError, KeyError) as e:
+                log.warning("Ignoring unreadable snapshot for %s: %s", self.design_id, e)
+                self.snapshot_seq = None
+        return self._read_json(self.base_file), 0
+
+    def _restore(self) -> int:
+        """Rebuild the manager's state at the cursor, returning the number of operations replayed."""
+        state, seq = self._read_start_state()
+        self.manager.current_state = state
+        if seq <= self.cursor:
+            for line in self._read_lines(self._offsets[seq : self.cursor]):
+                forward = json.loads(line)["forward"]
+                self._execute(forward["op"], forward.get("args", {}))
+        else:
+            # Undone past the snapshot: walk back through the inverses
+            for line in reversed(self._read_lines(self._offsets[self.cursor : seq])):
+                inverse = json.loads(line)["inverse"]
+                self._execute(inverse["op"], inverse.get("args", {}))
+        return abs(self.cursor - seq)
+
+    @staticmethod
+    def _encode(record: Dict[str, Any]) -> bytes:
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
     # ----------------- Inverse construction -----------------
 
     def _execute_and_make_inverse(self, op: str, args: Dict[str, Any]) -> Dict[str, Any]:
@@ -157,8 +426,18 @@ class OperationStore:
         Execute the forward op on manager and construct the exact inverse op.
         We read 'before' from manager.get_state() when needed.
         """
-        # We always read a deep copy of the state before applying mutating ops
-        before = copy.deepcopy(self.manager.get_state())
+        # get_state() is a read-only view that the mutating op below does not change, so it needs no copy
+        before = self.manager.get_state()
+
+        if op == "batch":
+            inverses = []
+            with self.manager.transaction():
+                for index, sub in enumerate(args["ops"]):
+                    try:
+                        inverses.append(self._execute_and_make_inverse(sub["op"], sub.get("args", {})))
+                    except Exception as e:
+                        raise BatchOperationError(index, sub.get("op", ""), e) from e
+            return {"op": "batch", "args": {"ops": inverses[::-1]}}
 
         # Network-level operations
         if op == "set_network_name":
@@ -174,7 +453,7 @@ class OperationStore:
             state_dict = args["state_dict"]
             source = args.get("source", "ops_store")
             # Save current state as inverse
-            current_state = copy.deepcopy(before)
+            current_state = before
             ok = self.manager.update_network_state(network_name, state_dict, source)
             if not ok:
                 raise RuntimeError("update_network_state failed")
@@ -183,7 +462,7 @@ class OperationStore:
         if op == "update_top_level_config":
             updates = args["updates"]
             # Save current top-level config as inverse
-            current_top_level = copy.deepcopy(before.get("top_level", {}))
+            current_top_level = before.get("top_level", {})
             ok = self.manager.update_top_level_config(updates)
             if not ok:
                 raise RuntimeError("update_top_level_config failed")
@@ -278,7 +557,7 @@ class OperationStore:
             # capture full agent & relationships BEFORE deletion
             if name not in before["agents"]:
                 raise ValueError(f"Agent '{name}' not found")
-            deleted_agent = copy.deepcopy(before["agents"][name])
+            deleted_agent = before["agents"][name]
             # all children that had this agent as parent (by convention: stored in child["_parent"])
             children = [a for a, d in before["agents"].items() if d.get("_parent") == name]
             parent = deleted_agent.get("_parent")
@@ -298,7 +577,7 @@ class OperationStore:
             updates = args["updates"]
             if name not in before["agents"]:
                 raise ValueError(f"Agent '{name}' not found")
-            prev = copy.deepcopy(before["agents"][name])
+            prev = before["agents"][name]
 
             ok = self.manager.update_agent(name, updates)  # :contentReference[oaicite:5]{index=5}
             if not ok:
@@ -344,13 +623,13 @@ class OperationStore:
         if op == "restore_full_state":
             # Restore complete state (used as inverse for update_network_state)
             state = args["state"]
-            self.manager.current_state = copy.deepcopy(state)
-            return {"op": "restore_full_state", "args": {"state": copy.deepcopy(self.manager.get_state())}}
+            self.manager.current_state = state
+            return {"op": "restore_full_state", "args": {"state": before}}
 
         if op == "restore_top_level_config":
             # Restore complete top-level config (used as inverse for update_top_level_config)
             config = args["config"]
-            current_top_level = copy.deepcopy(before.get("top_level", {}))
+            current_top_level = before.get("top_level", {})
             ok = self.manager.restore_top_level_config(config)
             if not ok:
                 raise RuntimeError("restore_top_level_config failed")
@@ -362,6 +641,12 @@ class OperationStore:
         """
         Execute an operation without recording history (used for undo/redo).
         """
+        if op == "batch":
+            with self.manager.transaction():
+                for sub in args["ops"]:
+                    self._execute(sub["op"], sub.get("args", {}))
+            return
+
         # Network-level operations
         if op == "set_network_name":
             ok = self.manager.set_network_name(args["name"])
@@ -384,7 +669,7 @@ class OperationStore:
             return
 
         if op == "restore_full_state":
-            self.manager.current_state = copy.deepcopy(args["state"])
+            self.manager.current_state = args["state"]
             return
 
         if op == "restore_top_level_config":
@@ -559,12 +844,12 @@ class OperationStore:
                 "version": "1.0",
                 "network_name": self.manager.get_state().get("network_name", ""),
                 "agent_count": len(self.manager.get_state().get("agents", {})),
-                "operation_count": len(self._read_jsonl(self.hist_file)),
+                "operation_count": self.operation_count,
             }
             self._write_json(self.meta_file, meta)
 
-            # Update base state to current state
-            self._write_json(self.base_file, copy.deepcopy(self.manager.get_state()))
+            # Checkpoint the current state; base_state.json stays the state the history starts from
+            self.write_snapshot()
 
             log.info(f"Draft saved for design_id: {self.design_id}")
             return True
@@ -576,8 +861,6 @@ class OperationStore:
         """Get draft metadata and statistics"""
         try:
             meta = self._read_json(self.meta_file)
-            history = self._read_jsonl(self.hist_file)
-            redo_stack = self._read_jsonl(self.redo_file)
 
             return {
                 "design_id": self.design_id,
@@ -585,9 +868,9 @@ class OperationStore:
                 "created_at": meta.get("created_at"),
                 "last_saved": meta.get("last_saved"),
                 "agent_count": meta.get("agent_count", 0),
-                "operation_count": len(history),
-                "can_undo": len(history) > 0,
-                "can_redo": len(redo_stack) > 0,
+                "operation_count": self.operation_count,
+                "can_undo": self.can_undo(),
+                "can_redo": self.can_redo(),
                 "draft_path": self.root,
             }
         except Exception as e:
@@ -595,8 +878,11 @@ class OperationStore:
             return {}
 
     @staticmethod
-    def list_all_drafts() -> List[Dict[str, Any]]:
-        """List all draft states in the draft_states directory"""
+    def list_draft_meta() -> List[Dict[str, Any]]:
+        """
+        List the metadata of all draft states from their meta.json files alone,
+        without reading their history or state.
+        """
         draft_root = os.path.join(ROOT_DIR, "draft_states")
         if not os.path.exists(draft_root):
             return []
@@ -605,53 +891,70 @@ class OperationStore:
         try:
             for design_dir in os.listdir(draft_root):
                 design_path = os.path.join(draft_root, design_dir)
-                if os.path.isdir(design_path):
-                    meta_file = os.path.join(design_path, "meta.json")
-                    if os.path.exists(meta_file):
-                        try:
-                            meta = OperationStore._read_json(meta_file)
-                            history_file = os.path.join(design_path, "history.jsonl")
-                            history = OperationStore._read_jsonl(history_file)
-                            redo_file = os.path.join(design_path, "redo_stack.jsonl")
-                            redo_stack = OperationStore._read_jsonl(redo_file)
-
-                            drafts.append(
-                                {
-                                    "design_id": meta.get("design_id", design_dir),
-                                    "network_name": meta.get("network_name", ""),
-                                    "created_at": meta.get("created_at"),
-                                    "last_saved": meta.get("last_saved"),
-                                    "agent_count": meta.get("agent_count", 0),
-                                    "operation_count": len(history),
-                                    "can_undo": len(history) > 0,
-                                    "can_redo": len(redo_stack) > 0,
-                                    "source": "draft",
-                                    "draft_path": design_path,
-                                }
-                            )
-                        except Exception as e:
-                            log.warning(f"Failed to read draft metadata from {design_path}: {e}")
+                meta_file = os.path.join(design_path, "meta.json")
+                if os.path.exists(meta_file):
+                    try:
+                        meta = OperationStore._read_json(meta_file)
+                        drafts.append(
+                            {
+                                "design_id": meta.get("design_id", design_dir),
+                                "network_name": meta.get("network_name", ""),
+                                "created_at": meta.get("created_at"),
+                                "last_saved": meta.get("last_saved"),
+                                "agent_count": meta.get("agent_count", 0),
+                                "draft_path": design_path,
+                            }
+                        )
+                    except Exception as e:
+                        log.warning(f"Failed to read draft metadata from {design_path}: {e}")
         except Exception as e:
             log.error(f"Failed to list drafts: {e}")
 
         return drafts
 
+    @staticmethod
+    def list_all_drafts() -> List[Dict[str, Any]]:
+        """List all draft states in the draft_states directory"""
+        drafts = []
+        for meta in OperationStore.list_draft_meta():
+            try:
+                operation_count, redo_count = OperationStore.count_history(meta["draft_path"])
+            except Exception as e:
+                log.warning(f"Failed to read draft history from {meta['draft_path']}: {e}")
+                continue
+            drafts.append(
+                {
+                    **meta,
+                    "operation_count": operation_count,
+                    "can_undo": operation_count > 0,
+                    "can_redo": redo_count > 0,
+                    "source": "draft",
+                }
+            )
+        return drafts
+
+    @staticmethod
+    def count_history(design_path: str) -> Tuple[int, int]:
+        """(applied, redoable) operation counts of a draft directory, without decoding its entries."""
+        scanned = OperationStore.scan_history(os.path.join(design_path, "history.jsonl"))
+        if scanned is None:
+            history = OperationStore.read_jsonl(os.path.join(design_path, "history.jsonl"))
+            redo_stack = OperationStore.read_jsonl(os.path.join(design_path, "redo_stack.jsonl"))
+            return len(history), len(redo_stack)
+        offsets, cursor, _records, _length = scanned
+        return cursor, len(offsets) - cursor
+
     @staticmethod
     def load_draft(design_id: str, manager: Any) -> Optional["OperationStore"]:
         """Load an existing draft and return the OperationStore"""
         try:
             store = OperationStore(design_id, manager)
-            # Load the base state into the manager
-            base_state = store._read_json(store.base_file)
-            manager.current_state = copy.deepcopy(base_state)
+            # Start from the snapshot (or the base state) and replay the operations up to the cursor
+            replayed = store._restore()
+            if replayed >= SNAPSHOT_INTERVAL:
+                store.write_snapshot()
 
-            # Replay all operations to get to current state
-            history = store._read_jsonl(store.hist_file)
-            for entry in history:
-                forward = entry["forward"]
-                store._execute(forward["op"], forward.get("args", {}))
-
-            log.info(f"Loaded draft for design_id: {design_id}")
+            log.info(f"Loaded draft for design_id: {design_id} ({replayed} operations replayed)")
             return store
         except Exception as e:
             log.error(f"Failed to load draft {design_id}: {e}")
@@ -663,17 +966,6 @@ class OperationStore:
     def _now() -> str:
         return datetime.now().isoformat()
 
-    @staticmethod
-    def _append_jsonl(path: str, obj: Dict[str, Any]) -> None:
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(obj, ensure_ascii=False) + "\n")
-
-    @staticmethod
-    def _write_jsonl(path: str, rows: List[Dict[str, Any]]) -> None:
-        with open(path, "w", encoding="utf-8") as f:
-            for r in rows:
-                f.write(json.dumps(r, ensure_ascii=False) + "\n")
-
     @staticmethod
     def read_jsonl(path: str) -> List[Dict[str, Any]]:
         if not os.path.exists(path):
@@ -17,15 +17,24 @@
 """
 Simplified state manager that avoids locks and complex async patterns.
 Designed for single-user editing sessions with simpler state management.
+
+The state is shared structurally: history entries and the views returned by get_state() are
+read-only (see frozen_state) and reference the same agent records as the current state. An edit
+replaces only the records it changes, so a history entry costs the changed records plus one
+reference per agent instead of a deep copy of the network.
 """
 
 import json
 import logging
 import os
 import uuid
+from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from nsflow.backend.utils.editor.frozen_state import FrozenDict, FrozenList, freeze
+from nsflow.backend.utils.editor.graph_index import GraphIndex
 
 logger = logging.getLogger(__name__)
 
@@ -40,18 +49,121 @@ class SimpleStateManager:
 
     def __init__(self, design_id: Optional[str] = None):
         self.design_id = design_id or str(uuid.uuid4())
-        self.current_state: Dict[str, Any] = {}
-        self.state_history: List[Dict[str, Any]] = []
+        # Working state: the top-level dict and the agents dict are owned by the manager, the values
+        # in them may be frozen records shared with history and views (see _own_agent/_own)
+        self._state: Dict[str, Any] = {}
+        # Graph index over the agents, kept in step by the per-agent edits and rebuilt on first use
+        # after an edit that replaces the agents wholesale (see _graph_index)
+        self._graph: Optional[GraphIndex] = None
+        self.state_history: List[FrozenDict] = []
         self.history_index = -1
         self.max_history = 20  # Reduced for simplicity
+        # Set while a transaction() groups edits into a single history entry
+        self._in_transaction = False
+        # Called with the manager after each completed edit, e.g. to push it to editor clients (state_sync)
+        self.change_listeners: List[Callable[["SimpleStateManager"], None]] = []
+        # Depth of nested grouped_changes() blocks; listeners are told when the outermost one ends
+        self._change_group_depth = 0
 
         if self.NSFLOW_PLUGIN_MANUAL_EDITOR:
             # Initialize empty state structure
             self._initialize_empty_state()
 
+    @property
+    def current_state(self) -> Dict[str, Any]:
+        """
+        The working state. Its top level and agents dict can be assigned to; agent records and
+        nested values may be read-only and are changed through the manager's methods.
+        """
+        return self._state
+
+    @current_state.setter
+    def current_state(self, state: Dict[str, Any]):
+        self._set_working_state(freeze(state))
+        self._notify_change()
+
+    @staticmethod
+    def _working_copy(frozen_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Shallow working state over a frozen one: new top-level and agents dicts, shared records."""
+        state = dict(frozen_state)
+        if "agents" in state:
+            state["agents"] = dict(state["agents"])
+        return state
+
+    def _set_working_state(self, frozen_state: Dict[str, Any]):
+        """Replace the working state with one over a frozen state, e.g. a history entry."""
+        self._state = self._working_copy(frozen_state)
+        self._graph = None
+
+    def _graph_index(self) -> GraphIndex:
+        """The graph index of the agents, built from the current state if it is not kept yet."""
+        if self._graph is None:
+            self._graph = GraphIndex.build(self._state["agents"])
+        return self._graph
+
+    def _reindex(self, *agent_names: str):
+        """Update the graph index, if it is kept, for agents whose tools or parent changed."""
+        if self._graph is not None:
+            agents = self._state["agents"]
+            for agent_name in agent_names:
+                self._graph.refresh(agent_name, agents.get(agent_name))
+
+    def _snapshot(self) -> FrozenDict:
+        """
+        Freeze the working state in place and return it as a read-only state.
+        Records frozen by an earlier snapshot are reused as they are.
+        """
+        state = self._state
+        for key, value in state.items():
+            if key != "agents":
+                state[key] = freeze(value)
+        agents = state.get("agents")
+        if agents is None:
+            return FrozenDict(state)
+        for name, agent in agents.items():
+            if not isinstance(agent, FrozenDict):
+                agents[name] = freeze(agent)
+        snapshot = dict(state)
+        snapshot["agents"] = FrozenDict(agents)
+        return FrozenDict(snapshot)
+
+    def _own(self, key: str) -> Dict[str, Any]:
+        """Make a top-level section (meta, top_level) of the working state writable and return it."""
+        section = self._state[key]
+        if isinstance(section, FrozenDict):
+            section = dict(section)
+            self._state[key] = section
+        return section
+
+    def _own_agent(self, agent_name: str) -> Dict[str, Any]:
+        """Make an agent record writable, including its tools list, and return it."""
+        agents = self._state["agents"]
+        agent = agents[agent_name]
+        if isinstance(agent, FrozenDict) or isinstance(agent.get("tools"), FrozenList):
+            agent = dict(agent)
+            if "tools" in agent:
+                agent["tools"] = list(agent["tools"])
+            agents[agent_name] = agent
+        return agent
+
+    def _touch(self):
+        self._own("meta")["updated_at"] = datetime.now().isoformat()
+        self._notify_change()
+
+    def _notify_change(self):
+        """Tell the change listeners about a completed edit; a transaction tells them once, at its end."""
+        if self._in_transaction or self._change_group_depth:
+            return
+        for listener in list(self.change_listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                logger.error(f"State change listener failed: {e}")
+
     def _initialize_empty_state(self):
         """Initialize an empty state structure"""
-        self.current_state = {
+        self._graph = None
+        self._state = {
             "design_id": self.design_id,
             "network_name": "",
             "meta": {"created_at": datetime.now().isoformat(), "updated_at": datetime.now().isoformat(), "version": 1},
@@ -65,12 +177,16 @@ class SimpleStateManager:
 
     def _save_to_history(self):
         """Save current state to history for undo/redo"""
+        if self._in_transaction:
+            # The transaction saved the state before its first edit
+            return
+
         # Remove future history if we're not at the end
         if self.history_index < len(self.state_history) - 1:
             self.state_history = self.state_history[: self.history_index + 1]
 
-        # Add current state to history
-        self.state_history.append(deepcopy(self.current_state))
+        # Add current state to history; it shares every record with the working state
+        self.state_history.append(self._snapshot())
         self.history_index = len(self.state_history) - 1
 
         # Limit history size
@@ -78,12 +194,49 @@ class SimpleStateManager:
             self.state_history.pop(0)
             self.history_index -= 1
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group the edits made inside the block into one history entry. If the block raises,
+        the state and history are restored to what they were before it. Nested transactions
+        join the outermost one.
+        """
+        if self._in_transaction:
+            yield
+            return
+
+        saved = (self._snapshot(), list(self.state_history), self.history_index)
+        self._save_to_history()
+        self._in_transaction = True
+        try:
+            yield
+        except BaseException:
+            snapshot, self.state_history, self.history_index = saved
+            self._set_working_state(snapshot)
+            raise
+        finally:
+            self._in_transaction = False
+        self._notify_change()
+
+    @contextmanager
+    def grouped_changes(self) -> Iterator[None]:
+        """
+        Report the edits made inside the block to the change listeners as one change, at its end.
+        Unlike transaction(), history entries and failures are left to the edits themselves.
+        """
+        self._change_group_depth += 1
+        try:
+            yield
+        finally:
+            self._change_group_depth -= 1
+            self._notify_change()
+
     def undo(self) -> bool:
         """Undo last operation"""
         if self.history_index > 0:
             self.history_index -= 1
-            self.current_state = deepcopy(self.state_history[self.history_index])
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._set_working_state(self.state_history[self.history_index])
+            self._touch()
             return True
         return False
 
@@ -91,8 +244,8 @@ class SimpleStateManager:
         """Redo last undone operation"""
         if self.history_index < len(self.state_history) - 1:
             self.history_index += 1
-            self.current_state = deepcopy(self.state_history[self.history_index])
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._set_working_state(self.state_history[self.history_index])
+            self._touch()
             return True
         return False
 
@@ -105,15 +258,18 @@ class SimpleStateManager:
         return self.history_index < len(self.state_history) - 1
 
     def get_state(self) -> Dict[str, Any]:
-        """Get current state"""
-        return deepcopy(self.current_state)
+        """
+        Get the current state as a read-only view. It does not change with later edits;
+        use copy.deepcopy() for a mutable copy.
+        """
+        return self._snapshot()
 
     def set_network_name(self, network_name: str) -> bool:
         """Set network name"""
         try:
             self._save_to_history()
             self.current_state["network_name"] = network_name
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._touch()
             return True
         except Exception as e:
             logger.error(f"Failed to set network name: {e}")
@@ -140,7 +296,7 @@ class SimpleStateManager:
             # Set parent relationships
             self._update_parent_relationships()
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._touch()
 
         except Exception as e:
             logger.error(f"Failed to load from HOCON: {e}")
@@ -148,7 +304,7 @@ class SimpleStateManager:
 
     def _load_top_level_config(self, hocon_config: Dict[str, Any]):
         """Load top-level configuration from HOCON"""
-        top_level = self.current_state["top_level"]
+        top_level = self._own("top_level")
 
         # Map HOCON fields to our structure
         field_mappings = {
@@ -205,14 +361,14 @@ class SimpleStateManager:
     def _update_parent_relationships(self):
         """Update parent relationships based on tools connections"""
         # Reset all parent relationships
-        for agent in self.current_state["agents"].values():
-            agent["_parent"] = None
+        for agent_name in self.current_state["agents"]:
+            self._own_agent(agent_name)["_parent"] = None
 
         # Set parent relationships based on tools
         for agent_name, agent in self.current_state["agents"].items():
             for child_name in agent.get("tools", []):
                 if child_name in self.current_state["agents"]:
-                    self.current_state["agents"][child_name]["_parent"] = agent_name
+                    self._own_agent(child_name)["_parent"] = agent_name
 
     def load_from_copilot_state(self, copilot_state: Dict[str, Any]) -> bool:
         """Load state from copilot agent network definition"""
@@ -223,6 +379,7 @@ class SimpleStateManager:
             agent_network_definition = copilot_state.get("agent_network_definition", {})
 
             # Reset agents but keep top-level config
+            self._graph = None
             self.current_state["agents"] = {}
             self.current_state["network_name"] = network_name
 
@@ -240,7 +397,7 @@ class SimpleStateManager:
             # Set parent relationships
             self._update_parent_relationships()
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._touch()
             return True
 
         except Exception as e:
@@ -270,7 +427,7 @@ class SimpleStateManager:
             else:
                 raise ValueError(f"Unknown template type: {template_type}")
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._touch()
             return True
 
         except Exception as e:
@@ -378,9 +535,10 @@ class SimpleStateManager:
             # Add to parent's tools if parent specified
             if parent_name and parent_name in self.current_state["agents"]:
                 if agent_name not in self.current_state["agents"][parent_name]["tools"]:
-                    self.current_state["agents"][parent_name]["tools"].append(agent_name)
+                    self._own_agent(parent_name)["tools"].append(agent_name)
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._reindex(agent_name, parent_name)
+            self._touch()
             return True
 
         except Exception as e:
@@ -396,11 +554,13 @@ class SimpleStateManager:
             self._save_to_history()
 
             # Update agent properties
-            agent = self.current_state["agents"][agent_name]
+            agent = self._own_agent(agent_name)
             for key, value in updates.items():
-                agent[key] = value
+                agent[key] = freeze(value)
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            if "tools" in updates or "_parent" in updates:
+                self._reindex(agent_name)
+            self._touch()
             return True
 
         except Exception as e:
@@ -425,9 +585,10 @@ class SimpleStateManager:
             parent_name = original_agent.get("_parent")
             if parent_name and parent_name in self.current_state["agents"]:
                 if new_name not in self.current_state["agents"][parent_name]["tools"]:
-                    self.current_state["agents"][parent_name]["tools"].append(new_name)
+                    self._own_agent(parent_name)["tools"].append(new_name)
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._reindex(new_name, parent_name)
+            self._touch()
             return True
 
         except Exception as e:
@@ -443,28 +604,33 @@ class SimpleStateManager:
             self._save_to_history()
 
             agent = self.current_state["agents"][agent_name]
+            graph = self._graph_index()
+            changed = set()
 
             # Remove from parent's tools
             parent_name = agent.get("_parent")
             if parent_name and parent_name in self.current_state["agents"]:
-                tools = self.current_state["agents"][parent_name]["tools"]
-                if agent_name in tools:
-                    tools.remove(agent_name)
+                if agent_name in self.current_state["agents"][parent_name]["tools"]:
+                    self._own_agent(parent_name)["tools"].remove(agent_name)
+                    changed.add(parent_name)
 
             # Update children to have no parent (orphan them)
             for child_name in agent.get("tools", []):
                 if child_name in self.current_state["agents"]:
-                    self.current_state["agents"][child_name]["_parent"] = None
+                    self._own_agent(child_name)["_parent"] = None
+                    changed.add(child_name)
 
-            # Remove agent references from all other agents' tools
-            for other_agent in self.current_state["agents"].values():
-                if agent_name in other_agent.get("tools", []):
-                    other_agent["tools"].remove(agent_name)
+            # Remove agent references from the other agents' tools; the reverse adjacency names them
+            for other_name in graph.sources(agent_name):
+                if other_name != agent_name and agent_name in self.current_state["agents"][other_name]["tools"]:
+                    self._own_agent(other_name)["tools"].remove(agent_name)
+                    changed.add(other_name)
 
             # Delete the agent
             del self.current_state["agents"][agent_name]
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._reindex(agent_name, *changed)
+            self._touch()
             return True
 
         except Exception as e:
@@ -484,14 +650,14 @@ class SimpleStateManager:
             self._save_to_history()
 
             # Add target to source's tools
-            source_tools = self.current_state["agents"][source_agent]["tools"]
-            if target_agent not in source_tools:
-                source_tools.append(target_agent)
+            if target_agent not in self.current_state["agents"][source_agent]["tools"]:
+                self._own_agent(source_agent)["tools"].append(target_agent)
 
             # Set parent relationship
-            self.current_state["agents"][target_agent]["_parent"] = source_agent
+            self._own_agent(target_agent)["_parent"] = source_agent
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._reindex(source_agent, target_agent)
+            self._touch()
             return True
 
         except Exception as e:
@@ -507,16 +673,15 @@ class SimpleStateManager:
             self._save_to_history()
 
             # Remove target from source's tools
-            source_tools = self.current_state["agents"][source_agent]["tools"]
-            if target_agent in source_tools:
-                source_tools.remove(target_agent)
+            if target_agent in self.current_state["agents"][source_agent]["tools"]:
+                self._own_agent(source_agent)["tools"].remove(target_agent)
 
             # Remove parent relationship if this was the parent
-            target_agent_data = self.current_state["agents"][target_agent]
-            if target_agent_data.get("_parent") == source_agent:
-                target_agent_data["_parent"] = None
+            if self.current_state["agents"][target_agent].get("_parent") == source_agent:
+                self._own_agent(target_agent)["_parent"] = None
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._reindex(source_agent, target_agent)
+            self._touch()
             return True
 
         except Exception as e:
@@ -525,27 +690,7 @@ class SimpleStateManager:
 
     def _would_create_cycle(self, source: str, target: str) -> bool:
         """Check if adding edge would create a cycle"""
-        visited = set()
-
-        def dfs(current: str) -> bool:
-            if current == source:
-                return True
-            if current in visited:
-                return False
-
-            visited.add(current)
-
-            agent = self.current_state["agents"].get(current)
-            if not agent:
-                return False
-
-            for child in agent.get("tools", []):
-                if child in self.current_state["agents"] and dfs(child):
-                    return True
-
-            return False
-
-        return dfs(target)
+        return self._graph_index().would_create_cycle(source, target)
 
     def validate_network(self) -> Dict[str, Any]:
         """Validate network structure"""
@@ -559,18 +704,26 @@ class SimpleStateManager:
             return validation_result
 
         # Find frontman (agents with no parent)
-        frontmen = [name for name, agent in agents.items() if not agent.get("_parent")]
+        candidates = self._graph_index().frontman_candidates
 
-        if len(frontmen) == 0:
+        if len(candidates) == 0:
             validation_result["errors"].append("Network has no frontman (root agent)")
             validation_result["valid"] = False
-        elif len(frontmen) > 1:
+        elif len(candidates) > 1:
+            frontmen = [name for name in agents if name in candidates]
             validation_result["warnings"].append(
                 f"Network has multiple frontmen: {', '.join(frontmen)}. Only one frontman is recommended."
             )
 
         return validation_result
 
+    def get_graph_index(self) -> GraphIndex:
+        """
+        The graph index of the agents: adjacency, reverse adjacency, topological order, frontman
+        candidates and orphans. Read it only; it follows the manager's edits.
+        """
+        return self._graph_index()
+
     def export_to_hocon(self) -> Dict[str, Any]:
         """Export current state to HOCON format"""
         hocon_config = {}
@@ -671,9 +824,10 @@ class SimpleStateManager:
                 loaded_state = json.load(f)
 
             self._save_to_history()
-            self.current_state = loaded_state
+            # Not through the current_state setter: _touch() tells the listeners, once the design id is set too
+            self._set_working_state(freeze(loaded_state))
             self.design_id = loaded_state.get("design_id", self.design_id)
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._touch()
 
             return True
         except Exception as e:
@@ -719,6 +873,7 @@ class SimpleStateManager:
             network_name_from_dict = state_dict.get("agent_network_name", network_name)
 
             # Clear current agents and reload from the state_dict
+            self._graph = None
             self.current_state["agents"] = {}
             self.current_state["network_name"] = network_name_from_dict
 
@@ -737,8 +892,8 @@ class SimpleStateManager:
             self._update_parent_relationships()
 
             # Update metadata
-            self.current_state["meta"]["source"] = source
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._own("meta")["source"] = source
+            self._touch()
 
             return True
 
@@ -747,8 +902,8 @@ class SimpleStateManager:
             return False
 
     def get_top_level_config(self) -> Dict[str, Any]:
-        """Get current top-level configuration"""
-        return deepcopy(self.current_state.get("top_level", {}))
+        """Get current top-level configuration as a read-only view"""
+        return self._snapshot().get("top_level", FrozenDict())
 
     def update_top_level_config(self, updates: Dict[str, Any]) -> bool:
         """Update top-level configuration"""
@@ -756,14 +911,14 @@ class SimpleStateManager:
             self._save_to_history()
 
             # Get current top-level config
-            top_level = self.current_state["top_level"]
+            top_level = self._own("top_level")
 
             # Apply updates
             for key, value in updates.items():
                 if value is not None:
                     top_level[key] = value
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._touch()
             return True
 
         except Exception as e:
@@ -776,9 +931,9 @@ class SimpleStateManager:
             self._save_to_history()
 
             # Replace the entire top-level config
-            self.current_state["top_level"] = deepcopy(config)
+            self.current_state["top_level"] = freeze(config)
 
-            self.current_state["meta"]["updated_at"] = datetime.now().isoformat()
+            self._touch()
             return True
 
         except Exception as e:
@@ -32,6 +32,7 @@ from nsflow.backend.utils.agentutils.agent_network_utils import REGISTRY_DIR as
 from nsflow.backend.utils.editor.hocon_reader import IndependentHoconReader
 from nsflow.backend.utils.editor.ops_store import OperationStore
 from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+from nsflow.backend.utils.editor.state_sync import EDITOR_STATE_SYNC
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +52,8 @@ class SimpleStateRegistry:
         self.operation_stores: Dict[str, OperationStore] = {}
         self.network_to_design_ids: Dict[str, List[str]] = {}
         self.design_id_to_info: Dict[str, Dict[str, Any]] = {}
+        # Drafts registered from their metadata at startup; their state is loaded on first access
+        self.pending_drafts: Dict[str, Dict[str, Any]] = {}
 
         # Initialize HOCON reader
         self.hocon_reader = IndependentHoconReader()
@@ -66,61 +69,95 @@ class SimpleStateRegistry:
         self._auto_load_draft_states()
 
     def _auto_load_draft_states(self):
-        """Auto-load existing draft states on startup to preserve operation history"""
+        """
+        Register existing draft states on startup from their metadata alone.
+        A draft's state and operation history are loaded the first time it is accessed.
+        """
         try:
-            draft_states = OperationStore.list_all_drafts()
-            loaded_count = 0
+            draft_states = OperationStore.list_draft_meta()
 
             for draft in draft_states:
                 design_id = draft["design_id"]
-                try:
-                    # Create a new manager
-                    manager = SimpleStateManager(design_id)
-
-                    # Load the draft using OperationStore
-                    operation_store = OperationStore.load_draft(design_id, manager)
-                    if operation_store:
-                        # Register the manager and operation store
-                        self.managers[design_id] = manager
-                        self.operation_stores[design_id] = operation_store
-
-                        # Get network name from the ACTUAL restored state, not metadata
-                        state = manager.get_state()
-                        network_name = state.get("network_name", "")
-
-                        # If network name is empty, try to get it from metadata as fallback
-                        if not network_name:
-                            network_name = draft.get("network_name", f"draft_{design_id[:8]}")
-                            # Update the manager's state with the fallback name
-                            manager.set_network_name(network_name)
-
-                        # Update mappings
-                        if network_name not in self.network_to_design_ids:
-                            self.network_to_design_ids[network_name] = []
-                        self.network_to_design_ids[network_name].append(design_id)
-
-                        # Get additional info from the restored state
-                        meta = state.get("meta", {})
-
-                        self.design_id_to_info[design_id] = {
-                            "network_name": network_name,
-                            "source": "draft_auto_loaded",
-                            "created_at": meta.get("created_at", draft.get("created_at")),
-                            "loaded_at": meta.get("updated_at", draft.get("last_saved")),
-                            "original_network_name": state.get("original_network_name"),
-                        }
-
-                        loaded_count += 1
-
-                except Exception as e:
-                    logger.warning(f"Failed to auto-load draft {design_id}: {e}")
+                network_name = draft.get("network_name") or f"draft_{design_id[:8]}"
+
+                # Update mappings; _hydrate_draft corrects them from the restored state
+                if network_name not in self.network_to_design_ids:
+                    self.network_to_design_ids[network_name] = []
+                self.network_to_design_ids[network_name].append(design_id)
+
+                self.design_id_to_info[design_id] = {
+                    "network_name": network_name,
+                    "source": "draft_auto_loaded",
+                    "created_at": draft.get("created_at"),
+                    "loaded_at": draft.get("last_saved"),
+                    "original_network_name": None,
+                }
+                self.pending_drafts[design_id] = draft
 
-            if loaded_count > 0:
-                logger.info(f"Auto-loaded {loaded_count} draft states with operation history")
+            if draft_states:
+                logger.info(f"Registered {len(draft_states)} draft states, each loaded on first access")
 
         except Exception as e:
             logger.error(f"Failed to auto-load draft states: {e}")
 
+    def _hydrate_draft(self, design_id: str) -> Optional[SimpleStateManager]:
+        """Load the state and operation history of a draft registered at startup"""
+        draft = self.pending_drafts.pop(design_id, None)
+        if draft is None:
+            return self.managers.get(design_id)
+
+        info = self.design_id_to_info[design_id]
+        try:
+            manager = SimpleStateManager(design_id)
+            operation_store = OperationStore.load_draft(design_id, manager)
+        except Exception as e:
+            logger.warning(f"Failed to auto-load draft {design_id}: {e}")
+            operation_store = None
+        if not operation_store:
+            self._unregister(design_id)
+            return None
+
+        # Register the manager and operation store
+        self.managers[design_id] = manager
+        self.operation_stores[design_id] = operation_store
+
+        # Get network name from the ACTUAL restored state, not metadata
+        state = manager.get_state()
+        network_name = state.get("network_name", "")
+
+        if not network_name:
+            # Fall back to the name registered from metadata
+            network_name = info["network_name"]
+            manager.set_network_name(network_name)
+        elif network_name != info["network_name"]:
+            # Renamed since the metadata was saved
+            self._unregister(design_id)
+            if network_name not in self.network_to_design_ids:
+                self.network_to_design_ids[network_name] = []
+            self.network_to_design_ids[network_name].append(design_id)
+
+        meta = state.get("meta", {})
+        self.design_id_to_info[design_id] = {
+            "network_name": network_name,
+            "source": "draft_auto_loaded",
+            "created_at": meta.get("created_at", draft.get("created_at")),
+            "loaded_at": meta.get("updated_at", draft.get("last_saved")),
+            "original_network_name": state.get("original_network_name"),
+        }
+        return manager
+
+    def _unregister(self, design_id: str):
+        """Remove a design ID from the info and network mappings"""
+        info = self.design_id_to_info.pop(design_id, {})
+        network_name = info.get("network_name", "")
+        if network_name in self.network_to_design_ids:
+            if design_id in self.network_to_design_ids[network_name]:
+                self.network_to_design_ids[network_name].remove(design_id)
+
+            # Clean up empty network entries
+            if not self.network_to_design_ids[network_name]:
+                del self.network_to_design_ids[network_name]
+
     def create_new_network(
         self, network_name: str = "", template_type: str = "single_agent", **template_kwargs
     ) -> Tuple[str, SimpleStateManager]:
@@ -268,15 +305,22 @@ class SimpleStateRegistry:
             return design_id, manager
 
     def get_manager(self, design_id: str) -> Optional[SimpleStateManager]:
-        """Get state manager by design ID"""
+        """Get state manager by design ID, loading a registered draft on first access"""
+        if design_id in self.pending_drafts:
+            return self._hydrate_draft(design_id)
         return self.managers.get(design_id)
 
     def get_operation_store(self, design_id: str) -> Optional[OperationStore]:
-        """Get operation store by design ID"""
+        """Get operation store by design ID, loading a registered draft on first access"""
+        if design_id in self.pending_drafts:
+            self._hydrate_draft(design_id)
         return self.operation_stores.get(design_id)
 
     def get_managers_for_network(self, network_name: str) -> Dict[str, SimpleStateManager]:
         """Get all managers for a network name"""
+        for design_id in list(self.network_to_design_ids.get(network_name, [])):
+            if design_id in self.pending_drafts:
+                self._hydrate_draft(design_id)
         design_ids = self.network_to_design_ids.get(network_name, [])
         return {design_id: self.managers[design_id] for design_id in design_ids if design_id in self.managers}
 
@@ -320,7 +364,24 @@ class SimpleStateRegistry:
 
         # Get current editing sessions
         for design_id, info in self.design_id_to_info.items():
-            if design_id in self.managers:
+            if design_id in self.pending_drafts:
+                # Not loaded yet: report it from its metadata and history index
+                draft = self.pending_drafts[design_id]
+                operation_count, redo_count = OperationStore.count_history(draft["draft_path"])
+                result["editing_sessions"].append(
+                    {
+                        "design_id": design_id,
+                        "network_name": info.get("network_name", ""),
+                        "original_network_name": info.get("original_network_name"),
+                        "source": info.get("source", "unknown"),
+                        "agent_count": draft.get("agent_count", 0),
+                        "created_at": info.get("created_at"),
+                        "updated_at": info.get("loaded_at"),
+                        "can_undo": operation_count > 0,
+                        "can_redo": redo_count > 0,
+                    }
+                )
+            elif design_id in self.managers:
                 manager = self.managers[design_id]
                 operation_store = self.operation_stores.get(design_id)
                 state = manager.get_state()
@@ -336,16 +397,8 @@ class SimpleStateRegistry:
                     "agent_count": len(state.get("agents", {})),
                     "created_at": state.get("meta", {}).get("created_at") or info.get("created_at"),
                     "updated_at": state.get("meta", {}).get("updated_at") or info.get("loaded_at"),
-                    "can_undo": (
-                        len(operation_store._read_jsonl(operation_store.hist_file)) > 0
-                        if operation_store
-                        else manager.can_undo()
-                    ),
-                    "can_redo": (
-                        len(operation_store._read_jsonl(operation_store.redo_file)) > 0
-                        if operation_store
-                        else manager.can_redo()
-                    ),
+                    "can_undo": operation_store.can_undo() if operation_store else manager.can_undo(),
+                    "can_redo": operation_store.can_redo() if operation_store else manager.can_redo(),
                 }
 
                 result["editing_sessions"].append(session_info)
@@ -367,6 +420,12 @@ class SimpleStateRegistry:
 
     def load_draft_state(self, design_id: str) -> Tuple[str, SimpleStateManager]:
         """Load a draft state into an active editing session"""
+        if design_id in self.pending_drafts:
+            manager = self._hydrate_draft(design_id)
+            if manager is None:
+                raise Exception(f"Failed to load draft {design_id}")
+            return design_id, manager
+
         try:
             # Create a new manager
             manager = SimpleStateManager(design_id)
@@ -417,6 +476,11 @@ class SimpleStateRegistry:
 
     def delete_session(self, design_id: str) -> bool:
         """Delete an editing session and all associated draft files"""
+        if design_id in self.pending_drafts:
+            # Registered but never loaded: forget it and delete its files below
+            del self.pending_drafts[design_id]
+            self._unregister(design_id)
+
         if design_id not in self.managers:
             # Check if it's a draft that's not currently loaded
             try:
@@ -441,10 +505,6 @@ class SimpleStateRegistry:
                 return False
 
         try:
-            # Get info before deletion
-            info = self.design_id_to_info.get(design_id, {})
-            network_name = info.get("network_name", "")
-
             # Remove operation store and clean up draft files
             if design_id in self.operation_stores:
                 operation_store = self.operation_stores[design_id]
@@ -462,18 +522,9 @@ class SimpleStateRegistry:
             # Remove from managers
             del self.managers[design_id]
 
-            # Remove from mappings
-            if network_name in self.network_to_design_ids:
-                if design_id in self.network_to_design_ids[network_name]:
-                    self.network_to_design_ids[network_name].remove(design_id)
-
-                # Clean up empty network entries
-                if not self.network_to_design_ids[network_name]:
-                    del self.network_to_design_ids[network_name]
-
-            # Remove info
-            if design_id in self.design_id_to_info:
-                del self.design_id_to_info[design_id]
+            # Remove from mappings and info
+            self._unregister(design_id)
+            EDITOR_STATE_SYNC.discard(design_id)
 
             logger.info(f"Deleted session {design_id} and all associated files")
             return True
@@ -484,10 +535,10 @@ class SimpleStateRegistry:
 
     def get_session_info(self, design_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a session"""
-        if design_id not in self.managers:
+        manager = self.get_manager(design_id)
+        if manager is None:
             return None
 
-        manager = self.managers[design_id]
         info = self.design_id_to_info.get(design_id, {})
         state = manager.get_state()
         validation = manager.validate_network()
@@ -558,7 +609,7 @@ class SimpleStateRegistry:
 
     def export_to_hocon_file(self, design_id: str, output_path: Optional[str] = "") -> bool:
         """Export editing session to a HOCON-like file safely under EXPORT_ROOT_DIR."""
-        manager = self.managers.get(design_id)
+        manager = self.get_manager(design_id)
         if not manager:
             return False
 
@@ -0,0 +1,293 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+
+"""
+Push-based sync of editor state to WebSocket clients, one channel per design_id.
+
+After each completed edit the state is diffed against the last published one and the
+difference is published as an RFC 6902 JSON patch with a version number:
+
+    {"type": "snapshot", "design_id": ..., "version": 3, "state": {...}}
+    {"type": "patch", "design_id": ..., "version": 4, "base_version": 3, "ops": [...]}
+
+A client applies a patch when base_version equals the version it holds. On a gap (it missed a
+patch, e.g. its queue overflowed) it sends {"type": "resync", "since": <its version>} and gets
+the missed patches from the recent patch log, or a full snapshot when they are no longer kept.
+
+Unchanged agent records are the same objects in consecutive states (see frozen_state), so the
+diff skips them by identity and costs the changed records, not the network.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from nsflow.backend.utils.editor.frozen_state import thaw
+from nsflow.backend.utils.logutils.websocket_pubsub import Channel, OverflowPolicy
+
+logger = logging.getLogger(__name__)
+
+# Number of recent patches kept per design for clients catching up after a gap
+PATCH_LOG_SIZE = int(os.getenv("NSFLOW_EDITOR_SYNC_PATCH_LOG", "64"))
+
+
+def _pointer(path: str, token: Any) -> str:
+    """Append a reference token to a JSON pointer (RFC 6901 escaping)."""
+    return path + "/" + str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff_state(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    RFC 6902 operations turning old into new.
+    Identical objects are skipped without being compared. Lists that only grew or shrank at
+    the end get add/remove operations; any other list change replaces the list.
+    :param old: The previous JSON-like value.
+    :param new: The current JSON-like value.
+    :param path: JSON pointer of the values, "" for the document root.
+    :return: The list of patch operations, empty when the values are equal.
+    """
+    if old is new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in old.items():
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+            else:
+                ops.extend(diff_state(value, new[key], _pointer(path, key)))
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        if old == new:
+            return []
+        common = min(len(old), len(new))
+        if old[:common] == new[:common]:
+            if len(new) > common:
+                return [
+                    {"op": "add", "path": _pointer(path, index), "value": new[index]}
+                    for index in range(common, len(new))
+                ]
+            return [{"op": "remove", "path": _pointer(path, index)} for index in range(len(old) - 1, common - 1, -1)]
+    elif type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """
+    Apply add/remove/replace operations, as produced by diff_state, to a copy of a document.
+    :param document: The JSON-like document.
+    :param ops: The patch operations.
+    :return: A new, plain document with the operations applied.
+    """
+    document = thaw(document)
+    for operation in ops:
+        if operation["path"] == "":
+            document = thaw(operation["value"])
+            continue
+        tokens = [_unescape(token) for token in operation["path"].split("/")[1:]]
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if operation["op"] == "add":
+                parent.insert(index, thaw(operation["value"]))
+            elif operation["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = thaw(operation["value"])
+        elif operation["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = thaw(operation["value"])
+    return document
+
+
+class DesignSync:
+    """
+    Sync state of one design: its channel, current version, last published state and recent patches.
+    """
+
+    def __init__(self, design_id: str, manager: Any):
+        self.design_id = design_id
+        self.manager = manager
+        self.version = 0
+        self.state = manager.get_state()
+        self.patches: Deque[Dict[str, Any]] = deque(maxlen=PATCH_LOG_SIZE)
+        # Clients that fall behind miss patches and resync, so drop the oldest rather than block
+        self.channel = Channel(f"editor:{design_id}", policy=OverflowPolicy.DROP_OLDEST)
+        # Edits made while nobody is subscribed are diffed once, when the next client subscribes
+        self.pending = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def on_change(self, _manager: Any):
+        """Change listener registered on the manager; publishes the edit to the subscribers."""
+        if not self.channel.subscribers:
+            self.pending = True
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self.loop is not None and running is not self.loop:
+            # Edited from a worker thread: publish on the loop that owns the subscribers
+            self.loop.call_soon_threadsafe(self.flush)
+        else:
+            self.flush()
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """
+        Diff the manager's state against the last published state and publish the difference.
+        :return: The published patch message, or None when nothing changed.
+        """
+        self.pending = False
+        state = self.manager.get_state()
+        ops = diff_state(self.state, state)
+        self.state = state
+        if not ops:
+            return None
+        self.version += 1
+        message = {
+            "type": "patch",
+            "design_id": self.design_id,
+            "version": self.version,
+            "base_version": self.version - 1,
+            "ops": ops,
+        }
+        self.patches.append(message)
+        self.channel.publish(message)
+        return message
+
+    def snapshot_message(self) -> Dict[str, Any]:
+        """The full state at the current version."""
+        return {"type": "snapshot", "design_id": self.design_id, "version": self.version, "state": self.state}
+
+    def catch_up(self, since: Any) -> List[Dict[str, Any]]:
+        """
+        Messages bringing a client from a version it holds to the current one.
+        :param since: The client's version, or None for a client without state.
+        :return: The missed patches when they are all in the patch log, otherwise a snapshot.
+        """
+        try:
+            since = int(since)
+        except (TypeError, ValueError):
+            return [self.snapshot_message()]
+        if since == self.version:
+            return []
+        if self.patches and self.patches[0]["base_version"] <= since < self.version:
+            return [message for message in self.patches if message["version"] > since]
+        return [self.snapshot_message()]
+
+
+class EditorStateSync:
+    """
+    Per-process registry of design syncs. A design is tracked from its first subscriber on.
+    """
+
+    def __init__(self):
+        self.designs: Dict[str, DesignSync] = {}
+
+    def attach(self, design_id: str, manager: Any) -> DesignSync:
+        """
+        Start tracking a design, or switch it to a new manager (e.g. after a draft was reloaded).
+        :param design_id: The design ID.
+        :param manager: The design's SimpleStateManager.
+        :return: The design's sync state.
+        """
+        sync = self.designs.get(design_id)
+        if sync is None:
+            sync = DesignSync(design_id, manager)
+            self.designs[design_id] = sync
+        elif sync.manager is not manager:
+            if sync.on_change in sync.manager.change_listeners:
+                sync.manager.change_listeners.remove(sync.on_change)
+            sync.manager = manager
+            sync.pending = True
+        if sync.on_change not in manager.change_listeners:
+            manager.change_listeners.append(sync.on_change)
+        return sync
+
+    def discard(self, design_id: str):
+        """
+        Stop tracking a deleted design and tell its subscribers.
+        :param design_id: The design ID.
+        """
+        sync = self.designs.pop(design_id, None)
+        if sync is None:
+            return
+        if sync.on_change in sync.manager.change_listeners:
+            sync.manager.change_listeners.remove(sync.on_change)
+        sync.channel.publish({"type": "deleted", "design_id": design_id, "version": sync.version})
+
+    async def serve(self, websocket: WebSocket, design_id: str, manager: Any):
+        """
+        Serve one client: send its starting point, then the patches of every edit until it disconnects.
+        ?since=<version> on connect, or a {"type": "resync", "since": <version>} frame, asks for
+        the patches after that version; without a version the client gets a snapshot.
+        :param websocket: The WebSocket, not yet accepted.
+        :param design_id: The design ID.
+        :param manager: The design's SimpleStateManager.
+        """
+        await websocket.accept()
+        sync = self.attach(design_id, manager)
+        sync.loop = asyncio.get_running_loop()
+        if sync.pending:
+            sync.flush()
+        sync.channel.subscribe(websocket)
+        for message in sync.catch_up(websocket.query_params.get("since")):
+            sync.channel.send_to(websocket, message)
+        try:
+            while True:
+                frame = await websocket.receive()
+                if frame.get("type") == "websocket.disconnect":
+                    break
+                try:
+                    request = json.loads(frame.get("text") or "{}")
+                except ValueError:
+                    continue
+                if isinstance(request, dict) and request.get("type") == "resync":
+                    for message in sync.catch_up(request.get("since")):
+                        sync.channel.send_to(websocket, message)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            sync.channel.unsubscribe(websocket)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters per tracked design.
+        :return: Version, kept patches and channel counters by design ID.
+        """
+        return {
+            design_id: {"version": sync.version, "patch_log": len(sync.patches), **sync.channel.stats()}
+            for design_id, sync in self.designs.items()
+        }
+
+
+EDITOR_STATE_SYNC = EditorStateSync()
@@ -23,24 +23,41 @@ Instances are typically scoped per agent (e.g. "hello_world", "airline_policy")
 throughout the application via a shared registry.
 """
 
-import asyncio
 import json
 import logging
 import os
 from datetime import datetime, timezone
 from typing import Any, Dict, List
 
-from fastapi import WebSocket, WebSocketDisconnect
+from fastapi import WebSocket
+
+from nsflow.backend.utils.agentutils.session_registry import SESSION_REGISTRY
+from nsflow.backend.utils.logutils.websocket_pubsub import Channel, OverflowPolicy
 
 # Configuration
-ASYNCIO_SLEEP_INTERVAL = 0.5
+# Events queued per subscriber before its channel's overflow policy kicks in
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("NSFLOW_WS_QUEUE_SIZE", "256"))
+
+LOGS_CHANNEL = "logs"
+INTERNAL_CHAT_CHANNEL = "internal_chat"
+SLY_DATA_CHANNEL = "sly_data"
+PROGRESS_CHANNEL = "progress"
+
+# Logs and chat are histories, so a slow client loses the oldest entries first.
+# sly_data and progress are snapshots, so only the newest one is worth sending.
+CHANNEL_POLICIES = {
+    LOGS_CHANNEL: OverflowPolicy.DROP_OLDEST,
+    INTERNAL_CHAT_CHANNEL: OverflowPolicy.DROP_OLDEST,
+    SLY_DATA_CHANNEL: OverflowPolicy.COALESCE,
+    PROGRESS_CHANNEL: OverflowPolicy.COALESCE,
+}
 
 
 class WebsocketLogsManager:
     """
     Enables sending structured logs and internal chat messages over WebSocket connections.
-    Each instance manages a list of connected WebSocket clients and can broadcast messages
-    to clients in real-time. Supports both general logs and internal chat streams.
+    Each instance owns one pub/sub channel per stream (logs, internal chat, sly_data, progress);
+    events are serialized once per publish and fanned out to per-client queues.
     Scoped per agent and session to ensure multi-user isolation.
     """
 
@@ -54,13 +71,32 @@ class WebsocketLogsManager:
         """
         self.agent_name = agent_name
         self.session_id = session_id
-        self.active_log_connections: List[WebSocket] = []
-        self.active_internal_chat_connections: List[WebSocket] = []
-        self.active_sly_data_connections: List[WebSocket] = []
-        self.active_progress_connections: List[WebSocket] = []
+        self.channels: Dict[str, Channel] = {
+            name: Channel(name, SUBSCRIBER_QUEUE_SIZE, policy) for name, policy in CHANNEL_POLICIES.items()
+        }
         self.logger = logging.getLogger(f"{self.agent_name}")
         self.log_buffer: List[Dict] = []
 
+    @property
+    def active_log_connections(self) -> List[WebSocket]:
+        """Sockets subscribed to the logs stream."""
+        return self.channels[LOGS_CHANNEL].websockets
+
+    @property
+    def active_internal_chat_connections(self) -> List[WebSocket]:
+        """Sockets subscribed to the internal chat stream."""
+        return self.channels[INTERNAL_CHAT_CHANNEL].websockets
+
+    @property
+    def active_sly_data_connections(self) -> List[WebSocket]:
+        """Sockets subscribed to the sly_data stream."""
+        return self.channels[SLY_DATA_CHANNEL].websockets
+
+    @property
+    def active_progress_connections(self) -> List[WebSocket]:
+        """Sockets subscribed to the progress stream."""
+        return self.channels[PROGRESS_CHANNEL].websockets
+
     def get_timestamp(self):
         """
         Get the current UTC timestamp formatted as a string.
@@ -88,7 +124,7 @@ class WebsocketLogsManager:
         if len(self.log_buffer) > self.LOG_BUFFER_SIZE:
             self.log_buffer.pop(0)
         # Broadcast to connected clients
-        await self.broadcast_to_websocket(log_entry, self.active_log_connections)
+        self.channels[LOGS_CHANNEL].publish(log_entry)
 
     async def progress_event(self, message: Dict[str, Any]):
         """
@@ -97,7 +133,7 @@ class WebsocketLogsManager:
         """
         entry = {"message": message}
         self.logger.debug(message)
-        await self.broadcast_to_websocket(entry, self.active_progress_connections)
+        self.channels[PROGRESS_CHANNEL].publish(entry)
 
     async def internal_chat_event(self, message: Dict[str, Any]):
         """
@@ -106,7 +142,7 @@ class WebsocketLogsManager:
         """
         entry = {"message": message}
         self.logger.info(message)
-        await self.broadcast_to_websocket(entry, self.active_internal_chat_connections)
+        self.channels[INTERNAL_CHAT_CHANNEL].publish(entry)
 
     async def sly_data_event(self, message: Dict[str, Any]):
         """
@@ -115,22 +151,29 @@ class WebsocketLogsManager:
         """
         entry = {"message": message}
         self.logger.debug(message)
-        await self.broadcast_to_websocket(entry, self.active_sly_data_connections)
+        self.channels[SLY_DATA_CHANNEL].publish(entry)
+
+    async def serve_channel(self, websocket: WebSocket, channel_name: str):
+        """
+        Subscribe an accepted WebSocket to a channel and hold it until the client disconnects.
+        The session stays attached, and so is never evicted, while the client is connected.
+        :param websocket: The connected WebSocket instance.
+        :param channel_name: One of the channel names, e.g. LOGS_CHANNEL.
+        """
+        channel = self.channels[channel_name]
+        channel.subscribe(websocket)
+        try:
+            with SESSION_REGISTRY.attached(self.agent_name, self.session_id):
+                await channel.wait_for_disconnect(websocket)
+        finally:
+            channel.unsubscribe(websocket)
 
-    async def broadcast_to_websocket(self, entry: Dict[str, Any], connections_list: List[WebSocket]):
+    def stats(self) -> Dict[str, Any]:
         """
-        Broadcast a message to a list of WebSocket clients, removing any disconnected ones.
-        :param entry: The dictionary message to send (will be JSON serialized).
-        :param connections_list: List of currently active WebSocket clients.
+        Per-channel fan-out counters for this agent/session.
+        :return: A dictionary keyed by channel name.
         """
-        disconnected: List[WebSocket] = []
-        for ws in connections_list:
-            try:
-                await ws.send_text(json.dumps(entry))
-            except WebSocketDisconnect:
-                disconnected.append(ws)
-        for ws in disconnected:
-            connections_list.remove(ws)
+        return {name: channel.stats() for name, channel in self.channels.items()}
 
     async def handle_internal_chat_websocket(self, websocket: WebSocket):
         """
@@ -138,14 +181,10 @@ class WebsocketLogsManager:
         :param websocket: The connected WebSocket instance.
         """
         await websocket.accept()
-        self.active_internal_chat_connections.append(websocket)
+        self.channels[INTERNAL_CHAT_CHANNEL].subscribe(websocket)
         await self.internal_chat_event(f"Internal chat connected: {self.agent_name}")
-        try:
-            while True:
-                await asyncio.sleep(1)
-        except WebSocketDisconnect:
-            self.active_internal_chat_connections.remove(websocket)
-            await self.internal_chat_event(f"Internal chat disconnected: {self.agent_name}")
+        await self.serve_channel(websocket, INTERNAL_CHAT_CHANNEL)
+        await self.internal_chat_event(f"Internal chat disconnected: {self.agent_name}")
 
     async def handle_log_websocket(self, websocket: WebSocket):
         """
@@ -153,14 +192,10 @@ class WebsocketLogsManager:
         :param websocket: The connected WebSocket instance.
         """
         await websocket.accept()
-        self.active_log_connections.append(websocket)
+        self.channels[LOGS_CHANNEL].subscribe(websocket)
         await self.log_event("New logs client connected", "FastAPI")
-        try:
-            while True:
-                await asyncio.sleep(2)
-        except WebSocketDisconnect:
-            self.active_log_connections.remove(websocket)
-            await self.log_event("Logs client disconnected", "FastAPI")
+        await self.serve_channel(websocket, LOGS_CHANNEL)
+        await self.log_event("Logs client disconnected", "FastAPI")
 
     async def handle_sly_data_websocket(self, websocket: WebSocket):
         """
@@ -168,14 +203,10 @@ class WebsocketLogsManager:
         :param websocket: The connected WebSocket instance.
         """
         await websocket.accept()
-        self.active_sly_data_connections.append(websocket)
+        self.channels[SLY_DATA_CHANNEL].subscribe(websocket)
         await self.sly_data_event(f"Sly Data connected: {self.agent_name}")
-        try:
-            while True:
-                await asyncio.sleep(3)
-        except WebSocketDisconnect:
-            self.active_sly_data_connections.remove(websocket)
-            await self.sly_data_event(f"Sly Data disconnected: {self.agent_name}")
+        await self.serve_channel(websocket, SLY_DATA_CHANNEL)
+        await self.sly_data_event(f"Sly Data disconnected: {self.agent_name}")
 
     async def handle_progress_websocket(self, websocket: WebSocket):
         """
@@ -183,15 +214,11 @@ class WebsocketLogsManager:
         :param websocket: The connected WebSocket instance.
         """
         await websocket.accept()
-        self.active_progress_connections.append(websocket)
+        self.channels[PROGRESS_CHANNEL].subscribe(websocket)
         await self.progress_event(
             {"text": json.dumps({"event": "progress_client_connected", "agent": self.agent_name})}
         )
-        try:
-            while True:
-                await asyncio.sleep(ASYNCIO_SLEEP_INTERVAL)
-        except WebSocketDisconnect:
-            self.active_progress_connections.remove(websocket)
-            await self.progress_event(
-                {"text": json.dumps({"event": "progress_client_connected", "agent": self.agent_name})}
-            )
+        await self.serve_channel(websocket, PROGRESS_CHANNEL)
+        await self.progress_event(
+            {"text": json.dumps({"event": "progress_client_disconnected", "agent": self.agent_name})}
+        )
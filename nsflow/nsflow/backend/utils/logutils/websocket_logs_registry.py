@@ -18,10 +18,12 @@ Manages a global registry of WebsocketLogsManager instances, scoped by agent nam
 
 This allows consistent reuse of log managers across different components
 (e.g., WebSocket handlers, services) while avoiding redundant instantiations.
+Managers are dropped when the session registry evicts their session.
 """
 
 from typing import Dict
 
+from nsflow.backend.utils.agentutils.session_registry import SESSION_REGISTRY, SessionRecord, approx_size
 from nsflow.backend.utils.logutils.websocket_logs_manager import WebsocketLogsManager
 
 
@@ -50,7 +52,28 @@ class LogsRegistry:
                           Defaults to "global" for backward compatibility.
         :return: A WebsocketLogsManager instance tied to the given agent_name:session_id pair.
         """
-        key = f"{agent_name}:{session_id}"
+        key = SESSION_REGISTRY.touch(agent_name, session_id).key
         if key not in cls._managers:
             cls._managers[key] = WebsocketLogsManager(agent_name, session_id)
         return cls._managers[key]
+
+    @classmethod
+    def evict(cls, record: SessionRecord):
+        """
+        Drop the logs manager of an evicted session.
+        :param record: The evicted session.
+        """
+        cls._managers.pop(record.key, None)
+
+    @classmethod
+    def approx_bytes(cls, record: SessionRecord) -> int:
+        """
+        Approximate size of a session's log buffer.
+        :param record: A live session.
+        :return: Bytes held, 0 if the session has no logs manager.
+        """
+        manager = cls._managers.get(record.key)
+        return approx_size(manager.log_buffer) if manager is not None else 0
+
+
+SESSION_REGISTRY.register_owner("logs_managers", LogsRegistry.evict, LogsRegistry.approx_bytes)
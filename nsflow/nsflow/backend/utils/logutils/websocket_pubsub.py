@@ -0,0 +1,221 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+"""
+Per-channel publish/subscribe fan-out for WebSocket streams.
+
+A publish serializes the event once and appends the text to each subscriber's bounded
+queue without awaiting any socket. Every subscriber has its own sender task draining its
+queue, so one slow client never delays the others, and a full queue is handled by the
+channel's overflow policy instead of by blocking the publisher.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(str, Enum):
+    """What to do when a subscriber's queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    # Keep only the newest event; for streams where each event supersedes the last
+    COALESCE = "coalesce"
+
+
+class Subscriber:
+    """
+    One WebSocket client on a channel: a bounded queue of serialized events and the task sending them.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue: int, policy: OverflowPolicy, tagged: bool = False):
+        self.websocket = websocket
+        # Tagged subscribers share one socket across channels and get {"channel": ..., "data": ...} frames
+        self.tagged = tagged
+        self.max_queue = max_queue
+        self.policy = policy
+        self.queue: Deque[str] = deque()
+        self.ready = asyncio.Event()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.sender: Optional[asyncio.Task] = None
+
+    def offer(self, text: str):
+        """
+        Queue an already-serialized event, applying the overflow policy. Never blocks.
+        :param text: The JSON text to send.
+        """
+        if self.closed:
+            return
+        if self.policy == OverflowPolicy.COALESCE:
+            self.dropped += len(self.queue)
+            self.queue.clear()
+        elif len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            if self.policy == OverflowPolicy.DROP_NEWEST:
+                return
+            self.queue.popleft()
+        self.queue.append(text)
+        self.ready.set()
+
+    async def run_sender(self):
+        """
+        Drain the queue to the socket until the subscriber is closed or a send fails.
+        """
+        try:
+            while not self.closed:
+                await self.ready.wait()
+                self.ready.clear()
+                while self.queue and not self.closed:
+                    await self.websocket.send_text(self.queue.popleft())
+                    self.sent += 1
+        except (WebSocketDisconnect, RuntimeError, ConnectionError) as exc:
+            logger.debug("Send to subscriber failed, closing it: %s", exc)
+            self.closed = True
+
+    def close(self):
+        """
+        Stop the sender task and drop anything still queued.
+        """
+        self.closed = True
+        self.queue.clear()
+        if self.sender is not None:
+            self.sender.cancel()
+
+
+class Channel:
+    """
+    A named stream (logs, progress, ...) with its own subscribers and overflow policy.
+    """
+
+    def __init__(self, name: str, max_queue: int = 256, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        self.name = name
+        self.max_queue = max_queue
+        self.policy = policy
+        self.frame_prefix = '{"channel": ' + json.dumps(name) + ', "data": '
+        self.subscribers: Dict[int, Subscriber] = {}
+        self.published = 0
+        # Totals carried over from subscribers that have left
+        self.sent_closed = 0
+        self.dropped_closed = 0
+
+    @property
+    def websockets(self) -> List[WebSocket]:
+        """The sockets currently subscribed to this channel."""
+        return [subscriber.websocket for subscriber in self.subscribers.values() if not subscriber.closed]
+
+    def publish(self, entry: Dict[str, Any]):
+        """
+        Serialize an event once and queue it for every subscriber.
+        :param entry: The dictionary message to send.
+        """
+        self.published += 1
+        if not self.subscribers:
+            return
+        text = json.dumps(entry)
+        tagged_text = None
+        for subscriber in list(self.subscribers.values()):
+            if subscriber.closed:
+                self.unsubscribe(subscriber.websocket)
+            elif subscriber.tagged:
+                # Wrap the already-serialized entry rather than serializing it again
+                if tagged_text is None:
+                    tagged_text = self.tag(text)
+                subscriber.offer(tagged_text)
+            else:
+                subscriber.offer(text)
+
+    def send_to(self, websocket: WebSocket, entry: Dict[str, Any]):
+        """
+        Queue an event for one subscriber only, e.g. the current state for a client that just joined.
+        :param websocket: A subscribed WebSocket.
+        :param entry: The dictionary message to send.
+        """
+        subscriber = self.subscribers.get(id(websocket))
+        if subscriber is not None:
+            text = json.dumps(entry)
+            subscriber.offer(self.tag(text) if subscriber.tagged else text)
+
+    def tag(self, text: str) -> str:
+        """
+        Wrap serialized data in this channel's multiplexed frame.
+        :param text: JSON text of the payload.
+        :return: JSON text of {"channel": name, "data": payload}.
+        """
+        return self.frame_prefix + text + "}"
+
+    def subscribe(self, websocket: WebSocket, tagged: bool = False) -> Subscriber:
+        """
+        Register an accepted WebSocket and start its sender task. Subscribing twice is a no-op.
+        :param websocket: The connected WebSocket instance.
+        :param tagged: Send channel-tagged frames, for sockets multiplexing several channels.
+        :return: The Subscriber for this socket.
+        """
+        if id(websocket) in self.subscribers:
+            return self.subscribers[id(websocket)]
+        subscriber = Subscriber(websocket, self.max_queue, self.policy, tagged)
+        subscriber.sender = asyncio.create_task(subscriber.run_sender())
+        self.subscribers[id(websocket)] = subscriber
+        return subscriber
+
+    def unsubscribe(self, websocket: WebSocket):
+        """
+        Remove a WebSocket from the channel and stop its sender task.
+        :param websocket: The WebSocket to remove.
+        """
+        subscriber = self.subscribers.pop(id(websocket), None)
+        if subscriber is not None:
+            self.sent_closed += subscriber.sent
+            self.dropped_closed += subscriber.dropped + len(subscriber.queue)
+            subscriber.close()
+
+    async def wait_for_disconnect(self, websocket: WebSocket):
+        """
+        Block until the client disconnects, by receiving rather than polling.
+        Clients on these streams do not send anything meaningful; incoming frames are ignored.
+        :param websocket: The subscribed WebSocket instance.
+        """
+        try:
+            while True:
+                message = await websocket.receive()
+                if message.get("type") == "websocket.disconnect":
+                    return
+        except (WebSocketDisconnect, RuntimeError):
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters for this channel.
+        :return: Subscriber count, queued/sent/dropped totals and the channel configuration.
+        """
+        subscribers = list(self.subscribers.values())
+        return {
+            "subscribers": len(subscribers),
+            "published": self.published,
+            "queued": sum(len(subscriber.queue) for subscriber in subscribers),
+            "sent": self.sent_closed + sum(subscriber.sent for subscriber in subscribers),
+            "dropped": self.dropped_closed + sum(subscriber.dropped for subscriber in subscribers),
+            "max_queue": self.max_queue,
+            "policy": self.policy.value,
+        }
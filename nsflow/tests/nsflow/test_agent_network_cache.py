@@ -0,0 +1,83 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import os
+import tempfile
+import unittest
+
+from nsflow.backend.utils.agentutils.agent_network_cache import AgentNetworkCache
+
+
+class TestAgentNetworkCache(unittest.TestCase):
+    def setUp(self):
+        """Create a tiny registry with one shared include."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.registry_dir = os.path.join(self.tmp.name, "registries")
+        os.makedirs(self.registry_dir)
+        self.shared = self._write("aaosa.hocon", "aaosa_call = {}\n")
+        self.network = self._write("net.hocon", 'include "registries/aaosa.hocon"\n{ tools = [] }\n')
+        self.cache = AgentNetworkCache(max_entries=2, search_dirs=[self.tmp.name, self.registry_dir])
+        self.loads = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.registry_dir, name)
+        with open(path, "w", encoding="utf-8") as hocon_file:
+            hocon_file.write(content)
+        return path
+
+    def _touch(self, path, content):
+        with open(path, "a", encoding="utf-8") as hocon_file:
+            hocon_file.write(content)
+        # Make sure the change is visible even on filesystems with coarse mtimes.
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def _load(self):
+        self.loads += 1
+        return self.loads
+
+    def test_hit_until_network_changes(self):
+        """Unchanged files are served from cache; editing the network reloads it."""
+        self.assertEqual(self.cache.get(self.network, self._load), 1)
+        self.assertEqual(self.cache.get(self.network, self._load), 1)
+        self._touch(self.network, "# edited\n")
+        self.assertEqual(self.cache.get(self.network, self._load), 2)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["invalidations"]), (1, 2, 1))
+
+    def test_include_change_invalidates_dependents(self):
+        """Editing a shared include reloads the network that pulls it in."""
+        self.cache.get(self.network, self._load)
+        self._touch(self.shared, "extra = 1\n")
+        self.assertEqual(self.cache.get(self.network, self._load), 2)
+
+    def test_lru_eviction(self):
+        """The least recently used network is evicted once the cache is full."""
+        other = self._write("other.hocon", "{ tools = [] }\n")
+        third = self._write("third.hocon", "{ tools = [] }\n")
+        self.cache.get(self.network, self._load)
+        self.cache.get(other, self._load)
+        self.cache.get(self.network, self._load)
+        self.cache.get(third, self._load)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.cache.get(self.network, self._load)
+        self.assertEqual(self.loads, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import asyncio
+import threading
+import unittest
+
+from nsflow.backend.utils.agentutils.async_streaming_input_processor import StreamReaderThread
+
+
+class TestStreamReaderThread(unittest.TestCase):
+    def setUp(self):
+        self.reader = StreamReaderThread("test-reader")
+
+    def tearDown(self):
+        self.reader.close()
+
+    def _collect(self, open_stream, limit=None):
+        async def run():
+            items = []
+            async for item in self.reader.iterate(open_stream):
+                items.append(item)
+                if limit is not None and len(items) >= limit:
+                    break
+            return items
+
+        return asyncio.run(run())
+
+    def test_streams_in_order_on_one_thread(self):
+        """Every stream of a reader is opened and drained on the same dedicated thread."""
+        threads = set()
+
+        def numbers():
+            threads.add(threading.current_thread().name)
+            yield from range(5)
+
+        self.assertEqual(self._collect(numbers), [0, 1, 2, 3, 4])
+        self.assertEqual(self._collect(numbers), [0, 1, 2, 3, 4])
+        self.assertEqual(threads, {"test-reader"})
+
+    def test_errors_reach_the_consumer(self):
+        """An exception raised by the blocking iterator is re-raised on the event loop."""
+
+        def failing():
+            yield 1
+            raise ValueError("server went away")
+
+        with self.assertRaisesRegex(ValueError, "server went away"):
+            self._collect(failing)
+
+    def test_early_stop_closes_the_stream(self):
+        """A consumer that stops early makes the reader close the generator and move on."""
+        closed = threading.Event()
+
+        def endless():
+            try:
+                count = 0
+                while True:
+                    yield count
+                    count += 1
+            finally:
+                closed.set()
+
+        self.assertEqual(self._collect(endless, limit=3), [0, 1, 2])
+        self.assertTrue(closed.wait(5))
+        self.assertEqual(self._collect(lambda: iter("ab")), ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
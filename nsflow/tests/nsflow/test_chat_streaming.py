@@ -0,0 +1,77 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from nsflow.backend.utils.agentutils.ns_websocket_utils import CHAT_MODE_STREAM, NsWebsocketUtils
+from nsflow.backend.utils.tools.ns_configs_registry import NsConfigsRegistry
+
+
+class FakeAgentSession:
+    """Streams two agent messages and the final answer."""
+
+    def streaming_chat(self, _chat_request):
+        yield {"response": {"type": "AGENT", "text": "looking up flights", "origin": [{"tool": "airline"}]}}
+        yield {"response": {"type": "AGENT_FRAMEWORK", "text": "", "chat_context": {}}}
+        yield {"response": {"type": "AI", "text": "Your flight is at 9am.", "origin": [{"tool": "airline"}]}}
+
+
+class TestChatStreaming(unittest.TestCase):
+    def setUp(self):
+        NsConfigsRegistry.set_current("http", "localhost", 8080)
+
+    def _run(self, session_id, message_data, chat_mode="final"):
+        frames = []
+
+        async def send(text):
+            frames.append(json.loads(text))
+
+        async def run():
+            with mock.patch.object(NsWebsocketUtils, "create_agent_session", return_value=FakeAgentSession()):
+                utils = NsWebsocketUtils("stream_net", None, session_id, chat_mode)
+            await utils.process_message(message_data, send)
+            await utils.close_user_session()
+            return utils
+
+        return asyncio.run(run()), frames
+
+    def test_final_mode_sends_one_frame(self):
+        """Without negotiation the client gets the single AI frame it always got."""
+        utils, frames = self._run("stream-1", {"message": "when is my flight?"})
+        self.assertEqual(frames, [{"message": {"type": "AI", "text": "Your flight is at 9am."}}])
+        self.assertIsNotNone(utils.last_time_to_first_frame)
+
+    def test_stream_mode_forwards_partials_then_final(self):
+        """In stream mode AI/AGENT messages arrive as partial frames before the final frame."""
+        _utils, frames = self._run("stream-2", {"message": "when is my flight?", "mode": CHAT_MODE_STREAM})
+        self.assertEqual(
+            frames[0],
+            {"message": {"type": "AGENT", "text": "looking up flights", "partial": True, "origin": ["airline"]}},
+        )
+        self.assertEqual(frames[1]["message"]["partial"], True)
+        self.assertEqual(frames[-1], {"message": {"type": "AI", "text": "Your flight is at 9am.", "final": True}})
+        self.assertEqual(len(frames), 3)
+
+    def test_mode_negotiated_per_socket(self):
+        """A socket opened with mode=stream streams every message that does not override it."""
+        _utils, frames = self._run("stream-3", {"message": "hi"}, chat_mode=CHAT_MODE_STREAM)
+        self.assertTrue(frames[0]["message"]["partial"])
+
+
+if __name__ == "__main__":
+    unittest.main()
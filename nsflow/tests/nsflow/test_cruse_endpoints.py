@@ -0,0 +1,265 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from datetime import timezone
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from nsflow.backend.api.v1 import cruse_endpoints
+from nsflow.backend.db import database
+from nsflow.backend.db import models
+from nsflow.backend.db.chat_context_cache import CHAT_CONTEXT_CACHE
+from nsflow.backend.db.database import Base, get_threads_session, set_sqlite_pragma
+
+
+class TestCruseEndpoints(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "threads.db")
+        engine = create_engine(f"sqlite:///{self.path}")
+        event.listen(engine, "connect", set_sqlite_pragma)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{self.path}")
+        event.listen(self.async_engine.sync_engine, "connect", set_sqlite_pragma)
+        session_factory = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+
+        async def get_session():
+            async with session_factory() as db:
+                yield db
+
+        app = FastAPI()
+        app.include_router(cruse_endpoints.router)
+        app.dependency_overrides[get_threads_session] = get_session
+        self.client = TestClient(app)
+        self.client.__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+        self.addCleanup(self.client.portal.call, self.async_engine.dispose)
+
+    def test_thread_lifecycle(self):
+        """Threads and messages are created, listed, read and deleted through the async session."""
+        thread = self.client.post("/cruse/threads", json={"title": "First", "agent_name": "hello"}).json()
+        self.assertEqual((thread["title"], thread["agent_name"]), ("First", "hello"))
+        self.assertIsNotNone(thread["created_at"])
+
+        message = {"sender": "HUMAN", "origin": [{"tool": "hello", "instantiation_index": 1}], "text": "Hi"}
+        response = self.client.post(f"/cruse/threads/{thread['id']}/messages", json=message)
+        self.assertEqual(response.status_code, 200)
+        self.client.post(f"/cruse/threads/{thread['id']}/messages", json={**message, "sender": "AI", "text": "Hello"})
+
+        listed = self.client.get("/cruse/threads").json()
+        self.assertEqual([item["id"] for item in listed], [thread["id"]])
+        full = self.client.get(f"/cruse/threads/{thread['id']}").json()
+        self.assertEqual([item["text"] for item in full["messages"]], ["Hi", "Hello"])
+        context = self.client.get(f"/cruse/threads/{thread['id']}/chat_context").json()["chat_context"]
+        self.assertEqual([item["type"] for item in context["chat_histories"][0]["messages"]], ["HUMAN", "AI"])
+
+        self.assertEqual(self.client.get("/cruse/threads/missing").status_code, 404)
+        deleted = self.client.delete("/cruse/threads/agent/hello").json()
+        self.assertEqual(deleted["deleted_count"], 1)
+        self.assertEqual(self.client.get(f"/cruse/threads/{thread['id']}/messages").status_code, 404)
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM messages").fetchone()[0], 0)
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_thread_summaries_pages(self):
+        """Summary pages follow the update order without repeats and carry the maintained counters."""
+        ids = [self.client.post("/cruse/threads", json={"title": f"T{index}"}).json()["id"] for index in range(5)]
+        message = {"sender": "AI", "origin": [], "text": "x" * 500}
+        self.client.post(f"/cruse/threads/{ids[1]}/messages", json=message)
+        self.client.post(f"/cruse/threads/{ids[1]}/messages", json={**message, "text": "latest"})
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = self.client.get("/cruse/threads/summaries", params=params).json()
+            seen += page["threads"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        listed = self.client.get("/cruse/threads").json()
+        self.assertEqual([item["id"] for item in seen], [item["id"] for item in listed])
+        self.assertEqual(sorted(item["id"] for item in seen), sorted(ids))
+        self.assertEqual(seen[0]["id"], ids[1])
+        self.assertEqual((seen[0]["message_count"], seen[0]["last_message_preview"]), (2, "latest"))
+
+        first = self.client.get("/cruse/threads", params={"limit": 3})
+        self.assertEqual(len(first.json()), 3)
+        rest = self.client.get("/cruse/threads", params={"cursor": first.headers["X-Next-Cursor"]}).json()
+        self.assertEqual([item["id"] for item in first.json() + rest], [item["id"] for item in seen])
+        self.assertEqual(self.client.get("/cruse/threads/summaries", params={"cursor": "bogus"}).status_code, 400)
+
+    def test_message_cursor_pages(self):
+        """Messages page by cursor in creation order, optionally without their widgets."""
+        thread_id = self.client.post("/cruse/threads", json={"title": "Long"}).json()["id"]
+        widget = {"title": "Form", "schema": {"type": "object"}}
+        for index in range(7):
+            body = {"sender": "AI", "origin": [], "text": f"m{index}", "widget": widget}
+            self.client.post(f"/cruse/threads/{thread_id}/messages", json=body)
+
+        texts, cursor = [], None
+        while True:
+            params = {"limit": 3, "include_widgets": False, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get(f"/cruse/threads/{thread_id}/messages", params=params)
+            self.assertTrue(all(item["widget"] is None for item in response.json()))
+            texts += [item["text"] for item in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+        self.assertEqual(texts, [f"m{index}" for index in range(7)])
+
+        offset_page = self.client.get(f"/cruse/threads/{thread_id}/messages", params={"limit": 3, "offset": 3}).json()
+        self.assertEqual([item["text"] for item in offset_page], ["m3", "m4", "m5"])
+        self.assertEqual(offset_page[0]["widget"]["title"], "Form")
+
+        head = self.client.get(f"/cruse/threads/{thread_id}", params={"message_limit": 2}).json()
+        self.assertEqual(([item["text"] for item in head["messages"]], head["message_count"]), (["m0", "m1"], 7))
+        rest = self.client.get(f"/cruse/threads/{thread_id}/messages", params={"cursor": head["next_cursor"]}).json()
+        self.assertEqual([item["text"] for item in rest], [f"m{index}" for index in range(2, 7)])
+
+    def test_bulk_messages(self):
+        """A bulk add stores the messages in the given order and updates the thread summary once."""
+        thread_id = self.client.post("/cruse/threads", json={"title": "Import"}).json()["id"]
+        self.client.post(f"/cruse/threads/{thread_id}/messages", json={"sender": "HUMAN", "origin": [], "text": "m0"})
+        widget = {"title": "Form", "schema": {"type": "object"}}
+        bulk = {"messages": [{"sender": "AI", "origin": [], "text": f"m{index}"} for index in range(1, 40)]}
+        bulk["messages"][5]["widget"] = widget
+
+        response = self.client.post(f"/cruse/threads/{thread_id}/messages:bulk", json=bulk).json()
+        self.assertEqual(len(response["message_ids"]), 39)
+        messages = self.client.get(f"/cruse/threads/{thread_id}/messages").json()
+        self.assertEqual([item["text"] for item in messages], [f"m{index}" for index in range(40)])
+        self.assertEqual([item["id"] for item in messages[1:]], response["message_ids"])
+        self.assertEqual(messages[6]["widget"]["schema"], widget["schema"])
+        summary = self.client.get("/cruse/threads/summaries").json()["threads"][0]
+        self.assertEqual((summary["message_count"], summary["last_message_preview"]), (40, "m39"))
+
+        self.assertEqual(self.client.post("/cruse/threads/missing/messages:bulk", json=bulk).status_code, 404)
+        empty = self.client.post(f"/cruse/threads/{thread_id}/messages:bulk", json={"messages": []})
+        self.assertEqual(empty.status_code, 422)
+
+    def test_messages_keep_the_order_they_were_added(self):
+        """Messages added in the same instant, singly and in bulk, are listed in the order they were added."""
+        thread_id = self.client.post("/cruse/threads", json={"title": "Busy"}).json()["id"]
+        url = f"/cruse/threads/{thread_id}/messages"
+
+        def bulk(*texts):
+            return {"messages": [{"sender": "AI", "origin": [], "text": text} for text in texts]}
+
+        with mock.patch.object(models, "datetime") as clock:
+            clock.now.return_value = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            self.client.post(url, json={"sender": "HUMAN", "origin": [], "text": "m0"})
+            self.client.post(f"{url}:bulk", json=bulk("m1", "m2", "m3"))
+            self.client.post(url, json={"sender": "HUMAN", "origin": [], "text": "m4"})
+            self.client.post(f"{url}:bulk", json=bulk("m5", "m6"))
+
+        texts, cursor = [], None
+        while True:
+            response = self.client.get(url, params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+            texts += [item["text"] for item in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+        self.assertEqual(texts, [f"m{index}" for index in range(7)])
+        context = self.client.get(f"/cruse/threads/{thread_id}/chat_context", params={"max_history": 3}).json()
+        history = context["chat_context"]["chat_histories"][0]["messages"]
+        self.assertEqual([item["text"] for item in history], ["m4", "m5", "m6"])
+
+    def test_chat_context_cache(self):
+        """chat_context is served from the cached window, extended by new messages and reloaded when stale."""
+        thread_id = self.client.post("/cruse/threads", json={"title": "Chat"}).json()["id"]
+        url = f"/cruse/threads/{thread_id}/chat_context"
+
+        def texts(max_history):
+            histories = self.client.get(url, params={"max_history": max_history}).json()["chat_context"]
+            return [item["text"] for item in histories["chat_histories"][0]["messages"]] if histories else []
+
+        origin = [{"tool": "front", "instantiation_index": 1}]
+        question = {"sender": "HUMAN", "origin": origin, "text": "q0"}
+        self.client.post(f"/cruse/threads/{thread_id}/messages", json=question)
+        self.assertEqual(texts(3), ["q0"])
+        hits = CHAT_CONTEXT_CACHE.stats()["hits"]
+        bulk = {"messages": [{"sender": "AI", "origin": origin, "text": f"a{index}"} for index in range(1, 5)]}
+        self.client.post(f"/cruse/threads/{thread_id}/messages:bulk", json=bulk)
+        self.client.post(f"/cruse/threads/{thread_id}/messages", json={"sender": "HUMAN", "origin": [], "text": "q5"})
+        self.assertEqual(texts(3), ["a3", "a4", "q5"])
+        self.assertEqual(texts(10), ["q0", "a1", "a2", "a3", "a4", "q5"])
+        self.assertEqual(CHAT_CONTEXT_CACHE.stats()["hits"], hits + 2)
+        context = self.client.get(url, params={"max_history": 2}).json()["chat_context"]
+        self.assertEqual(context["chat_histories"][0]["origin"], origin)
+
+        # A message written by another process changes the thread's count and the window is reloaded
+        with sqlite3.connect(self.path) as connection:
+            connection.execute(
+                "INSERT INTO messages VALUES ('x', ?, 'AI', '[]', 'elsewhere', NULL, '2999-01-01 00:00:00', 7)",
+                (thread_id,),
+            )
+            connection.execute("UPDATE threads SET message_count = message_count + 1 WHERE id = ?", (thread_id,))
+        self.assertEqual(texts(2), ["q5", "elsewhere"])
+
+        self.client.delete(f"/cruse/threads/{thread_id}")
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_upgrade_adds_summary_columns(self):
+        """A database from before the summary and sequence columns gains them, filled from its messages."""
+        path = os.path.join(os.path.dirname(self.path), "old.db")
+        with sqlite3.connect(path) as connection:
+            connection.executescript(
+                "CREATE TABLE threads (id VARCHAR PRIMARY KEY, title VARCHAR, agent_name VARCHAR,"
+                " created_at DATETIME, updated_at DATETIME);"
+                "CREATE TABLE messages (id VARCHAR PRIMARY KEY, thread_id VARCHAR, sender VARCHAR, origin TEXT,"
+                " text TEXT, widget_json JSON, created_at DATETIME);"
+                "INSERT INTO threads VALUES ('t1', 'Old', NULL, '2025-01-01 00:00:00', '2025-01-01 00:00:00');"
+                "INSERT INTO messages VALUES ('m1', 't1', 'HUMAN', '[]', 'first', NULL, '2025-01-01 00:00:01');"
+                "INSERT INTO messages VALUES ('m2', 't1', 'AI', '[]', 'second', NULL, '2025-01-01 00:00:02');"
+                "INSERT INTO messages VALUES ('m0', 't1', 'HUMAN', '[]', 'zeroth', NULL, '2025-01-01 00:00:00');"
+            )
+        engine = create_engine(f"sqlite:///{path}")
+        self.addCleanup(engine.dispose)
+        with mock.patch.object(database, "threads_engine", engine):
+            database.init_threads_db()
+        with sqlite3.connect(path) as connection:
+            row = connection.execute("SELECT message_count, last_message_preview FROM threads").fetchone()
+            sequence = connection.execute("SELECT id, seq FROM messages ORDER BY seq").fetchall()
+            indexes = {item[1] for item in connection.execute("PRAGMA index_list('threads')")}
+            message_indexes = {item[1] for item in connection.execute("PRAGMA index_list('messages')")}
+        self.assertEqual(row, (3, "second"))
+        self.assertEqual(sequence, [("m0", 1), ("m1", 2), ("m2", 3)])
+        self.assertIn("idx_threads_updated_id", indexes)
+        self.assertIn("idx_messages_thread_seq", message_indexes)
+
+    def test_themes(self):
+        """A theme entry holds a static and a dynamic theme, created and updated separately."""
+        body = {"agent_name": "org/agent", "theme_type": "static", "theme_json": {"color": "blue"}}
+        self.assertEqual(self.client.post("/cruse/themes", json=body).json()["static_theme"], {"color": "blue"})
+        update = {"theme_type": "dynamic", "theme_json": {"mood": "calm"}}
+        theme = self.client.patch("/cruse/themes/org/agent", json=update).json()
+        self.assertEqual((theme["static_theme"], theme["dynamic_theme"]), ({"color": "blue"}, {"mood": "calm"}))
+        self.assertEqual(self.client.get("/cruse/themes/org/other").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from nsflow.backend.api.v1 import editor_endpoints
+from nsflow.backend.utils.editor import ops_store
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+from nsflow.backend.utils.editor.simple_state_registry import SimpleStateRegistry
+
+
+class TestEditorBatch(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for patcher in (
+            mock.patch.object(ops_store, "ROOT_DIR", tmp.name),
+            mock.patch.object(SimpleStateManager, "NSFLOW_PLUGIN_MANUAL_EDITOR", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.registry = SimpleStateRegistry()
+        patcher = mock.patch.object(editor_endpoints, "get_registry", return_value=self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.design_id, self.manager = self.registry.create_new_network("batch", "single_agent")
+        app = FastAPI()
+        app.include_router(editor_endpoints.router)
+        self.client = TestClient(app)
+        self.url = f"/api/v1/andeditor/networks/{self.design_id}"
+
+    def test_batch_is_one_undoable_entry(self):
+        """A batch is written as one history record and undone as a whole."""
+        store = self.registry.get_operation_store(self.design_id)
+        ops = [
+            {"op": "create_agent_with_parent", "args": {"name": "researcher", "parent": "frontman"}},
+            {"op": "create_agent_with_parent", "args": {"name": "writer", "parent": "frontman"}},
+            {"op": "update_agent", "args": {"name": "writer", "updates": {"instructions": "Write it up"}}},
+            {"op": "add_edge", "args": {"src": "researcher", "dst": "writer"}},
+        ]
+        response = self.client.post(f"{self.url}/batch", json={"ops": ops})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["applied"], body["can_undo"], body["validation"]["valid"]), (4, True, True))
+        with open(store.hist_file, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(self.manager.get_state()["agents"]["writer"]["_parent"], "researcher")
+
+        self.assertTrue(self.client.post(f"{self.url}/undo").json()["success"])
+        self.assertEqual(list(self.manager.get_state()["agents"]), ["frontman"])
+        self.assertTrue(self.client.post(f"{self.url}/redo").json()["success"])
+        self.assertEqual(self.manager.get_state()["agents"]["writer"]["instructions"], "Write it up")
+
+    def test_failed_batch_changes_nothing(self):
+        """An operation failing part way rolls back the ones before it and records nothing."""
+        store = self.registry.get_operation_store(self.design_id)
+        before = self.manager.get_state()
+        ops = [
+            {"op": "add_agent", "args": {"name": "helper"}},
+            {"op": "add_edge", "args": {"src": "frontman", "dst": "helper"}},
+            {"op": "add_edge", "args": {"src": "helper", "dst": "frontman"}},
+        ]
+        response = self.client.post(f"{self.url}/batch", json={"ops": ops})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((response.json()["detail"]["index"], response.json()["detail"]["op"]), (2, "add_edge"))
+        self.assertEqual(self.manager.get_state()["agents"], before["agents"])
+        self.assertEqual(os.path.getsize(store.hist_file), 0)
+
+        response = self.client.post(f"{self.url}/batch", json={"ops": [{"op": "drop_tables"}]})
+        self.assertEqual(response.status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from nsflow.backend.utils.editor import ops_store
+from nsflow.backend.utils.editor.ops_store import OperationStore
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+from nsflow.backend.utils.editor.simple_state_registry import SimpleStateRegistry
+
+
+def make_manager(design_id="design"):
+    manager = SimpleStateManager(design_id)
+    manager._initialize_empty_state()  # pylint: disable=protected-access
+    manager.add_agent("frontman")
+    return manager
+
+
+class TestOperationStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(ops_store, "ROOT_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def _instructions(self, manager):
+        return manager.get_state()["agents"]["frontman"]["instructions"]
+
+    def _edit(self, store, text):
+        store.apply({"op": "update_agent", "args": {"name": "frontman", "updates": {"instructions": text}}})
+
+    def test_undo_redo_move_a_cursor(self):
+        """Undo/redo only append markers; a new edit after undo drops the redo tail."""
+        manager = make_manager()
+        store = OperationStore("design", manager)
+        for text in ("one", "two", "three"):
+            self._edit(store, text)
+        size = os.path.getsize(store.hist_file)
+
+        self.assertTrue(store.undo())
+        self.assertTrue(store.undo())
+        self.assertEqual(self._instructions(manager), "one")
+        self.assertEqual((store.operation_count, store.redo_count), (1, 2))
+        self.assertTrue(store.redo())
+        self.assertEqual(self._instructions(manager), "two")
+        # Three short marker records, the history itself was not rewritten
+        self.assertLess(os.path.getsize(store.hist_file) - size, 60)
+
+        self._edit(store, "four")
+        self.assertFalse(store.can_redo())
+        self.assertEqual(store.operation_count, 3)
+
+        reopened = OperationStore("design", make_manager())
+        self.assertEqual((reopened.operation_count, reopened.redo_count), (3, 0))
+        self.assertEqual([entry["forward"]["args"]["updates"]["instructions"] for entry in reopened.applied_entries()],
+                         ["one", "two", "four"])
+
+    def test_compaction_keeps_live_entries_and_cursor(self):
+        """Compaction drops markers and dead entries but keeps redo available."""
+        manager = make_manager()
+        store = OperationStore("design", manager)
+        for index in range(5):
+            self._edit(store, f"v{index}")
+        store.undo()
+        store.undo()
+        self._edit(store, "branch")
+        store.undo()
+        store.compact()
+
+        with open(store.hist_file, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record.get("seq") for record in records], [1, 2, 3, 4, None])
+        self.assertEqual(records[-1], {"cursor": 3})
+        self.assertTrue(store.redo())
+        self.assertEqual(self._instructions(manager), "branch")
+
+    def test_legacy_history_is_migrated(self):
+        """A history.jsonl/redo_stack.jsonl pair from before the indexed log keeps its undo and redo."""
+        manager = make_manager()
+        root = os.path.join(self.tmp.name, "draft_states", "legacy")
+        os.makedirs(root)
+
+        def entry(old, new):
+            return {
+                "ts": "2025-01-01T00:00:00",
+                "forward": {"op": "update_agent", "args": {"name": "frontman", "updates": {"instructions": new}}},
+                "inverse": {"op": "update_agent", "args": {"name": "frontman", "updates": {"instructions": old}}},
+            }
+
+        with open(os.path.join(root, "history.jsonl"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(entry("a", "b")) + "\n")
+        with open(os.path.join(root, "redo_stack.jsonl"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(entry("b", "c")) + "\n")
+
+        store = OperationStore("legacy", manager)
+        self.assertEqual((store.operation_count, store.redo_count), (1, 1))
+        self.assertFalse(os.path.exists(store.redo_file))
+        self.assertTrue(store.redo())
+        self.assertEqual(self._instructions(manager), "c")
+
+    def test_load_draft_replays_from_snapshot(self):
+        """Loads start at the snapshot and go forward or, past an undo, back through the inverses."""
+        manager = make_manager()
+        store = OperationStore("design", manager)
+        with mock.patch.object(ops_store, "SNAPSHOT_INTERVAL", 4):
+            for index in range(10):
+                self._edit(store, f"v{index}")
+            self.assertEqual(store.snapshot_seq, 8)
+            store.save_draft()
+            self.assertEqual(store.snapshot_seq, 10)
+
+            with mock.patch.object(OperationStore, "_execute", wraps=store._execute) as execute:
+                loaded = OperationStore.load_draft("design", make_manager())
+            self.assertEqual(execute.call_count, 0)
+            # Saving no longer moves base_state.json, so the history is not replayed on top of it twice
+            self.assertEqual(loaded.manager.get_state()["agents"], manager.get_state()["agents"])
+
+            store.undo()
+            store.undo()
+            loaded = OperationStore.load_draft("design", make_manager())
+            self.assertEqual(self._instructions(loaded.manager), "v7")
+
+            # An edit replacing entries the snapshot covers discards it before checkpointing again
+            with mock.patch.object(OperationStore, "write_snapshot"):
+                self._edit(store, "branch")
+            self.assertIsNone(store.snapshot_seq)
+            self.assertFalse(os.path.exists(store.snapshot_file))
+            loaded = OperationStore.load_draft("design", make_manager())
+            self.assertEqual(self._instructions(loaded.manager), "branch")
+            self.assertEqual(loaded.operation_count, 9)
+
+
+class TestLazyDrafts(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(ops_store, "ROOT_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_drafts_load_on_first_access(self):
+        """Startup registers drafts from meta.json; the state is restored when a draft is first used."""
+        manager = make_manager("draft-1")
+        manager.set_network_name("saved_name")
+        store = OperationStore("draft-1", manager)
+        store.save_draft()
+        store.apply({"op": "set_network_name", "args": {"name": "renamed"}})
+
+        with mock.patch.object(OperationStore, "load_draft", wraps=OperationStore.load_draft) as load_draft:
+            registry = SimpleStateRegistry()
+            self.assertEqual(load_draft.call_count, 0)
+            self.assertIn("draft-1", registry.network_to_design_ids["saved_name"])
+            sessions = registry.list_all_networks()["editing_sessions"]
+            self.assertEqual([(s["design_id"], s["can_undo"]) for s in sessions], [("draft-1", True)])
+            self.assertEqual(load_draft.call_count, 0)
+
+            hydrated = registry.get_manager("draft-1")
+            self.assertEqual(load_draft.call_count, 1)
+        self.assertEqual(hydrated.get_state()["network_name"], "renamed")
+        self.assertEqual(registry.network_to_design_ids, {"renamed": ["draft-1"]})
+        self.assertTrue(registry.get_operation_store("draft-1").undo())
+
+
+if __name__ == "__main__":
+    unittest.main()
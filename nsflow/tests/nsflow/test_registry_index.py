@@ -0,0 +1,128 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from nsflow.backend.utils.agentutils import registry_index
+from nsflow.backend.utils.agentutils.registry_index import RegistryIndex
+
+ROOT_MANIFEST = """{
+    include "registries/basic/manifest.hocon",
+    "front.hocon": true,
+    "hidden.hocon": false,
+}
+"""
+
+BASIC_MANIFEST = """{
+    "basic/rag.hocon": true,
+}
+"""
+
+FRONT_NETWORK = """include "registries/aaosa.hocon"
+{
+    "tools": [
+        {"name": "Front", "tools": ["Helper", "/basic/rag"]},
+        {"name": "Helper", "class": "tools.pdf_rag.PdfRag"}
+    ]
+}
+"""
+
+RAG_NETWORK = """{
+    "tools": [{"name": "Rag", "class": "tools.webpage_rag.WebpageRag"}]
+}
+"""
+
+
+class TestRegistryIndex(unittest.TestCase):
+    def setUp(self):
+        """Create a small registry with a nested manifest and a shared include."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.registry_dir = os.path.join(self.tmp.name, "registries")
+        os.makedirs(os.path.join(self.registry_dir, "basic"))
+        self._write("manifest.hocon", ROOT_MANIFEST)
+        self._write("basic/manifest.hocon", BASIC_MANIFEST)
+        self._write("aaosa.hocon", "aaosa_call = {}\n")
+        self._write("front.hocon", FRONT_NETWORK)
+        self._write("hidden.hocon", "{ tools = [] }\n")
+        self._write("basic/rag.hocon", RAG_NETWORK)
+        self.index = RegistryIndex(os.path.join(self.registry_dir, "manifest.hocon"), watch=False)
+
+    def tearDown(self):
+        self.index.stop()
+        self.tmp.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.registry_dir, name)
+        with open(path, "w", encoding="utf-8") as hocon_file:
+            hocon_file.write(content)
+        stat = os.stat(path)
+        # Bump the mtime so rewrites are noticed on filesystems with coarse timestamps.
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_listing_follows_manifest_includes(self):
+        """Enabled networks from included manifests are listed too."""
+        self.assertEqual(sorted(self.index.list_available_networks()["networks"]), ["front", "rag"])
+
+    def test_reverse_dependencies(self):
+        """Includes, coded tools and sub-networks can be looked up in reverse."""
+        self.assertEqual(self.index.networks_using("registries/aaosa.hocon"), ["front"])
+        self.assertEqual(self.index.networks_using("coded_tools.tools.pdf_rag"), ["front"])
+        self.assertEqual(self.index.networks_using("tools"), ["basic/rag", "front"])
+        self.assertEqual(self.index.networks_using("/basic/rag"), ["front"])
+        self.assertEqual(
+            self.index.network_dependencies("front"),
+            {"includes": ["aaosa.hocon"], "coded_tools": ["tools.pdf_rag.PdfRag"], "sub_networks": ["basic/rag"]},
+        )
+
+    def test_incremental_reload(self):
+        """Only changed files are rescanned, and manifest edits add or drop networks."""
+        self._write("front.hocon", FRONT_NETWORK.replace("tools.pdf_rag.PdfRag", "tools.docling_rag.DoclingRag"))
+        self._write("basic/manifest.hocon", '{ "basic/rag.hocon": true, "basic/new.hocon": true }\n')
+        self._write("basic/new.hocon", 'include "registries/aaosa.hocon"\n{ tools = [] }\n')
+        self.index.poll()
+        self.assertEqual(self.index.networks_using("tools.pdf_rag"), [])
+        self.assertEqual(self.index.networks_using("tools.docling_rag.DoclingRag"), ["front"])
+        self.assertEqual(self.index.networks_using("aaosa.hocon"), ["basic/new", "front"])
+        self.assertIn("new", self.index.list_available_networks()["networks"])
+        self.assertEqual(self.index.rebuilds, 1)
+
+    @unittest.skipIf(registry_index.Observer is None, "watchdog is not installed")
+    def test_watcher_refreshes_each_edit_a_bounded_number_of_times(self):
+        """Reading a changed file does not trigger further refreshes of it."""
+        watched = RegistryIndex(os.path.join(self.registry_dir, "manifest.hocon"), watch=False)
+        self.addCleanup(watched.stop)
+        refreshes = []
+        refresh_path = watched.refresh_path
+        with mock.patch.object(watched, "refresh_path", side_effect=lambda path: refreshes.append(refresh_path(path))):
+            watched.start_watching()
+            self.assertEqual(watched.watch_mode, "watchdog")
+            self._write("front.hocon", FRONT_NETWORK.replace("tools.pdf_rag.PdfRag", "tools.docling_rag.DoclingRag"))
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and watched.networks_using("tools.docling_rag") != ["front"]:
+                time.sleep(0.05)
+            self.assertEqual(watched.networks_using("tools.docling_rag"), ["front"])
+            time.sleep(1)
+            settled = len(refreshes)
+            time.sleep(1)
+        self.assertLessEqual(settled, 10)
+        self.assertEqual(len(refreshes), settled)
+
+
+if __name__ == "__main__":
+    unittest.main()
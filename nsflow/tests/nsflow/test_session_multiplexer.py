@@ -0,0 +1,103 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import json
+import unittest
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from nsflow.backend.api.v1.fast_websocket import router
+from nsflow.backend.trust.rai_service import RaiService
+from nsflow.backend.utils.logutils.websocket_logs_registry import LogsRegistry
+
+
+class TestSessionMultiplexer(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+
+    def test_channel_tagged_frames_and_subscriptions(self):
+        """Initial channels come from the query string; frames carry their channel."""
+        RaiService.get_instance().session_metrics["mux-1"] = {"energy": "1 kWh"}
+        url = "/api/v1/ws/session/mux_agent/mux-1?channels=logs,sustainability"
+        with self.client.websocket_connect(url) as websocket:
+            self.assertEqual(
+                websocket.receive_json(),
+                {"channel": "control", "type": "subscribed", "channels": ["logs", "sustainability"]},
+            )
+            frames = [websocket.receive_json(), websocket.receive_json()]
+            by_channel = {frame["channel"]: frame["data"] for frame in frames}
+            self.assertEqual(by_channel["sustainability"], {"energy": "1 kWh"})
+            self.assertEqual(by_channel["logs"]["message"], "Session client connected: mux-1")
+
+            websocket.send_json({"type": "unsubscribe", "channels": ["logs"]})
+            self.assertEqual(websocket.receive_json()["channels"], ["sustainability"])
+            websocket.send_json({"type": "ping"})
+            self.assertEqual(websocket.receive_json(), {"channel": "control", "type": "pong"})
+
+        manager = LogsRegistry.register("mux_agent", "mux-1")
+        self.assertEqual(manager.active_log_connections, [])
+        self.assertNotIn("mux-1", RaiService.get_instance().channels)
+
+    def test_rejects_unknown_frames(self):
+        """Unknown or malformed channels, frame types and chat without the chat channel get control errors."""
+        with self.client.websocket_connect("/api/v1/ws/session/mux_agent/mux-2?channels=progress") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "subscribe", "channels": ["nope"]})
+            self.assertIn("Unknown channels", websocket.receive_json()["error"])
+            self.assertEqual(websocket.receive_json()["channels"], ["progress"])
+            websocket.send_json({"type": "subscribe", "channels": "logs"})
+            self.assertIn("list of channel names", websocket.receive_json()["error"])
+            websocket.send_json({"type": "unsubscribe", "channels": "progress"})
+            self.assertIn("list of channel names", websocket.receive_json()["error"])
+            websocket.send_json({"type": "ping"})
+            self.assertEqual(websocket.receive_json()["type"], "pong")
+            websocket.send_json({"type": "chat", "message": "hi"})
+            self.assertIn("chat channel", websocket.receive_json()["error"])
+            websocket.send_text("not json")
+            self.assertEqual(websocket.receive_json()["type"], "error")
+
+    def test_chat_responses_are_tagged(self):
+        """Chat frames run through the session's chat utils and come back on the chat channel."""
+
+        class FakeChatUtils:
+            def __init__(self, agent_name, websocket, session_id):
+                self.session_id = session_id
+
+            async def open_user_session(self):
+                return {}
+
+            async def close_user_session(self):
+                return None
+
+            async def process_message(self, message_data, send):
+                await send(json.dumps({"message": {"type": "AI", "text": message_data["message"].upper()}}))
+
+        patch_target = "nsflow.backend.utils.agentutils.session_multiplexer.NsWebsocketUtils"
+        with mock.patch(patch_target, FakeChatUtils):
+            with self.client.websocket_connect("/api/v1/ws/session/mux_agent/mux-3?channels=chat") as websocket:
+                websocket.receive_json()
+                websocket.send_json({"type": "chat", "message": "hello"})
+                self.assertEqual(
+                    websocket.receive_json(),
+                    {"channel": "chat", "data": {"message": {"type": "AI", "text": "HELLO"}}},
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import unittest
+
+from nsflow.backend.utils.agentutils import ns_websocket_utils
+from nsflow.backend.utils.agentutils.session_registry import SESSION_REGISTRY, SessionRegistry
+from nsflow.backend.utils.logutils.websocket_logs_registry import LogsRegistry
+
+
+class TestSessionRegistry(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.registry = SessionRegistry(idle_ttl=60, max_sessions=3, sweep_interval=10, clock=lambda: self.now)
+        self.evicted = []
+        self.registry.register_owner("test", lambda record: self.evicted.append(record.key), lambda record: 10)
+
+    def test_idle_sessions_expire_unless_attached(self):
+        """Detached sessions go after the TTL; attached ones stay until they detach and idle out."""
+        self.registry.touch("net", "idle")
+        self.registry.attach("net", "busy")
+        self.now = 61
+        self.assertEqual(self.registry.sweep(), 1)
+        self.assertEqual(self.evicted, ["net:idle"])
+        self.assertTrue(self.registry.is_live("net", "busy"))
+
+        self.registry.detach("net", "busy")
+        self.now = 100
+        self.assertEqual(self.registry.sweep(), 0)
+        self.now = 122
+        # Lookups sweep as a side effect once the sweep interval has passed
+        self.registry.touch("net", "other")
+        self.assertEqual(self.evicted, ["net:idle", "net:busy"])
+        self.assertEqual(self.registry.stats()["evicted_idle"], 2)
+
+    def test_cap_evicts_least_recently_used_detached(self):
+        """Beyond the cap the least recently used detached session is evicted first."""
+        self.registry.attach("net", "a")
+        self.registry.touch("net", "b")
+        self.registry.touch("net", "c")
+        self.registry.touch("net", "b")
+        self.registry.touch("net", "d")
+        self.assertEqual(self.evicted, ["net:c"])
+        stats = self.registry.stats()
+        self.assertEqual((stats["live"], stats["attached"], stats["evicted_lru"]), (3, 1, 1))
+        self.assertEqual(stats["approx_bytes"], {"test": 30})
+
+    def test_shared_stores_drop_evicted_sessions(self):
+        """Evicting a session releases its logs manager and chat state."""
+        manager = LogsRegistry.register("lifecycle_net", "s-1")
+        ns_websocket_utils.user_sessions["s-1"] = {"state": {"sly_data": {"x": 1}}}
+        ns_websocket_utils.latest_sly_data_storage["lifecycle_net:s-1"] = {"x": 1}
+        self.assertGreater(SESSION_REGISTRY.stats()["approx_bytes"]["user_sessions"], 0)
+
+        self.assertTrue(SESSION_REGISTRY.evict("lifecycle_net", "s-1"))
+        self.assertNotIn("s-1", ns_websocket_utils.user_sessions)
+        self.assertNotIn("lifecycle_net:s-1", ns_websocket_utils.latest_sly_data_storage)
+        self.assertIsNot(LogsRegistry.register("lifecycle_net", "s-1"), manager)
+        SESSION_REGISTRY.evict("lifecycle_net", "s-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import copy
+import json
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from nsflow.backend.utils.editor.frozen_state import ReadOnlyStateError
+from nsflow.backend.utils.editor.graph_index import GraphIndex
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+
+
+class TestSharedState(unittest.TestCase):
+    def setUp(self):
+        self.manager = SimpleStateManager("design")
+        self.manager._initialize_empty_state()  # pylint: disable=protected-access
+        self.manager.create_from_template("hierarchical", levels=2, agents_per_level=[1, 3])
+
+    def test_views_are_read_only_snapshots(self):
+        """get_state() cannot be modified and does not follow later edits."""
+        view = self.manager.get_state()
+        with self.assertRaises(ReadOnlyStateError):
+            view["agents"]["frontman"]["tools"].append("intruder")
+        with self.assertRaises(ReadOnlyStateError):
+            view["network_name"] = "renamed"
+
+        self.manager.remove_edge("frontman", "agent_L1_1")
+        self.assertIn("agent_L1_1", view["agents"]["frontman"]["tools"])
+        self.assertNotIn("agent_L1_1", self.manager.get_state()["agents"]["frontman"]["tools"])
+
+        mutable = copy.deepcopy(view)
+        mutable["agents"]["frontman"]["tools"].append("copy_only")
+        self.assertNotIn("copy_only", json.loads(json.dumps(view))["agents"]["frontman"]["tools"])
+
+    def test_load_notifies_once(self):
+        """Loading a state from a file is one change for the listeners, made after the design id is set."""
+        state = json.loads(json.dumps(self.manager.get_state()))
+        state["design_id"] = "loaded"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "state.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(state, file)
+            seen = []
+            self.manager.change_listeners.append(lambda manager: seen.append(manager.design_id))
+            self.assertTrue(self.manager.load_from_file(path))
+        self.assertEqual(seen, ["loaded"])
+
+    def test_history_shares_unchanged_agents(self):
+        """An edit copies only the records it changes; undo/redo restore the shared records."""
+        before = self.manager.get_state()
+        self.manager.update_agent("agent_L1_2", {"instructions": "changed"})
+        latest = self.manager.state_history[-1]
+        after = self.manager.get_state()
+
+        for name in ("frontman", "agent_L1_1", "agent_L1_3"):
+            self.assertIs(latest["agents"][name], before["agents"][name])
+            self.assertIs(after["agents"][name], before["agents"][name])
+        self.assertIsNot(after["agents"]["agent_L1_2"], before["agents"]["agent_L1_2"])
+
+        # History holds the state before each edit; undo and redo move between those entries
+        self.manager.add_edge("agent_L1_1", "agent_L1_3")
+        self.assertTrue(self.manager.undo())
+        restored = self.manager.get_state()
+        self.assertEqual(restored["agents"], before["agents"])
+        self.assertIs(restored["agents"]["agent_L1_2"], before["agents"]["agent_L1_2"])
+        self.assertTrue(self.manager.redo())
+        self.assertEqual(self.manager.get_state()["agents"]["agent_L1_2"]["instructions"], "changed")
+
+
+class TestGraphIndex(unittest.TestCase):
+    @staticmethod
+    def reaches(agents, start, goal):
+        """Reference cycle check: walk the tools from start."""
+        seen, stack = set(), [start]
+        while stack:
+            name = stack.pop()
+            if name == goal:
+                return True
+            if name not in seen and name in agents:
+                seen.add(name)
+                stack.extend(agents[name]["tools"])
+        return False
+
+    def test_index_follows_edits(self):
+        """After any sequence of edits the kept index matches a fresh one and answers cycle checks right."""
+        rng = random.Random(7)
+        manager = SimpleStateManager("graph")
+        manager._initialize_empty_state()  # pylint: disable=protected-access
+        manager.create_from_template("hierarchical", levels=2, agents_per_level=[1, 3])
+        for step in range(400):
+            names = list(manager.current_state["agents"])
+            source, target = rng.choice(names), rng.choice(names)
+            action = rng.random()
+            if action < 0.45:
+                expected = source == target or self.reaches(manager.current_state["agents"], target, source)
+                self.assertEqual(manager.add_edge(source, target), not expected)
+            elif action < 0.6:
+                manager.remove_edge(source, target)
+            elif action < 0.75:
+                manager.add_agent(f"agent_{step}", rng.choice(names + [None]))
+            elif action < 0.85 and len(names) > 2:
+                manager.delete_agent(source)
+            elif action < 0.92:
+                manager.update_agent(source, {"tools": rng.sample(names, 1) if source != names[0] else []})
+            elif action < 0.96:
+                manager.undo()
+            else:
+                manager.duplicate_agent(source, f"copy_{step}")
+
+            index = manager.get_graph_index()
+            fresh = GraphIndex.build(manager.current_state["agents"])
+            self.assertEqual(index.frontman_candidates, fresh.frontman_candidates)
+            self.assertEqual(index.orphans, fresh.orphans)
+            self.assertEqual(index.acyclic, fresh.acyclic)
+            self.assertEqual(
+                {name: children for name, children in index.children.items() if children},
+                {name: children for name, children in fresh.children.items() if children},
+            )
+            if index.acyclic:
+                order = {name: position for position, name in enumerate(index.topological_order())}
+                for name, children in index.children.items():
+                    for child in children:
+                        if child in order:
+                            self.assertLess(order[name], order[child])
+
+    def test_order_is_kept_again_once_a_cycle_is_broken(self):
+        """Unlinking the edge that closed a cycle restores the order, and cycle checks are incremental again."""
+        index = GraphIndex.build({"a": {"tools": ["b"]}, "b": {"tools": ["c"]}, "c": {"tools": []}})
+        index.refresh("c", {"tools": ["a"]})
+        self.assertFalse(index.acyclic)
+        with mock.patch.object(index, "_collect", wraps=index._collect) as walk:  # pylint: disable=protected-access
+            self.assertTrue(index.would_create_cycle("a", "c"))
+            self.assertEqual(walk.call_count, 1)
+
+        index.refresh("c", {"tools": []})
+        self.assertTrue(index.acyclic)
+        self.assertEqual(index.topological_order(), ["a", "b", "c"])
+        with mock.patch.object(index, "_collect", wraps=index._collect) as walk:  # pylint: disable=protected-access
+            self.assertFalse(index.would_create_cycle("a", "c"))
+            walk.assert_not_called()
+            self.assertTrue(index.would_create_cycle("c", "a"))
+
+        index.refresh("c", {"tools": ["a"]})
+        index.refresh("b", None)
+        self.assertTrue(index.acyclic)
+        self.assertEqual(index.topological_order(), ["c", "a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
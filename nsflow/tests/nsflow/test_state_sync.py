@@ -0,0 +1,127 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from nsflow.backend.api.v1 import editor_endpoints
+from nsflow.backend.utils.editor import ops_store
+from nsflow.backend.utils.editor.simple_state_manager import SimpleStateManager
+from nsflow.backend.utils.editor.simple_state_registry import SimpleStateRegistry
+from nsflow.backend.utils.editor.state_sync import EDITOR_STATE_SYNC, apply_patch, diff_state
+
+
+class TestDiffState(unittest.TestCase):
+    def test_diff_round_trips(self):
+        """Applying the diff of two documents to the first yields the second."""
+        old = {"a/b": 1, "tools": ["x", "y"], "meta": {"k": "v", "gone": True}, "flag": 1}
+        for new in (
+            {"a/b": 2, "tools": ["x", "y", "z"], "meta": {"k": "v"}, "flag": True, "new~key": None},
+            {"a/b": 1, "tools": ["x"], "meta": {"k": "w", "gone": True}, "flag": 1},
+            {"a/b": 1, "tools": ["y", "x"], "meta": [], "flag": 1},
+        ):
+            ops = diff_state(old, new)
+            self.assertEqual(apply_patch(old, ops), new)
+        self.assertEqual(diff_state(old, dict(old)), [])
+        self.assertEqual(
+            diff_state({"tools": ["x"]}, {"tools": ["x", "y"]}), [{"op": "add", "path": "/tools/1", "value": "y"}]
+        )
+
+
+class TestEditorStateSync(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for patcher in (
+            mock.patch.object(ops_store, "ROOT_DIR", tmp.name),
+            mock.patch.object(SimpleStateManager, "NSFLOW_PLUGIN_MANUAL_EDITOR", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.registry = SimpleStateRegistry()
+        patcher = mock.patch.object(editor_endpoints, "get_registry", return_value=self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.design_id, self.manager = self.registry.create_new_network("sync", "single_agent")
+        app = FastAPI()
+        app.include_router(editor_endpoints.router)
+        self.client = TestClient(app)
+        self.url = f"/api/v1/andeditor/networks/{self.design_id}"
+
+    def test_edits_are_pushed_as_patches(self):
+        """A client gets a snapshot, then one versioned patch per edit carrying only the changed fields."""
+        with self.client.websocket_connect(f"{self.url}/sync") as websocket:
+            snapshot = websocket.receive_json()
+            self.assertEqual((snapshot["type"], snapshot["version"]), ("snapshot", 0))
+            state = snapshot["state"]
+
+            self.client.post(f"{self.url}/agents", json={"name": "helper", "parent_name": "frontman"})
+            self.client.put(f"{self.url}/agents/helper", json={"instructions": "Help out"})
+            self.client.post(
+                f"{self.url}/batch",
+                json={"ops": [{"op": "add_agent", "args": {"name": "a"}}, {"op": "add_agent", "args": {"name": "b"}}]},
+            )
+            for version in (1, 2, 3):
+                patch = websocket.receive_json()
+                self.assertEqual(patch["version"], version)
+                self.assertEqual((patch["type"], patch["base_version"]), ("patch", version - 1))
+                self.assertNotIn("/agents", [op["path"] for op in patch["ops"]])
+                state = apply_patch(state, patch["ops"])
+                if version == 2:
+                    paths = {op["path"] for op in patch["ops"]}
+                    self.assertEqual(paths, {"/meta/updated_at", "/agents/helper/instructions"})
+            self.assertEqual(state, json.loads(json.dumps(self.manager.get_state())))
+
+            # A client that lost track asks for the patches after the version it holds
+            websocket.send_json({"type": "resync", "since": 1})
+            self.assertEqual([websocket.receive_json()["version"] for _ in range(2)], [2, 3])
+            websocket.send_json({"type": "resync"})
+            self.assertEqual(websocket.receive_json()["type"], "snapshot")
+
+    def test_copilot_updates_and_reconnects(self):
+        """Copilot updates are pushed too; a reconnecting client resumes from its version."""
+        with self.client.websocket_connect(f"{self.url}/sync") as websocket:
+            state = websocket.receive_json()["state"]
+            progress = {
+                "agent_network_name": "sync",
+                "agent_network_definition": {"frontman": {"instructions": "Route", "down_chains": []}},
+            }
+            self.manager.update_network_state("sync", progress, source="copilot_logs")
+            patch = websocket.receive_json()
+            state = apply_patch(state, patch["ops"])
+            self.assertEqual(state["agents"]["frontman"]["instructions"], "Route")
+            self.assertNotIn({"op": "replace", "path": "/agents"}, patch["ops"])
+
+        # Edits while nobody listens are sent as one patch to the next client that resumes
+        self.manager.add_agent("late", "frontman")
+        self.manager.update_agent("late", {"instructions": "Arrived later"})
+        with self.client.websocket_connect(f"{self.url}/sync?since=1") as websocket:
+            patch = websocket.receive_json()
+            self.assertEqual((patch["type"], patch["base_version"], patch["version"]), ("patch", 1, 2))
+            state = apply_patch(state, patch["ops"])
+            self.assertEqual(state["agents"]["late"]["instructions"], "Arrived later")
+
+        self.assertTrue(self.registry.delete_session(self.design_id))
+        self.assertNotIn(self.design_id, EDITOR_STATE_SYNC.designs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Copyright © 2025 Cognizant Technology Solutions Corp, www.cognizant.com.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# END COPYRIGHT
+import asyncio
+import json
+import unittest
+
+from nsflow.backend.utils.logutils.websocket_logs_manager import WebsocketLogsManager
+from nsflow.backend.utils.logutils.websocket_pubsub import Channel, OverflowPolicy
+
+
+class FakeWebSocket:
+    """Records sent frames; send_text can be held to simulate a slow client."""
+
+    def __init__(self):
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.incoming = asyncio.Queue()
+
+    async def accept(self):
+        return None
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    def disconnect(self):
+        self.incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestWebsocketPubSub(unittest.IsolatedAsyncioTestCase):
+    async def test_fan_out_is_independent_of_slow_subscribers(self):
+        """A stalled client fills its own queue without holding up the others."""
+        channel = Channel("logs", max_queue=2, policy=OverflowPolicy.DROP_OLDEST)
+        fast, slow = FakeWebSocket(), FakeWebSocket()
+        slow.gate.clear()
+        channel.subscribe(fast)
+        channel.subscribe(slow)
+        await settle()
+
+        for index in range(5):
+            channel.publish({"n": index})
+            await settle()
+
+        self.assertEqual([entry["n"] for entry in fast.sent], [0, 1, 2, 3, 4])
+        slow.gate.set()
+        await settle()
+        # The slow client was mid-send of 0, then kept only the newest two
+        self.assertEqual([entry["n"] for entry in slow.sent], [0, 3, 4])
+        self.assertEqual(channel.stats()["dropped"], 2)
+
+    async def test_coalesce_and_drop_newest(self):
+        """Coalescing keeps the latest event; drop-newest keeps the earliest."""
+        coalesce = Channel("progress", max_queue=8, policy=OverflowPolicy.COALESCE)
+        newest = Channel("chat", max_queue=1, policy=OverflowPolicy.DROP_NEWEST)
+        first, second = FakeWebSocket(), FakeWebSocket()
+        first.gate.clear()
+        second.gate.clear()
+        coalesce.subscribe(first)
+        newest.subscribe(second)
+        await settle()
+        for index in range(4):
+            coalesce.publish({"n": index})
+            newest.publish({"n": index})
+        first.gate.set()
+        second.gate.set()
+        await settle()
+        self.assertEqual([entry["n"] for entry in first.sent], [3])
+        self.assertEqual([entry["n"] for entry in second.sent], [0])
+
+    async def test_handler_returns_on_disconnect(self):
+        """The log handler waits on receive and unsubscribes when the client leaves."""
+        manager = WebsocketLogsManager("agent", "session")
+        websocket = FakeWebSocket()
+        handler = asyncio.create_task(manager.handle_log_websocket(websocket))
+        await settle()
+        self.assertEqual(manager.active_log_connections, [websocket])
+
+        await manager.log_event("hello")
+        await settle()
+        self.assertEqual([entry["message"] for entry in websocket.sent], ["New logs client connected", "hello"])
+
+        websocket.disconnect()
+        await asyncio.wait_for(handler, timeout=1)
+        self.assertEqual(manager.active_log_connections, [])
+        self.assertEqual(manager.stats()["logs"]["sent"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()